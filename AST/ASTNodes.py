@@ -18,6 +18,7 @@ Gerarchia delle classi:
     - BooleanLiteral
     - Identifier
     - EmptyList
+    - ListLiteral
   - Condition
     - BinaryCondition
     - UnaryCondition
@@ -25,7 +26,11 @@ Gerarchia delle classi:
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Union, Any
+from copy import copy as _shallow_copy  # privato: non esportato da import *
+from types import GeneratorType
+from typing import Any, Callable, List, Optional, Union
+
+from packed_lists import PACK_THRESHOLD as _PACK_THRESHOLD, pack as _pack
 
 
 class SourcePosition:
@@ -53,6 +58,10 @@ class ASTNode(ABC):
     def __str__(self):
         return self.__class__.__name__
 
+    def _describe(self):
+        """Descrizione del nodo per __str__; i nodi composti producono i figli."""
+        return str(self)
+
 
 # ==================== NODI DI LIVELLO SUPERIORE ====================
 
@@ -123,7 +132,11 @@ class Assignment(Statement):
         return visitor.visit_assignment(self)
 
     def __str__(self):
-        return f"Assignment({self.variable} = {self.value})"
+        return describe(self)
+
+    def _describe(self):
+        value = yield self.value
+        return f"Assignment({self.variable} = {value})"
 
 
 class IfStatement(Statement):
@@ -141,8 +154,12 @@ class IfStatement(Statement):
         return visitor.visit_if_statement(self)
 
     def __str__(self):
+        return describe(self)
+
+    def _describe(self):
+        condition = yield self.condition
         else_part = f" else {self.else_block}" if self.else_block else ""
-        return f"IfStatement(if {self.condition} then {self.then_block}{else_part})"
+        return f"IfStatement(if {condition} then {self.then_block}{else_part})"
 
 
 class ReturnStatement(Statement):
@@ -157,7 +174,11 @@ class ReturnStatement(Statement):
         return visitor.visit_return_statement(self)
 
     def __str__(self):
-        return f"ReturnStatement(return {self.value})"
+        return describe(self)
+
+    def _describe(self):
+        value = yield self.value
+        return f"ReturnStatement(return {value})"
 
 
 # ==================== EXPRESSIONS ====================
@@ -176,12 +197,19 @@ class BinaryExpression(Expression):
         self.left = left
         self.operator = operator
         self.right = right
+        # Operatore legato dopo l'analisi (None = dispatch table)
+        self.operator_impl = None
 
     def accept(self, visitor):
         return visitor.visit_binary_expression(self)
 
     def __str__(self):
-        return f"BinaryExpression({self.left} {self.operator} {self.right})"
+        return describe(self)
+
+    def _describe(self):
+        left = yield self.left
+        right = yield self.right
+        return f"BinaryExpression({left} {self.operator} {right})"
 
 
 class UnaryExpression(Expression):
@@ -192,12 +220,18 @@ class UnaryExpression(Expression):
         super().__init__(position)
         self.operator = operator
         self.operand = operand
+        # Operatore legato dopo l'analisi (None = dispatch table)
+        self.operator_impl = None
 
     def accept(self, visitor):
         return visitor.visit_unary_expression(self)
 
     def __str__(self):
-        return f"UnaryExpression({self.operator} {self.operand})"
+        return describe(self)
+
+    def _describe(self):
+        operand = yield self.operand
+        return f"UnaryExpression({self.operator} {operand})"
 
 
 class FunctionCall(Expression):
@@ -213,8 +247,14 @@ class FunctionCall(Expression):
         return visitor.visit_function_call(self)
 
     def __str__(self):
-        args = ', '.join(str(arg) for arg in self.arguments)
-        return f"FunctionCall({self.function}({args}))"
+        return describe(self)
+
+    def _describe(self):
+        function = yield self.function
+        args = []
+        for arg in self.arguments:
+            args.append((yield arg))
+        return f"FunctionCall({function}({', '.join(args)}))"
 
 
 class IntegerLiteral(Expression):
@@ -258,6 +298,45 @@ class EmptyList(Expression):
         return "EmptyList([])"
 
 
+class ListLiteral(Expression):
+    """Letterale di lista [e1, e2, ..., en] (equivale a e1 :: ... :: en :: [])."""
+
+    def __init__(self, elements: List[Union[Expression, 'Condition']],
+                 position: Optional[SourcePosition] = None):
+        super().__init__(position)
+        self.elements = elements
+        # Valore precalcolato se gli elementi sono tutti interi letterali
+        # (None = elementi valutati a runtime)
+        self.value = None
+
+    def accept(self, visitor):
+        return visitor.visit_list_literal(self)
+
+    def __str__(self):
+        return f"ListLiteral({len(self.elements)} elements)"
+
+
+def constant_value(elements: List) -> Optional[object]:
+    """
+    Valore di un letterale i cui elementi sono tutti interi letterali
+    (anche con segno), compattato oltre PACK_THRESHOLD; altrimenti None.
+    """
+    values = []
+    for element in elements:
+        sign = 1
+        if isinstance(element, UnaryExpression) and element.operator in ('+', '-'):
+            sign = -1 if element.operator == '-' else 1
+            element = element.operand
+        if not isinstance(element, IntegerLiteral):
+            return None
+        values.append(sign * element.value)
+    if len(values) > _PACK_THRESHOLD:
+        packed = _pack(values)
+        if packed is not None:
+            return packed
+    return values
+
+
 # ==================== CONDITIONS ====================
 
 class Condition(ASTNode):
@@ -274,12 +353,19 @@ class BinaryCondition(Condition):
         self.left = left
         self.operator = operator
         self.right = right
+        # Operatore legato dopo l'analisi (None = dispatch table)
+        self.operator_impl = None
 
     def accept(self, visitor):
         return visitor.visit_binary_condition(self)
 
     def __str__(self):
-        return f"BinaryCondition({self.left} {self.operator} {self.right})"
+        return describe(self)
+
+    def _describe(self):
+        left = yield self.left
+        right = yield self.right
+        return f"BinaryCondition({left} {self.operator} {right})"
 
 
 class UnaryCondition(Condition):
@@ -295,7 +381,11 @@ class UnaryCondition(Condition):
         return visitor.visit_unary_condition(self)
 
     def __str__(self):
-        return f"UnaryCondition({self.operator} {self.operand})"
+        return describe(self)
+
+    def _describe(self):
+        operand = yield self.operand
+        return f"UnaryCondition({self.operator} {operand})"
 
 
 class ComparisonCondition(Condition):
@@ -307,12 +397,19 @@ class ComparisonCondition(Condition):
         self.left = left
         self.operator = operator
         self.right = right
+        # Operatore legato dopo l'analisi (None = dispatch table)
+        self.operator_impl = None
 
     def accept(self, visitor):
         return visitor.visit_comparison_condition(self)
 
     def __str__(self):
-        return f"ComparisonCondition({self.left} {self.operator} {self.right})"
+        return describe(self)
+
+    def _describe(self):
+        left = yield self.left
+        right = yield self.right
+        return f"ComparisonCondition({left} {self.operator} {right})"
 
 
 class BooleanLiteral(Expression):
@@ -370,6 +467,9 @@ class ASTVisitor(ABC):
     @abstractmethod
     def visit_empty_list(self, node: EmptyList): pass
 
+    @abstractmethod
+    def visit_list_literal(self, node: ListLiteral): pass
+
     @abstractmethod
     def visit_binary_condition(self, node: BinaryCondition): pass
 
@@ -381,3 +481,99 @@ class ASTVisitor(ABC):
 
     @abstractmethod
     def visit_boolean_literal(self, node: BooleanLiteral): pass
+
+
+# ==================== VISITA SENZA RICORSIONE ====================
+
+def walk(root, visit: Callable[[Any], Any]) -> Any:
+    """
+    Visita un albero con uno stack esplicito, senza ricorsione Python.
+
+    visit(nodo) restituisce il risultato del nodo oppure un generatore: il
+    generatore produce (yield) i figli da visitare, riceve il risultato di
+    ognuno come valore dell'espressione yield e restituisce (return) il
+    risultato del nodo. Un'eccezione sollevata visitando un figlio viene
+    rilanciata nel generatore del padre, come con le chiamate ricorsive.
+
+    Funziona per qualunque albero: i nodi AST (visit = node.accept(visitor))
+    e i contesti del parse tree di ANTLR.
+    """
+    result = visit(root)
+    if type(result) is not GeneratorType:
+        return result
+    stack = [result]
+    value = error = None
+    while stack:
+        try:
+            if error is None:
+                child = stack[-1].send(value)
+            else:
+                pending, error = error, None
+                child = stack[-1].throw(pending)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            continue
+        except Exception as e:
+            stack.pop()
+            if not stack:
+                raise
+            error = e
+            continue
+        try:
+            value = visit(child)
+        except Exception as e:
+            error = e
+            continue
+        if type(value) is GeneratorType:
+            stack.append(value)
+            value = None
+    return value
+
+
+def describe(node: ASTNode) -> str:
+    """Testo di str(node), costruito senza ricorsione anche per espressioni profonde."""
+    return walk(node, lambda child: child._describe())
+
+
+# Attributi che contengono i figli di ogni tipo di nodo
+CHILD_FIELDS = {
+    Program: ('functions',),
+    Function: ('body',),
+    Block: ('statements',),
+    Assignment: ('value',),
+    IfStatement: ('condition', 'then_block', 'else_block'),
+    ReturnStatement: ('value',),
+    BinaryExpression: ('left', 'right'),
+    UnaryExpression: ('operand',),
+    FunctionCall: ('function', 'arguments'),
+    ListLiteral: ('elements',),
+    BinaryCondition: ('left', 'right'),
+    UnaryCondition: ('operand',),
+    ComparisonCondition: ('left', 'right'),
+}
+
+
+def copy_tree(root: ASTNode) -> ASTNode:
+    """
+    Copia profonda di un sottoalbero AST, come copy.deepcopy ma con uno
+    stack esplicito. Le posizioni, gli operatori legati e i valori
+    precalcolati dei letterali non vengono mai modificati: sono condivisi.
+    """
+    root_copy = _shallow_copy(root)
+    stack = [root_copy]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Function):
+            node.parameters = list(node.parameters)
+        for field in CHILD_FIELDS.get(type(node), ()):
+            child = getattr(node, field)
+            if isinstance(child, list):
+                copies = [_shallow_copy(item) for item in child]
+                stack.extend(copies)
+                setattr(node, field, copies)
+            elif child is not None:
+                child = _shallow_copy(child)
+                stack.append(child)
+                setattr(node, field, child)
+    return root_copy
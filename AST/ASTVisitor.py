@@ -3,125 +3,152 @@ ASTVisitor per il linguaggio Saltino.
 
 Questo visitor trasforma il parse tree generato da ANTLR in un AST
 utilizzando le classi definite in ASTNodes.py.
+
+Come l'interprete, la costruzione non usa la ricorsione Python: i metodi
+_build* sono generatori che producono (yield) i contesti figli e ricevono i
+loro nodi AST, e walk li esegue con uno stack esplicito. Così anche catene
+di '::' o blocchi annidati per centinaia di migliaia di livelli non
+raggiungono il limite di ricorsione. I metodi visit* del visitor di ANTLR
+restituiscono il nodo AST del contesto, come prima.
+
+Nomi, operatori, posizioni e interi passano dalla HashConsTable del
+visitor: le occorrenze ripetute condividono lo stesso oggetto.
 """
 
 from Grammatica.SaltinoParser import SaltinoParser
 from Grammatica.SaltinoVisitor import SaltinoVisitor
 from .ASTNodes import *
+from .hash_consing import HashConsTable
+import re
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Elemento di un token TABELLA: intero con segno opzionale
+_TABLE_ELEMENT = re.compile(r'[+-]?[0-9]+')
+
 
 class SaltinoASTVisitor(SaltinoVisitor):
     """
     Visitor che trasforma il parse tree di ANTLR in un AST.
 
-    Ogni metodo visit_* corrisponde a una regola della grammatica
-    e restituisce il nodo AST appropriato.
+    Ogni metodo visit* corrisponde a una regola della grammatica e
+    restituisce il nodo AST appropriato. Il lavoro è svolto dal metodo
+    _build* della stessa regola; quelli delle regole con figli sono
+    generatori eseguiti da visit tramite walk.
     """
 
-    def __init__(self):
+    def __init__(self, hash_cons: Optional[HashConsTable] = None):
         super().__init__()
+        self.hash_cons = hash_cons if hash_cons is not None else HashConsTable()
+
+    def visit(self, tree):
+        """Costruisce il nodo AST di un contesto con uno stack esplicito."""
+        return walk(tree, self._build)
+
+    def _build(self, ctx):
+        """Esegue il metodo _build* della regola del contesto."""
+        rule = type(ctx).__name__[:-len('Context')]
+        return getattr(self, '_build' + rule)(ctx)
 
     def _get_position(self, ctx):
         """Estrae la posizione dal contesto del parser."""
         if ctx.start:
-            return SourcePosition(ctx.start.line, ctx.start.column)
+            return self.hash_cons.position(ctx.start.line, ctx.start.column)
         return None
 
     # ==================== PROGRAMMA E FUNZIONI ====================
 
-    def visitProgramma(self, ctx: SaltinoParser.ProgrammaContext):
+    def _buildProgramma(self, ctx: SaltinoParser.ProgrammaContext):
         """Visita il programma principale."""
         functions = []
         for func_ctx in ctx.funzione():
             # print(f"Visiting function: {func_ctx.getText()}")
-            functions.append(self.visitFunzione(func_ctx))
+            functions.append((yield func_ctx))
         return Program(functions, self._get_position(ctx))
 
-    def visitFunzione(self, ctx: SaltinoParser.FunzioneContext):
+    def _buildFunzione(self, ctx: SaltinoParser.FunzioneContext):
         """Visita una definizione di funzione."""
-        name = ctx.ID().getText()
+        name = self.hash_cons.name(ctx.ID().getText())
         # print(f"Visiting function definition: {name}")
 
         # Parametri (opzionali)
         parameters = []
         if ctx.parametri():
-            parameters = self.visit(ctx.parametri())
+            parameters = (yield ctx.parametri())
 
         # Corpo della funzione
-        body = self.visit(ctx.blocco())
+        body = (yield ctx.blocco())
 
         return Function(name, parameters, body, self._get_position(ctx))
 
-    def visitParametri(self, ctx: SaltinoParser.ParametriContext):
+    def _buildParametri(self, ctx: SaltinoParser.ParametriContext):
         """Visita la lista dei parametri."""
         parameters = []
         for id_node in ctx.ID():
-            parameters.append(id_node.getText())
+            parameters.append(self.hash_cons.name(id_node.getText()))
         return parameters
 
     # ==================== BLOCCHI E ISTRUZIONI ====================
 
-    def visitBlocco(self, ctx: SaltinoParser.BloccoContext):
+    def _buildBlocco(self, ctx: SaltinoParser.BloccoContext):
         """Visita un blocco di istruzioni."""
         statements = []
 
         # Un blocco può contenere istruzioni e blocchi annidati
         for child in ctx.children:
             if hasattr(child, 'getRuleIndex'):  # È un nodo grammaticale, non un token
-                visited = self.visit(child)
+                visited = (yield child)
                 if visited is not None:
                     statements.append(visited)
 
         return Block(statements, self._get_position(ctx))
 
-    def visitIstruzione(self, ctx: SaltinoParser.IstruzioneContext):
+    def _buildIstruzione(self, ctx: SaltinoParser.IstruzioneContext):
         """Visita un'istruzione generica."""
         # Determina il tipo di istruzione e visita il sottotipo appropriato
         if ctx.assegnamento():
-            return self.visit(ctx.assegnamento())
+            return (yield ctx.assegnamento())
         elif ctx.if_stmt():
-            return self.visit(ctx.if_stmt())
+            return (yield ctx.if_stmt())
         elif ctx.return_stmt():
-            return self.visit(ctx.return_stmt())
+            return (yield ctx.return_stmt())
         else:
             return None
 
-    def visitAssegnamento(self, ctx: SaltinoParser.AssegnamentoContext):
+    def _buildAssegnamento(self, ctx: SaltinoParser.AssegnamentoContext):
         """Visita un assegnamento."""
-        variable = ctx.ID().getText()
+        variable = self.hash_cons.name(ctx.ID().getText())
 
         # Il valore può essere un'espressione o una condizione
         if ctx.espressione():
-            value = self.visit(ctx.espressione())
+            value = (yield ctx.espressione())
         elif ctx.condizione():
-            value = self.visit(ctx.condizione())
+            value = (yield ctx.condizione())
         else:
             value = None
 
         return Assignment(variable, value, self._get_position(ctx))
 
-    def visitIf_stmt(self, ctx: SaltinoParser.If_stmtContext):
+    def _buildIf_stmt(self, ctx: SaltinoParser.If_stmtContext):
         """Visita un'istruzione if-then-else."""
-        condition = self.visit(ctx.condizione())
-        then_block = self.visit(ctx.blocco(0))  # Primo blocco
+        condition = (yield ctx.condizione())
+        then_block = (yield ctx.blocco(0))  # Primo blocco
 
         # else è opzionale
         else_block = None
         if len(ctx.blocco()) > 1:
-            else_block = self.visit(ctx.blocco(1))
+            else_block = (yield ctx.blocco(1))
 
         return IfStatement(condition, then_block, else_block, self._get_position(ctx))
 
-    def visitReturn_stmt(self, ctx: SaltinoParser.Return_stmtContext):
+    def _buildReturn_stmt(self, ctx: SaltinoParser.Return_stmtContext):
         """Visita un'istruzione return."""
         # Il valore può essere un'espressione o una condizione
         if ctx.espressione():
-            value = self.visit(ctx.espressione())
+            value = (yield ctx.espressione())
         elif ctx.condizione():
-            value = self.visit(ctx.condizione())
+            value = (yield ctx.condizione())
         else:
             value = None
 
@@ -129,63 +156,94 @@ class SaltinoASTVisitor(SaltinoVisitor):
 
     # ==================== ESPRESSIONI ====================
 
-    def visitAddizione(self, ctx: SaltinoParser.AddizioneContext):
+    def _buildAddizione(self, ctx: SaltinoParser.AddizioneContext):
         """Visita addizione o sottrazione."""
-        left = self.visit(ctx.espressione(0))
-        right = self.visit(ctx.espressione(1))
+        left = (yield ctx.espressione(0))
+        right = (yield ctx.espressione(1))
 
         # Determina l'operatore dal testo
-        op_text = ctx.getChild(1).getText()
+        op_text = self.hash_cons.name(ctx.getChild(1).getText())
         return BinaryExpression(left, op_text, right, self._get_position(ctx))
 
-    def visitMoltiplicazione(self, ctx: SaltinoParser.MoltiplicazioneContext):
+    def _buildMoltiplicazione(self, ctx: SaltinoParser.MoltiplicazioneContext):
         """Visita moltiplicazione, divisione o modulo."""
-        left = self.visit(ctx.espressione(0))
-        right = self.visit(ctx.espressione(1))
+        left = (yield ctx.espressione(0))
+        right = (yield ctx.espressione(1))
 
-        op_text = ctx.getChild(1).getText()
+        op_text = self.hash_cons.name(ctx.getChild(1).getText())
         return BinaryExpression(left, op_text, right, self._get_position(ctx))
 
-    def visitPotenza(self, ctx: SaltinoParser.PotenzaContext):
+    def _buildPotenza(self, ctx: SaltinoParser.PotenzaContext):
         """Visita potenza."""
-        left = self.visit(ctx.espressione(0))
-        right = self.visit(ctx.espressione(1))
+        left = (yield ctx.espressione(0))
+        right = (yield ctx.espressione(1))
 
         return BinaryExpression(left, '^', right, self._get_position(ctx))
 
-    def visitCons(self, ctx: SaltinoParser.ConsContext):
+    def _buildCons(self, ctx: SaltinoParser.ConsContext):
         """Visita operatore cons (::)."""
-        left = self.visit(ctx.espressione(0))
-        right = self.visit(ctx.espressione(1))
+        left = (yield ctx.espressione(0))
+        right = (yield ctx.espressione(1))
 
         return BinaryExpression(left, '::', right, self._get_position(ctx))
 
-    def visitUnario(self, ctx: SaltinoParser.UnarioContext):
+    def _buildUnario(self, ctx: SaltinoParser.UnarioContext):
         """Visita espressione unaria (+ o -)."""
-        operand = self.visit(ctx.espressione())
-        op_text = ctx.getChild(0).getText()
+        operand = (yield ctx.espressione())
+        op_text = self.hash_cons.name(ctx.getChild(0).getText())
 
         return UnaryExpression(op_text, operand, self._get_position(ctx))
 
-    def visitHeadTail(self, ctx: SaltinoParser.HeadTailContext):
+    def _buildHeadTail(self, ctx: SaltinoParser.HeadTailContext):
         """Visita operatori head e tail."""
-        operand = self.visit(ctx.espressione())
-        op_text = ctx.getChild(0).getText()  # 'head' o 'tail'
+        operand = (yield ctx.espressione())
+        op_text = self.hash_cons.name(ctx.getChild(0).getText())  # 'head' o 'tail'
 
         return UnaryExpression(op_text, operand, self._get_position(ctx))
 
-    def visitChiamataFunzione(self, ctx: SaltinoParser.ChiamataFunzioneContext):
+    def _buildChiamataFunzione(self, ctx: SaltinoParser.ChiamataFunzioneContext):
         """Visita chiamata di funzione."""
-        function = self.visit(ctx.espressione())
+        function = (yield ctx.espressione())
 
         # Argomenti (opzionali)
         arguments = []
         if ctx.argomenti():
-            arguments = self.visit(ctx.argomenti())
+            arguments = (yield ctx.argomenti())
 
         return FunctionCall(function, arguments, self._get_position(ctx))
 
-    def visitArgomenti(self, ctx: SaltinoParser.ArgomentiContext):
+    def _buildListaLetterale(self, ctx: SaltinoParser.ListaLetteraleContext):
+        """Visita un letterale di lista [e1, ..., en]."""
+        elements = (yield ctx.argomenti())
+        return self._list_literal(elements, ctx)
+
+    def _buildTabella(self, ctx: SaltinoParser.TabellaContext):
+        """Visita una tabella [k1, ..., kn] di soli interi, che è un solo token."""
+        token = ctx.TABELLA().symbol
+        text = token.text
+        elements = []
+        # Riga corrente e indice nel testo del suo primo carattere (negativo
+        # sulla prima riga, che inizia prima del token)
+        line, line_start = token.line, -token.column
+        scanned = 0
+        for match in _TABLE_ELEMENT.finditer(text):
+            newline = text.rfind('\n', scanned, match.start())
+            if newline >= 0:
+                line += text.count('\n', scanned, match.start())
+                line_start = newline + 1
+            scanned = match.start()
+            elements.append(IntegerLiteral(
+                self.hash_cons.integer(int(match.group())),
+                self.hash_cons.position(line, match.start() - line_start)))
+        return self._list_literal(elements, ctx)
+
+    def _list_literal(self, elements, ctx):
+        """Letterale di lista [e1, ..., en], con il valore precalcolato se costante."""
+        literal = ListLiteral(elements, self._get_position(ctx))
+        literal.value = constant_value(elements)
+        return literal
+
+    def _buildArgomenti(self, ctx: SaltinoParser.ArgomentiContext):
         """Visita lista di argomenti."""
         arguments = []
 
@@ -193,96 +251,102 @@ class SaltinoASTVisitor(SaltinoVisitor):
         for i in range(len(ctx.children)):
             child = ctx.children[i]
             if hasattr(child, 'getRuleIndex'):  # È un nodo grammaticale
-                visited = self.visit(child)
+                visited = (yield child)
                 if visited is not None:
                     arguments.append(visited)
 
         return arguments
 
-    def visitIntero(self, ctx: SaltinoParser.InteroContext):
+    def _buildIntero(self, ctx: SaltinoParser.InteroContext):
         """Visita letterale intero."""
-        value = int(ctx.INT().getText())
+        value = self.hash_cons.integer(int(ctx.INT().getText()))
         return IntegerLiteral(value, self._get_position(ctx))
 
-    def visitBooleanoLiterale(self, ctx: SaltinoParser.BooleanoLiteraleContext):
+    def _buildBooleanoLiterale(self, ctx: SaltinoParser.BooleanoLiteraleContext):
         """Visita letterale booleano nelle espressioni."""
         value = ctx.getText() == 'true'
         return BooleanLiteral(value, self._get_position(ctx))
 
-    def visitIdentificatore(self, ctx: SaltinoParser.IdentificatoreContext):
+    def _buildIdentificatore(self, ctx: SaltinoParser.IdentificatoreContext):
         """Visita identificatore."""
-        name = ctx.ID().getText()
+        name = self.hash_cons.name(ctx.ID().getText())
         return Identifier(name, self._get_position(ctx))
 
-    def visitListaVuota(self, ctx: SaltinoParser.ListaVuotaContext):
+    def _buildListaVuota(self, ctx: SaltinoParser.ListaVuotaContext):
         """Visita lista vuota []."""
         return EmptyList(self._get_position(ctx))
 
-    def visitParantesi(self, ctx: SaltinoParser.ParantesiContext):
+    def _buildParantesi(self, ctx: SaltinoParser.ParantesiContext):
         """Visita espressione tra parentesi."""
         # Le parentesi non creano un nodo specifico, restituiamo solo l'espressione interna
-        return self.visit(ctx.espressione())
+        return (yield ctx.espressione())
 
     # ==================== CONDIZIONI ====================
 
-    def visitCondizione(self, ctx: SaltinoParser.CondizioneContext):
+    def _buildCondizione(self, ctx: SaltinoParser.CondizioneContext):
         """Visita il punto di ingresso per le condizioni."""
-        return self.visit(ctx.condOr())
+        return (yield ctx.condOr())
 
-    def visitCondOr(self, ctx: SaltinoParser.CondOrContext):
+    def _buildCondOr(self, ctx: SaltinoParser.CondOrContext):
         """Visita operatore logico OR (precedenza più bassa)."""
         # condOr: condAnd ('or' condAnd)*
-        result = self.visit(ctx.condAnd(0))  # Primo operando
+        result = (yield ctx.condAnd(0))  # Primo operando
 
         # Se ci sono più operandi, costruisci una catena di OR associativi a sinistra
         for i in range(1, len(ctx.condAnd())):
-            right = self.visit(ctx.condAnd(i))
+            right = (yield ctx.condAnd(i))
             result = BinaryCondition(
                 result, 'or', right, self._get_position(ctx))
 
         return result
 
-    def visitCondAnd(self, ctx: SaltinoParser.CondAndContext):
+    def _buildCondAnd(self, ctx: SaltinoParser.CondAndContext):
         """Visita operatore logico AND."""
         # condAnd: condNot ('and' condNot)*
-        result = self.visit(ctx.condNot(0))  # Primo operando
+        result = (yield ctx.condNot(0))  # Primo operando
 
         # Se ci sono più operandi, costruisci una catena di AND associativi a sinistra
         for i in range(1, len(ctx.condNot())):
-            right = self.visit(ctx.condNot(i))
+            right = (yield ctx.condNot(i))
             result = BinaryCondition(
                 result, 'and', right, self._get_position(ctx))
 
         return result
 
-    def visitCondNot(self, ctx: SaltinoParser.CondNotContext):
+    def _buildCondNot(self, ctx: SaltinoParser.CondNotContext):
         """Visita negazione logica NOT."""
         # condNot: '!' condNot | condAtom
-        if ctx.getText().startswith('!'):
+        # (ctx.getText() attraverserebbe tutto il sottoalbero)
+        if ctx.condNot() is not None:
             # È una negazione
-            operand = self.visit(ctx.condNot())
+            operand = (yield ctx.condNot())
             return UnaryCondition('!', operand, self._get_position(ctx))
         else:
             # È un atomo
-            return self.visit(ctx.condAtom())
+            return (yield ctx.condAtom())
 
-    def visitCondAtom(self, ctx: SaltinoParser.CondAtomContext):
+    def _buildCondAtom(self, ctx: SaltinoParser.CondAtomContext):
         """Visita condizioni atomiche (precedenza più alta)."""
         # condAtom: espressione relop espressione | espressione | 'true' | 'false' | ID | '(' condizione ')'
 
         if ctx.relop():
             # È un confronto: espressione relop espressione
-            left = self.visit(ctx.espressione(0))
-            right = self.visit(ctx.espressione(1))
-            op_text = self.visit(ctx.relop())
+            left = (yield ctx.espressione(0))
+            right = (yield ctx.espressione(1))
+            op_text = (yield ctx.relop())
             return ComparisonCondition(left, op_text, right, self._get_position(ctx))
 
         elif len(ctx.espressione()) == 1:
             # È una singola espressione usata come condizione (include chiamate di funzione)
-            expr = self.visit(ctx.espressione(0))
+            expr = (yield ctx.espressione(0))
             # Restituiamo l'espressione direttamente - la verifica del tipo sarà fatta nell'interprete
             return expr
 
+        elif ctx.condizione():
+            # Parentesi: '(' condizione ')'. Controllata prima dei letterali:
+            # ctx.getText() attraverserebbe tutto il sottoalbero
+            return (yield ctx.condizione())
+
         elif ctx.getText() == 'true':
             return BooleanLiteral(True, self._get_position(ctx))
 
@@ -291,36 +355,49 @@ class SaltinoASTVisitor(SaltinoVisitor):
 
         elif ctx.ID():
             # Variabile booleana
-            name = ctx.ID().getText()
+            name = self.hash_cons.name(ctx.ID().getText())
             return Identifier(name, self._get_position(ctx))
 
-        elif ctx.condizione():
-            # Parentesi: '(' condizione ')'
-            return self.visit(ctx.condizione())
-
         else:
             raise ValueError(
                 f"Tipo di condizione atomica non riconosciuto: {ctx.getText()}")
 
-    def visitRelop(self, ctx: SaltinoParser.RelopContext):
+    def _buildRelop(self, ctx: SaltinoParser.RelopContext):
         """Visita operatori di confronto."""
         # relop: '<=' | '<' | '==' | '>' | '>='
-        return ctx.getText()
+        return self.hash_cons.name(ctx.getText())
+
+
+def _visit_method(rule: str):
+    """Metodo visit<rule> pubblico: restituisce il nodo AST del contesto."""
+    def visit_rule(self, ctx):
+        return self.visit(ctx)
+    visit_rule.__name__ = visit_rule.__qualname__ = 'visit' + rule
+    visit_rule.__doc__ = f"Visita un contesto {rule} e ne restituisce il nodo AST."
+    return visit_rule
+
+
+for _name in list(vars(SaltinoASTVisitor)):
+    if _name.startswith('_build') and _name != '_build':
+        setattr(SaltinoASTVisitor, 'visit' + _name[len('_build'):],
+                _visit_method(_name[len('_build'):]))
 
 
 # ==================== UTILITY FUNCTIONS ====================
 
-def build_ast(parse_tree) -> Program:
+def build_ast(parse_tree, hash_cons: Optional[HashConsTable] = None) -> Program:
     """
     Costruisce un AST a partire dal parse tree di ANTLR.
 
     Args:
         parse_tree: Il parse tree generato dal parser ANTLR
+        hash_cons: Tabella di hash-consing da usare, per condividere nomi,
+            posizioni e interi tra più programmi (di default una nuova)
 
     Returns:
         Program: Il nodo radice dell'AST
     """
-    visitor = SaltinoASTVisitor()
+    visitor = SaltinoASTVisitor(hash_cons)
     return visitor.visit(parse_tree)
 
 
@@ -335,42 +412,50 @@ def print_ast(node: ASTNode, indent: int = 0) -> str:
     Returns:
         str: Rappresentazione testuale dell'AST
     """
-    result = "  " * indent + str(node) + "\n"
-
-    # Attraversa ricorsivamente i figli
+    lines = []
+    # Stack esplicito di (nodo, indentazione): i figli vengono inseriti in
+    # ordine inverso, così escono nell'ordine di stampa
+    stack = [(node, indent)]
+    while stack:
+        node, indent = stack.pop()
+        lines.append("  " * indent + str(node) + "\n")
+        stack.extend((child, indent + 1) for child in reversed(_printed_children(node)))
+    return "".join(lines)
+
+
+def _printed_children(node) -> list:
+    """Figli di un nodo nell'ordine in cui print_ast li stampa."""
     if hasattr(node, 'functions'):
-        for func in node.functions:
-            result += print_ast(func, indent + 1)
+        return list(node.functions)
 
     elif hasattr(node, 'body'):
-        result += print_ast(node.body, indent + 1)
+        return [node.body]
 
     elif hasattr(node, 'statements'):
-        for stmt in node.statements:
-            result += print_ast(stmt, indent + 1)
+        return list(node.statements)
+
+    elif hasattr(node, 'elements'):
+        return list(node.elements)
 
     elif hasattr(node, 'value') and hasattr(node, 'variable'):
-        result += print_ast(node.value, indent + 1)
+        return [node.value]
 
     elif hasattr(node, 'condition') and hasattr(node, 'then_block'):
-        result += print_ast(node.condition, indent + 1)
-        result += print_ast(node.then_block, indent + 1)
+        children = [node.condition, node.then_block]
         if node.else_block:
-            result += print_ast(node.else_block, indent + 1)
+            children.append(node.else_block)
+        return children
 
     elif hasattr(node, 'value') and not hasattr(node, 'variable'):
-        result += print_ast(node.value, indent + 1)
+        return [node.value]
 
     elif hasattr(node, 'left') and hasattr(node, 'right'):
-        result += print_ast(node.left, indent + 1)
-        result += print_ast(node.right, indent + 1)
+        return [node.left, node.right]
 
     elif hasattr(node, 'operand'):
-        result += print_ast(node.operand, indent + 1)
+        return [node.operand]
 
     elif hasattr(node, 'function') and hasattr(node, 'arguments'):
-        result += print_ast(node.function, indent + 1)
-        for arg in node.arguments:
-            result += print_ast(arg, indent + 1)
+        return [node.function] + list(node.arguments)
 
-    return result
+    return []
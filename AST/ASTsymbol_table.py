@@ -1,5 +1,6 @@
+import sys
 from dataclasses import dataclass
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, List, Tuple
 from enum import Enum
 from AST.ASTNodes import ASTNode
 
@@ -18,20 +19,30 @@ class SymbolInfo:
     node_ref: Optional[ASTNode] = None  # Riferimento al nodo AST originale
 
 class SymbolTable:
-    NUM_INSTANCES = 0
-
     def __init__(self, parent=None, scope_name="global"):
-        self.num = SymbolTable.NUM_INSTANCES
-        SymbolTable.NUM_INSTANCES += 1
+        # Il contatore degli scope è condiviso solo all'interno di una stessa
+        # gerarchia: ogni compilazione numera i propri scope a partire da 0,
+        # senza stato globale condiviso tra thread
+        self._scope_counter = [0] if parent is None else parent._scope_counter
+        # Quante volte ogni nome è stato associato nella gerarchia: invalida i
+        # risultati di lookup memorizzati negli scope annidati
+        self._generations: Dict[str, int] = {} if parent is None else parent._generations
+        self.num = self._scope_counter[0]
+        self._scope_counter[0] += 1
         self.parent = parent
         self.scope_name = scope_name
         self.symbol2info: Dict[str, SymbolInfo] = {}
         self.level = 0 if parent is None else parent.level + 1
         self.children: List['SymbolTable'] = []  # Lista dei scope figli
+        # Risultati di lookup trovati negli scope esterni: nome -> (generazione, info)
+        self._outer_lookups: Dict[str, Tuple[int, SymbolInfo]] = {}
 
     def bind(self, symbol: str, kind: SymbolKind, node_ref=None):
         """Associa un simbolo nel scope corrente"""
-        unique_name = f"{symbol}_{self.num}_{len(self.symbol2info)}"
+        # Nomi internati: ogni nome univoco è un solo oggetto, condiviso dai
+        # nodi e dalle strutture che lo usano come chiave
+        symbol = sys.intern(symbol)
+        unique_name = sys.intern(f"{symbol}_{self.num}_{len(self.symbol2info)}")
         info = SymbolInfo(
             name=symbol,
             kind=kind,
@@ -40,14 +51,32 @@ class SymbolTable:
             node_ref=node_ref
         )
         self.symbol2info[symbol] = info
+        self._generations[symbol] = self._generations.get(symbol, 0) + 1
         return info
 
     def lookup(self, symbol: str) -> SymbolInfo:
-        """Cerca un simbolo risalendo la catena degli scope"""
-        if symbol in self.symbol2info:
-            return self.symbol2info[symbol]
-        if self.parent:
-            return self.parent.lookup(symbol)
+        """
+        Cerca un simbolo risalendo la catena degli scope.
+
+        Il risultato viene memorizzato negli scope attraversati, così i
+        lookup dagli scope annidati si fermano al primo già risolto e una
+        catena di n scope costa O(n) in tutto invece che O(n) per lookup.
+        """
+        generation = self._generations.get(symbol, 0)
+        visited = []
+        scope = self
+        while scope is not None:
+            info = scope.symbol2info.get(symbol)
+            if info is None:
+                cached = scope._outer_lookups.get(symbol)
+                if cached is not None and cached[0] == generation:
+                    info = cached[1]
+            if info is not None:
+                for inner in visited:
+                    inner._outer_lookups[symbol] = (generation, info)
+                return info
+            visited.append(scope)
+            scope = scope.parent
         raise ValueError(f'Symbol {symbol} not found')
 
     def lookup_local(self, symbol: str) -> Optional[SymbolInfo]:
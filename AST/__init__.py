@@ -15,7 +15,7 @@ __all__ = [
     'Program', 'Function',
     'Statement', 'Block', 'Assignment', 'IfStatement', 'ReturnStatement',
     'Expression', 'BinaryExpression', 'UnaryExpression', 'FunctionCall',
-    'IntegerLiteral', 'Identifier', 'EmptyList',
+    'IntegerLiteral', 'Identifier', 'EmptyList', 'ListLiteral',
     'Condition', 'BinaryCondition', 'UnaryCondition', 'ComparisonCondition',
     'BooleanLiteral',
     'ASTVisitor',
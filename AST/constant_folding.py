@@ -0,0 +1,266 @@
+"""
+Constant folding e semplificazioni algebriche per il linguaggio Saltino.
+
+Il passo lavora sull'AST già analizzato e tipato (dopo TypeInference) e
+riscrive in loco:
+- le sottoespressioni con soli letterali (aritmetica, confronti, '!');
+- and/or con un lato letterale, quando il risultato non cambia;
+- head/tail di liste letterali, es. head(1 :: []) -> 1;
+- i letterali di lista con soli elementi costanti, precalcolati una volta;
+- le identità x * 1, 1 * x, x + 0, 0 + x, x - 0 con x intero dimostrato;
+- gli if con condizione letterale, sostituiti dal ramo eseguito.
+
+Un nodo la cui valutazione solleverebbe un errore (divisione per zero, head
+di lista vuota, operandi di tipo errato) non viene piegato: l'errore resta
+nel programma e viene sollevato a runtime come prima.
+"""
+
+from typing import Optional
+
+from AST.ASTNodes import *
+from AST.type_inference import SaltinoType
+from errors.runtime_errors import SaltinoRuntimeError
+from saltino_operators import SaltinoOperators
+
+# Oltre questa dimensione stimata (in bit) un'elevamento a potenza non viene
+# calcolato in compilazione: potrebbe trovarsi in un ramo mai eseguito
+MAX_FOLDED_POWER_BITS = 4096
+
+# Nodi che producono sempre un booleano (o sollevano un errore)
+BOOLEAN_NODES = (BooleanLiteral, BinaryCondition, UnaryCondition, ComparisonCondition)
+
+
+class ConstantFolder:
+    """Piega le costanti e semplifica le identità su un programma analizzato."""
+
+    def __init__(self, semantic_analyzer):
+        self.semantic_analyzer = semantic_analyzer
+        self.binary_operators = SaltinoOperators.get_binary_operators()
+        self.unary_operators = SaltinoOperators.get_unary_operators()
+        self.comparison_operators = SaltinoOperators.get_comparison_operators()
+        self.folded_nodes = 0
+
+    # ==================== PUNTO DI INGRESSO ====================
+
+    def fold_program(self, program: Program) -> Program:
+        """Applica il passo a tutte le funzioni del programma."""
+        for function in program.functions:
+            self.fold(function.body)
+        return program
+
+    def fold(self, node: ASTNode) -> ASTNode:
+        """Restituisce il nodo piegato (o il nodo stesso, con i figli piegati)."""
+        return walk(node, self._fold)
+
+    # ==================== STATEMENT ====================
+
+    # I metodi _fold* sono generatori eseguiti da walk: producono i figli e
+    # ricevono i figli piegati, senza ricorsione Python
+
+    def _fold(self, node: ASTNode):
+        if isinstance(node, Block):
+            statements = []
+            for statement in node.statements:
+                statements.append((yield statement))
+            node.statements = statements
+            return node
+        if isinstance(node, (Assignment, ReturnStatement)):
+            if node.value is not None:
+                node.value = yield node.value
+            return node
+        if isinstance(node, IfStatement):
+            return (yield from self._fold_if(node))
+        return (yield from self._fold_expression(node))
+
+    def _fold_if(self, if_stmt: IfStatement):
+        """
+        Sostituisce un if con condizione letterale con il ramo eseguito.
+
+        Il ramo resta un blocco annidato: il valore del blocco è lo stesso
+        dell'if, e un if(false) senza else diventa un blocco vuoto (None).
+        """
+        if_stmt.condition = yield if_stmt.condition
+        yield if_stmt.then_block
+        if if_stmt.else_block:
+            yield if_stmt.else_block
+
+        if isinstance(if_stmt.condition, BooleanLiteral):
+            self.folded_nodes += 1
+            if if_stmt.condition.value:
+                return if_stmt.then_block
+            return if_stmt.else_block or Block([], if_stmt.position)
+        return if_stmt
+
+    # ==================== ESPRESSIONI E CONDIZIONI ====================
+
+    def _fold_expression(self, node: ASTNode):
+        if isinstance(node, BinaryExpression):
+            node.left = yield node.left
+            node.right = yield node.right
+            return self._fold_binary_expression(node) or node
+        if isinstance(node, UnaryExpression):
+            node.operand = yield node.operand
+            return self._fold_unary_expression(node) or node
+        if isinstance(node, ComparisonCondition):
+            node.left = yield node.left
+            node.right = yield node.right
+            return self._fold_comparison(node) or node
+        if isinstance(node, BinaryCondition):
+            node.left = yield node.left
+            node.right = yield node.right
+            return self._fold_logical(node) or node
+        if isinstance(node, UnaryCondition):
+            node.operand = yield node.operand
+            if node.operator == '!' and isinstance(node.operand, BooleanLiteral):
+                return self._boolean(not node.operand.value, node)
+            return node
+        if isinstance(node, FunctionCall):
+            node.function = yield node.function
+            arguments = []
+            for argument in node.arguments:
+                arguments.append((yield argument))
+            node.arguments = arguments
+        if isinstance(node, ListLiteral) and node.value is None:
+            elements = []
+            for element in node.elements:
+                elements.append((yield element))
+            node.elements = elements
+            # Con gli elementi piegati il letterale può diventare costante
+            node.value = constant_value(node.elements)
+        return node
+
+    def _fold_binary_expression(self, node: BinaryExpression) -> Optional[ASTNode]:
+        left, right = node.left, node.right
+        if isinstance(left, IntegerLiteral) and isinstance(right, IntegerLiteral):
+            if (node.operator == '^' and
+                    abs(left.value).bit_length() * right.value > MAX_FOLDED_POWER_BITS):
+                return None
+            value = self._evaluate(self.binary_operators.get(node.operator),
+                                   left.value, right.value)
+            # '^' con esponente negativo produce un float: non è un letterale
+            if type(value) is int:
+                return self._integer(value, node)
+            return None
+
+        # Identità algebriche: l'operando resta valutato, cade solo l'operazione
+        if node.operator == '*':
+            if self._is_integer(left, 1) and self._proven_int(right):
+                return self._simplified(right)
+            if self._is_integer(right, 1) and self._proven_int(left):
+                return self._simplified(left)
+        elif node.operator == '+':
+            if self._is_integer(left, 0) and self._proven_int(right):
+                return self._simplified(right)
+            if self._is_integer(right, 0) and self._proven_int(left):
+                return self._simplified(left)
+        elif node.operator == '-':
+            if self._is_integer(right, 0) and self._proven_int(left):
+                return self._simplified(left)
+        return None
+
+    def _fold_unary_expression(self, node: UnaryExpression) -> Optional[ASTNode]:
+        operand = node.operand
+        if isinstance(operand, IntegerLiteral) and node.operator in ('+', '-'):
+            value = self._evaluate(self.unary_operators.get(node.operator),
+                                   operand.value)
+            return self._integer(value, node) if value is not None else None
+
+        # head/tail di una lista letterale: (h :: t) con h intero e t lista letterale
+        if (node.operator in ('head', 'tail') and
+                isinstance(operand, BinaryExpression) and operand.operator == '::' and
+                isinstance(operand.left, IntegerLiteral) and
+                is_literal_list(operand.right)):
+            self.folded_nodes += 1
+            return operand.left if node.operator == 'head' else operand.right
+        return None
+
+    def _fold_comparison(self, node: ComparisonCondition) -> Optional[ASTNode]:
+        left, right = node.left, node.right
+        literal_types = (IntegerLiteral, EmptyList)
+        if isinstance(left, literal_types) and isinstance(right, literal_types):
+            value = self._evaluate(self.comparison_operators.get(node.operator),
+                                   literal_value(left), literal_value(right))
+            return self._boolean(value, node) if value is not None else None
+        return None
+
+    def _fold_logical(self, node: BinaryCondition) -> Optional[ASTNode]:
+        """
+        Semplifica and/or con il lato sinistro letterale. Il lato destro può
+        essere scartato solo quando la valutazione short-circuit non lo
+        valuterebbe; un lato sinistro non letterale resta sempre valutato.
+        """
+        left, right = node.left, node.right
+        if not isinstance(left, BooleanLiteral):
+            return None
+        if node.operator == 'and':
+            if not left.value:
+                return self._boolean(False, node)
+            if self._proven_bool(right):
+                return self._simplified(right)
+        elif node.operator == 'or':
+            if left.value:
+                return self._boolean(True, node)
+            if self._proven_bool(right):
+                return self._simplified(right)
+        return None
+
+    # ==================== UTILITY ====================
+
+    def _evaluate(self, operation, *values):
+        """Valuta un operatore controllato; None se solleverebbe un errore."""
+        if operation is None:
+            return None
+        try:
+            return operation(*values)
+        except (SaltinoRuntimeError, ArithmeticError):
+            # '%' e '^' per zero sollevano gli errori di Python: come gli
+            # altri, restano da sollevare a runtime, se il nodo viene valutato
+            return None
+
+    def _proven_int(self, node: ASTNode) -> bool:
+        if isinstance(node, IntegerLiteral):
+            return True
+        return (self.semantic_analyzer.get_node_info(node, 'inferred_type') ==
+                SaltinoType.INT)
+
+    def _proven_bool(self, node: ASTNode) -> bool:
+        if isinstance(node, BOOLEAN_NODES):
+            return True
+        return (self.semantic_analyzer.get_node_info(node, 'inferred_type') ==
+                SaltinoType.BOOL)
+
+    @staticmethod
+    def _is_integer(node: ASTNode, value: int) -> bool:
+        return isinstance(node, IntegerLiteral) and node.value == value
+
+    def _simplified(self, node: ASTNode) -> ASTNode:
+        self.folded_nodes += 1
+        return node
+
+    def _integer(self, value: int, original: ASTNode) -> IntegerLiteral:
+        self.folded_nodes += 1
+        literal = IntegerLiteral(value, original.position)
+        self.semantic_analyzer.set_node_info(
+            literal, inferred_type=SaltinoType.INT)
+        return literal
+
+    def _boolean(self, value: bool, original: ASTNode) -> BooleanLiteral:
+        self.folded_nodes += 1
+        literal = BooleanLiteral(value, original.position)
+        self.semantic_analyzer.set_node_info(
+            literal, inferred_type=SaltinoType.BOOL)
+        return literal
+
+
+def is_literal_list(node: ASTNode) -> bool:
+    """Vero per [] e per catene di cons di letterali interi che terminano in []."""
+    while isinstance(node, BinaryExpression) and node.operator == '::':
+        if not isinstance(node.left, IntegerLiteral):
+            return False
+        node = node.right
+    return isinstance(node, EmptyList)
+
+
+def literal_value(node: ASTNode):
+    """Valore di un letterale intero o della lista vuota."""
+    return [] if isinstance(node, EmptyList) else node.value
@@ -0,0 +1,145 @@
+"""
+Hash-consing delle parti immutabili dell'AST.
+
+I programmi generati ripetono migliaia di volte gli stessi nomi, operatori,
+letterali e sottoespressioni. HashConsTable rende canonici questi valori:
+il costruttore dell'AST ottiene dalla tabella un solo oggetto per ogni nome,
+operatore, posizione e intero, e i sottoalberi strutturalmente uguali
+ricevono lo stesso numero, così confrontarli costa un confronto tra interi.
+
+I nodi invece restano uno per occorrenza: le informazioni del
+SemanticAnalyzer (scope, simboli risolti, tipi, operatori legati) sono
+indicizzate per id(nodo) e i passi di ottimizzazione riscrivono i figli sul
+posto, quindi un nodo condiviso mescolerebbe annotazioni che devono restare
+distinte. La tabella dei numeri strutturali è la rappresentazione condivisa
+dei sottoalberi: ogni struttura distinta vi compare una volta sola, come
+tupla dei numeri dei figli.
+"""
+
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+from .ASTNodes import (CHILD_FIELDS, ASTNode, Assignment, BinaryCondition, BinaryExpression,
+                       Block, BooleanLiteral, ComparisonCondition, EmptyList, Function,
+                       FunctionCall, Identifier, IfStatement, IntegerLiteral, ListLiteral,
+                       Program, ReturnStatement, SourcePosition, UnaryCondition,
+                       UnaryExpression, walk)
+
+# Attributi che, oltre ai figli, fanno parte della struttura di ogni tipo di nodo
+VALUE_FIELDS = {
+    Program: (),
+    Function: ('name', 'parameters'),
+    Block: (),
+    Assignment: ('variable',),
+    IfStatement: (),
+    ReturnStatement: (),
+    BinaryExpression: ('operator',),
+    UnaryExpression: ('operator',),
+    FunctionCall: (),
+    IntegerLiteral: ('value',),
+    Identifier: ('name',),
+    EmptyList: (),
+    ListLiteral: (),
+    BinaryCondition: ('operator',),
+    UnaryCondition: ('operator',),
+    ComparisonCondition: ('operator',),
+    BooleanLiteral: ('value',),
+}
+
+
+class HashConsTable:
+    """
+    Tabella di hash-consing condivisa dal costruttore dell'AST e dai passi
+    che confrontano sottoalberi (Deforester, RecurrenceSolver,
+    TailCallTransformer).
+
+    name, position e integer restituiscono l'oggetto canonico di un valore;
+    key restituisce il numero strutturale di un sottoalbero. Gli
+    identificatori sono confrontati per nome, non per simbolo risolto: due
+    'x' in scope diversi hanno lo stesso numero.
+    """
+
+    def __init__(self):
+        self._positions: Dict[Tuple[int, int], SourcePosition] = {}
+        self._integers: Dict[int, int] = {}
+        # Struttura (tipo, valori, numeri dei figli) -> numero
+        self._keys: Dict[Tuple, int] = {}
+
+    def __len__(self):
+        """Numero di strutture distinte registrate."""
+        return len(self._keys)
+
+    # ==================== VALORI ====================
+
+    @staticmethod
+    def name(text: str) -> str:
+        """Nome o operatore internato: le occorrenze uguali sono lo stesso oggetto."""
+        return sys.intern(text)
+
+    def position(self, line: int, column: int) -> SourcePosition:
+        """
+        Posizione condivisa: i nodi che iniziano allo stesso token (un'espressione
+        e il suo primo operando) usano lo stesso oggetto. Le posizioni non vengono
+        mai modificate, come assume già copy_tree.
+        """
+        position = self._positions.get((line, column))
+        if position is None:
+            position = self._positions[(line, column)] = SourcePosition(line, column)
+        return position
+
+    def integer(self, value: int) -> int:
+        """Intero condiviso (Python condivide da sé solo quelli piccoli)."""
+        return self._integers.setdefault(value, value)
+
+    # ==================== SOTTOALBERI ====================
+
+    def key(self, node: ASTNode) -> int:
+        """Numero strutturale di un sottoalbero, calcolato senza ricorsione."""
+        return walk(node, self._number)
+
+    def keys_below(self, root: ASTNode) -> Dict[int, int]:
+        """Numeri strutturali (per id) di root e di tutti i nodi sotto di esso."""
+        keys: Dict[int, int] = {}
+
+        def number(node):
+            result = yield from self._number(node)
+            keys[id(node)] = result
+            return result
+
+        walk(root, number)
+        return keys
+
+    def same_tree(self, first: Optional[ASTNode], second: Optional[ASTNode]) -> bool:
+        """
+        True se i due sottoalberi sono strutturalmente uguali (posizioni escluse).
+        Nodi di tipo diverso sono scartati senza numerarli.
+        """
+        if first is None or second is None or type(first) is not type(second):
+            return first is second
+        return first is second or self.key(first) == self.key(second)
+
+    def _number(self, node: ASTNode):
+        node_type = type(node)
+        values = tuple(self._value(getattr(node, field)) for field in VALUE_FIELDS[node_type])
+        children = []
+        for field in CHILD_FIELDS.get(node_type, ()):
+            child = getattr(node, field)
+            if isinstance(child, list):
+                numbers = []
+                for item in child:
+                    numbers.append((yield item))
+                children.append(tuple(numbers))
+            elif child is None:
+                children.append(None)
+            else:
+                children.append((yield child))
+        structure = (node_type, values, tuple(children))
+        number = self._keys.get(structure)
+        if number is None:
+            number = self._keys[structure] = len(self._keys)
+        return number
+
+    @staticmethod
+    def _value(value: Any) -> Any:
+        # I parametri delle funzioni sono liste, non utilizzabili come chiave
+        return tuple(value) if isinstance(value, list) else value
@@ -0,0 +1,394 @@
+"""
+Inlining delle funzioni piccole e non ricorsive per il linguaggio Saltino.
+
+Il passo lavora sull'AST già analizzato e tipato e sostituisce le chiamate
+dirette a funzioni il cui corpo è un solo `return E` con una copia di E in
+cui i parametri sono rimpiazzati dagli argomenti. Una chiamata viene
+sostituita solo se il risultato è indistinguibile dall'originale:
+
+- il callee è risolto staticamente (grafo delle chiamate dell'analizzatore),
+  non è ricorsivo e il numero di argomenti è corretto;
+- E rientra nel budget di nodi e usa solo i parametri e funzioni globali,
+  quindi non introduce variabili nel chiamante: i nomi univoci della symbol
+  table restano validi perché ogni identificatore copiato mantiene lo scope
+  in cui era stato risolto;
+- gli argomenti non banali (tutto tranne letterali, parametri e funzioni)
+  compaiono in E una sola volta, nello stesso ordine della chiamata e prima
+  di qualunque operazione che possa fallire: l'ordine di valutazione, e
+  quindi il primo errore sollevato, non cambia.
+"""
+
+import operator
+from typing import Dict, List, Optional, Set
+
+from AST.ASTNodes import *
+from AST.ASTsymbol_table import SymbolKind
+from AST.type_inference import SaltinoType, iter_nodes
+from saltino_operators import SaltinoOperators
+
+# Numero massimo di nodi dell'espressione restituita da un callee inlinabile
+DEFAULT_INLINE_BUDGET = 16
+
+# Implementazioni che non possono sollevare errori (operandi già verificati)
+NON_FAILING_OPERATORS = {
+    operator.add, operator.sub, operator.mul, operator.neg, operator.pos,
+    operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge,
+    SaltinoOperators.unchecked_cons, SaltinoOperators.equality_comparison,
+    SaltinoOperators.accumulate, SaltinoOperators.unchecked_cons_all,
+}
+
+# Nodi che producono sempre un booleano e possono stare in posizione di condizione
+CONDITION_NODES = (BooleanLiteral, BinaryCondition, UnaryCondition, ComparisonCondition)
+
+# Posizioni in cui compare un'espressione: ognuna accetta nodi diversi
+EXPRESSION = 'expression'   # valutata con un frame EXPRESSION o CONDITION
+CONDITION = 'condition'     # valutata con un frame CONDITION
+OPERAND = 'operand'         # operando di un confronto, solo frame EXPRESSION
+
+# Informazioni semantiche che non vanno copiate sui nodi duplicati
+_POSITIONAL_INFO = ('is_potential_tail_call',)
+
+
+class _Rejected(Exception):
+    """La chiamata non può essere sostituita senza cambiare il comportamento."""
+
+
+class FunctionInliner:
+    """Sostituisce le chiamate a funzioni piccole con il loro corpo."""
+
+    def __init__(self, semantic_analyzer, budget: int = DEFAULT_INLINE_BUDGET,
+                 lazy_lists: bool = False):
+        self.semantic_analyzer = semantic_analyzer
+        self.budget = budget
+        # Con le liste pigre un `::` restituito resta pigro solo in posizione di return
+        self.lazy_lists = lazy_lists
+        self.functions: Dict[str, Function] = {}
+        self.inlined_calls = 0
+        self._prepared: Set[str] = set()
+        self._recursive: Dict[str, bool] = {}
+
+    # ==================== PUNTO DI INGRESSO ====================
+
+    def inline_program(self, program: Program) -> Program:
+        """Applica l'inlining a tutte le funzioni del programma."""
+        self.functions = {function.name: function for function in program.functions}
+        for function in program.functions:
+            self._prepare(function)
+        return program
+
+    def _prepare(self, function: Function):
+        """Applica l'inlining al corpo di una funzione (una volta sola)."""
+        if function.name in self._prepared:
+            return
+        self._prepared.add(function.name)
+        walk((function.body, EXPRESSION), lambda item: self._inline(*item))
+
+    # ==================== ATTRAVERSAMENTO ====================
+
+    def _inline(self, node: ASTNode, position: str):
+        """
+        Restituisce il nodo con le chiamate inlinabili sostituite. È un
+        generatore eseguito da walk: produce le coppie (figlio, posizione)
+        e riceve i figli riscritti, senza ricorsione Python.
+        """
+        if isinstance(node, Block):
+            statements = []
+            for statement in node.statements:
+                statements.append((yield statement, EXPRESSION))
+            node.statements = statements
+        elif isinstance(node, (Assignment, ReturnStatement)):
+            if node.value is not None:
+                node.value = yield node.value, EXPRESSION
+        elif isinstance(node, IfStatement):
+            node.condition = yield node.condition, CONDITION
+            yield node.then_block, EXPRESSION
+            if node.else_block:
+                yield node.else_block, EXPRESSION
+        elif isinstance(node, (BinaryExpression, ComparisonCondition)):
+            child_position = OPERAND if isinstance(node, ComparisonCondition) else EXPRESSION
+            node.left = yield node.left, child_position
+            node.right = yield node.right, child_position
+        elif isinstance(node, BinaryCondition):
+            node.left = yield node.left, CONDITION
+            node.right = yield node.right, CONDITION
+        elif isinstance(node, UnaryCondition):
+            node.operand = yield node.operand, CONDITION
+        elif isinstance(node, UnaryExpression):
+            node.operand = yield node.operand, EXPRESSION
+        elif isinstance(node, ListLiteral) and node.value is None:
+            elements = []
+            for element in node.elements:
+                elements.append((yield element, EXPRESSION))
+            node.elements = elements
+        elif isinstance(node, FunctionCall):
+            arguments = []
+            for argument in node.arguments:
+                arguments.append((yield argument, EXPRESSION))
+            node.arguments = arguments
+            replacement = self._inline_call(node, position)
+            if replacement is not None:
+                self.inlined_calls += 1
+                return replacement
+        return node
+
+    # ==================== SOSTITUZIONE ====================
+
+    def _inline_call(self, call: FunctionCall, position: str) -> Optional[ASTNode]:
+        callee = self._static_callee(call)
+        if (callee is None or self._is_recursive(callee.name) or
+                len(call.arguments) != len(callee.parameters)):
+            return None
+
+        self._prepare(callee)
+        body = callee_expression(callee)
+        if body is None or count_nodes(body) > self.budget:
+            return None
+        if self.lazy_lists and isinstance(body, BinaryExpression) and body.operator == '::':
+            return None
+        if not fits_position(body, position):
+            return None
+
+        parameters = self._parameter_symbols(callee)
+        if parameters is None:
+            return None
+        trivial = [self._is_trivial(argument) for argument in call.arguments]
+        try:
+            self._check_evaluation_order(body, position, parameters,
+                                         call.arguments, trivial)
+            return self._copy(body, parameters, call.arguments, trivial)
+        except _Rejected:
+            return None
+
+    def _check_evaluation_order(self, body: ASTNode, position: str,
+                                parameters: Dict[str, int],
+                                arguments: List[ASTNode], trivial: List[bool]):
+        """
+        Verifica che gli argomenti non banali siano valutati da E esattamente
+        come dalla chiamata: una volta, in ordine, incondizionatamente e prima
+        di ogni operazione che possa fallire. Ogni argomento deve inoltre
+        comportarsi come il parametro nella posizione in cui lo sostituisce.
+        """
+        expected = [index for index, is_trivial in enumerate(trivial) if not is_trivial]
+        seen: List[int] = []
+        may_fail = False
+        for event, index, use_position in evaluation_events(
+                body, position, parameters, self.semantic_analyzer):
+            if event == 'fail':
+                may_fail = True
+                continue
+            if not self._fits_argument(arguments[index], use_position):
+                raise _Rejected()
+            if not trivial[index]:
+                if may_fail or event == 'conditional':
+                    raise _Rejected()
+                seen.append(index)
+        if seen != expected:
+            raise _Rejected()
+
+    def _fits_argument(self, argument: ASTNode, position: str) -> bool:
+        """
+        Vero se l'argomento, valutato al posto del parametro, si comporta
+        come la lettura del parametro in quella posizione.
+        """
+        if position == OPERAND:
+            return isinstance(argument, BooleanLiteral) or not isinstance(argument, CONDITION_NODES)
+        if position == CONDITION:
+            # La lettura del parametro controlla che il valore sia booleano:
+            # l'argomento deve produrre sempre un booleano
+            if isinstance(argument, CONDITION_NODES):
+                return True
+            return (isinstance(argument, (Identifier, FunctionCall)) and
+                    self.semantic_analyzer.get_node_info(argument, 'inferred_type') ==
+                    SaltinoType.BOOL)
+        return True
+
+    def _copy(self, node: ASTNode, parameters: Dict[str, int],
+              arguments: List[ASTNode], trivial: List[bool]) -> ASTNode:
+        """Copia E sostituendo i parametri e copiando le informazioni semantiche."""
+        if isinstance(node, Identifier):
+            symbol = self.semantic_analyzer.get_node_info(node, 'resolved_info')
+            if symbol is not None and symbol.unique_name in parameters:
+                argument = arguments[parameters[symbol.unique_name]]
+                # Un argomento non banale compare una sola volta e viene spostato
+                if not trivial[parameters[symbol.unique_name]]:
+                    return argument
+                return self._clone(argument, lambda: self._copy_leaf(argument))
+            return self._clone(node, lambda: Identifier(node.name, node.position))
+        if isinstance(node, (IntegerLiteral, BooleanLiteral, EmptyList)):
+            return self._clone(node, lambda: self._copy_leaf(node))
+
+        copy = lambda child: self._copy(child, parameters, arguments, trivial)
+        if isinstance(node, BinaryExpression):
+            result = BinaryExpression(copy(node.left), node.operator,
+                                      copy(node.right), node.position)
+        elif isinstance(node, ComparisonCondition):
+            result = ComparisonCondition(copy(node.left), node.operator,
+                                         copy(node.right), node.position)
+        elif isinstance(node, BinaryCondition):
+            result = BinaryCondition(copy(node.left), node.operator,
+                                     copy(node.right), node.position)
+        elif isinstance(node, UnaryExpression):
+            result = UnaryExpression(node.operator, copy(node.operand), node.position)
+        elif isinstance(node, UnaryCondition):
+            result = UnaryCondition(node.operator, copy(node.operand), node.position)
+        elif isinstance(node, FunctionCall):
+            result = FunctionCall(copy(node.function),
+                                  [copy(argument) for argument in node.arguments],
+                                  node.position)
+        elif isinstance(node, ListLiteral):
+            result = ListLiteral([copy(element) for element in node.elements],
+                                 node.position)
+            # Il valore precalcolato non viene mai modificato: si condivide
+            result.value = node.value
+        else:
+            raise _Rejected()
+        if hasattr(node, 'operator_impl'):
+            result.operator_impl = node.operator_impl
+        return self._clone(node, lambda: result)
+
+    @staticmethod
+    def _copy_leaf(node: ASTNode) -> ASTNode:
+        if isinstance(node, Identifier):
+            return Identifier(node.name, node.position)
+        if isinstance(node, EmptyList):
+            return EmptyList(node.position)
+        return type(node)(node.value, node.position)
+
+    def _clone(self, original: ASTNode, build) -> ASTNode:
+        """Crea il nodo con build() e gli copia le informazioni semantiche dell'originale."""
+        clone = build()
+        info = {key: value for key, value in
+                self.semantic_analyzer.node_info.get(id(original), {}).items()
+                if key not in _POSITIONAL_INFO}
+        if info:
+            self.semantic_analyzer.set_node_info(clone, **info)
+        return clone
+
+    # ==================== UTILITY ====================
+
+    def _static_callee(self, call: FunctionCall) -> Optional[Function]:
+        if not isinstance(call.function, Identifier):
+            return None
+        symbol = self.semantic_analyzer.get_node_info(call.function, 'resolved_info')
+        if symbol is None or symbol.kind != SymbolKind.FUNCTION:
+            return None
+        return self.functions.get(symbol.name)
+
+    def _parameter_symbols(self, function: Function) -> Optional[Dict[str, int]]:
+        """Nome univoco -> posizione di ogni parametro."""
+        scope = self.semantic_analyzer.get_node_info(function, 'scope')
+        if scope is None:
+            return None
+        parameters = {}
+        for index, name in enumerate(function.parameters):
+            info = scope.lookup_local(name)
+            if info is None:
+                return None
+            parameters[info.unique_name] = index
+        return parameters
+
+    def _is_trivial(self, node: ASTNode) -> bool:
+        """Letterali, parametri e funzioni: valutarli non fallisce mai."""
+        if isinstance(node, (IntegerLiteral, BooleanLiteral, EmptyList)):
+            return True
+        if isinstance(node, Identifier):
+            symbol = self.semantic_analyzer.get_node_info(node, 'resolved_info')
+            return symbol is not None and symbol.kind in (SymbolKind.PARAMETER,
+                                                          SymbolKind.FUNCTION)
+        return False
+
+    def _is_recursive(self, name: str) -> bool:
+        """Vero se la funzione può richiamare sé stessa tramite chiamate dirette."""
+        if name not in self._recursive:
+            call_graph = self.semantic_analyzer.call_graph
+            stack = list(call_graph.get(name, ()))
+            visited = set()
+            while stack:
+                current = stack.pop()
+                if current == name:
+                    self._recursive[name] = True
+                    break
+                if current not in visited:
+                    visited.add(current)
+                    stack.extend(call_graph.get(current, ()))
+            else:
+                self._recursive[name] = False
+        return self._recursive[name]
+
+
+def callee_expression(function: Function) -> Optional[ASTNode]:
+    """L'espressione E se il corpo della funzione è esattamente `return E`."""
+    statements = function.body.statements
+    if (len(statements) == 1 and isinstance(statements[0], ReturnStatement) and
+            statements[0].value is not None):
+        return statements[0].value
+    return None
+
+
+def fits_position(body: ASTNode, position: str) -> bool:
+    """Vero se E può essere valutata nella posizione della chiamata."""
+    if position == CONDITION:
+        return isinstance(body, CONDITION_NODES)
+    if position == OPERAND:
+        return isinstance(body, BooleanLiteral) or not isinstance(body, CONDITION_NODES)
+    return True
+
+
+def count_nodes(node: ASTNode) -> int:
+    """Numero di nodi di un'espressione."""
+    return sum(1 for _ in iter_nodes(node))
+
+
+def evaluation_events(node: ASTNode, position: str, parameters: Dict[str, int],
+                      semantic_analyzer, conditional: bool = False):
+    """
+    Eventi della valutazione di E nell'ordine dell'interprete:
+    ('param', i, posizione) / ('conditional', i, posizione) per ogni uso del
+    parametro i (il secondo se la valutazione dipende da uno short-circuit) e
+    ('fail', None, None) per ogni operazione che può sollevare un errore.
+    """
+    param_event = 'conditional' if conditional else 'param'
+    fail = ('fail', None, None)
+
+    def events(child, child_position, child_conditional=conditional):
+        return evaluation_events(child, child_position, parameters,
+                                 semantic_analyzer, child_conditional)
+
+    if isinstance(node, Identifier):
+        symbol = semantic_analyzer.get_node_info(node, 'resolved_info')
+        if symbol is not None and symbol.unique_name in parameters:
+            yield param_event, parameters[symbol.unique_name], position
+        elif position == CONDITION:
+            yield fail
+    elif isinstance(node, BinaryExpression):
+        yield from events(node.left, EXPRESSION)
+        yield from events(node.right, EXPRESSION)
+        if node.operator_impl not in NON_FAILING_OPERATORS:
+            yield fail
+    elif isinstance(node, ComparisonCondition):
+        yield from events(node.left, OPERAND)
+        yield from events(node.right, OPERAND)
+        if node.operator_impl not in NON_FAILING_OPERATORS:
+            yield fail
+    elif isinstance(node, UnaryExpression):
+        yield from events(node.operand, EXPRESSION)
+        if node.operator_impl not in NON_FAILING_OPERATORS:
+            yield fail
+    elif isinstance(node, UnaryCondition):
+        yield from events(node.operand, CONDITION)
+        yield fail
+    elif isinstance(node, BinaryCondition):
+        # Il lato destro è valutato solo se lo short-circuit non scatta
+        yield from events(node.left, CONDITION)
+        yield fail
+        yield from events(node.right, CONDITION, True)
+    elif isinstance(node, FunctionCall):
+        yield from events(node.function, EXPRESSION)
+        for argument in node.arguments:
+            yield from events(argument, EXPRESSION)
+        yield fail
+    elif isinstance(node, ListLiteral):
+        for element in node.elements:
+            yield from events(element, EXPRESSION)
+        if node.value is None:
+            yield fail
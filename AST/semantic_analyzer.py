@@ -2,12 +2,14 @@ from AST.ASTsymbol_table import SymbolTable, SymbolKind
 from AST.ASTNodes import *
 import sys
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 # Add the workspace root to the Python path
 workspace_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, workspace_root)
 
+from prelude import PRELUDE
+
 
 class SemanticError(Exception):
     """Eccezione base per errori semantici"""
@@ -23,7 +25,13 @@ class UnboundLocalError(SemanticError):
 
 
 class SemanticAnalyzer:
-    """Analizzatore semantico che implementa il pattern Visitor per decorare l'AST"""
+    """
+    Analizzatore semantico che implementa il pattern Visitor per decorare l'AST.
+
+    I metodi visit_* dei nodi con figli sono generatori: producono (yield) i
+    figli da visitare e walk li esegue con uno stack esplicito, quindi
+    l'analisi non usa la ricorsione Python anche su AST molto profondi.
+    """
 
     def __init__(self, debug_mode: bool = False):
         self.debug_mode = debug_mode
@@ -36,11 +44,22 @@ class SemanticAnalyzer:
         # Dizionario per memorizzare le informazioni semantiche sui nodi
         # Chiave: id(nodo), Valore: informazioni semantiche
         self.node_info: Dict[int, Dict[str, Any]] = {}
+        # Riferimenti ai nodi decorati: mantengono validi gli id usati come
+        # chiave e permettono di ricostruire node_info dopo la serializzazione
+        self._node_refs: Dict[int, Any] = {}
+        # Hash-consing delle informazioni: i dizionari uguali, come {'scope': S}
+        # di tutti i nodi di un blocco, sono un solo oggetto.
+        # Chiave: coppie (nome, id(valore)) -> dizionario condiviso
+        self._shared_info: Dict[tuple, Dict[str, Any]] = {}
+        # Grafo delle chiamate dirette: funzione -> funzioni chiamate per nome
+        self.call_graph: Dict[str, Set[str]] = {}
+        # Variabili assegnate in ogni blocco (id -> nomi), valide durante analyze
+        self._block_assignments: Dict[int, Dict[str, None]] = {}
 
     def analyze(self, program: Program):
         """Punto di ingresso per l'analisi semantica"""
         try:
-            program.accept(self)
+            walk(program, lambda node: node.accept(self))
             if self.debug_mode:
                 print("✅ Analisi semantica completata con successo!")
             return True
@@ -70,19 +89,56 @@ class SemanticAnalyzer:
             if self.debug_mode:
                 print(f"❌ Errore nell'analisi semantica: {e}")
             return False
+        finally:
+            self._block_assignments.clear()
 
     def set_node_info(self, node: ASTNode, **kwargs):
-        """Memorizza informazioni semantiche per un nodo"""
+        """
+        Memorizza informazioni semantiche per un nodo.
+
+        Le informazioni restano per occorrenza, indicizzate per id(nodo), ma
+        i dizionari uguali sono condivisi: per questo non vengono mai
+        modificati sul posto, ogni aggiornamento ne sceglie un altro.
+        """
         node_id = id(node)
-        if node_id not in self.node_info:
-            self.node_info[node_id] = {}
-        self.node_info[node_id].update(kwargs)
+        info = self.node_info.get(node_id)
+        if info is None:
+            self._node_refs[node_id] = node
+            info = kwargs
+        else:
+            info = {**info, **kwargs}
+        key = tuple((name, id(value)) for name, value in info.items())
+        self.node_info[node_id] = self._shared_info.setdefault(key, info)
 
     def get_node_info(self, node: ASTNode, key: str, default=None):
         """Recupera informazioni semantiche di un nodo"""
         node_id = id(node)
         return self.node_info.get(node_id, {}).get(key, default)
 
+    def __getstate__(self):
+        """
+        Stato serializzabile: node_info è indicizzato per id(), che non
+        sopravvive alla serializzazione, quindi viene salvato come lista di
+        coppie (nodo, informazioni) e reindicizzato al caricamento.
+        """
+        state = self.__dict__.copy()
+        state['node_info'] = [(self._node_refs[node_id], info)
+                              for node_id, info in self.node_info.items()]
+        del state['_node_refs']
+        # Le chiavi contengono id() che non sopravvivono alla serializzazione
+        del state['_shared_info']
+        # L'ErrorCollector appartiene alla fase di parsing
+        state['error_collector'] = None
+        return state
+
+    def __setstate__(self, state):
+        """Ripristina lo stato reindicizzando node_info con i nuovi id."""
+        entries = state.pop('node_info')
+        self.__dict__.update(state)
+        self.node_info = {id(node): info for node, info in entries}
+        self._node_refs = {id(node): node for node, _ in entries}
+        self._shared_info = {}
+
     def _debug_print(self, message: str):
         """Stampa un messaggio solo se debug_mode è attivo"""
         if self.debug_mode:
@@ -102,6 +158,13 @@ class SemanticAnalyzer:
         """Visita il programma principale"""
         self.set_node_info(node, scope=self.current_scope)
 
+        # Le funzioni del preludio sono dichiarate per prime: quelle del
+        # programma con lo stesso nome le nascondono
+        defined = {function.name for function in node.functions}
+        for builtin in PRELUDE.values():
+            if builtin.name not in defined:
+                self.current_scope.bind(builtin.name, SymbolKind.FUNCTION, builtin)
+
         # Prima passa: dichiara tutte le funzioni nel scope globale
         for function in node.functions:
             func_info = self.current_scope.bind(
@@ -112,7 +175,7 @@ class SemanticAnalyzer:
 
         # Seconda passa: analizza i corpi delle funzioni
         for function in node.functions:
-            function.accept(self)
+            yield function
 
     def visit_function(self, node: Function):
         """Visita una definizione di funzione"""
@@ -136,7 +199,7 @@ class SemanticAnalyzer:
                 f"  Parametro: {param} -> {param_info.unique_name}")
 
         # Analizza il corpo della funzione
-        node.body.accept(self)
+        yield node.body
 
         # Esce dal scope della funzione
         self.current_scope = old_scope
@@ -161,8 +224,7 @@ class SemanticAnalyzer:
 
         # FASE 1: Pre-dichiarazione delle variabili locali
         # Identifica tutte le variabili che vengono assegnate in questo blocco
-        local_assignments = set()
-        self._collect_local_assignments(node.statements, local_assignments)
+        local_assignments = self._collect_local_assignments(node)
 
         # Pre-dichiara tutte le variabili locali come "non inizializzate"
         for var_name in local_assignments:
@@ -175,27 +237,45 @@ class SemanticAnalyzer:
 
         # FASE 2: Analisi delle istruzioni
         for statement in node.statements:
-            statement.accept(self)
+            yield statement
 
         # Esce dal scope del blocco
         self.current_scope = old_scope
         self._debug_print(f"  Uscito dal blocco scope: {block_scope}")
 
-    def _collect_local_assignments(self, statements, local_assignments):
-        """Raccoglie ricorsivamente tutti i nomi di variabili assegnate nelle statements"""
-        for stmt in statements:
-            if isinstance(stmt, Assignment):
-                local_assignments.add(stmt.variable)
-            elif isinstance(stmt, IfStatement):
-                # Analizza ricorsivamente i blocchi then/else
-                self._collect_local_assignments(
-                    stmt.then_block.statements, local_assignments)
-                if stmt.else_block:
-                    self._collect_local_assignments(
-                        stmt.else_block.statements, local_assignments)
-            elif isinstance(stmt, Block):
-                # Non raccoglie da blocchi annidati - hanno il loro scope
-                pass
+    def _collect_local_assignments(self, block: Block) -> Dict[str, None]:
+        """
+        Raccoglie tutti i nomi di variabili assegnate nel blocco e nei rami
+        dei suoi if, in ordine di sorgente. I risultati dei rami restano in
+        _block_assignments: quando il blocco di un ramo viene visitato non
+        vengono ricalcolati, così if annidati non costano tempo quadratico.
+        """
+        collected = self._block_assignments
+        pending = [block]
+        while pending:
+            current = pending[-1]
+            if id(current) in collected:
+                pending.pop()
+                continue
+            # Prima i rami degli if (i blocchi annidati hanno il loro scope)
+            branches = [branch for stmt in current.statements
+                        if isinstance(stmt, IfStatement)
+                        for branch in (stmt.then_block, stmt.else_block)
+                        if branch is not None and id(branch) not in collected]
+            if branches:
+                pending.extend(branches)
+                continue
+            names: Dict[str, None] = {}
+            for stmt in current.statements:
+                if isinstance(stmt, Assignment):
+                    names[stmt.variable] = None
+                elif isinstance(stmt, IfStatement):
+                    names.update(collected[id(stmt.then_block)])
+                    if stmt.else_block:
+                        names.update(collected[id(stmt.else_block)])
+            collected[id(current)] = names
+            pending.pop()
+        return collected[id(block)]
 
     def visit_assignment(self, node: Assignment):
         """Visita un assegnamento
@@ -224,7 +304,7 @@ class SemanticAnalyzer:
         self.set_node_info(node, scope=self.current_scope)
 
         # Prima analizza il valore da assegnare (RHS)
-        node.value.accept(self)
+        yield node.value
 
         # Poi gestisce l'assegnamento (LHS)
         existing = self.current_scope.lookup_local(node.variable)
@@ -255,19 +335,19 @@ class SemanticAnalyzer:
         self.set_node_info(node, scope=self.current_scope)
 
         # Analizza la condizione
-        node.condition.accept(self)
+        yield node.condition
 
         # Analizza il blocco then
-        node.then_block.accept(self)
+        yield node.then_block
 
         # Analizza il blocco else se presente
         if node.else_block:
-            node.else_block.accept(self)
+            yield node.else_block
 
     def visit_return_statement(self, node: ReturnStatement):
         """Visita un'istruzione return"""
         self.set_node_info(node, scope=self.current_scope)
-        node.value.accept(self)
+        yield node.value
         # Tail Call Optimization annotation: only mark recursive calls as potential tail calls
         if isinstance(node.value, FunctionCall):
             # Check if this is a recursive call by comparing function names
@@ -280,24 +360,31 @@ class SemanticAnalyzer:
     def visit_binary_expression(self, node: BinaryExpression):
         """Visita un'espressione binaria"""
         self.set_node_info(node, scope=self.current_scope)
-        node.left.accept(self)
-        node.right.accept(self)
+        yield node.left
+        yield node.right
 
     def visit_unary_expression(self, node: UnaryExpression):
         """Visita un'espressione unaria"""
         self.set_node_info(node, scope=self.current_scope)
-        node.operand.accept(self)
+        yield node.operand
 
     def visit_function_call(self, node: FunctionCall):
         """Visita una chiamata di funzione"""
         self.set_node_info(node, scope=self.current_scope)
 
         # Analizza la funzione (dovrebbe essere un Identifier)
-        node.function.accept(self)
+        yield node.function
+
+        # Registra l'arco nel grafo delle chiamate se il callee è una funzione globale
+        callee = self.get_node_info(node.function, 'resolved_info')
+        current_function_name = self._get_current_function_name()
+        if (callee is not None and callee.kind == SymbolKind.FUNCTION and
+                current_function_name is not None):
+            self.call_graph.setdefault(current_function_name, set()).add(callee.name)
 
         # Analizza tutti gli argomenti
         for arg in node.arguments:
-            arg.accept(self)
+            yield arg
 
     def visit_identifier(self, node: Identifier):
         """Visita un identificatore (riferimento a variabile/funzione)"""
@@ -338,22 +425,28 @@ class SemanticAnalyzer:
         """Visita una lista vuota"""
         self.set_node_info(node, scope=self.current_scope)
 
+    def visit_list_literal(self, node: ListLiteral):
+        """Visita un letterale di lista"""
+        self.set_node_info(node, scope=self.current_scope)
+        for element in node.elements:
+            yield element
+
     def visit_binary_condition(self, node: BinaryCondition):
         """Visita una condizione binaria"""
         self.set_node_info(node, scope=self.current_scope)
-        node.left.accept(self)
-        node.right.accept(self)
+        yield node.left
+        yield node.right
 
     def visit_unary_condition(self, node: UnaryCondition):
         """Visita una condizione unaria"""
         self.set_node_info(node, scope=self.current_scope)
-        node.operand.accept(self)
+        yield node.operand
 
     def visit_comparison_condition(self, node: ComparisonCondition):
         """Visita una condizione di confronto"""
         self.set_node_info(node, scope=self.current_scope)
-        node.left.accept(self)
-        node.right.accept(self)
+        yield node.left
+        yield node.right
 
     # ==================== UTILITY METHODS ====================
 
@@ -0,0 +1,56 @@
+"""
+Tree shaking per il linguaggio Saltino.
+
+Rimuove dal programma le funzioni non raggiungibili dai punti di ingresso
+prima dell'analisi semantica, così che non vengano né analizzate né
+registrate nell'ambiente globale. Sono raggiungibili le funzioni chiamate
+direttamente e quelle riferite come valori (passate come argomento,
+restituite o assegnate).
+
+Il passo è sintattico: ogni identificatore con il nome di una funzione conta
+come riferimento, anche se nel suo scope il nome è una variabile. L'errore è
+solo per eccesso (una funzione viene mantenuta inutilmente), mai per difetto.
+"""
+
+from typing import Dict, Iterable, List
+
+from AST.ASTNodes import *
+from AST.type_inference import iter_nodes
+
+
+class TreeShaker:
+    """Elimina le funzioni irraggiungibili dai punti di ingresso."""
+
+    def __init__(self, entry_points: Iterable[str] = ('main',)):
+        self.entry_points = list(entry_points)
+        self.removed_functions: List[str] = []
+
+    def shake(self, program: Program) -> Program:
+        """Rimuove in loco le funzioni irraggiungibili e restituisce il programma."""
+        functions: Dict[str, List[Function]] = {}
+        for function in program.functions:
+            functions.setdefault(function.name, []).append(function)
+
+        # Senza punti di ingresso definiti il programma resta invariato:
+        # l'errore (es. main mancante) verrà segnalato come prima
+        roots = [name for name in self.entry_points if name in functions]
+        if not roots:
+            return program
+
+        reachable = set()
+        stack = roots
+        while stack:
+            name = stack.pop()
+            if name in reachable:
+                continue
+            reachable.add(name)
+            for function in functions[name]:
+                for node in iter_nodes(function.body):
+                    if isinstance(node, Identifier) and node.name in functions:
+                        stack.append(node.name)
+
+        self.removed_functions = [function.name for function in program.functions
+                                  if function.name not in reachable]
+        program.functions = [function for function in program.functions
+                             if function.name in reachable]
+        return program
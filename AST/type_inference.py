@@ -0,0 +1,470 @@
+"""
+Inferenza statica dei tipi per il linguaggio Saltino.
+
+Il passo lavora sull'AST già decorato dal SemanticAnalyzer e inferisce, dove
+possibile, il tipo (int, bool, lista, funzione) di ogni espressione:
+- i letterali e i risultati degli operatori hanno tipo noto;
+- le variabili hanno il tipo di tutti i valori che vi vengono assegnati;
+- i parametri ricevono i tipi degli argomenti di tutte le chiamate dirette;
+- il tipo di ritorno di una funzione è l'unione dei valori restituiti.
+
+L'analisi è un punto fisso sull'intero programma. Al termine ogni nodo
+operatore riceve in operator_impl una funzione piatta: specializzata senza
+controlli di tipo se i tipi degli operandi sono dimostrati, altrimenti la
+versione controllata delle dispatch table.
+"""
+
+import operator
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Set
+
+from AST.ASTNodes import *
+from AST.ASTsymbol_table import SymbolKind
+from packed_lists import is_list
+from prelude import BuiltinFunction
+from saltino_operators import SaltinoOperators
+
+
+class SaltinoType(Enum):
+    """Reticolo dei tipi: BOTTOM (nessun valore) < tipi concreti < ANY."""
+    BOTTOM = "bottom"
+    INT = "int"
+    BOOL = "bool"
+    LIST = "list"          # lista di soli interi
+    FUNCTION = "function"
+    ANY = "any"
+
+
+def join_types(left: SaltinoType, right: SaltinoType) -> SaltinoType:
+    """Minimo maggiorante di due tipi nel reticolo."""
+    if left == SaltinoType.BOTTOM:
+        return right
+    if right == SaltinoType.BOTTOM or left == right:
+        return left
+    return SaltinoType.ANY
+
+
+# Operatori aritmetici il cui risultato è sempre un intero (o un errore).
+# '^' è escluso: con esponente negativo Python restituisce un float
+INT_RESULT_OPERATORS = {'+', '-', '*', '/', '%'}
+
+# Operatori specializzati quando entrambi gli operandi sono interi
+UNCHECKED_BINARY_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': SaltinoOperators.unchecked_divide,
+    '%': operator.mod,
+    '^': operator.pow,
+}
+
+UNCHECKED_COMPARISON_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'int>=': operator.ge,
+}
+
+# Operatori controllati (dispatch table dell'interprete) per tipo di nodo
+CHECKED_OPERATORS = {
+    BinaryExpression: SaltinoOperators.get_binary_operators(),
+    UnaryExpression: SaltinoOperators.get_unary_operators(),
+    ComparisonCondition: SaltinoOperators.get_comparison_operators(),
+    BinaryCondition: SaltinoOperators.get_logical_operators(),
+}
+
+
+def checked_operator(node: ASTNode):
+    """Operatore controllato per un nodo, None se l'operatore è sconosciuto."""
+    table = CHECKED_OPERATORS.get(type(node))
+    return table.get(node.operator) if table is not None else None
+
+
+class TypeInference:
+    """Inferenza dei tipi a punto fisso su un programma già analizzato."""
+
+    def __init__(self, semantic_analyzer, entry_points: Iterable[str] = ('main',)):
+        self.semantic_analyzer = semantic_analyzer
+        self.entry_points = set(entry_points)
+        # Tipi delle variabili e dei parametri, per nome univoco
+        self.variable_types: Dict[str, SaltinoType] = {}
+        # Tipi di ritorno delle funzioni, per nome
+        self.return_types: Dict[str, SaltinoType] = {}
+        # Funzioni usate come valori: possono essere chiamate ovunque
+        self.escaping_functions: Set[str] = set()
+        self.functions: Dict[str, Function] = {}
+        self._changed = False
+
+    # ==================== PUNTO DI INGRESSO ====================
+
+    def infer(self, program: Program):
+        """Esegue l'inferenza e decora l'AST con tipi e operatori specializzati."""
+        self.functions = {function.name: function for function in program.functions}
+        self._collect_escaping_functions(program)
+
+        # I parametri dei punti di ingresso e delle funzioni che sfuggono
+        # come valori possono ricevere qualunque valore
+        for function in program.functions:
+            if (function.name in self.entry_points or
+                    function.name in self.escaping_functions):
+                for unique_name in self._parameter_names(function):
+                    self.variable_types[unique_name] = SaltinoType.ANY
+
+        # Punto fisso: i tipi crescono solo verso ANY, quindi termina
+        self._changed = True
+        while self._changed:
+            self._changed = False
+            for function in program.functions:
+                self._infer_function(function)
+
+        for function in program.functions:
+            self._annotate_function(function)
+
+    # ==================== RACCOLTA DEI VINCOLI ====================
+
+    def _collect_escaping_functions(self, program: Program):
+        """Trova le funzioni riferite come valori (non solo chiamate direttamente)."""
+        for function in program.functions:
+            for node in iter_nodes(function.body):
+                children = (node.arguments if isinstance(node, FunctionCall)
+                            else child_nodes(node))
+                for child in children:
+                    self._mark_if_function_value(child)
+
+    def _mark_if_function_value(self, node: ASTNode):
+        symbol = self._resolved_symbol(node)
+        if symbol is not None and symbol.kind == SymbolKind.FUNCTION:
+            self.escaping_functions.add(symbol.name)
+
+    def _parameter_names(self, function: Function) -> List[str]:
+        """Nomi univoci dei parametri di una funzione."""
+        scope = self.semantic_analyzer.get_node_info(function, 'scope')
+        names = []
+        if scope is not None:
+            for param in function.parameters:
+                info = scope.lookup_local(param)
+                if info is not None:
+                    names.append(info.unique_name)
+        return names
+
+    def _update(self, table: Dict[str, SaltinoType], key: str, new_type: SaltinoType):
+        """Unisce new_type al tipo registrato, segnalando se è cambiato."""
+        current = table.get(key, SaltinoType.BOTTOM)
+        joined = join_types(current, new_type)
+        if joined != current:
+            table[key] = joined
+            self._changed = True
+
+    def _infer_function(self, function: Function):
+        """Propaga i tipi attraverso il corpo di una funzione."""
+        self._current_function = function.name
+        self._infer_block(function.body)
+        if not always_returns(function.body):
+            # Il corpo può terminare senza return (risultato implicito o None)
+            self._update(self.return_types, function.name, SaltinoType.ANY)
+
+    def _infer_block(self, block: Block):
+        # Stack esplicito di istruzioni: blocchi e if annidati non ricorrono
+        stack = list(reversed(block.statements))
+        while stack:
+            statement = stack.pop()
+            if isinstance(statement, Assignment):
+                value_type = self.type_of(statement.value)
+                var_info = self.semantic_analyzer.get_node_info(
+                    statement, 'variable_info')
+                if var_info is not None:
+                    self._update(self.variable_types,
+                                 var_info.unique_name, value_type)
+            elif isinstance(statement, ReturnStatement):
+                self._update(self.return_types, self._current_function,
+                             self.type_of(statement.value))
+            elif isinstance(statement, IfStatement):
+                self.type_of(statement.condition)
+                if statement.else_block:
+                    stack.extend(reversed(statement.else_block.statements))
+                stack.extend(reversed(statement.then_block.statements))
+            elif isinstance(statement, Block):
+                stack.extend(reversed(statement.statements))
+            else:
+                self.type_of(statement)
+
+    # ==================== TIPI DELLE ESPRESSIONI ====================
+
+    def type_of(self, node: ASTNode) -> SaltinoType:
+        """Calcola il tipo di un'espressione, propagando i vincoli delle chiamate."""
+        return self._types_below(node)[id(node)]
+
+    def _types_below(self, root: ASTNode) -> Dict[int, SaltinoType]:
+        """
+        Tipi (per id) di root e dei nodi sotto di esso, calcolati dal basso
+        con uno stack esplicito: ogni nodo è tipato una volta sola, senza
+        ricorsione anche per catene di operatori molto lunghe.
+        """
+        types: Dict[int, SaltinoType] = {}
+        stack = [(root, False)]
+        while stack:
+            node, children_typed = stack.pop()
+            if children_typed or type(node) in LEAF_NODES:
+                types[id(node)] = self._node_type(node, types)
+                continue
+            stack.append((node, True))
+            if isinstance(node, ListLiteral) and node.value is not None:
+                # Gli elementi di un letterale costante non portano vincoli
+                continue
+            stack.extend((child, False) for child in reversed(child_nodes(node)))
+        return types
+
+    def _node_type(self, node: ASTNode, types: Dict[int, SaltinoType]) -> SaltinoType:
+        """Tipo di un nodo dati i tipi dei figli, già presenti in types."""
+        if isinstance(node, IntegerLiteral):
+            return SaltinoType.INT
+        if isinstance(node, BooleanLiteral):
+            return SaltinoType.BOOL
+        if isinstance(node, EmptyList):
+            return SaltinoType.LIST
+        if isinstance(node, ListLiteral):
+            # Come la catena di cons: una lista di interi o un errore
+            return SaltinoType.LIST
+        if isinstance(node, Identifier):
+            symbol = self._resolved_symbol(node)
+            if symbol is None:
+                return SaltinoType.ANY
+            if symbol.kind == SymbolKind.FUNCTION:
+                return SaltinoType.FUNCTION
+            return self.variable_types.get(symbol.unique_name, SaltinoType.BOTTOM)
+        if isinstance(node, BinaryExpression):
+            left_type = types[id(node.left)]
+            right_type = types[id(node.right)]
+            if node.operator in INT_RESULT_OPERATORS:
+                return SaltinoType.INT
+            if node.operator == '::':
+                return SaltinoType.LIST
+            if node.operator == 'cons_all':
+                return SaltinoType.LIST
+            if node.operator[:5] in ('foldr', 'foldl'):
+                # Senza operazioni in sospeso il risultato è il valore base
+                symbol = node.operator[5:]
+                if symbol in INT_RESULT_OPERATORS:
+                    return join_types(SaltinoType.INT, right_type)
+                if symbol == '::':
+                    return join_types(SaltinoType.LIST, right_type)
+                return SaltinoType.ANY
+            if node.operator == 'accumulate':
+                # Accumulatore interno senza controlli: è una lista di interi
+                # solo se lo sono già i suoi operandi
+                if SaltinoType.BOTTOM in (left_type, right_type):
+                    return SaltinoType.BOTTOM
+                if left_type == SaltinoType.LIST and right_type == SaltinoType.INT:
+                    return SaltinoType.LIST
+            return SaltinoType.ANY
+        if isinstance(node, UnaryExpression):
+            operand_type = types[id(node.operand)]
+            if node.operator in ('+', '-'):
+                return SaltinoType.INT
+            # LIST indica una lista di interi: solo allora head/tail
+            # producono valori di tipo noto (le liste in ingresso possono
+            # contenere valori arbitrari)
+            if operand_type == SaltinoType.LIST:
+                if node.operator == 'head':
+                    return SaltinoType.INT
+                if node.operator == 'tail':
+                    return SaltinoType.LIST
+            return SaltinoType.ANY
+        if isinstance(node, (ComparisonCondition, BinaryCondition, UnaryCondition)):
+            return SaltinoType.BOOL
+        if isinstance(node, FunctionCall):
+            return self._type_of_call(node, types)
+        return SaltinoType.ANY
+
+    def _type_of_call(self, call: FunctionCall, types: Dict[int, SaltinoType]) -> SaltinoType:
+        """Tipo di una chiamata; per le chiamate dirette propaga i tipi degli argomenti."""
+        argument_types = [types[id(argument)] for argument in call.arguments]
+        callee = self._static_callee(call)
+        if callee is None:
+            symbol = self._resolved_symbol(call.function)
+            if symbol is not None and isinstance(symbol.node_ref, BuiltinFunction):
+                # Funzione del preludio: il tipo del risultato è dichiarato
+                return SaltinoType(symbol.node_ref.return_type)
+            return SaltinoType.ANY
+
+        if len(argument_types) == len(callee.parameters):
+            for unique_name, argument_type in zip(self._parameter_names(callee),
+                                                  argument_types):
+                self._update(self.variable_types, unique_name, argument_type)
+        return self.return_types.get(callee.name, SaltinoType.BOTTOM)
+
+    def _static_callee(self, call: FunctionCall) -> Optional[Function]:
+        """Restituisce la funzione chiamata se è risolta staticamente."""
+        symbol = self._resolved_symbol(call.function)
+        if symbol is not None and symbol.kind == SymbolKind.FUNCTION:
+            return self.functions.get(symbol.name)
+        return None
+
+    def _resolved_symbol(self, node: ASTNode):
+        if not isinstance(node, Identifier):
+            return None
+        return self.semantic_analyzer.get_node_info(node, 'resolved_info')
+
+    # ==================== DECORAZIONE ====================
+
+    def _known(self, node: ASTNode, types: Dict[int, SaltinoType]) -> SaltinoType:
+        """Tipo finale di un nodo; BOTTOM è trattato in modo conservativo come ANY."""
+        node_type = types.get(id(node))
+        if node_type is None:
+            # Elemento di un letterale costante, non tipato da _types_below
+            node_type = self.type_of(node)
+        return SaltinoType.ANY if node_type == SaltinoType.BOTTOM else node_type
+
+    def _annotate_function(self, function: Function):
+        """Registra i tipi inferiti e lega gli operatori ai nodi."""
+        param_types = [self.variable_types.get(name, SaltinoType.ANY)
+                       for name in self._parameter_names(function)]
+        self.semantic_analyzer.set_node_info(
+            function, param_types=[SaltinoType.ANY if t == SaltinoType.BOTTOM else t
+                                   for t in param_types],
+            return_type=self.return_types.get(function.name, SaltinoType.ANY))
+
+        # Tipi di tutti i nodi del corpo, calcolati in una sola visita
+        types = self._types_below(function.body)
+        for node in iter_nodes(function.body):
+            if isinstance(node, (Expression, Condition)):
+                self.semantic_analyzer.set_node_info(
+                    node, inferred_type=self._known(node, types))
+            if type(node) in CHECKED_OPERATORS:
+                # Ogni operatore viene legato una volta sola al nodo:
+                # specializzato se i tipi sono dimostrati, altrimenti controllato
+                node.operator_impl = (self._specialized_operator(node, types) or
+                                      checked_operator(node))
+
+    def _specialized_operator(self, node: ASTNode, types: Dict[int, SaltinoType]):
+        """Operatore senza controlli di tipo per i nodi con operandi di tipo dimostrato."""
+        if isinstance(node, BinaryExpression):
+            left, right = self._known(node.left, types), self._known(node.right, types)
+            if node.operator == '::':
+                if left == SaltinoType.INT and right == SaltinoType.LIST:
+                    return SaltinoOperators.unchecked_cons
+                return None
+            if node.operator == 'cons_all':
+                if left == SaltinoType.LIST and right == SaltinoType.LIST:
+                    return SaltinoOperators.unchecked_cons_all
+                return None
+            if left == SaltinoType.INT and right == SaltinoType.INT:
+                return UNCHECKED_BINARY_OPERATORS.get(node.operator)
+        elif isinstance(node, UnaryExpression):
+            operand = self._known(node.operand, types)
+            if node.operator == '-' and operand == SaltinoType.INT:
+                return operator.neg
+            if node.operator == '+' and operand == SaltinoType.INT:
+                return operator.pos
+            if node.operator == 'head' and operand == SaltinoType.LIST:
+                return SaltinoOperators.unchecked_head
+            if node.operator == 'tail' and operand == SaltinoType.LIST:
+                return SaltinoOperators.unchecked_tail
+        elif isinstance(node, ComparisonCondition):
+            left, right = self._known(node.left, types), self._known(node.right, types)
+            if left == SaltinoType.INT and right == SaltinoType.INT:
+                return UNCHECKED_COMPARISON_OPERATORS.get(node.operator)
+            if (node.operator == '==' and
+                    left == SaltinoType.LIST and right == SaltinoType.LIST):
+                return operator.eq
+        return None
+
+
+# ==================== UTILITY ====================
+
+# Nodi senza figli
+LEAF_NODES = (IntegerLiteral, BooleanLiteral, Identifier, EmptyList)
+
+
+def child_nodes(node: ASTNode) -> List[ASTNode]:
+    """Figli diretti di un nodo AST, nell'ordine di valutazione."""
+    if type(node) in LEAF_NODES:
+        # Caso più frequente (es. gli elementi di un letterale di lista)
+        return []
+    if isinstance(node, Program):
+        return list(node.functions)
+    if isinstance(node, Function):
+        return [node.body]
+    if isinstance(node, Block):
+        return list(node.statements)
+    if isinstance(node, (Assignment, ReturnStatement)):
+        return [node.value] if node.value is not None else []
+    if isinstance(node, IfStatement):
+        children = [node.condition, node.then_block]
+        if node.else_block:
+            children.append(node.else_block)
+        return children
+    if isinstance(node, (BinaryExpression, BinaryCondition, ComparisonCondition)):
+        return [node.left, node.right]
+    if isinstance(node, (UnaryExpression, UnaryCondition)):
+        return [node.operand]
+    if isinstance(node, FunctionCall):
+        return [node.function] + list(node.arguments)
+    if isinstance(node, ListLiteral):
+        return list(node.elements)
+    return []
+
+
+def iter_nodes(root: ASTNode):
+    """Visita in profondità (pre-ordine) tutti i nodi sotto root, con stack esplicito."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(child_nodes(node)))
+
+
+def iter_nodes_post_order(root: ASTNode):
+    """Visita in profondità (post-ordine) tutti i nodi sotto root, con stack esplicito."""
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded or type(node) in LEAF_NODES:
+            yield node
+            continue
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(child_nodes(node)))
+
+
+def always_returns(block: Block) -> bool:
+    """Vero se ogni percorso di esecuzione del blocco termina con un return."""
+    # Post-ordine con stack esplicito: ogni blocco è valutato dopo quelli
+    # annidati, il cui risultato è già in returns
+    returns: Dict[int, bool] = {}
+    stack = [(block, False)]
+    while stack:
+        current, nested_done = stack.pop()
+        if not nested_done:
+            stack.append((current, True))
+            for statement in current.statements:
+                if isinstance(statement, Block):
+                    stack.append((statement, False))
+                elif isinstance(statement, IfStatement) and statement.else_block:
+                    stack.append((statement.then_block, False))
+                    stack.append((statement.else_block, False))
+            continue
+        returns[id(current)] = any(
+            isinstance(statement, ReturnStatement) or
+            (isinstance(statement, Block) and returns[id(statement)]) or
+            (isinstance(statement, IfStatement) and statement.else_block is not None and
+             returns[id(statement.then_block)] and returns[id(statement.else_block)])
+            for statement in current.statements)
+    return returns[id(block)]
+
+
+def value_has_type(value, expected: SaltinoType) -> bool:
+    """Vero se un valore a runtime appartiene al tipo inferito."""
+    if expected == SaltinoType.INT:
+        return type(value) is int
+    if expected == SaltinoType.BOOL:
+        return type(value) is bool
+    if expected == SaltinoType.LIST:
+        # Le liste compatte contengono solo interi per costruzione
+        return is_list(value) and (type(value) is not list or
+                                   all(type(item) is int for item in value))
+    if expected == SaltinoType.FUNCTION:
+        return isinstance(value, Function)
+    return True
@@ -62,7 +62,8 @@ return_stmt: 'return' (espressione | condizione);
  * 5. mult/% - associativi a sinistra
  * 6. +/- binari - associativi a sinistra  
  * 7. :: (cons) - associativo a destra per costruire liste
- * 8. Elementi primari (letterali interi/booleani, liste vuote, ID, parentesi)
+ * 8. Elementi primari (letterali interi/booleani, liste vuote, letterali
+ *    di lista [e1, ..., en], ID, parentesi)
  */
 espressione: espressione '(' argomenti? ')'                    # chiamataFunzione  // Associativa a destra
            | ('head' | 'tail') '(' espressione ')'            # headTail          // Operatori unari liste
@@ -72,6 +73,8 @@ espressione: espressione '(' argomenti? ')'                    # chiamataFunzion
            | espressione ('+' | '-') espressione               # addizione         // Associativo a sinistra
            | <assoc=right> espressione '::' espressione        # cons              // Associativo a destra
            | '[]'                                              # listaVuota        // Letterale lista vuota
+           | '[' argomenti ']'                                 # listaLetterale    // Letterale [e1, ..., en]
+           | TABELLA                                           # tabella           // Letterale di soli interi
            | INT                                               # intero            // Litterale intero
            | ('true' | 'false')                                # booleanoLiterale  // Litterale booleano
            | ID                                                # identificatore    // Riferimento a variabile
@@ -140,6 +143,17 @@ ID: [_a-zA-Z][_a-zA-Z0-9]*;
  */
 INT: [0-9]+;
 
+/**
+ * Tabelle: letterali di lista di soli interi, con segno opzionale, come
+ * [1, -2, 3]. Sono un solo token, così le tabelle di dati lunghe non
+ * passano per la scelta tra espressione e condizione di ogni argomento.
+ * Le altre liste, e quelle con commenti tra gli elementi, usano '[' e ']'.
+ * '[ ]' senza elementi non è una lista: l'unica lista vuota è '[]'
+ */
+TABELLA: '[' SPAZIO* INTERO_CON_SEGNO (SPAZIO* ',' SPAZIO* INTERO_CON_SEGNO)* SPAZIO* ']';
+fragment SPAZIO: [ \t\r\n];
+fragment INTERO_CON_SEGNO: [+-]? [0-9]+;
+
 // ========== GESTIONE WHITESPACE E COMMENTI ==========
 
 // Spazi bianchi ignorati
@@ -80,6 +80,51 @@ class SaltinoListener(ParseTreeListener):
         pass
 
 
+    # Enter a parse tree produced by SaltinoParser#intero.
+    def enterIntero(self, ctx:SaltinoParser.InteroContext):
+        pass
+
+    # Exit a parse tree produced by SaltinoParser#intero.
+    def exitIntero(self, ctx:SaltinoParser.InteroContext):
+        pass
+
+
+    # Enter a parse tree produced by SaltinoParser#chiamataFunzione.
+    def enterChiamataFunzione(self, ctx:SaltinoParser.ChiamataFunzioneContext):
+        pass
+
+    # Exit a parse tree produced by SaltinoParser#chiamataFunzione.
+    def exitChiamataFunzione(self, ctx:SaltinoParser.ChiamataFunzioneContext):
+        pass
+
+
+    # Enter a parse tree produced by SaltinoParser#parantesi.
+    def enterParantesi(self, ctx:SaltinoParser.ParantesiContext):
+        pass
+
+    # Exit a parse tree produced by SaltinoParser#parantesi.
+    def exitParantesi(self, ctx:SaltinoParser.ParantesiContext):
+        pass
+
+
+    # Enter a parse tree produced by SaltinoParser#addizione.
+    def enterAddizione(self, ctx:SaltinoParser.AddizioneContext):
+        pass
+
+    # Exit a parse tree produced by SaltinoParser#addizione.
+    def exitAddizione(self, ctx:SaltinoParser.AddizioneContext):
+        pass
+
+
+    # Enter a parse tree produced by SaltinoParser#headTail.
+    def enterHeadTail(self, ctx:SaltinoParser.HeadTailContext):
+        pass
+
+    # Exit a parse tree produced by SaltinoParser#headTail.
+    def exitHeadTail(self, ctx:SaltinoParser.HeadTailContext):
+        pass
+
+
     # Enter a parse tree produced by SaltinoParser#unario.
     def enterUnario(self, ctx:SaltinoParser.UnarioContext):
         pass
@@ -89,12 +134,12 @@ class SaltinoListener(ParseTreeListener):
         pass
 
 
-    # Enter a parse tree produced by SaltinoParser#intero.
-    def enterIntero(self, ctx:SaltinoParser.InteroContext):
+    # Enter a parse tree produced by SaltinoParser#listaLetterale.
+    def enterListaLetterale(self, ctx:SaltinoParser.ListaLetteraleContext):
         pass
 
-    # Exit a parse tree produced by SaltinoParser#intero.
-    def exitIntero(self, ctx:SaltinoParser.InteroContext):
+    # Exit a parse tree produced by SaltinoParser#listaLetterale.
+    def exitListaLetterale(self, ctx:SaltinoParser.ListaLetteraleContext):
         pass
 
 
@@ -107,15 +152,6 @@ class SaltinoListener(ParseTreeListener):
         pass
 
 
-    # Enter a parse tree produced by SaltinoParser#chiamataFunzione.
-    def enterChiamataFunzione(self, ctx:SaltinoParser.ChiamataFunzioneContext):
-        pass
-
-    # Exit a parse tree produced by SaltinoParser#chiamataFunzione.
-    def exitChiamataFunzione(self, ctx:SaltinoParser.ChiamataFunzioneContext):
-        pass
-
-
     # Enter a parse tree produced by SaltinoParser#identificatore.
     def enterIdentificatore(self, ctx:SaltinoParser.IdentificatoreContext):
         pass
@@ -125,15 +161,6 @@ class SaltinoListener(ParseTreeListener):
         pass
 
 
-    # Enter a parse tree produced by SaltinoParser#parantesi.
-    def enterParantesi(self, ctx:SaltinoParser.ParantesiContext):
-        pass
-
-    # Exit a parse tree produced by SaltinoParser#parantesi.
-    def exitParantesi(self, ctx:SaltinoParser.ParantesiContext):
-        pass
-
-
     # Enter a parse tree produced by SaltinoParser#moltiplicazione.
     def enterMoltiplicazione(self, ctx:SaltinoParser.MoltiplicazioneContext):
         pass
@@ -143,15 +170,6 @@ class SaltinoListener(ParseTreeListener):
         pass
 
 
-    # Enter a parse tree produced by SaltinoParser#addizione.
-    def enterAddizione(self, ctx:SaltinoParser.AddizioneContext):
-        pass
-
-    # Exit a parse tree produced by SaltinoParser#addizione.
-    def exitAddizione(self, ctx:SaltinoParser.AddizioneContext):
-        pass
-
-
     # Enter a parse tree produced by SaltinoParser#listaVuota.
     def enterListaVuota(self, ctx:SaltinoParser.ListaVuotaContext):
         pass
@@ -161,12 +179,12 @@ class SaltinoListener(ParseTreeListener):
         pass
 
 
-    # Enter a parse tree produced by SaltinoParser#headTail.
-    def enterHeadTail(self, ctx:SaltinoParser.HeadTailContext):
+    # Enter a parse tree produced by SaltinoParser#tabella.
+    def enterTabella(self, ctx:SaltinoParser.TabellaContext):
         pass
 
-    # Exit a parse tree produced by SaltinoParser#headTail.
-    def exitHeadTail(self, ctx:SaltinoParser.HeadTailContext):
+    # Exit a parse tree produced by SaltinoParser#tabella.
+    def exitTabella(self, ctx:SaltinoParser.TabellaContext):
         pass
 
 
@@ -10,71 +10,74 @@ else:
 
 def serializedATN():
     return [
-        4,1,35,186,2,0,7,0,2,1,7,1,2,2,7,2,2,3,7,3,2,4,7,4,2,5,7,5,2,6,7,
+        4,1,38,191,2,0,7,0,2,1,7,1,2,2,7,2,2,3,7,3,2,4,7,4,2,5,7,5,2,6,7,
         6,2,7,7,7,2,8,7,8,2,9,7,9,2,10,7,10,2,11,7,11,2,12,7,12,2,13,7,13,
         2,14,7,14,2,15,7,15,1,0,4,0,34,8,0,11,0,12,0,35,1,0,1,0,1,1,1,1,
         1,1,1,1,3,1,44,8,1,1,1,1,1,1,1,1,2,1,2,1,2,5,2,52,8,2,10,2,12,2,
         55,9,2,1,3,1,3,1,3,5,3,60,8,3,10,3,12,3,63,9,3,1,3,1,3,1,4,1,4,1,
         4,3,4,70,8,4,1,5,1,5,1,5,1,5,3,5,76,8,5,1,6,1,6,1,6,1,6,1,6,1,6,
         1,6,3,6,85,8,6,1,7,1,7,1,7,3,7,90,8,7,1,8,1,8,1,8,1,8,1,8,1,8,1,
-        8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,3,8,108,8,8,1,8,1,8,1,8,1,
-        8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,3,8,125,8,8,1,8,5,
-        8,128,8,8,10,8,12,8,131,9,8,1,9,1,9,3,9,135,8,9,1,9,1,9,1,9,3,9,
-        140,8,9,5,9,142,8,9,10,9,12,9,145,9,9,1,10,1,10,1,11,1,11,1,11,5,
-        11,152,8,11,10,11,12,11,155,9,11,1,12,1,12,1,12,5,12,160,8,12,10,
-        12,12,12,163,9,12,1,13,1,13,1,13,3,13,168,8,13,1,14,1,14,1,14,1,
-        14,1,14,1,14,1,14,1,14,1,14,1,14,1,14,1,14,3,14,182,8,14,1,15,1,
-        15,1,15,0,1,16,16,0,2,4,6,8,10,12,14,16,18,20,22,24,26,28,30,0,5,
-        1,0,11,12,1,0,14,15,1,0,21,22,1,0,16,18,1,0,26,30,202,0,33,1,0,0,
-        0,2,39,1,0,0,0,4,48,1,0,0,0,6,56,1,0,0,0,8,69,1,0,0,0,10,71,1,0,
-        0,0,12,77,1,0,0,0,14,86,1,0,0,0,16,107,1,0,0,0,18,134,1,0,0,0,20,
-        146,1,0,0,0,22,148,1,0,0,0,24,156,1,0,0,0,26,167,1,0,0,0,28,181,
-        1,0,0,0,30,183,1,0,0,0,32,34,3,2,1,0,33,32,1,0,0,0,34,35,1,0,0,0,
-        35,33,1,0,0,0,35,36,1,0,0,0,36,37,1,0,0,0,37,38,5,0,0,1,38,1,1,0,
-        0,0,39,40,5,1,0,0,40,41,5,31,0,0,41,43,5,2,0,0,42,44,3,4,2,0,43,
-        42,1,0,0,0,43,44,1,0,0,0,44,45,1,0,0,0,45,46,5,3,0,0,46,47,3,6,3,
-        0,47,3,1,0,0,0,48,53,5,31,0,0,49,50,5,4,0,0,50,52,5,31,0,0,51,49,
-        1,0,0,0,52,55,1,0,0,0,53,51,1,0,0,0,53,54,1,0,0,0,54,5,1,0,0,0,55,
-        53,1,0,0,0,56,61,5,5,0,0,57,60,3,8,4,0,58,60,3,6,3,0,59,57,1,0,0,
-        0,59,58,1,0,0,0,60,63,1,0,0,0,61,59,1,0,0,0,61,62,1,0,0,0,62,64,
-        1,0,0,0,63,61,1,0,0,0,64,65,5,6,0,0,65,7,1,0,0,0,66,70,3,10,5,0,
-        67,70,3,12,6,0,68,70,3,14,7,0,69,66,1,0,0,0,69,67,1,0,0,0,69,68,
-        1,0,0,0,70,9,1,0,0,0,71,72,5,31,0,0,72,75,5,7,0,0,73,76,3,16,8,0,
-        74,76,3,20,10,0,75,73,1,0,0,0,75,74,1,0,0,0,76,11,1,0,0,0,77,78,
-        5,8,0,0,78,79,5,2,0,0,79,80,3,20,10,0,80,81,5,3,0,0,81,84,3,6,3,
-        0,82,83,5,9,0,0,83,85,3,6,3,0,84,82,1,0,0,0,84,85,1,0,0,0,85,13,
-        1,0,0,0,86,89,5,10,0,0,87,90,3,16,8,0,88,90,3,20,10,0,89,87,1,0,
-        0,0,89,88,1,0,0,0,90,15,1,0,0,0,91,92,6,8,-1,0,92,93,7,0,0,0,93,
-        94,5,2,0,0,94,95,3,16,8,0,95,96,5,3,0,0,96,108,1,0,0,0,97,98,7,1,
-        0,0,98,108,3,16,8,9,99,108,5,20,0,0,100,108,5,32,0,0,101,108,7,2,
-        0,0,102,108,5,31,0,0,103,104,5,2,0,0,104,105,3,16,8,0,105,106,5,
-        3,0,0,106,108,1,0,0,0,107,91,1,0,0,0,107,97,1,0,0,0,107,99,1,0,0,
-        0,107,100,1,0,0,0,107,101,1,0,0,0,107,102,1,0,0,0,107,103,1,0,0,
-        0,108,129,1,0,0,0,109,110,10,10,0,0,110,111,5,13,0,0,111,128,3,16,
-        8,10,112,113,10,8,0,0,113,114,7,3,0,0,114,128,3,16,8,9,115,116,10,
-        7,0,0,116,117,7,1,0,0,117,128,3,16,8,8,118,119,10,6,0,0,119,120,
-        5,19,0,0,120,128,3,16,8,6,121,122,10,12,0,0,122,124,5,2,0,0,123,
-        125,3,18,9,0,124,123,1,0,0,0,124,125,1,0,0,0,125,126,1,0,0,0,126,
-        128,5,3,0,0,127,109,1,0,0,0,127,112,1,0,0,0,127,115,1,0,0,0,127,
-        118,1,0,0,0,127,121,1,0,0,0,128,131,1,0,0,0,129,127,1,0,0,0,129,
-        130,1,0,0,0,130,17,1,0,0,0,131,129,1,0,0,0,132,135,3,16,8,0,133,
-        135,3,20,10,0,134,132,1,0,0,0,134,133,1,0,0,0,135,143,1,0,0,0,136,
-        139,5,4,0,0,137,140,3,16,8,0,138,140,3,20,10,0,139,137,1,0,0,0,139,
-        138,1,0,0,0,140,142,1,0,0,0,141,136,1,0,0,0,142,145,1,0,0,0,143,
-        141,1,0,0,0,143,144,1,0,0,0,144,19,1,0,0,0,145,143,1,0,0,0,146,147,
-        3,22,11,0,147,21,1,0,0,0,148,153,3,24,12,0,149,150,5,23,0,0,150,
-        152,3,24,12,0,151,149,1,0,0,0,152,155,1,0,0,0,153,151,1,0,0,0,153,
-        154,1,0,0,0,154,23,1,0,0,0,155,153,1,0,0,0,156,161,3,26,13,0,157,
-        158,5,24,0,0,158,160,3,26,13,0,159,157,1,0,0,0,160,163,1,0,0,0,161,
-        159,1,0,0,0,161,162,1,0,0,0,162,25,1,0,0,0,163,161,1,0,0,0,164,165,
-        5,25,0,0,165,168,3,26,13,0,166,168,3,28,14,0,167,164,1,0,0,0,167,
-        166,1,0,0,0,168,27,1,0,0,0,169,170,3,16,8,0,170,171,3,30,15,0,171,
-        172,3,16,8,0,172,182,1,0,0,0,173,182,3,16,8,0,174,182,5,21,0,0,175,
-        182,5,22,0,0,176,182,5,31,0,0,177,178,5,2,0,0,178,179,3,20,10,0,
-        179,180,5,3,0,0,180,182,1,0,0,0,181,169,1,0,0,0,181,173,1,0,0,0,
-        181,174,1,0,0,0,181,175,1,0,0,0,181,176,1,0,0,0,181,177,1,0,0,0,
-        182,29,1,0,0,0,183,184,7,4,0,0,184,31,1,0,0,0,20,35,43,53,59,61,
-        69,75,84,89,107,124,127,129,134,139,143,153,161,167,181
+        8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,3,8,113,
+        8,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,
+        3,8,130,8,8,1,8,5,8,133,8,8,10,8,12,8,136,9,8,1,9,1,9,3,9,140,8,
+        9,1,9,1,9,1,9,3,9,145,8,9,5,9,147,8,9,10,9,12,9,150,9,9,1,10,1,10,
+        1,11,1,11,1,11,5,11,157,8,11,10,11,12,11,160,9,11,1,12,1,12,1,12,
+        5,12,165,8,12,10,12,12,12,168,9,12,1,13,1,13,1,13,3,13,173,8,13,
+        1,14,1,14,1,14,1,14,1,14,1,14,1,14,1,14,1,14,1,14,1,14,1,14,3,14,
+        187,8,14,1,15,1,15,1,15,0,1,16,16,0,2,4,6,8,10,12,14,16,18,20,22,
+        24,26,28,30,0,5,1,0,11,12,1,0,14,15,1,0,23,24,1,0,16,18,1,0,28,32,
+        209,0,33,1,0,0,0,2,39,1,0,0,0,4,48,1,0,0,0,6,56,1,0,0,0,8,69,1,0,
+        0,0,10,71,1,0,0,0,12,77,1,0,0,0,14,86,1,0,0,0,16,112,1,0,0,0,18,
+        139,1,0,0,0,20,151,1,0,0,0,22,153,1,0,0,0,24,161,1,0,0,0,26,172,
+        1,0,0,0,28,186,1,0,0,0,30,188,1,0,0,0,32,34,3,2,1,0,33,32,1,0,0,
+        0,34,35,1,0,0,0,35,33,1,0,0,0,35,36,1,0,0,0,36,37,1,0,0,0,37,38,
+        5,0,0,1,38,1,1,0,0,0,39,40,5,1,0,0,40,41,5,33,0,0,41,43,5,2,0,0,
+        42,44,3,4,2,0,43,42,1,0,0,0,43,44,1,0,0,0,44,45,1,0,0,0,45,46,5,
+        3,0,0,46,47,3,6,3,0,47,3,1,0,0,0,48,53,5,33,0,0,49,50,5,4,0,0,50,
+        52,5,33,0,0,51,49,1,0,0,0,52,55,1,0,0,0,53,51,1,0,0,0,53,54,1,0,
+        0,0,54,5,1,0,0,0,55,53,1,0,0,0,56,61,5,5,0,0,57,60,3,8,4,0,58,60,
+        3,6,3,0,59,57,1,0,0,0,59,58,1,0,0,0,60,63,1,0,0,0,61,59,1,0,0,0,
+        61,62,1,0,0,0,62,64,1,0,0,0,63,61,1,0,0,0,64,65,5,6,0,0,65,7,1,0,
+        0,0,66,70,3,10,5,0,67,70,3,12,6,0,68,70,3,14,7,0,69,66,1,0,0,0,69,
+        67,1,0,0,0,69,68,1,0,0,0,70,9,1,0,0,0,71,72,5,33,0,0,72,75,5,7,0,
+        0,73,76,3,16,8,0,74,76,3,20,10,0,75,73,1,0,0,0,75,74,1,0,0,0,76,
+        11,1,0,0,0,77,78,5,8,0,0,78,79,5,2,0,0,79,80,3,20,10,0,80,81,5,3,
+        0,0,81,84,3,6,3,0,82,83,5,9,0,0,83,85,3,6,3,0,84,82,1,0,0,0,84,85,
+        1,0,0,0,85,13,1,0,0,0,86,89,5,10,0,0,87,90,3,16,8,0,88,90,3,20,10,
+        0,89,87,1,0,0,0,89,88,1,0,0,0,90,15,1,0,0,0,91,92,6,8,-1,0,92,93,
+        7,0,0,0,93,94,5,2,0,0,94,95,3,16,8,0,95,96,5,3,0,0,96,113,1,0,0,
+        0,97,98,7,1,0,0,98,113,3,16,8,11,99,113,5,20,0,0,100,101,5,21,0,
+        0,101,102,3,18,9,0,102,103,5,22,0,0,103,113,1,0,0,0,104,113,5,35,
+        0,0,105,113,5,34,0,0,106,113,7,2,0,0,107,113,5,33,0,0,108,109,5,
+        2,0,0,109,110,3,16,8,0,110,111,5,3,0,0,111,113,1,0,0,0,112,91,1,
+        0,0,0,112,97,1,0,0,0,112,99,1,0,0,0,112,100,1,0,0,0,112,104,1,0,
+        0,0,112,105,1,0,0,0,112,106,1,0,0,0,112,107,1,0,0,0,112,108,1,0,
+        0,0,113,134,1,0,0,0,114,115,10,12,0,0,115,116,5,13,0,0,116,133,3,
+        16,8,12,117,118,10,10,0,0,118,119,7,3,0,0,119,133,3,16,8,11,120,
+        121,10,9,0,0,121,122,7,1,0,0,122,133,3,16,8,10,123,124,10,8,0,0,
+        124,125,5,19,0,0,125,133,3,16,8,8,126,127,10,14,0,0,127,129,5,2,
+        0,0,128,130,3,18,9,0,129,128,1,0,0,0,129,130,1,0,0,0,130,131,1,0,
+        0,0,131,133,5,3,0,0,132,114,1,0,0,0,132,117,1,0,0,0,132,120,1,0,
+        0,0,132,123,1,0,0,0,132,126,1,0,0,0,133,136,1,0,0,0,134,132,1,0,
+        0,0,134,135,1,0,0,0,135,17,1,0,0,0,136,134,1,0,0,0,137,140,3,16,
+        8,0,138,140,3,20,10,0,139,137,1,0,0,0,139,138,1,0,0,0,140,148,1,
+        0,0,0,141,144,5,4,0,0,142,145,3,16,8,0,143,145,3,20,10,0,144,142,
+        1,0,0,0,144,143,1,0,0,0,145,147,1,0,0,0,146,141,1,0,0,0,147,150,
+        1,0,0,0,148,146,1,0,0,0,148,149,1,0,0,0,149,19,1,0,0,0,150,148,1,
+        0,0,0,151,152,3,22,11,0,152,21,1,0,0,0,153,158,3,24,12,0,154,155,
+        5,25,0,0,155,157,3,24,12,0,156,154,1,0,0,0,157,160,1,0,0,0,158,156,
+        1,0,0,0,158,159,1,0,0,0,159,23,1,0,0,0,160,158,1,0,0,0,161,166,3,
+        26,13,0,162,163,5,26,0,0,163,165,3,26,13,0,164,162,1,0,0,0,165,168,
+        1,0,0,0,166,164,1,0,0,0,166,167,1,0,0,0,167,25,1,0,0,0,168,166,1,
+        0,0,0,169,170,5,27,0,0,170,173,3,26,13,0,171,173,3,28,14,0,172,169,
+        1,0,0,0,172,171,1,0,0,0,173,27,1,0,0,0,174,175,3,16,8,0,175,176,
+        3,30,15,0,176,177,3,16,8,0,177,187,1,0,0,0,178,187,3,16,8,0,179,
+        187,5,23,0,0,180,187,5,24,0,0,181,187,5,33,0,0,182,183,5,2,0,0,183,
+        184,3,20,10,0,184,185,5,3,0,0,185,187,1,0,0,0,186,174,1,0,0,0,186,
+        178,1,0,0,0,186,179,1,0,0,0,186,180,1,0,0,0,186,181,1,0,0,0,186,
+        182,1,0,0,0,187,29,1,0,0,0,188,189,7,4,0,0,189,31,1,0,0,0,20,35,
+        43,53,59,61,69,75,84,89,112,129,132,134,139,144,148,158,166,172,
+        186
     ]
 
 class SaltinoParser ( Parser ):
@@ -90,8 +93,8 @@ class SaltinoParser ( Parser ):
     literalNames = [ "<INVALID>", "'def'", "'('", "')'", "','", "'{'", "'}'", 
                      "'='", "'if'", "'else'", "'return'", "'head'", "'tail'", 
                      "'^'", "'+'", "'-'", "'*'", "'/'", "'%'", "'::'", "'[]'", 
-                     "'true'", "'false'", "'or'", "'and'", "'!'", "'<='", 
-                     "'<'", "'=='", "'>'", "'>='" ]
+                     "'['", "']'", "'true'", "'false'", "'or'", "'and'", 
+                     "'!'", "'<='", "'<'", "'=='", "'>'", "'>='" ]
 
     symbolicNames = [ "<INVALID>", "<INVALID>", "<INVALID>", "<INVALID>", 
                       "<INVALID>", "<INVALID>", "<INVALID>", "<INVALID>", 
@@ -100,8 +103,9 @@ class SaltinoParser ( Parser ):
                       "<INVALID>", "<INVALID>", "<INVALID>", "<INVALID>", 
                       "<INVALID>", "<INVALID>", "<INVALID>", "<INVALID>", 
                       "<INVALID>", "<INVALID>", "<INVALID>", "<INVALID>", 
-                      "<INVALID>", "<INVALID>", "<INVALID>", "ID", "INT", 
-                      "WS", "COMMENT", "BLOCK_COMMENT" ]
+                      "<INVALID>", "<INVALID>", "<INVALID>", "<INVALID>", 
+                      "<INVALID>", "ID", "INT", "TABELLA", "WS", "COMMENT", 
+                      "BLOCK_COMMENT" ]
 
     RULE_programma = 0
     RULE_funzione = 1
@@ -156,11 +160,14 @@ class SaltinoParser ( Parser ):
     T__27=28
     T__28=29
     T__29=30
-    ID=31
-    INT=32
-    WS=33
-    COMMENT=34
-    BLOCK_COMMENT=35
+    T__30=31
+    T__31=32
+    ID=33
+    INT=34
+    TABELLA=35
+    WS=36
+    COMMENT=37
+    BLOCK_COMMENT=38
 
     def __init__(self, input:TokenStream, output:TextIO = sys.stdout):
         super().__init__(input, output)
@@ -292,7 +299,7 @@ class SaltinoParser ( Parser ):
             self.state = 43
             self._errHandler.sync(self)
             _la = self._input.LA(1)
-            if _la==31:
+            if _la==33:
                 self.state = 42
                 self.parametri()
 
@@ -426,11 +433,11 @@ class SaltinoParser ( Parser ):
             self.state = 61
             self._errHandler.sync(self)
             _la = self._input.LA(1)
-            while (((_la) & ~0x3f) == 0 and ((1 << _la) & 2147484960) != 0):
+            while (((_la) & ~0x3f) == 0 and ((1 << _la) & 8589935904) != 0):
                 self.state = 59
                 self._errHandler.sync(self)
                 token = self._input.LA(1)
-                if token in [8, 10, 31]:
+                if token in [8, 10, 33]:
                     self.state = 57
                     self.istruzione()
                     pass
@@ -503,7 +510,7 @@ class SaltinoParser ( Parser ):
             self.state = 69
             self._errHandler.sync(self)
             token = self._input.LA(1)
-            if token in [31]:
+            if token in [33]:
                 self.enterOuterAlt(localctx, 1)
                 self.state = 66
                 self.assegnamento()
@@ -757,7 +764,31 @@ class SaltinoParser ( Parser ):
             super().copyFrom(ctx)
 
 
-    class UnarioContext(EspressioneContext):
+    class InteroContext(EspressioneContext):
+
+        def __init__(self, parser, ctx:ParserRuleContext): # actually a SaltinoParser.EspressioneContext
+            super().__init__(parser)
+            self.copyFrom(ctx)
+
+        def INT(self):
+            return self.getToken(SaltinoParser.INT, 0)
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterIntero" ):
+                listener.enterIntero(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitIntero" ):
+                listener.exitIntero(self)
+
+        def accept(self, visitor:ParseTreeVisitor):
+            if hasattr( visitor, "visitIntero" ):
+                return visitor.visitIntero(self)
+            else:
+                return visitor.visitChildren(self)
+
+
+    class ChiamataFunzioneContext(EspressioneContext):
 
         def __init__(self, parser, ctx:ParserRuleContext): # actually a SaltinoParser.EspressioneContext
             super().__init__(parser)
@@ -766,47 +797,51 @@ class SaltinoParser ( Parser ):
         def espressione(self):
             return self.getTypedRuleContext(SaltinoParser.EspressioneContext,0)
 
+        def argomenti(self):
+            return self.getTypedRuleContext(SaltinoParser.ArgomentiContext,0)
+
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterUnario" ):
-                listener.enterUnario(self)
+            if hasattr( listener, "enterChiamataFunzione" ):
+                listener.enterChiamataFunzione(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitUnario" ):
-                listener.exitUnario(self)
+            if hasattr( listener, "exitChiamataFunzione" ):
+                listener.exitChiamataFunzione(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitUnario" ):
-                return visitor.visitUnario(self)
+            if hasattr( visitor, "visitChiamataFunzione" ):
+                return visitor.visitChiamataFunzione(self)
             else:
                 return visitor.visitChildren(self)
 
 
-    class InteroContext(EspressioneContext):
+    class ParantesiContext(EspressioneContext):
 
         def __init__(self, parser, ctx:ParserRuleContext): # actually a SaltinoParser.EspressioneContext
             super().__init__(parser)
             self.copyFrom(ctx)
 
-        def INT(self):
-            return self.getToken(SaltinoParser.INT, 0)
+        def espressione(self):
+            return self.getTypedRuleContext(SaltinoParser.EspressioneContext,0)
+
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterIntero" ):
-                listener.enterIntero(self)
+            if hasattr( listener, "enterParantesi" ):
+                listener.enterParantesi(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitIntero" ):
-                listener.exitIntero(self)
+            if hasattr( listener, "exitParantesi" ):
+                listener.exitParantesi(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitIntero" ):
-                return visitor.visitIntero(self)
+            if hasattr( visitor, "visitParantesi" ):
+                return visitor.visitParantesi(self)
             else:
                 return visitor.visitChildren(self)
 
 
-    class PotenzaContext(EspressioneContext):
+    class AddizioneContext(EspressioneContext):
 
         def __init__(self, parser, ctx:ParserRuleContext): # actually a SaltinoParser.EspressioneContext
             super().__init__(parser)
@@ -820,21 +855,21 @@ class SaltinoParser ( Parser ):
 
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterPotenza" ):
-                listener.enterPotenza(self)
+            if hasattr( listener, "enterAddizione" ):
+                listener.enterAddizione(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitPotenza" ):
-                listener.exitPotenza(self)
+            if hasattr( listener, "exitAddizione" ):
+                listener.exitAddizione(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitPotenza" ):
-                return visitor.visitPotenza(self)
+            if hasattr( visitor, "visitAddizione" ):
+                return visitor.visitAddizione(self)
             else:
                 return visitor.visitChildren(self)
 
 
-    class ChiamataFunzioneContext(EspressioneContext):
+    class HeadTailContext(EspressioneContext):
 
         def __init__(self, parser, ctx:ParserRuleContext): # actually a SaltinoParser.EspressioneContext
             super().__init__(parser)
@@ -843,75 +878,73 @@ class SaltinoParser ( Parser ):
         def espressione(self):
             return self.getTypedRuleContext(SaltinoParser.EspressioneContext,0)
 
-        def argomenti(self):
-            return self.getTypedRuleContext(SaltinoParser.ArgomentiContext,0)
-
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterChiamataFunzione" ):
-                listener.enterChiamataFunzione(self)
+            if hasattr( listener, "enterHeadTail" ):
+                listener.enterHeadTail(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitChiamataFunzione" ):
-                listener.exitChiamataFunzione(self)
+            if hasattr( listener, "exitHeadTail" ):
+                listener.exitHeadTail(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitChiamataFunzione" ):
-                return visitor.visitChiamataFunzione(self)
+            if hasattr( visitor, "visitHeadTail" ):
+                return visitor.visitHeadTail(self)
             else:
                 return visitor.visitChildren(self)
 
 
-    class IdentificatoreContext(EspressioneContext):
+    class UnarioContext(EspressioneContext):
 
         def __init__(self, parser, ctx:ParserRuleContext): # actually a SaltinoParser.EspressioneContext
             super().__init__(parser)
             self.copyFrom(ctx)
 
-        def ID(self):
-            return self.getToken(SaltinoParser.ID, 0)
+        def espressione(self):
+            return self.getTypedRuleContext(SaltinoParser.EspressioneContext,0)
+
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterIdentificatore" ):
-                listener.enterIdentificatore(self)
+            if hasattr( listener, "enterUnario" ):
+                listener.enterUnario(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitIdentificatore" ):
-                listener.exitIdentificatore(self)
+            if hasattr( listener, "exitUnario" ):
+                listener.exitUnario(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitIdentificatore" ):
-                return visitor.visitIdentificatore(self)
+            if hasattr( visitor, "visitUnario" ):
+                return visitor.visitUnario(self)
             else:
                 return visitor.visitChildren(self)
 
 
-    class ParantesiContext(EspressioneContext):
+    class ListaLetteraleContext(EspressioneContext):
 
         def __init__(self, parser, ctx:ParserRuleContext): # actually a SaltinoParser.EspressioneContext
             super().__init__(parser)
             self.copyFrom(ctx)
 
-        def espressione(self):
-            return self.getTypedRuleContext(SaltinoParser.EspressioneContext,0)
+        def argomenti(self):
+            return self.getTypedRuleContext(SaltinoParser.ArgomentiContext,0)
 
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterParantesi" ):
-                listener.enterParantesi(self)
+            if hasattr( listener, "enterListaLetterale" ):
+                listener.enterListaLetterale(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitParantesi" ):
-                listener.exitParantesi(self)
+            if hasattr( listener, "exitListaLetterale" ):
+                listener.exitListaLetterale(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitParantesi" ):
-                return visitor.visitParantesi(self)
+            if hasattr( visitor, "visitListaLetterale" ):
+                return visitor.visitListaLetterale(self)
             else:
                 return visitor.visitChildren(self)
 
 
-    class MoltiplicazioneContext(EspressioneContext):
+    class PotenzaContext(EspressioneContext):
 
         def __init__(self, parser, ctx:ParserRuleContext): # actually a SaltinoParser.EspressioneContext
             super().__init__(parser)
@@ -925,21 +958,45 @@ class SaltinoParser ( Parser ):
 
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterMoltiplicazione" ):
-                listener.enterMoltiplicazione(self)
+            if hasattr( listener, "enterPotenza" ):
+                listener.enterPotenza(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitMoltiplicazione" ):
-                listener.exitMoltiplicazione(self)
+            if hasattr( listener, "exitPotenza" ):
+                listener.exitPotenza(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitMoltiplicazione" ):
-                return visitor.visitMoltiplicazione(self)
+            if hasattr( visitor, "visitPotenza" ):
+                return visitor.visitPotenza(self)
             else:
                 return visitor.visitChildren(self)
 
 
-    class AddizioneContext(EspressioneContext):
+    class IdentificatoreContext(EspressioneContext):
+
+        def __init__(self, parser, ctx:ParserRuleContext): # actually a SaltinoParser.EspressioneContext
+            super().__init__(parser)
+            self.copyFrom(ctx)
+
+        def ID(self):
+            return self.getToken(SaltinoParser.ID, 0)
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterIdentificatore" ):
+                listener.enterIdentificatore(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitIdentificatore" ):
+                listener.exitIdentificatore(self)
+
+        def accept(self, visitor:ParseTreeVisitor):
+            if hasattr( visitor, "visitIdentificatore" ):
+                return visitor.visitIdentificatore(self)
+            else:
+                return visitor.visitChildren(self)
+
+
+    class MoltiplicazioneContext(EspressioneContext):
 
         def __init__(self, parser, ctx:ParserRuleContext): # actually a SaltinoParser.EspressioneContext
             super().__init__(parser)
@@ -953,16 +1010,16 @@ class SaltinoParser ( Parser ):
 
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterAddizione" ):
-                listener.enterAddizione(self)
+            if hasattr( listener, "enterMoltiplicazione" ):
+                listener.enterMoltiplicazione(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitAddizione" ):
-                listener.exitAddizione(self)
+            if hasattr( listener, "exitMoltiplicazione" ):
+                listener.exitMoltiplicazione(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitAddizione" ):
-                return visitor.visitAddizione(self)
+            if hasattr( visitor, "visitMoltiplicazione" ):
+                return visitor.visitMoltiplicazione(self)
             else:
                 return visitor.visitChildren(self)
 
@@ -989,27 +1046,26 @@ class SaltinoParser ( Parser ):
                 return visitor.visitChildren(self)
 
 
-    class HeadTailContext(EspressioneContext):
+    class TabellaContext(EspressioneContext):
 
         def __init__(self, parser, ctx:ParserRuleContext): # actually a SaltinoParser.EspressioneContext
             super().__init__(parser)
             self.copyFrom(ctx)
 
-        def espressione(self):
-            return self.getTypedRuleContext(SaltinoParser.EspressioneContext,0)
-
+        def TABELLA(self):
+            return self.getToken(SaltinoParser.TABELLA, 0)
 
         def enterRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "enterHeadTail" ):
-                listener.enterHeadTail(self)
+            if hasattr( listener, "enterTabella" ):
+                listener.enterTabella(self)
 
         def exitRule(self, listener:ParseTreeListener):
-            if hasattr( listener, "exitHeadTail" ):
-                listener.exitHeadTail(self)
+            if hasattr( listener, "exitTabella" ):
+                listener.exitTabella(self)
 
         def accept(self, visitor:ParseTreeVisitor):
-            if hasattr( visitor, "visitHeadTail" ):
-                return visitor.visitHeadTail(self)
+            if hasattr( visitor, "visitTabella" ):
+                return visitor.visitTabella(self)
             else:
                 return visitor.visitChildren(self)
 
@@ -1075,7 +1131,7 @@ class SaltinoParser ( Parser ):
         self._la = 0 # Token type
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 107
+            self.state = 112
             self._errHandler.sync(self)
             token = self._input.LA(1)
             if token in [11, 12]:
@@ -1109,7 +1165,7 @@ class SaltinoParser ( Parser ):
                     self._errHandler.reportMatch(self)
                     self.consume()
                 self.state = 98
-                self.espressione(9)
+                self.espressione(11)
                 pass
             elif token in [20]:
                 localctx = SaltinoParser.ListaVuotaContext(self, localctx)
@@ -1118,48 +1174,66 @@ class SaltinoParser ( Parser ):
                 self.state = 99
                 self.match(SaltinoParser.T__19)
                 pass
-            elif token in [32]:
-                localctx = SaltinoParser.InteroContext(self, localctx)
+            elif token in [21]:
+                localctx = SaltinoParser.ListaLetteraleContext(self, localctx)
                 self._ctx = localctx
                 _prevctx = localctx
                 self.state = 100
+                self.match(SaltinoParser.T__20)
+                self.state = 101
+                self.argomenti()
+                self.state = 102
+                self.match(SaltinoParser.T__21)
+                pass
+            elif token in [35]:
+                localctx = SaltinoParser.TabellaContext(self, localctx)
+                self._ctx = localctx
+                _prevctx = localctx
+                self.state = 104
+                self.match(SaltinoParser.TABELLA)
+                pass
+            elif token in [34]:
+                localctx = SaltinoParser.InteroContext(self, localctx)
+                self._ctx = localctx
+                _prevctx = localctx
+                self.state = 105
                 self.match(SaltinoParser.INT)
                 pass
-            elif token in [21, 22]:
+            elif token in [23, 24]:
                 localctx = SaltinoParser.BooleanoLiteraleContext(self, localctx)
                 self._ctx = localctx
                 _prevctx = localctx
-                self.state = 101
+                self.state = 106
                 _la = self._input.LA(1)
-                if not(_la==21 or _la==22):
+                if not(_la==23 or _la==24):
                     self._errHandler.recoverInline(self)
                 else:
                     self._errHandler.reportMatch(self)
                     self.consume()
                 pass
-            elif token in [31]:
+            elif token in [33]:
                 localctx = SaltinoParser.IdentificatoreContext(self, localctx)
                 self._ctx = localctx
                 _prevctx = localctx
-                self.state = 102
+                self.state = 107
                 self.match(SaltinoParser.ID)
                 pass
             elif token in [2]:
                 localctx = SaltinoParser.ParantesiContext(self, localctx)
                 self._ctx = localctx
                 _prevctx = localctx
-                self.state = 103
+                self.state = 108
                 self.match(SaltinoParser.T__1)
-                self.state = 104
+                self.state = 109
                 self.espressione(0)
-                self.state = 105
+                self.state = 110
                 self.match(SaltinoParser.T__2)
                 pass
             else:
                 raise NoViableAltException(self)
 
             self._ctx.stop = self._input.LT(-1)
-            self.state = 129
+            self.state = 134
             self._errHandler.sync(self)
             _alt = self._interp.adaptivePredict(self._input,12,self._ctx)
             while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
@@ -1167,94 +1241,94 @@ class SaltinoParser ( Parser ):
                     if self._parseListeners is not None:
                         self.triggerExitRuleEvent()
                     _prevctx = localctx
-                    self.state = 127
+                    self.state = 132
                     self._errHandler.sync(self)
                     la_ = self._interp.adaptivePredict(self._input,11,self._ctx)
                     if la_ == 1:
                         localctx = SaltinoParser.PotenzaContext(self, SaltinoParser.EspressioneContext(self, _parentctx, _parentState))
                         self.pushNewRecursionContext(localctx, _startState, self.RULE_espressione)
-                        self.state = 109
-                        if not self.precpred(self._ctx, 10):
+                        self.state = 114
+                        if not self.precpred(self._ctx, 12):
                             from antlr4.error.Errors import FailedPredicateException
-                            raise FailedPredicateException(self, "self.precpred(self._ctx, 10)")
-                        self.state = 110
+                            raise FailedPredicateException(self, "self.precpred(self._ctx, 12)")
+                        self.state = 115
                         self.match(SaltinoParser.T__12)
-                        self.state = 111
-                        self.espressione(10)
+                        self.state = 116
+                        self.espressione(12)
                         pass
 
                     elif la_ == 2:
                         localctx = SaltinoParser.MoltiplicazioneContext(self, SaltinoParser.EspressioneContext(self, _parentctx, _parentState))
                         self.pushNewRecursionContext(localctx, _startState, self.RULE_espressione)
-                        self.state = 112
-                        if not self.precpred(self._ctx, 8):
+                        self.state = 117
+                        if not self.precpred(self._ctx, 10):
                             from antlr4.error.Errors import FailedPredicateException
-                            raise FailedPredicateException(self, "self.precpred(self._ctx, 8)")
-                        self.state = 113
+                            raise FailedPredicateException(self, "self.precpred(self._ctx, 10)")
+                        self.state = 118
                         _la = self._input.LA(1)
                         if not((((_la) & ~0x3f) == 0 and ((1 << _la) & 458752) != 0)):
                             self._errHandler.recoverInline(self)
                         else:
                             self._errHandler.reportMatch(self)
                             self.consume()
-                        self.state = 114
-                        self.espressione(9)
+                        self.state = 119
+                        self.espressione(11)
                         pass
 
                     elif la_ == 3:
                         localctx = SaltinoParser.AddizioneContext(self, SaltinoParser.EspressioneContext(self, _parentctx, _parentState))
                         self.pushNewRecursionContext(localctx, _startState, self.RULE_espressione)
-                        self.state = 115
-                        if not self.precpred(self._ctx, 7):
+                        self.state = 120
+                        if not self.precpred(self._ctx, 9):
                             from antlr4.error.Errors import FailedPredicateException
-                            raise FailedPredicateException(self, "self.precpred(self._ctx, 7)")
-                        self.state = 116
+                            raise FailedPredicateException(self, "self.precpred(self._ctx, 9)")
+                        self.state = 121
                         _la = self._input.LA(1)
                         if not(_la==14 or _la==15):
                             self._errHandler.recoverInline(self)
                         else:
                             self._errHandler.reportMatch(self)
                             self.consume()
-                        self.state = 117
-                        self.espressione(8)
+                        self.state = 122
+                        self.espressione(10)
                         pass
 
                     elif la_ == 4:
                         localctx = SaltinoParser.ConsContext(self, SaltinoParser.EspressioneContext(self, _parentctx, _parentState))
                         self.pushNewRecursionContext(localctx, _startState, self.RULE_espressione)
-                        self.state = 118
-                        if not self.precpred(self._ctx, 6):
+                        self.state = 123
+                        if not self.precpred(self._ctx, 8):
                             from antlr4.error.Errors import FailedPredicateException
-                            raise FailedPredicateException(self, "self.precpred(self._ctx, 6)")
-                        self.state = 119
+                            raise FailedPredicateException(self, "self.precpred(self._ctx, 8)")
+                        self.state = 124
                         self.match(SaltinoParser.T__18)
-                        self.state = 120
-                        self.espressione(6)
+                        self.state = 125
+                        self.espressione(8)
                         pass
 
                     elif la_ == 5:
                         localctx = SaltinoParser.ChiamataFunzioneContext(self, SaltinoParser.EspressioneContext(self, _parentctx, _parentState))
                         self.pushNewRecursionContext(localctx, _startState, self.RULE_espressione)
-                        self.state = 121
-                        if not self.precpred(self._ctx, 12):
+                        self.state = 126
+                        if not self.precpred(self._ctx, 14):
                             from antlr4.error.Errors import FailedPredicateException
-                            raise FailedPredicateException(self, "self.precpred(self._ctx, 12)")
-                        self.state = 122
+                            raise FailedPredicateException(self, "self.precpred(self._ctx, 14)")
+                        self.state = 127
                         self.match(SaltinoParser.T__1)
-                        self.state = 124
+                        self.state = 129
                         self._errHandler.sync(self)
                         _la = self._input.LA(1)
-                        if (((_la) & ~0x3f) == 0 and ((1 << _la) & 6483400708) != 0):
-                            self.state = 123
+                        if (((_la) & ~0x3f) == 0 and ((1 << _la) & 60292126724) != 0):
+                            self.state = 128
                             self.argomenti()
 
 
-                        self.state = 126
+                        self.state = 131
                         self.match(SaltinoParser.T__2)
                         pass
 
              
-                self.state = 131
+                self.state = 136
                 self._errHandler.sync(self)
                 _alt = self._interp.adaptivePredict(self._input,12,self._ctx)
 
@@ -1315,41 +1389,41 @@ class SaltinoParser ( Parser ):
         self._la = 0 # Token type
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 134
+            self.state = 139
             self._errHandler.sync(self)
             la_ = self._interp.adaptivePredict(self._input,13,self._ctx)
             if la_ == 1:
-                self.state = 132
+                self.state = 137
                 self.espressione(0)
                 pass
 
             elif la_ == 2:
-                self.state = 133
+                self.state = 138
                 self.condizione()
                 pass
 
 
-            self.state = 143
+            self.state = 148
             self._errHandler.sync(self)
             _la = self._input.LA(1)
             while _la==4:
-                self.state = 136
+                self.state = 141
                 self.match(SaltinoParser.T__3)
-                self.state = 139
+                self.state = 144
                 self._errHandler.sync(self)
                 la_ = self._interp.adaptivePredict(self._input,14,self._ctx)
                 if la_ == 1:
-                    self.state = 137
+                    self.state = 142
                     self.espressione(0)
                     pass
 
                 elif la_ == 2:
-                    self.state = 138
+                    self.state = 143
                     self.condizione()
                     pass
 
 
-                self.state = 145
+                self.state = 150
                 self._errHandler.sync(self)
                 _la = self._input.LA(1)
 
@@ -1399,7 +1473,7 @@ class SaltinoParser ( Parser ):
         self.enterRule(localctx, 20, self.RULE_condizione)
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 146
+            self.state = 151
             self.condOr()
         except RecognitionException as re:
             localctx.exception = re
@@ -1451,17 +1525,17 @@ class SaltinoParser ( Parser ):
         self._la = 0 # Token type
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 148
-            self.condAnd()
             self.state = 153
+            self.condAnd()
+            self.state = 158
             self._errHandler.sync(self)
             _la = self._input.LA(1)
-            while _la==23:
-                self.state = 149
-                self.match(SaltinoParser.T__22)
-                self.state = 150
-                self.condAnd()
+            while _la==25:
+                self.state = 154
+                self.match(SaltinoParser.T__24)
                 self.state = 155
+                self.condAnd()
+                self.state = 160
                 self._errHandler.sync(self)
                 _la = self._input.LA(1)
 
@@ -1515,17 +1589,17 @@ class SaltinoParser ( Parser ):
         self._la = 0 # Token type
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 156
-            self.condNot()
             self.state = 161
+            self.condNot()
+            self.state = 166
             self._errHandler.sync(self)
             _la = self._input.LA(1)
-            while _la==24:
-                self.state = 157
-                self.match(SaltinoParser.T__23)
-                self.state = 158
-                self.condNot()
+            while _la==26:
+                self.state = 162
+                self.match(SaltinoParser.T__25)
                 self.state = 163
+                self.condNot()
+                self.state = 168
                 self._errHandler.sync(self)
                 _la = self._input.LA(1)
 
@@ -1578,19 +1652,19 @@ class SaltinoParser ( Parser ):
         localctx = SaltinoParser.CondNotContext(self, self._ctx, self.state)
         self.enterRule(localctx, 26, self.RULE_condNot)
         try:
-            self.state = 167
+            self.state = 172
             self._errHandler.sync(self)
             token = self._input.LA(1)
-            if token in [25]:
+            if token in [27]:
                 self.enterOuterAlt(localctx, 1)
-                self.state = 164
-                self.match(SaltinoParser.T__24)
-                self.state = 165
+                self.state = 169
+                self.match(SaltinoParser.T__26)
+                self.state = 170
                 self.condNot()
                 pass
-            elif token in [2, 11, 12, 14, 15, 20, 21, 22, 31, 32]:
+            elif token in [2, 11, 12, 14, 15, 20, 21, 23, 24, 33, 34, 35]:
                 self.enterOuterAlt(localctx, 2)
-                self.state = 166
+                self.state = 171
                 self.condAtom()
                 pass
             else:
@@ -1655,50 +1729,50 @@ class SaltinoParser ( Parser ):
         localctx = SaltinoParser.CondAtomContext(self, self._ctx, self.state)
         self.enterRule(localctx, 28, self.RULE_condAtom)
         try:
-            self.state = 181
+            self.state = 186
             self._errHandler.sync(self)
             la_ = self._interp.adaptivePredict(self._input,19,self._ctx)
             if la_ == 1:
                 self.enterOuterAlt(localctx, 1)
-                self.state = 169
+                self.state = 174
                 self.espressione(0)
-                self.state = 170
+                self.state = 175
                 self.relop()
-                self.state = 171
+                self.state = 176
                 self.espressione(0)
                 pass
 
             elif la_ == 2:
                 self.enterOuterAlt(localctx, 2)
-                self.state = 173
+                self.state = 178
                 self.espressione(0)
                 pass
 
             elif la_ == 3:
                 self.enterOuterAlt(localctx, 3)
-                self.state = 174
-                self.match(SaltinoParser.T__20)
+                self.state = 179
+                self.match(SaltinoParser.T__22)
                 pass
 
             elif la_ == 4:
                 self.enterOuterAlt(localctx, 4)
-                self.state = 175
-                self.match(SaltinoParser.T__21)
+                self.state = 180
+                self.match(SaltinoParser.T__23)
                 pass
 
             elif la_ == 5:
                 self.enterOuterAlt(localctx, 5)
-                self.state = 176
+                self.state = 181
                 self.match(SaltinoParser.ID)
                 pass
 
             elif la_ == 6:
                 self.enterOuterAlt(localctx, 6)
-                self.state = 177
+                self.state = 182
                 self.match(SaltinoParser.T__1)
-                self.state = 178
+                self.state = 183
                 self.condizione()
-                self.state = 179
+                self.state = 184
                 self.match(SaltinoParser.T__2)
                 pass
 
@@ -1747,9 +1821,9 @@ class SaltinoParser ( Parser ):
         self._la = 0 # Token type
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 183
+            self.state = 188
             _la = self._input.LA(1)
-            if not((((_la) & ~0x3f) == 0 and ((1 << _la) & 2080374784) != 0)):
+            if not((((_la) & ~0x3f) == 0 and ((1 << _la) & 8321499136) != 0)):
                 self._errHandler.recoverInline(self)
             else:
                 self._errHandler.reportMatch(self)
@@ -1776,23 +1850,23 @@ class SaltinoParser ( Parser ):
 
     def espressione_sempred(self, localctx:EspressioneContext, predIndex:int):
             if predIndex == 0:
-                return self.precpred(self._ctx, 10)
+                return self.precpred(self._ctx, 12)
          
 
             if predIndex == 1:
-                return self.precpred(self._ctx, 8)
+                return self.precpred(self._ctx, 10)
          
 
             if predIndex == 2:
-                return self.precpred(self._ctx, 7)
+                return self.precpred(self._ctx, 9)
          
 
             if predIndex == 3:
-                return self.precpred(self._ctx, 6)
+                return self.precpred(self._ctx, 8)
          
 
             if predIndex == 4:
-                return self.precpred(self._ctx, 12)
+                return self.precpred(self._ctx, 14)
          
 
 
@@ -49,43 +49,53 @@ class SaltinoVisitor(ParseTreeVisitor):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by SaltinoParser#unario.
-    def visitUnario(self, ctx:SaltinoParser.UnarioContext):
+    # Visit a parse tree produced by SaltinoParser#intero.
+    def visitIntero(self, ctx:SaltinoParser.InteroContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by SaltinoParser#intero.
-    def visitIntero(self, ctx:SaltinoParser.InteroContext):
+    # Visit a parse tree produced by SaltinoParser#chiamataFunzione.
+    def visitChiamataFunzione(self, ctx:SaltinoParser.ChiamataFunzioneContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by SaltinoParser#potenza.
-    def visitPotenza(self, ctx:SaltinoParser.PotenzaContext):
+    # Visit a parse tree produced by SaltinoParser#parantesi.
+    def visitParantesi(self, ctx:SaltinoParser.ParantesiContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by SaltinoParser#chiamataFunzione.
-    def visitChiamataFunzione(self, ctx:SaltinoParser.ChiamataFunzioneContext):
+    # Visit a parse tree produced by SaltinoParser#addizione.
+    def visitAddizione(self, ctx:SaltinoParser.AddizioneContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by SaltinoParser#identificatore.
-    def visitIdentificatore(self, ctx:SaltinoParser.IdentificatoreContext):
+    # Visit a parse tree produced by SaltinoParser#headTail.
+    def visitHeadTail(self, ctx:SaltinoParser.HeadTailContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by SaltinoParser#parantesi.
-    def visitParantesi(self, ctx:SaltinoParser.ParantesiContext):
+    # Visit a parse tree produced by SaltinoParser#unario.
+    def visitUnario(self, ctx:SaltinoParser.UnarioContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by SaltinoParser#moltiplicazione.
-    def visitMoltiplicazione(self, ctx:SaltinoParser.MoltiplicazioneContext):
+    # Visit a parse tree produced by SaltinoParser#listaLetterale.
+    def visitListaLetterale(self, ctx:SaltinoParser.ListaLetteraleContext):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by SaltinoParser#addizione.
-    def visitAddizione(self, ctx:SaltinoParser.AddizioneContext):
+    # Visit a parse tree produced by SaltinoParser#potenza.
+    def visitPotenza(self, ctx:SaltinoParser.PotenzaContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by SaltinoParser#identificatore.
+    def visitIdentificatore(self, ctx:SaltinoParser.IdentificatoreContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by SaltinoParser#moltiplicazione.
+    def visitMoltiplicazione(self, ctx:SaltinoParser.MoltiplicazioneContext):
         return self.visitChildren(ctx)
 
 
@@ -94,8 +104,8 @@ class SaltinoVisitor(ParseTreeVisitor):
         return self.visitChildren(ctx)
 
 
-    # Visit a parse tree produced by SaltinoParser#headTail.
-    def visitHeadTail(self, ctx:SaltinoParser.HeadTailContext):
+    # Visit a parse tree produced by SaltinoParser#tabella.
+    def visitTabella(self, ctx:SaltinoParser.TabellaContext):
         return self.visitChildren(ctx)
 
 
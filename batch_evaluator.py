@@ -0,0 +1,421 @@
+"""
+Valutazione vettoriale di una funzione Saltino su molti vettori di argomenti.
+
+Il BatchEvaluator esegue l'AST già analizzato una sola volta per l'intero
+batch, con array NumPy int64 (o booleani) al posto dei valori scalari: ogni
+riga del batch è una "lane". Gli if valutano la condizione su tutte le lane
+attive ed eseguono entrambi i rami, ciascuno sulle lane che lo prendono; le
+chiamate, anche ricorsive, proseguono solo con le lane che le raggiungono,
+finché tutte hanno restituito un valore. Una chiamata in coda alla funzione
+stessa (come nei loop degli helper del TailCallTransformer) non annida
+un'altra chiamata: le lane che la raggiungono rieseguono il corpo con i
+nuovi argomenti, in un ciclo che termina quando nessuna lane continua.
+
+Le lane che incontrano qualcosa che non si può rappresentare in int64
+(liste, valori funzione, interi oltre 64 bit) o che sollevano un errore
+vengono scartate dal calcolo vettoriale e rieseguite con l'interprete
+scalare, che produce esattamente il risultato o l'errore consueti. Lo stesso
+vale per le lane che superano max_depth chiamate annidate (le chiamate in
+coda alla funzione stessa non contano).
+
+NumPy è una dipendenza opzionale, richiesta solo da questo modulo.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from AST.ASTNodes import *
+from AST.ASTsymbol_table import SymbolKind
+from AST.type_inference import value_has_type
+from errors.runtime_errors import SaltinoRuntimeError
+from execution_environment import Environment
+from execution_handlers import is_condition_node
+from int64_operators import ARITHMETIC, COMPARISONS, INT64_MAX, INT64_MIN
+from interpreter import IterativeSaltinoInterpreter
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None
+
+# Profondità massima delle chiamate annidate valutate in modo vettoriale
+DEFAULT_MAX_DEPTH = 64
+
+# Tipi dei valori vettoriali: interi int64 o booleani
+INT = 'int'
+BOOL = 'bool'
+
+
+@dataclass
+class BatchResult:
+    """
+    Risultati di una valutazione a batch, nell'ordine delle righe.
+
+    values contiene None per le righe terminate con un errore, che si trova
+    in errors alla stessa posizione; fallback_rows conta le righe eseguite
+    dall'interprete scalare.
+    """
+    values: List[Any]
+    errors: Dict[int, SaltinoRuntimeError] = field(default_factory=dict)
+    fallback_rows: int = 0
+
+
+class _Frame:
+    """
+    Stato di un'esecuzione vettoriale del corpo di una funzione: lane,
+    variabili, valori restituiti e argomenti delle chiamate in coda.
+    """
+
+    def __init__(self, lanes, function: Function):
+        self.lanes = lanes                      # righe del batch di ogni posizione
+        self.function = function
+        self.variables: Dict[str, list] = {}    # nome univoco -> [tipo, valori, assegnata]
+        self.returned = np.zeros(len(lanes), dtype=bool)
+        self.result = np.zeros(len(lanes), dtype=np.int64)
+        self.result_kind: Optional[str] = None
+        # Lane che hanno eseguito return function(...) e i loro nuovi
+        # argomenti: [tipo, valori] per parametro
+        self.continuing = np.zeros(len(lanes), dtype=bool)
+        self.next_arguments: List[Optional[list]] = [None] * len(function.parameters)
+
+
+class BatchEvaluator:
+    """Valuta una funzione di un AnalyzedProgram su un batch di argomenti."""
+
+    def __init__(self, analyzed_program, max_depth: int = DEFAULT_MAX_DEPTH):
+        if np is None:
+            raise SaltinoRuntimeError(
+                "Batch evaluation requires NumPy (pip install numpy)")
+        self.program = analyzed_program.program
+        self.semantic_analyzer = analyzed_program.semantic_analyzer
+        self.max_depth = max_depth
+        self.functions = {function.name: function for function in self.program.functions}
+        # Interprete scalare per le lane scartate
+        self.interpreter = IterativeSaltinoInterpreter(
+            semantic_analyzer=self.semantic_analyzer)
+        self.interpreter.define_functions(self.program)
+        self._names = Environment()
+        self._failed = None
+
+    # ==================== PUNTO DI INGRESSO ====================
+
+    def evaluate(self, function_name: str, rows: Sequence[Sequence[Any]]) -> BatchResult:
+        """
+        Valuta function_name su ogni riga di argomenti.
+
+        rows può essere una sequenza di sequenze di valori Saltino o un
+        array NumPy bidimensionale di interi (una riga per chiamata).
+        """
+        function = self.functions.get(function_name)
+        if function is None:
+            raise SaltinoRuntimeError(f"Undefined function: {function_name}")
+
+        count = len(rows)
+        self._failed = np.zeros(count, dtype=bool)
+        arguments = self._columns(function, rows, count)
+
+        lanes = np.arange(count)
+        if arguments is not None:
+            kind, result = self._call(function, arguments, lanes, 0)
+        else:
+            self._failed[:] = True
+            kind, result = INT, np.zeros(count, dtype=np.int64)
+
+        values = result.astype(bool).tolist() if kind == BOOL else result.tolist()
+        errors = {}
+        fallback = np.flatnonzero(self._failed).tolist()
+        for row in fallback:
+            try:
+                values[row] = self.interpreter.call_function(function, list(rows[row]))
+            except SaltinoRuntimeError as e:
+                values[row] = None
+                errors[row] = e
+            finally:
+                self.interpreter.execution_stack.clear()
+        return BatchResult(values, errors, len(fallback))
+
+    def _columns(self, function: Function, rows, count: int) -> Optional[List[Tuple[str, Any]]]:
+        """Converte le righe in una colonna vettoriale per parametro."""
+        arity = len(function.parameters)
+        if isinstance(rows, np.ndarray) and rows.ndim == 2 and rows.dtype.kind == 'i':
+            if rows.shape[1] != arity:
+                return None
+            return [(INT, rows[:, i].astype(np.int64)) for i in range(arity)]
+
+        param_types = self.semantic_analyzer.get_node_info(function, 'param_types')
+        columns = []
+        for i in range(arity):
+            values = [row[i] if len(row) == arity else None for row in rows]
+            is_int = np.fromiter((type(value) is int and INT64_MIN <= value <= INT64_MAX
+                                  for value in values), dtype=bool, count=count)
+            if is_int.any():
+                kind, valid = INT, is_int
+                column = np.fromiter((value if ok else 0 for value, ok in zip(values, is_int)),
+                                     dtype=np.int64, count=count)
+            else:
+                kind = BOOL
+                valid = np.fromiter((type(value) is bool for value in values),
+                                    dtype=bool, count=count)
+                column = np.fromiter((value is True for value in values),
+                                     dtype=bool, count=count)
+            if param_types:
+                # Argomenti diversi dai tipi inferiti: l'interprete scalare
+                # solleva l'errore di specializzazione
+                valid &= np.fromiter((value_has_type(value, param_types[i]) for value in values),
+                                     dtype=bool, count=count)
+            self._failed |= ~valid
+            columns.append((kind, column))
+        return columns
+
+    # ==================== CHIAMATE E STATEMENT ====================
+
+    def _call(self, function: Function, arguments, lanes, depth: int):
+        """
+        Esegue il corpo della funzione sulle lane indicate. Le lane che
+        eseguono return function(...) rieseguono il corpo con i nuovi
+        argomenti, senza aumentare la profondità, finché tutte hanno
+        restituito un valore.
+        """
+        result = np.zeros(len(lanes), dtype=np.int64)
+        if depth > self.max_depth:
+            self._failed[lanes] = True
+            return INT, result
+
+        scope = self.semantic_analyzer.get_node_info(function, 'scope')
+        names = []
+        for param in function.parameters:
+            info = scope.lookup_local(param) if scope else None
+            if info is None or info.kind != SymbolKind.PARAMETER:
+                self._failed[lanes] = True
+                return INT, result
+            names.append(info.unique_name)
+
+        result_kind = None
+        # Posizioni in lanes delle lane che eseguono il corpo
+        positions = np.arange(len(lanes))
+        while positions.size:
+            frame = _Frame(lanes[positions], function)
+            for name, (kind, values) in zip(names, arguments):
+                frame.variables[name] = [kind, values, np.ones(positions.size, dtype=bool)]
+            self._exec_block(function.body, frame, np.arange(positions.size), depth)
+
+            finished = frame.returned & ~frame.continuing
+            if finished.any():
+                if result_kind is None:
+                    result_kind = frame.result_kind
+                if frame.result_kind == result_kind:
+                    result[positions[finished]] = frame.result[finished]
+                else:
+                    self._failed[frame.lanes[finished]] = True
+            # Le lane che escono senza return restituiscono None
+            self._failed[frame.lanes[~frame.returned]] = True
+
+            again = frame.continuing & ~self._failed[frame.lanes]
+            positions = positions[again]
+            if positions.size:
+                arguments = [(kind, values[again]) for kind, values in frame.next_arguments]
+        return result_kind or INT, result
+
+    def _exec_block(self, block: Block, frame: _Frame, selected, depth: int):
+        for statement in block.statements:
+            selected = selected[~frame.returned[selected] &
+                                ~self._failed[frame.lanes[selected]]]
+            if selected.size == 0:
+                return
+            self._exec_statement(statement, frame, selected, depth)
+
+    def _exec_statement(self, statement: ASTNode, frame: _Frame, selected, depth: int):
+        if isinstance(statement, Assignment):
+            kind, values = self._eval(statement.value, frame, selected, depth)
+            name = self._unique_name(statement, frame, selected)
+            if name is None:
+                return
+            variable = frame.variables.get(name)
+            if variable is None:
+                variable = frame.variables[name] = [
+                    kind, np.zeros(len(frame.lanes), dtype=values.dtype),
+                    np.zeros(len(frame.lanes), dtype=bool)]
+            if variable[0] != kind:
+                self._fail(frame, selected)
+                return
+            variable[1][selected] = values
+            variable[2][selected] = True
+        elif isinstance(statement, IfStatement):
+            condition = self._eval_condition(statement.condition, frame, selected, depth)
+            self._exec_block(statement.then_block, frame, selected[condition], depth)
+            if statement.else_block:
+                self._exec_block(statement.else_block, frame, selected[~condition], depth)
+        elif isinstance(statement, ReturnStatement):
+            if self._is_self_tail_call(statement.value, frame):
+                self._tail_call(statement.value, frame, selected, depth)
+                return
+            kind, values = self._eval(statement.value, frame, selected, depth)
+            if frame.result_kind is None:
+                frame.result_kind = kind
+            elif frame.result_kind != kind:
+                self._fail(frame, selected)
+                return
+            frame.result[selected] = values
+            frame.returned[selected] = True
+        elif isinstance(statement, Block):
+            self._exec_block(statement, frame, selected, depth)
+        else:
+            self._eval(statement, frame, selected, depth)
+
+    # ==================== ESPRESSIONI ====================
+
+    def _eval(self, node: ASTNode, frame: _Frame, selected, depth: int):
+        """Valuta un'espressione sulle lane selezionate: (tipo, valori)."""
+        if is_condition_node(node):
+            return BOOL, self._eval_condition(node, frame, selected, depth)
+        if isinstance(node, IntegerLiteral):
+            if not INT64_MIN <= node.value <= INT64_MAX:
+                return self._unsupported(frame, selected)
+            return INT, np.full(selected.size, node.value, dtype=np.int64)
+        if isinstance(node, Identifier):
+            return self._variable(node, frame, selected)
+        if isinstance(node, BinaryExpression):
+            left_kind, left = self._eval(node.left, frame, selected, depth)
+            right_kind, right = self._eval(node.right, frame, selected, depth)
+            if left_kind != INT or right_kind != INT or node.operator not in ARITHMETIC:
+                return self._unsupported(frame, selected)
+            values, invalid = ARITHMETIC[node.operator](left, right)
+            self._fail(frame, selected[invalid])
+            return INT, values
+        if isinstance(node, UnaryExpression):
+            kind, operand = self._eval(node.operand, frame, selected, depth)
+            if kind != INT or node.operator not in ('+', '-'):
+                return self._unsupported(frame, selected)
+            if node.operator == '+':
+                return INT, operand
+            self._fail(frame, selected[operand == INT64_MIN])
+            return INT, -operand
+        if isinstance(node, FunctionCall):
+            return self._eval_call(node, frame, selected, depth)
+        # Liste e altri valori non rappresentabili
+        return self._unsupported(frame, selected)
+
+    def _eval_call(self, call: FunctionCall, frame: _Frame, selected, depth: int):
+        callee = self._static_callee(call)
+        if callee is None:
+            return self._unsupported(frame, selected)
+        arguments = [self._eval(argument, frame, selected, depth)
+                     for argument in call.arguments]
+        if len(arguments) != len(callee.parameters):
+            return self._unsupported(frame, selected)
+
+        active = ~self._failed[frame.lanes[selected]]
+        values = np.zeros(selected.size, dtype=np.int64)
+        if not active.any():
+            return INT, values
+        kind, result = self._call(callee, [(kind, argument[active]) for kind, argument in arguments],
+                                  frame.lanes[selected[active]], depth + 1)
+        values[active] = result
+        return kind, values
+
+    def _is_self_tail_call(self, node: ASTNode, frame: _Frame) -> bool:
+        return (isinstance(node, FunctionCall) and
+                self._static_callee(node) is frame.function and
+                len(node.arguments) == len(frame.function.parameters))
+
+    def _tail_call(self, call: FunctionCall, frame: _Frame, selected, depth: int):
+        """return f(...) nel corpo di f: memorizza i nuovi argomenti delle lane."""
+        for index, argument in enumerate(call.arguments):
+            kind, values = self._eval(argument, frame, selected, depth)
+            target = frame.next_arguments[index]
+            if target is None:
+                target = frame.next_arguments[index] = [
+                    kind, np.zeros(len(frame.lanes), dtype=values.dtype)]
+            if target[0] != kind:
+                self._fail(frame, selected)
+                return
+            target[1][selected] = values
+        frame.continuing[selected] = True
+        frame.returned[selected] = True
+
+    def _eval_condition(self, node: ASTNode, frame: _Frame, selected, depth: int):
+        """Valuta una condizione sulle lane selezionate: array booleano."""
+        if isinstance(node, BooleanLiteral):
+            return np.full(selected.size, node.value, dtype=bool)
+        if isinstance(node, ComparisonCondition):
+            left_kind, left = self._eval(node.left, frame, selected, depth)
+            right_kind, right = self._eval(node.right, frame, selected, depth)
+            both_int = left_kind == INT and right_kind == INT
+            if node.operator == '==':
+                # Tra valori non interi (booleani) == è sempre falso
+                return left == right if both_int else np.zeros(selected.size, dtype=bool)
+            if node.operator == 'int>=' and left_kind == BOOL:
+                return np.zeros(selected.size, dtype=bool)
+            if not both_int or node.operator not in COMPARISONS:
+                self._fail(frame, selected)
+                return np.zeros(selected.size, dtype=bool)
+            return COMPARISONS[node.operator](left, right)
+        if isinstance(node, BinaryCondition):
+            left = self._boolean(node.left, frame, selected, depth)
+            # Valutazione short-circuit: il lato destro solo dove serve
+            pending = ~left if node.operator == 'and' else left
+            result = left.copy()
+            if node.operator not in ('and', 'or'):
+                self._fail(frame, selected)
+                return result
+            needed = selected[~pending]
+            if needed.size:
+                result[~pending] = self._boolean(node.right, frame, needed, depth)
+            return result
+        if isinstance(node, UnaryCondition):
+            operand = self._boolean(node.operand, frame, selected, depth)
+            if node.operator != '!':
+                self._fail(frame, selected)
+            return ~operand
+        return self._boolean(node, frame, selected, depth)
+
+    def _boolean(self, node: ASTNode, frame: _Frame, selected, depth: int):
+        """Operando che deve essere booleano: le lane con altri tipi falliscono."""
+        if is_condition_node(node):
+            return self._eval_condition(node, frame, selected, depth)
+        kind, values = self._eval(node, frame, selected, depth)
+        if kind != BOOL:
+            self._fail(frame, selected)
+            return np.zeros(selected.size, dtype=bool)
+        return values.astype(bool)
+
+    # ==================== UTILITY ====================
+
+    def _variable(self, node: Identifier, frame: _Frame, selected):
+        name = self._unique_name(node, frame, selected)
+        variable = frame.variables.get(name) if name is not None else None
+        if variable is None:
+            # Valore funzione o variabile non definita
+            return self._unsupported(frame, selected)
+        kind, values, assigned = variable
+        self._fail(frame, selected[~assigned[selected]])
+        return kind, values[selected]
+
+    def _unique_name(self, node: ASTNode, frame: _Frame, selected) -> Optional[str]:
+        try:
+            return self._names.get_unique_name(node, self.semantic_analyzer)
+        except SaltinoRuntimeError:
+            self._fail(frame, selected)
+            return None
+
+    def _static_callee(self, call: FunctionCall) -> Optional[Function]:
+        """Funzione globale chiamata direttamente (non tramite una variabile)."""
+        if not isinstance(call.function, Identifier):
+            return None
+        scope = self.semantic_analyzer.get_node_info(call.function, 'scope')
+        try:
+            info = scope.lookup(call.function.name) if scope else None
+        except ValueError:
+            return None
+        if info is None or info.kind != SymbolKind.FUNCTION:
+            return None
+        return self.functions.get(call.function.name)
+
+    def _fail(self, frame: _Frame, selected):
+        """Scarta le lane indicate: verranno eseguite dall'interprete scalare."""
+        if selected.size:
+            self._failed[frame.lanes[selected]] = True
+
+    def _unsupported(self, frame: _Frame, selected):
+        self._fail(frame, selected)
+        return INT, np.zeros(selected.size, dtype=np.int64)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Misura come scalano i passi di compilazione su AST annidati in profondità:
+blocchi dentro blocchi, catene di ::, if annidati, chiamate annidate e
+catene di and. I passi usano stack espliciti, quindi il tempo per livello
+deve restare circa costante al crescere della profondità.
+
+Gli AST vengono costruiti direttamente: il parser generato da ANTLR è
+molto più lento dei passi (e ricorsivo), quindi il parsing dei sorgenti
+corrispondenti è misurato solo fino a PARSE_LIMIT livelli.
+
+Uso: python benchmark_nesting.py [N ...]   (profondità, default 1000 10000 100000)
+"""
+
+import sys
+import time
+
+from AST.ASTNodes import (
+    BinaryCondition, BinaryExpression, Block, ComparisonCondition, EmptyList,
+    Function, FunctionCall, Identifier, IfStatement, IntegerLiteral, Program,
+    ReturnStatement,
+)
+from AST.constant_folding import ConstantFolder
+from AST.inliner import FunctionInliner
+from AST.semantic_analyzer import SemanticAnalyzer
+from AST.type_inference import TypeInference
+from saltino_parser import compile_saltino
+from tail_recursive_transformer import TailCallTransformer
+
+# Oltre questa profondità il parsing con ANTLR non viene misurato
+PARSE_LIMIT = 2000
+
+# Funzione chiamata dalle chiamate annidate
+INCREMENT = "def f(y) {\n    return y + 1\n}\n"
+
+
+def positive() -> ComparisonCondition:
+    return ComparisonCondition(Identifier('x'), '>', IntegerLiteral(0))
+
+
+def nested_blocks(n: int) -> Block:
+    body = Block([ReturnStatement(Identifier('x'))])
+    for _ in range(n):
+        body = Block([body])
+    return body
+
+
+def cons_chain(n: int) -> Block:
+    expression = EmptyList()
+    for _ in range(n):
+        expression = BinaryExpression(Identifier('x'), '::', expression)
+    return Block([ReturnStatement(expression)])
+
+
+def nested_ifs(n: int) -> Block:
+    body = Block([ReturnStatement(IntegerLiteral(1))])
+    for _ in range(n):
+        body = Block([IfStatement(positive(), body)])
+    return Block(body.statements + [ReturnStatement(IntegerLiteral(0))])
+
+
+def nested_calls(n: int) -> Block:
+    expression = Identifier('x')
+    for _ in range(n):
+        expression = FunctionCall(Identifier('f'), [expression])
+    return Block([ReturnStatement(expression)])
+
+
+def and_chain(n: int) -> Block:
+    condition = positive()
+    for _ in range(n):
+        condition = BinaryCondition(positive(), 'and', condition)
+    return Block([ReturnStatement(condition)])
+
+
+# Forma: (costruttore del corpo di main, sorgente equivalente)
+SHAPES = {
+    'blocchi': (nested_blocks, lambda n: "{\n" * n + "return x\n" + "}\n" * n),
+    'cons': (cons_chain, lambda n: "return " + "x :: " * n + "[]\n"),
+    'if': (nested_ifs, lambda n: "if (x > 0) {\n" * n + "return 1\n" + "}\n" * n + "return 0\n"),
+    'chiamate': (nested_calls, lambda n: "return " + "f(" * n + "x" + ")" * n + "\n"),
+    'and': (and_chain, lambda n: "return " + "x > 0 and " * n + "x > 0\n"),
+}
+
+# Le chiamate annidate richiedono ad ANTLR una predizione costosa per livello
+SLOW_TO_PARSE = {'chiamate'}
+
+PASSES = ['trasformazione', 'semantica', 'tipi', 'ottimizzazione']
+
+
+def program(body: Block) -> Program:
+    increment = Function('f', ['y'], Block([ReturnStatement(
+        BinaryExpression(Identifier('y'), '+', IntegerLiteral(1)))]))
+    return Program([Function('main', ['x'], body), increment])
+
+
+def measure_passes(body: Block) -> dict:
+    """Secondi spesi da ogni passo sull'AST di main."""
+    times = {}
+    start = time.perf_counter()
+    ast = TailCallTransformer().transform_program(program(body))
+    times['trasformazione'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    semantic_analyzer = SemanticAnalyzer()
+    if not semantic_analyzer.analyze(ast):
+        raise RuntimeError(semantic_analyzer.error_message)
+    times['semantica'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    TypeInference(semantic_analyzer, ('main',)).infer(ast)
+    times['tipi'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    FunctionInliner(semantic_analyzer).inline_program(ast)
+    ConstantFolder(semantic_analyzer).fold_program(ast)
+    times['ottimizzazione'] = time.perf_counter() - start
+    return times
+
+
+def measure_parse(shape: str, n: int) -> str:
+    """Secondi di compile_saltino sul sorgente, se misurato."""
+    if n > PARSE_LIMIT or shape in SLOW_TO_PARSE:
+        return '-'
+    source = "def main(x) {\n" + SHAPES[shape][1](n) + "}\n" + INCREMENT
+    start = time.perf_counter()
+    compile_saltino(source)
+    return f"{time.perf_counter() - start:.3f}"
+
+
+def main():
+    depths = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    print(f"Limite di ricorsione: {sys.getrecursionlimit()}")
+    print(f"{'forma':<10}{'livelli':>9}" + "".join(f"{name:>16}" for name in PASSES)
+          + f"{'µs/livello':>12}{'parsing (s)':>13}")
+    for shape, (build, _) in SHAPES.items():
+        for n in depths:
+            times = measure_passes(build(n))
+            per_level = sum(times.values()) / n * 1e6
+            print(f"{shape:<10}{n:>9}" + "".join(f"{times[name]:>16.3f}" for name in PASSES)
+                  + f"{per_level:>12.1f}{measure_parse(shape, n):>13}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Confronta i tempi delle funzioni native del preludio con quelli delle
+corrispondenti definizioni ricorsive Saltino (prelude.REFERENCE_SOURCE).
+
+Uso: python benchmark_prelude.py [N]   (N = lunghezza delle liste, default 2000)
+"""
+
+import sys
+import time
+
+from interpreter import IterativeSaltinoInterpreter
+from prelude import REFERENCE_SOURCE
+from saltino_parser import compile_saltino
+
+# Una funzione per ogni chiamata misurata, con i suoi argomenti
+BENCHMARKS = """
+def main() {
+    return 0
+}
+
+def run_length(xs, n) {
+    return length(xs)
+}
+
+def run_append(xs, n) {
+    return append(xs, xs)
+}
+
+def run_reverse(xs, n) {
+    return reverse(xs)
+}
+
+def run_range(xs, n) {
+    return range(0, n)
+}
+
+def run_sum(xs, n) {
+    return sum(xs)
+}
+
+def run_take(xs, n) {
+    return take(n - 1, xs)
+}
+
+def run_drop(xs, n) {
+    return drop(n - 1, xs)
+}
+
+def run_map(xs, n) {
+    return map(add1, xs)
+}
+
+def run_filter(xs, n) {
+    return filter(even, xs)
+}
+
+def run_foldl(xs, n) {
+    return foldl(plus, 0, xs)
+}
+
+def add1(x) {
+    return x + 1
+}
+
+def even(x) {
+    return x % 2 == 0
+}
+
+def plus(a, b) {
+    return a + b
+}
+"""
+
+NAMES = ['length', 'append', 'reverse', 'range', 'sum', 'take', 'drop',
+         'map', 'filter', 'foldl']
+
+
+def load(source: str) -> IterativeSaltinoInterpreter:
+    analyzed = compile_saltino(source, entry_points=['main'] + [f"run_{name}" for name in NAMES])
+    interpreter = IterativeSaltinoInterpreter(semantic_analyzer=analyzed.semantic_analyzer)
+    interpreter.load_program(analyzed.program)
+    return interpreter
+
+
+def measure(interpreter: IterativeSaltinoInterpreter, name: str, n: int):
+    """Restituisce (risultato, secondi) di una chiamata a run_<name>."""
+    function = interpreter.global_env.get_function(f"run_{name}")
+    start = time.perf_counter()
+    result = interpreter.call_function(function, [list(range(n)), n])
+    return result, time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    native = load(BENCHMARKS)
+    reference = load(BENCHMARKS + REFERENCE_SOURCE)
+
+    print(f"Liste di {n} elementi")
+    print(f"{'funzione':<10}{'nativa (s)':>14}{'Saltino (s)':>14}{'speedup':>10}")
+    for name in NAMES:
+        native_result, native_time = measure(native, name, n)
+        reference_result, reference_time = measure(reference, name, n)
+        if native_result != reference_result:
+            print(f"❌ {name}: risultati diversi")
+            return 1
+        speedup = reference_time / native_time if native_time else float('inf')
+        print(f"{name:<10}{native_time:>14.6f}{reference_time:>14.6f}{speedup:>9.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Lettura e scrittura di liste di interi in formato binario.
+
+Sono supportati due formati:
+- file .npy (NumPy) monodimensionali con dtype int64 little-endian ('<i8');
+- file grezzi di interi int64 little-endian (qualsiasi altra estensione).
+
+load_list mappa il file in memoria (mmap) e restituisce una PackedList
+di sola lettura sui byte del file: nessun elemento viene copiato né
+convertito in un int Python finché il programma non lo legge. save_list
+scrive una lista nello stesso formato; le liste compatte vengono scritte
+direttamente dal loro buffer, su un file temporaneo rinominato alla fine
+come in checkpoint.py: il file di destinazione può quindi essere lo stesso
+da cui è stata caricata (e mappata) la lista.
+
+NumPy non è necessario: l'intestazione dei file .npy è letta e scritta da
+questo modulo.
+"""
+
+import ast
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any
+
+from errors.runtime_errors import SaltinoRuntimeError
+from packed_lists import PackedList, is_list
+
+NPY_MAGIC = b'\x93NUMPY'
+NPY_DTYPE = '<i8'
+# Allineamento dei dati dopo l'intestazione richiesto dal formato .npy
+NPY_ALIGNMENT = 64
+
+NATIVE_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def is_npy(path: str) -> bool:
+    return path.lower().endswith('.npy')
+
+
+def load_list(path: str) -> Any:
+    """Lista di interi contenuta nel file, senza copiarne gli elementi."""
+    try:
+        with open(path, 'rb') as file:
+            offset, count = _npy_header(file, path) if is_npy(path) else (0, None)
+            file.seek(0, 2)
+            size = file.tell() - offset
+            if count is None:
+                if size % 8:
+                    raise SaltinoRuntimeError(
+                        f"Raw int64 file {path} has {size} bytes, not a multiple of 8")
+                count = size // 8
+            elif size < count * 8:
+                raise SaltinoRuntimeError(f"Truncated .npy file: {path}")
+            if count == 0:
+                return []
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError as e:
+        raise SaltinoRuntimeError(f"Cannot read list file {path}: {e.strerror}")
+
+    view = memoryview(mapped)[offset:offset + count * 8].cast('q')
+    if not NATIVE_LITTLE_ENDIAN:
+        # Su macchine big-endian i dati vanno convertiti in una copia
+        buffer = array('q', view.tobytes())
+        buffer.byteswap()
+        return PackedList(buffer)
+    return PackedList(view)
+
+
+def save_list(path: str, value: Any):
+    """Scrive una lista di interi nel formato indicato dall'estensione di path."""
+    if not is_list(value):
+        raise SaltinoRuntimeError(
+            f"Only list results can be written to a file, got {type(value).__name__}")
+    if type(value) is PackedList and NATIVE_LITTLE_ENDIAN:
+        data = value.view().cast('B')
+    else:
+        try:
+            buffer = array('q', value)
+        except (OverflowError, TypeError):
+            raise SaltinoRuntimeError(
+                f"List written to {path} has elements that do not fit in int64")
+        if not NATIVE_LITTLE_ENDIAN:
+            buffer.byteswap()
+        data = memoryview(buffer).cast('B')
+
+    # Troncare path sul posto invaliderebbe una lista mappata dallo stesso file
+    temporary_path = f"{path}.tmp"
+    try:
+        with open(temporary_path, 'wb') as file:
+            if is_npy(path):
+                file.write(_npy_header_bytes(len(value)))
+            file.write(data)
+        os.replace(temporary_path, path)
+    except OSError as e:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        raise SaltinoRuntimeError(f"Cannot write list file {path}: {e.strerror}")
+
+
+def _npy_header(file, path: str):
+    """Legge l'intestazione .npy: (posizione dei dati, numero di elementi)."""
+    prefix = file.read(len(NPY_MAGIC) + 2)
+    if len(prefix) < len(NPY_MAGIC) + 2 or not prefix.startswith(NPY_MAGIC):
+        raise SaltinoRuntimeError(f"Not a .npy file: {path}")
+    major = prefix[len(NPY_MAGIC)]
+    if major == 1:
+        (length,) = struct.unpack('<H', file.read(2))
+    elif major in (2, 3):
+        (length,) = struct.unpack('<I', file.read(4))
+    else:
+        raise SaltinoRuntimeError(f"Unsupported .npy version {major} in {path}")
+    try:
+        header = ast.literal_eval(file.read(length).decode('latin1'))
+        descr, shape = header['descr'], header['shape']
+    except (ValueError, SyntaxError, KeyError, TypeError):
+        raise SaltinoRuntimeError(f"Invalid .npy header in {path}")
+    if descr != NPY_DTYPE:
+        raise SaltinoRuntimeError(
+            f"Expected a .npy file of int64 ('{NPY_DTYPE}'), got '{descr}' in {path}")
+    if not isinstance(shape, tuple) or len(shape) != 1:
+        raise SaltinoRuntimeError(
+            f"Expected a one-dimensional .npy array, got shape {shape} in {path}")
+    return file.tell(), shape[0]
+
+
+def _npy_header_bytes(count: int) -> bytes:
+    """Intestazione .npy versione 1.0 per un vettore di count interi int64."""
+    header = f"{{'descr': '{NPY_DTYPE}', 'fortran_order': False, 'shape': ({count},), }}"
+    # magic + versione + lunghezza + intestazione + '\n' multipli di NPY_ALIGNMENT
+    used = len(NPY_MAGIC) + 2 + 2 + len(header) + 1
+    header += ' ' * (-used % NPY_ALIGNMENT) + '\n'
+    return NPY_MAGIC + b'\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1')
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Checkpoint e ripresa delle esecuzioni Saltino.
+
+Lo stato completo della macchina è esplicito: lo stack di ExecutionFrame,
+gli ambienti, l'AST e le informazioni semantiche. Questo modulo serializza
+un interprete in esecuzione su file e lo ricostruisce in un altro processo,
+così che un'esecuzione lunga possa sopravvivere al riavvio del worker o
+essere spostata su un'altra macchina.
+
+pickle serializza gli oggetti ricorsivamente, un livello di stack Python per
+livello di annidamento: un AST profondo quanto quelli accettati dal parser
+supererebbe qualunque limite di ricorsione. Le strutture annidate (nodi
+dell'AST, scope, ambienti e celle delle liste pigre) sono quindi scritte in
+forma piatta: nel flusso compaiono come riferimenti (indice, classe) e i
+loro stati seguono in lotti, ognuno dei quali contiene solo riferimenti agli
+altri. Al caricamento gli oggetti vengono creati vuoti al primo riferimento
+e riempiti alla fine, senza ricorsione.
+"""
+
+import os
+import pickle
+import signal
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+from AST.ASTNodes import ASTNode
+from AST.ASTsymbol_table import SymbolTable
+from errors.runtime_errors import SaltinoRuntimeError
+from execution_environment import Environment
+from interpreter import IterativeSaltinoInterpreter
+from lazy_lists import LazyList
+
+CHECKPOINT_FORMAT = "saltino-checkpoint"
+CHECKPOINT_VERSION = 2
+
+# Tipi che si annidano senza limite e vengono scritti in forma piatta
+_FLAT_TYPES = (ASTNode, SymbolTable, Environment, LazyList)
+
+# Profondità di ricorsione usata da pickle per i valori annidati, come le
+# liste di liste costruite dal programma
+_PICKLE_RECURSION_LIMIT = 20000
+
+
+class ExecutionSuspended(Exception):
+    """Sollevata quando un'esecuzione viene sospesa dopo aver salvato un checkpoint."""
+
+    def __init__(self, path: str, steps: int):
+        self.path = path
+        self.steps = steps
+        super().__init__(
+            f"Execution suspended after {steps} steps, checkpoint saved to {path}")
+
+
+class _FlatPickler(pickle.Pickler):
+    """Pickler che scrive gli oggetti di _FLAT_TYPES come riferimenti seguiti dai loro stati."""
+
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._indices = {}
+        self._pending = []
+
+    def persistent_id(self, obj):
+        if not isinstance(obj, _FLAT_TYPES):
+            return None
+        index = self._indices.get(id(obj))
+        if index is None:
+            index = self._indices[id(obj)] = len(self._indices)
+            self._pending.append(obj)
+        return (index, type(obj))
+
+    def dump_flat(self, payload):
+        """Scrive payload e poi, a lotti, gli stati degli oggetti riferiti."""
+        self.dump(payload)
+        while self._pending:
+            batch, self._pending = self._pending, []
+            self.dump([obj.__getstate__() for obj in batch])
+
+
+class _FlatUnpickler(pickle.Unpickler):
+    """Legge il formato di _FlatPickler."""
+
+    def __init__(self, file):
+        super().__init__(file)
+        self._objects = []
+
+    def persistent_load(self, pid):
+        index, cls = pid
+        if index == len(self._objects):
+            self._objects.append(cls.__new__(cls))
+        return self._objects[index]
+
+    def load_flat(self):
+        """Legge il payload, poi gli stati, e riempie gli oggetti creati vuoti."""
+        payload = self.load()
+        states = []
+        while len(states) < len(self._objects):
+            states.extend(self.load())
+        for obj, state in zip(self._objects, states):
+            _restore(obj, state)
+        return payload
+
+
+def _restore(obj, state):
+    """Applica uno stato di __getstate__ come farebbe pickle (dizionario e slot)."""
+    slots = None
+    if isinstance(state, tuple):
+        state, slots = state
+    if state:
+        obj.__dict__.update(state)
+    for name, value in (slots or {}).items():
+        setattr(obj, name, value)
+
+
+@contextmanager
+def _recursion_limit(limit: int):
+    """Alza temporaneamente il limite di ricorsione per oggetti molto annidati."""
+    previous = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(previous, limit))
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(previous)
+
+
+def save_checkpoint(interpreter: IterativeSaltinoInterpreter, path: str):
+    """
+    Salva lo stato dell'interprete su file.
+
+    La scrittura avviene su un file temporaneo rinominato alla fine, quindi un
+    checkpoint precedente non viene mai lasciato a metà.
+    """
+    payload = {
+        'format': CHECKPOINT_FORMAT,
+        'version': CHECKPOINT_VERSION,
+        'interpreter': interpreter,
+    }
+    temporary_path = f"{path}.tmp"
+    try:
+        with _recursion_limit(_PICKLE_RECURSION_LIMIT):
+            with open(temporary_path, 'wb') as file:
+                _FlatPickler(file).dump_flat(payload)
+        os.replace(temporary_path, path)
+    except (OSError, RecursionError, AttributeError, TypeError, pickle.PicklingError) as e:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise SaltinoRuntimeError(f"Cannot save checkpoint {path}: {e}")
+
+    if interpreter.debug_mode:
+        print(f"[CHECKPOINT] Salvato dopo {interpreter.steps_executed} passi "
+              f"(profondità stack {len(interpreter.execution_stack)}): {path}")
+
+
+def load_checkpoint(path: str) -> IterativeSaltinoInterpreter:
+    """Carica un interprete da un checkpoint salvato con save_checkpoint."""
+    try:
+        with _recursion_limit(_PICKLE_RECURSION_LIMIT):
+            with open(path, 'rb') as file:
+                payload = _FlatUnpickler(file).load_flat()
+    except FileNotFoundError:
+        raise SaltinoRuntimeError(f"Checkpoint not found: {path}")
+    except (pickle.UnpicklingError, EOFError, AttributeError, IndexError, TypeError,
+            ValueError) as e:
+        raise SaltinoRuntimeError(f"Invalid checkpoint {path}: {e}")
+
+    if (not isinstance(payload, dict) or
+            payload.get('format') != CHECKPOINT_FORMAT):
+        raise SaltinoRuntimeError(f"Invalid checkpoint {path}")
+    if payload.get('version') != CHECKPOINT_VERSION:
+        raise SaltinoRuntimeError(
+            f"Unsupported checkpoint version {payload.get('version')} in {path}")
+    return payload['interpreter']
+
+
+def run_with_checkpoints(interpreter: IterativeSaltinoInterpreter, path: str,
+                         every_steps: Optional[int] = None,
+                         deadline: Optional[float] = None,
+                         signals: Iterable[int] = (),
+                         slice_steps: int = 10000) -> bool:
+    """
+    Esegue l'interprete salvando checkpoint secondo i trigger richiesti.
+
+    Args:
+        interpreter: Interprete con una chiamata già avviata (start_call)
+        path: File del checkpoint
+        every_steps: Salva un checkpoint ogni every_steps dispatch e continua
+        deadline: Istante (time.time()) oltre il quale salvare e sospendere
+        signals: Segnali che richiedono di salvare e sospendere l'esecuzione
+        slice_steps: Dispatch eseguiti tra due controlli dei trigger
+
+    Returns:
+        True se l'esecuzione è terminata (risultato in final_result),
+        False se è stata sospesa dopo aver salvato il checkpoint.
+    """
+    if every_steps is not None:
+        slice_steps = min(slice_steps, every_steps)
+
+    requested = []
+    previous_handlers = {}
+
+    def request_checkpoint(signum, frame):
+        requested.append(signum)
+
+    for signum in signals:
+        previous_handlers[signum] = signal.signal(signum, request_checkpoint)
+
+    try:
+        last_checkpoint = interpreter.steps_executed
+        while not interpreter.run_steps(slice_steps):
+            if requested or (deadline is not None and time.time() >= deadline):
+                save_checkpoint(interpreter, path)
+                return False
+
+            if (every_steps is not None and
+                    interpreter.steps_executed - last_checkpoint >= every_steps):
+                save_checkpoint(interpreter, path)
+                last_checkpoint = interpreter.steps_executed
+        return True
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
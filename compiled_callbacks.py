@@ -0,0 +1,382 @@
+"""
+Compilazione in closure Python delle funzioni usate come callback.
+
+Le funzioni native di ordine superiore del preludio (map, filter, foldl)
+chiamano la funzione ricevuta una volta per elemento. Se il corpo della
+funzione è fatto solo di return e di if con espressioni senza chiamate
+(parametri, letterali e operatori), compile_callback lo traduce in una
+closure Python che applica gli stessi operatori legati ai nodi
+(operator_impl), quindi con gli stessi risultati e gli stessi errori
+dell'interprete ma senza frame. Per le altre funzioni restituisce None e la
+chiamata passa dall'interprete.
+
+Se NumPy è installato, vectorize_callback traduce allo stesso modo le
+funzioni con un solo parametro fatte di aritmetica intera e confronti in
+espressioni su array int64: map e filter le applicano allora a tutti gli
+elementi di una lista lunga con poche operazioni vettoriali. Gli elementi
+per cui il calcolo int64 va in overflow o solleva un errore (divisione per
+zero, esponente negativo) sono ricalcolati con la closure scalare, quindi
+con interi illimitati e gli errori consueti.
+"""
+
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from AST.ASTNodes import *
+from errors.runtime_errors import SaltinoRuntimeError
+from int64_operators import ARITHMETIC, COMPARISONS, INT64_MAX, INT64_MIN
+from packed_lists import PACK_THRESHOLD, PackedList, type_name
+from saltino_operators import SaltinoOperators
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None
+
+# Una closure riceve la tupla degli argomenti e restituisce il valore
+Compiled = Callable[[tuple], Any]
+
+# Lunghezza minima di una lista per la valutazione vettoriale
+VECTOR_THRESHOLD = PACK_THRESHOLD
+
+# Tipi dei valori vettoriali: interi int64 o booleani
+INT = 'int'
+BOOL = 'bool'
+
+# Un nodo vettoriale riceve la colonna degli elementi e restituisce
+# (valori, lane non valide)
+Vector = Tuple[str, Callable[[Any], Tuple[Any, Any]]]
+
+
+def compile_callback(function: Function, semantic_analyzer) -> Optional[Compiled]:
+    """Closure equivalente alla chiamata di function, o None se non è compilabile."""
+    if not isinstance(function.body, Block):
+        return None
+    parameters = _parameter_indices(function, semantic_analyzer)
+    if parameters is None:
+        return None
+    return _compile_statements(function.body.statements, parameters, semantic_analyzer)
+
+
+def _parameter_indices(function: Function, semantic_analyzer) -> Optional[Dict[str, int]]:
+    """Posizione di ogni parametro, indicizzata per nome univoco."""
+    scope = semantic_analyzer.get_node_info(function, 'scope')
+    if scope is None:
+        return None
+    indices = {}
+    for index, param in enumerate(function.parameters):
+        info = scope.lookup_local(param)
+        if info is None:
+            return None
+        indices[info.unique_name] = index
+    return indices
+
+
+def _compile_statements(statements: List[ASTNode], parameters: Dict[str, int],
+                        semantic_analyzer) -> Optional[Compiled]:
+    """Sequenza di statement che termina con un return su ogni cammino."""
+    if not statements:
+        return None
+    first, rest = statements[0], statements[1:]
+    if isinstance(first, ReturnStatement):
+        return _compile(first.value, parameters, semantic_analyzer)
+    if not isinstance(first, IfStatement):
+        return None
+    condition = _compile(first.condition, parameters, semantic_analyzer, condition=True)
+    then_branch = _compile_statements(first.then_block.statements, parameters,
+                                      semantic_analyzer)
+    # Senza return nel ramo else l'esecuzione prosegue con gli statement successivi
+    else_statements = (first.else_block.statements if first.else_block else []) + rest
+    else_branch = _compile_statements(else_statements, parameters, semantic_analyzer)
+    if condition is None or then_branch is None or else_branch is None:
+        return None
+    # Come execute_if_frame, il ramo è scelto dalla verità della condizione
+    return lambda args: then_branch(args) if condition(args) else else_branch(args)
+
+
+def _compile(node: ASTNode, parameters: Dict[str, int], semantic_analyzer,
+             condition: bool = False) -> Optional[Compiled]:
+    """
+    Closure di un'espressione. Con condition=True il nodo è valutato come
+    condizione (execute_condition_frame): una variabile deve essere booleana.
+    """
+    if condition and not isinstance(node, (BooleanLiteral, Identifier, BinaryCondition,
+                                           UnaryCondition, ComparisonCondition)):
+        return None
+    if isinstance(node, (IntegerLiteral, BooleanLiteral)):
+        value = node.value
+        return lambda args: value
+    if isinstance(node, EmptyList):
+        return lambda args: []
+    if isinstance(node, Identifier):
+        info = semantic_analyzer.get_node_info(node, 'resolved_info')
+        if info is None or info.unique_name not in parameters:
+            # Funzioni globali e variabili locali restano all'interprete
+            return None
+        index = parameters[info.unique_name]
+        if condition:
+            name = node.name
+            return lambda args: _boolean_variable(name, args[index])
+        return lambda args: args[index]
+    if isinstance(node, (UnaryExpression, UnaryCondition)):
+        operand = _compile(node.operand, parameters, semantic_analyzer,
+                           condition=isinstance(node, UnaryCondition))
+        if operand is None:
+            return None
+        if isinstance(node, UnaryCondition):
+            if node.operator != '!':
+                return None
+            return lambda args: _logical_not(operand(args))
+        operator = _operator(node, SaltinoOperators.get_unary_operators())
+        return operator and (lambda args: operator(operand(args)))
+    if isinstance(node, (BinaryExpression, ComparisonCondition, BinaryCondition)):
+        logical = isinstance(node, BinaryCondition)
+        left = _compile(node.left, parameters, semantic_analyzer, condition=logical)
+        right = _compile(node.right, parameters, semantic_analyzer, condition=logical)
+        if left is None or right is None:
+            return None
+        if logical:
+            return _compile_logical(node, left, right)
+        table = (SaltinoOperators.get_comparison_operators()
+                 if isinstance(node, ComparisonCondition)
+                 else SaltinoOperators.get_binary_operators())
+        operator = _operator(node, table)
+        return operator and (lambda args: operator(left(args), right(args)))
+    # Chiamate e nodi sconosciuti
+    return None
+
+
+def _operator(node: ASTNode, table: Dict[str, Callable]) -> Optional[Callable]:
+    """Operatore legato al nodo dall'inferenza dei tipi, o quello generico."""
+    return getattr(node, 'operator_impl', None) or table.get(node.operator)
+
+
+def _compile_logical(node: BinaryCondition, left: Compiled, right: Compiled) -> Optional[Compiled]:
+    # Stessa valutazione a corto circuito di execute_binary_condition
+    operator = _operator(node, SaltinoOperators.get_logical_operators())
+    if operator is None:
+        return None
+    if node.operator == 'and':
+        def evaluate(args):
+            left_value = left(args)
+            if not left_value:
+                return False
+            return operator(left_value, right(args))
+    elif node.operator == 'or':
+        def evaluate(args):
+            left_value = left(args)
+            if left_value:
+                return True
+            return operator(left_value, right(args))
+    else:
+        return None
+    return evaluate
+
+
+def _boolean_variable(name: str, value: Any) -> bool:
+    # Stesso controllo (e messaggio) di una variabile in execute_condition_frame
+    if type(value) is not bool:
+        raise SaltinoRuntimeError(
+            f"Error accessing variable '{name}': Variable '{name}' used in condition "
+            f"must be boolean, got {type_name(value)}")
+    return value
+
+
+def _logical_not(value: Any) -> bool:
+    # Stesso controllo di execute_unary_condition
+    if type(value) is not bool:
+        raise SaltinoRuntimeError(
+            f"Logical negation can only operate on boolean values, got {type_name(value)}")
+    return not value
+
+
+# ==================== CALLBACK VETTORIALI ====================
+
+class VectorCallback:
+    """Callback con un parametro applicato a tutti gli elementi di una lista."""
+
+    def __init__(self, kind: str, evaluate: Callable[[Any], Tuple[Any, Any]],
+                 exact: Compiled):
+        self.kind = kind            # INT o BOOL
+        self.evaluate = evaluate    # colonna int64 -> (valori, lane non valide)
+        self.exact = exact          # closure scalare per le lane non valide
+
+    def map(self, xs: Any) -> Optional[Any]:
+        """Risultato di map sulla lista, o None se serve il ciclo per elemento."""
+        column = int64_column(xs)
+        if column is None or self.kind != INT:
+            # Un risultato booleano fa fallire il cons: lo segnala il ciclo
+            return None
+        values, invalid = self.evaluate(column)
+        if not invalid.any():
+            return PackedList(array('q', values.tobytes()))
+        results = values.tolist()
+        # In ordine, così il primo errore è quello del primo elemento
+        for index in np.flatnonzero(invalid).tolist():
+            results[index] = self.exact((xs[index],))
+        # Come nel ciclo: i valori esatti passano dai controlli del cons
+        return SaltinoOperators.cons_all(results, [])
+
+    def filter(self, xs: Any) -> Optional[Any]:
+        """Risultato di filter sulla lista, o None se serve il ciclo per elemento."""
+        column = int64_column(xs)
+        if column is None or self.kind != BOOL:
+            return None
+        keep, invalid = self.evaluate(column)
+        if invalid.any():
+            keep = keep.copy()
+            for index in np.flatnonzero(invalid).tolist():
+                keep[index] = self.exact((xs[index],))
+        kept = column[keep]
+        if kept.size > PACK_THRESHOLD:
+            return PackedList(array('q', kept.tobytes()))
+        return kept.tolist()
+
+
+def int64_column(xs: Any) -> Optional[Any]:
+    """Elementi della lista come array int64 (senza copia per le liste compatte)."""
+    if type(xs) is PackedList:
+        return np.frombuffer(xs.view(), dtype=np.int64)
+    try:
+        return np.fromiter(xs, dtype=np.int64, count=len(xs))
+    except OverflowError:
+        return None
+
+
+def vectorize_callback(function: Function, semantic_analyzer,
+                       exact: Compiled) -> Optional[VectorCallback]:
+    """
+    Versione vettoriale di una funzione con un solo parametro (intero),
+    o None se NumPy manca o il corpo usa altro che aritmetica e confronti.
+    exact è la closure scalare della stessa funzione.
+    """
+    if np is None or len(function.parameters) != 1 or not isinstance(function.body, Block):
+        return None
+    parameters = _parameter_indices(function, semantic_analyzer)
+    if parameters is None:
+        return None
+    vector = _vectorize_statements(function.body.statements, parameters, semantic_analyzer)
+    if vector is None:
+        return None
+    kind, evaluate = vector
+    return VectorCallback(kind, evaluate, exact)
+
+
+def _vectorize_statements(statements: List[ASTNode], parameters: Dict[str, int],
+                          semantic_analyzer) -> Optional[Vector]:
+    if not statements:
+        return None
+    first, rest = statements[0], statements[1:]
+    if isinstance(first, ReturnStatement):
+        return _vectorize(first.value, parameters, semantic_analyzer)
+    if not isinstance(first, IfStatement):
+        return None
+    condition = _vectorize(first.condition, parameters, semantic_analyzer, condition=True)
+    then_branch = _vectorize_statements(first.then_block.statements, parameters,
+                                        semantic_analyzer)
+    else_statements = (first.else_block.statements if first.else_block else []) + rest
+    else_branch = _vectorize_statements(else_statements, parameters, semantic_analyzer)
+    if (condition is None or then_branch is None or else_branch is None or
+            condition[0] != BOOL or then_branch[0] != else_branch[0]):
+        return None
+    test, then_values, else_values = condition[1], then_branch[1], else_branch[1]
+
+    def evaluate(x):
+        # Entrambi i rami su tutte le lane; contano gli errori del ramo preso
+        taken, invalid = test(x)
+        then_result, then_invalid = then_values(x)
+        else_result, else_invalid = else_values(x)
+        return (np.where(taken, then_result, else_result),
+                invalid | np.where(taken, then_invalid, else_invalid))
+    return then_branch[0], evaluate
+
+
+def _vectorize(node: ASTNode, parameters: Dict[str, int], semantic_analyzer,
+               condition: bool = False) -> Optional[Vector]:
+    """Stessi nodi di _compile, con gli operandi di tipo noto staticamente."""
+    if isinstance(node, IntegerLiteral):
+        if condition or not INT64_MIN <= node.value <= INT64_MAX:
+            return None
+        value = node.value
+        return INT, lambda x: (np.full(x.shape, value, dtype=np.int64), _valid(x))
+    if isinstance(node, BooleanLiteral):
+        value = node.value
+        return BOOL, lambda x: (np.full(x.shape, value, dtype=bool), _valid(x))
+    if isinstance(node, Identifier):
+        info = semantic_analyzer.get_node_info(node, 'resolved_info')
+        if condition or info is None or info.unique_name not in parameters:
+            # Un intero usato come condizione è un errore: lo segnala il ciclo
+            return None
+        return INT, lambda x: (x, _valid(x))
+    if condition and not isinstance(node, (BinaryCondition, UnaryCondition,
+                                           ComparisonCondition)):
+        return None
+
+    if isinstance(node, UnaryExpression):
+        operand = _vectorize(node.operand, parameters, semantic_analyzer)
+        if operand is None or operand[0] != INT or node.operator not in ('+', '-'):
+            return None
+        evaluate = operand[1]
+        if node.operator == '+':
+            return operand
+
+        def negate(x):
+            values, invalid = evaluate(x)
+            return -values, invalid | (values == INT64_MIN)
+        return INT, negate
+    if isinstance(node, UnaryCondition):
+        operand = _vectorize(node.operand, parameters, semantic_analyzer, condition=True)
+        if operand is None or operand[0] != BOOL or node.operator != '!':
+            return None
+        evaluate = operand[1]
+
+        def negate_condition(x):
+            values, invalid = evaluate(x)
+            return ~values, invalid
+        return BOOL, negate_condition
+
+    if not isinstance(node, (BinaryExpression, ComparisonCondition, BinaryCondition)):
+        return None
+    logical = isinstance(node, BinaryCondition)
+    left = _vectorize(node.left, parameters, semantic_analyzer, condition=logical)
+    right = _vectorize(node.right, parameters, semantic_analyzer, condition=logical)
+    operand_kind = BOOL if logical else INT
+    if left is None or right is None or left[0] != operand_kind or right[0] != operand_kind:
+        return None
+    left_values, right_values = left[1], right[1]
+
+    if isinstance(node, BinaryExpression):
+        operator = ARITHMETIC.get(node.operator)
+        if operator is None:
+            return None
+
+        def arithmetic(x):
+            (lhs, left_invalid), (rhs, right_invalid) = left_values(x), right_values(x)
+            values, invalid = operator(lhs, rhs)
+            return values, invalid | left_invalid | right_invalid
+        return INT, arithmetic
+    if isinstance(node, ComparisonCondition):
+        operator = np.equal if node.operator == '==' else COMPARISONS.get(node.operator)
+        if operator is None:
+            return None
+
+        def compare(x):
+            (lhs, left_invalid), (rhs, right_invalid) = left_values(x), right_values(x)
+            return operator(lhs, rhs), left_invalid | right_invalid
+        return BOOL, compare
+    if node.operator not in ('and', 'or'):
+        return None
+    conjunction = node.operator == 'and'
+
+    def logical_operator(x):
+        lhs, left_invalid = left_values(x)
+        rhs, right_invalid = right_values(x)
+        # Corto circuito: il lato destro conta solo dove viene valutato
+        evaluated = lhs if conjunction else ~lhs
+        values = (lhs & rhs) if conjunction else (lhs | rhs)
+        return values, left_invalid | (evaluated & right_invalid)
+    return BOOL, logical_operator
+
+
+def _valid(x):
+    return np.zeros(x.shape, dtype=bool)
@@ -0,0 +1,406 @@
+"""
+Deforestation of producer/consumer pairs of list recursions.
+
+Recognizes calls of the form consumer(producer(args)) where the producer
+builds a list one element at a time and the consumer walks it back with
+head/tail, e.g.
+
+    build(n) = if (n <= 0) [] else n :: build(n - 1)
+    sum(xs)  = if (xs == []) 0 else head(xs) + sum(tail(xs))
+
+and replaces the call with a single fused recursion that never builds the
+intermediate list:
+
+    build_sum_fused_1(n) = if (n <= 0) 0 else n + build_sum_fused_1(n - 1)
+
+The original evaluates every step of the producer first, then the cons
+chain, then every step of the consumer; the fused function interleaves
+them. The pair is only fused when the interleaving cannot be observed:
+
+- the producer's element expression always yields an integer when it
+  succeeds (an arithmetic expression, a literal, or a parameter already
+  compared with a checked comparison), so no cons of the original can fail;
+- the consumer's step expression uses the list only through head(xs) and
+  cannot fail on an integer (+, -, * and unary minus over head(xs) and
+  literals, / and % by a non-zero literal), and its base value is an
+  integer literal (for +, -, *) or [] (for ::), so no consumer operation
+  can fail either.
+
+The producer's conditions, elements and arguments are then evaluated in
+the same order as in the original, and they are the only code that can
+fail or not terminate: results, errors and non-termination are unchanged.
+Consumers that stop early, such as head(producer(...)), are not fused: the
+original still runs the whole producer, whose later steps may fail.
+
+The pass runs before the RecurrenceSolver and the TailCallTransformer,
+which may then rewrite the fused functions as usual.
+"""
+
+import sys
+
+from AST.ASTNodes import *
+from AST.hash_consing import HashConsTable
+from AST.type_inference import always_returns, iter_nodes
+from typing import Dict, List, Optional, Any, Tuple
+
+# Comparisons that fail on non-integer operands: after one of them succeeds
+# both operands are known to be integers
+CHECKED_COMPARISONS = ('!=', '<', '<=', '>', '>=')
+
+# Arithmetic operators whose result is always an integer
+INTEGER_OPERATORS = ('+', '-', '*', '/', '%')
+
+# Consumer operators that cannot fail on two integers
+NON_FAILING_OPERATORS = ('+', '-', '*')
+
+
+class Deforester:
+    """
+    Fuses consumer(producer(args)) calls into a single recursion.
+
+    Producers may take any number of parameters; consumers take exactly one,
+    the list, and compare it with [] before walking it.
+    """
+
+    def __init__(self):
+        """Initialize the pass with fresh state for each program."""
+        self.helper_functions: List[Function] = []
+        self.name_counters: Dict[str, int] = {}
+        self.used_names: set = set()
+        self.fused_functions: Dict[Tuple[str, str], str] = {}
+        # Structural numbers of the subtrees compared with the consumer templates
+        self.table = HashConsTable()
+
+    def _get_unique_name(self, base_name: str) -> str:
+        """Generate a unique name, skipping the names already used in the program."""
+        while True:
+            self.name_counters[base_name] = self.name_counters.get(base_name, 0) + 1
+            name = sys.intern(f"{base_name}_{self.name_counters[base_name]}")
+            if name not in self.used_names:
+                self.used_names.add(name)
+                return name
+
+    def fuse_program(self, program: Program) -> Program:
+        """
+        Fuse every recognized producer/consumer call in the program.
+
+        Returns:
+            A new Program with the calls redirected to the fused functions,
+            which are appended after the original ones
+        """
+        self.helper_functions = []
+        self.name_counters = {}
+        self.used_names = {node.name for node in iter_nodes(program)
+                           if isinstance(node, Identifier)}
+        self.used_names.update(function.name for function in program.functions)
+        self.fused_functions = {}
+        self.table = HashConsTable()
+
+        functions: Dict[str, List[Function]] = {}
+        for function in program.functions:
+            functions.setdefault(function.name, []).append(function)
+        # Duplicated names are reported by the semantic analysis
+        unique = {name: defined[0] for name, defined in functions.items() if len(defined) == 1}
+
+        producers = {name: info for name, info in
+                     ((name, self._match_producer(function)) for name, function in unique.items())
+                     if info is not None}
+        consumers = {name: info for name, info in
+                     ((name, self._match_consumer(function)) for name, function in unique.items())
+                     if info is not None}
+
+        if producers and consumers:
+            for function in program.functions:
+                self._fuse_calls(function, producers, consumers)
+
+        return Program(program.functions + self.helper_functions, program.position)
+
+    # Call sites
+
+    def _fuse_calls(self, function: Function, producers: Dict[str, Any],
+                    consumers: Dict[str, Any]):
+        """Redirect consumer(producer(args)) calls in the function to the fused functions."""
+        # A local with the name of a function hides it in the whole body
+        local_names = set(function.parameters)
+        local_names.update(node.variable for node in iter_nodes(function.body)
+                           if isinstance(node, Assignment))
+
+        for node in iter_nodes(function.body):
+            consumer = self._called_name(node, consumers, local_names)
+            if consumer is None or len(node.arguments) != 1:
+                continue
+            inner = node.arguments[0]
+            producer = self._called_name(inner, producers, local_names)
+            if producer is None or len(inner.arguments) != len(producers[producer]['parameters']):
+                continue
+
+            key = (producer, consumer)
+            if key not in self.fused_functions:
+                self.fused_functions[key] = self._create_fused_function(
+                    producers[producer], consumers[consumer])
+            node.function = Identifier(self.fused_functions[key], node.function.position)
+            node.arguments = inner.arguments
+
+    @staticmethod
+    def _called_name(node, candidates: Dict[str, Any], local_names: set) -> Optional[str]:
+        """Name of the candidate function called directly by node, if any."""
+        if (isinstance(node, FunctionCall) and isinstance(node.function, Identifier) and
+                node.function.name in candidates and node.function.name not in local_names):
+            return node.function.name
+        return None
+
+    # Pattern matching
+
+    def _match_producer(self, function: Function) -> Optional[Dict[str, Any]]:
+        """
+        Match a function whose returns are all [] or element :: f(args).
+
+        The recursive calls may only appear as the right operand of those
+        returns, and every path of the body must end with a return.
+        """
+        name = function.name
+        if name in function.parameters or not always_returns(function.body):
+            return None
+
+        integer_parameters = self._compared_parameters(function)
+        steps = 0
+        for node in iter_nodes(function.body):
+            if isinstance(node, Assignment) and node.variable == name:
+                return None
+            if isinstance(node, ReturnStatement):
+                value = node.value
+                if isinstance(value, EmptyList):
+                    continue
+                if not (isinstance(value, BinaryExpression) and value.operator == '::' and
+                        self._is_call_to(value.right, name) and
+                        len(value.right.arguments) == len(function.parameters) and
+                        self._is_integer_valued(value.left, integer_parameters)):
+                    return None
+                steps += 1
+
+        # Recursive calls outside the returns matched above are not allowed
+        calls = [node for node in iter_nodes(function.body) if self._is_call_to(node, name)]
+        if steps == 0 or len(calls) != steps:
+            return None
+        if any(self._is_call_to(node, name) for call in calls
+               for argument in call.arguments for node in iter_nodes(argument)):
+            return None
+
+        return {'function': function, 'parameters': function.parameters}
+
+    def _match_consumer(self, function: Function) -> Optional[Dict[str, Any]]:
+        """
+        Match c(xs) = if (xs == []) Z else E(head(xs)) OP c(tail(xs)).
+
+        The recursive return may also follow the if as a guard clause.
+        """
+        if len(function.parameters) != 1:
+            return None
+        name = function.name
+        xs = function.parameters[0]
+        statements = function.body.statements
+        if not statements or not isinstance(statements[0], IfStatement):
+            return None
+
+        if_stmt = statements[0]
+        if len(statements) == 1 and if_stmt.else_block is not None:
+            recursive_block = if_stmt.else_block.statements
+        elif len(statements) == 2 and if_stmt.else_block is None:
+            recursive_block = statements[1:]
+        else:
+            return None
+
+        if not (self._is_empty_test(if_stmt.condition, xs) and
+                len(if_stmt.then_block.statements) == 1 and
+                isinstance(if_stmt.then_block.statements[0], ReturnStatement) and
+                len(recursive_block) == 1 and
+                isinstance(recursive_block[0], ReturnStatement)):
+            return None
+
+        base = if_stmt.then_block.statements[0].value
+        step = recursive_block[0].value
+        if not isinstance(step, BinaryExpression):
+            return None
+
+        operator = step.operator
+        if self._is_walk_call(step.right, name, xs):
+            element, call_on_left = step.left, False
+        elif self._is_walk_call(step.left, name, xs) and operator != '::':
+            element, call_on_left = step.right, True
+        else:
+            return None
+
+        if operator in NON_FAILING_OPERATORS:
+            valid_base = isinstance(base, IntegerLiteral)
+        else:
+            valid_base = operator == '::' and isinstance(base, EmptyList)
+        if not valid_base or not self._is_safe_step(element, xs):
+            return None
+
+        return {'function': function, 'parameter': xs, 'base': base,
+                'element': element, 'operator': operator,
+                'is_recursive_call_on_left': call_on_left}
+
+    def _compared_parameters(self, function: Function) -> set:
+        """
+        Parameters compared by the first condition of the body with a
+        checked comparison: past that condition they are integers.
+        """
+        statements = function.body.statements
+        if not statements or not isinstance(statements[0], IfStatement):
+            return set()
+        condition = statements[0].condition
+        if not (isinstance(condition, ComparisonCondition) and
+                condition.operator in CHECKED_COMPARISONS):
+            return set()
+        assigned = {node.variable for node in iter_nodes(function.body)
+                    if isinstance(node, Assignment)}
+        return {operand.name for operand in (condition.left, condition.right)
+                if isinstance(operand, Identifier) and operand.name in function.parameters
+                and operand.name not in assigned}
+
+    def _is_integer_valued(self, expr, integer_parameters: set) -> bool:
+        """True if expr always yields an integer when its evaluation succeeds."""
+        if isinstance(expr, IntegerLiteral):
+            return True
+        if isinstance(expr, Identifier):
+            return expr.name in integer_parameters
+        if isinstance(expr, BinaryExpression):
+            return expr.operator in INTEGER_OPERATORS
+        if isinstance(expr, UnaryExpression):
+            return expr.operator in ('+', '-')
+        return False
+
+    def _is_safe_step(self, expr, xs: str) -> bool:
+        """True if expr uses xs only as head(xs) and cannot fail on an integer head."""
+        # Every node must be safe on its own: check them with an explicit stack
+        stack = [expr]
+        while stack:
+            expr = stack.pop()
+            if isinstance(expr, IntegerLiteral):
+                continue
+            if isinstance(expr, UnaryExpression):
+                if expr.operator == 'head':
+                    if not self.table.same_tree(expr, UnaryExpression('head', Identifier(xs))):
+                        return False
+                elif expr.operator in ('+', '-'):
+                    stack.append(expr.operand)
+                else:
+                    return False
+            elif isinstance(expr, BinaryExpression) and expr.operator in NON_FAILING_OPERATORS:
+                stack.extend((expr.left, expr.right))
+            elif (isinstance(expr, BinaryExpression) and expr.operator in ('/', '%') and
+                  isinstance(expr.right, IntegerLiteral) and expr.right.value != 0):
+                stack.append(expr.left)
+            else:
+                return False
+        return True
+
+    def _is_empty_test(self, condition, xs: str) -> bool:
+        """xs == [] or [] == xs"""
+        return any(self.table.same_tree(condition, template) for template in (
+            ComparisonCondition(Identifier(xs), '==', EmptyList()),
+            ComparisonCondition(EmptyList(), '==', Identifier(xs))))
+
+    def _is_walk_call(self, expr, name: str, xs: str) -> bool:
+        """name(tail(xs))"""
+        return self.table.same_tree(
+            expr, FunctionCall(Identifier(name), [UnaryExpression('tail', Identifier(xs))]))
+
+    @staticmethod
+    def _is_call_to(expr, name: str) -> bool:
+        return (isinstance(expr, FunctionCall) and isinstance(expr.function, Identifier) and
+                expr.function.name == name)
+
+    # Rewriting
+
+    def _create_fused_function(self, producer: Dict[str, Any], consumer: Dict[str, Any]) -> str:
+        """
+        Build the fused function: a copy of the producer in which [] returns
+        the consumer's base value and element :: p(args) returns the
+        consumer's step applied to element, combined with fused(args).
+        """
+        producer_function = producer['function']
+        name = self._get_unique_name(
+            f"{producer_function.name}_{consumer['function'].name}_fused")
+        body = copy_tree(producer_function.body)
+
+        producer_names = {node.name for node in iter_nodes(producer_function)
+                          if isinstance(node, Identifier)}
+        producer_names.update(producer_function.parameters)
+        producer_names.update(node.variable for node in iter_nodes(producer_function.body)
+                              if isinstance(node, Assignment))
+
+        for block in [node for node in iter_nodes(body) if isinstance(node, Block)]:
+            statements = []
+            for statement in block.statements:
+                if isinstance(statement, ReturnStatement):
+                    statements.extend(self._fused_return(
+                        statement, name, consumer, producer_names))
+                else:
+                    statements.append(statement)
+            block.statements = statements
+
+        self.helper_functions.append(
+            Function(name, list(producer_function.parameters), body, producer_function.position))
+        return name
+
+    def _fused_return(self, statement: ReturnStatement, name: str,
+                      consumer: Dict[str, Any], producer_names: set) -> List[Statement]:
+        """Rewrite one return of the producer copy."""
+        value = statement.value
+        if isinstance(value, EmptyList):
+            return [ReturnStatement(copy_tree(consumer['base']), statement.position)]
+
+        statements = []
+        element = value.left
+        if not isinstance(element, (Identifier, IntegerLiteral)):
+            # The element is evaluated once, at its original place, even if
+            # the consumer's step uses head(xs) several times or not at all
+            local = self._local_name('element', producer_names)
+            statements.append(Assignment(local, element, element.position))
+            element = Identifier(local)
+
+        step = self._substitute_head(copy_tree(consumer['element']),
+                                     consumer['parameter'], element)
+        call = FunctionCall(Identifier(name, value.right.function.position),
+                            value.right.arguments, value.right.position)
+        if consumer['is_recursive_call_on_left']:
+            result = BinaryExpression(call, consumer['operator'], step, value.position)
+        else:
+            result = BinaryExpression(step, consumer['operator'], call, value.position)
+        statements.append(ReturnStatement(result, statement.position))
+        return statements
+
+    def _substitute_head(self, expr, xs: str, element):
+        """Replace every head(xs) in the consumer's step with the element."""
+        if isinstance(expr, UnaryExpression) and expr.operator == 'head':
+            return copy_tree(element)
+        # Parents of the head(xs) nodes are rewritten in place, with an explicit stack
+        stack = [expr]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, UnaryExpression):
+                fields = ('operand',)
+            elif isinstance(node, BinaryExpression):
+                fields = ('left', 'right')
+            else:
+                continue
+            for field in fields:
+                child = getattr(node, field)
+                if isinstance(child, UnaryExpression) and child.operator == 'head':
+                    setattr(node, field, copy_tree(element))
+                else:
+                    stack.append(child)
+        return expr
+
+    @staticmethod
+    def _local_name(base_name: str, used: set) -> str:
+        """A local variable name not used by the producer."""
+        name = base_name
+        counter = 0
+        while name in used:
+            counter += 1
+            name = f"{base_name}_{counter}"
+        used.add(name)
+        return name
@@ -86,23 +86,25 @@ class Environment:
 
     def get_variable(self, unique_name: str) -> Any:
         """Ottiene il valore di una variabile usando il nome univoco."""
-        if unique_name in self.variables:
-            return self.variables[unique_name]
-        elif self.parent:
-            return self.parent.get_variable(unique_name)
-        else:
-            raise SaltinoRuntimeError(
-                f"Undefined variable with unique name: {unique_name}")
+        environment = self
+        while environment is not None:
+            if unique_name in environment.variables:
+                return environment.variables[unique_name]
+            environment = environment.parent
+        raise SaltinoRuntimeError(
+            f"Undefined variable with unique name: {unique_name}")
 
     def set_variable(self, unique_name: str, value: Any):
         """Imposta il valore di una variabile esistente usando il nome univoco."""
-        if unique_name in self.variables:
-            self.variables[unique_name] = value
-        elif self.parent:
-            self.parent.set_variable(unique_name, value)
-        else:
-            # Se la variabile non esiste, la creiamo nell'ambiente corrente
-            self.variables[unique_name] = value
+        environment = self
+        while environment is not None:
+            if unique_name in environment.variables:
+                environment.variables[unique_name] = value
+                return
+            environment = environment.parent
+        # Se la variabile non esiste, la creiamo nell'ambiente corrente (e non
+        # in quello globale: ogni chiamata, anche ricorsiva, ha i suoi locali)
+        self.variables[unique_name] = value
 
     def define_function(self, name: str, function: Any):
         """Definisce una funzione nell'ambiente corrente."""
@@ -110,9 +112,9 @@ class Environment:
 
     def get_function(self, name: str) -> Any:
         """Ottiene una funzione per nome."""
-        if name in self.functions:
-            return self.functions[name]
-        elif self.parent:
-            return self.parent.get_function(name)
-        else:
-            raise SaltinoRuntimeError(f"Undefined function: {name}")
+        environment = self
+        while environment is not None:
+            if name in environment.functions:
+                return environment.functions[name]
+            environment = environment.parent
+        raise SaltinoRuntimeError(f"Undefined function: {name}")
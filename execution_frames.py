@@ -20,6 +20,10 @@ class FrameType(Enum):
     IF_STATEMENT = "if_statement"
     ASSIGNMENT = "assignment"
     RETURN = "return"
+    # Forzatura della coda sospesa di una lista pigra (node è la LazyList)
+    FORCE = "force"
+    # Callback di map, filter o foldl (node è il CallbackLoop del preludio)
+    BUILTIN = "builtin"
 
 
 @dataclass
@@ -84,4 +88,9 @@ class ExecutionFrame:
             self.state.update({
                 'value_evaluated': False,
                 'return_value': None
+            })
+        elif self.frame_type in (FrameType.FORCE, FrameType.BUILTIN):
+            self.state.update({
+                'value_evaluated': False,
+                'value': None
             })
\ No newline at end of file
@@ -8,7 +8,11 @@ from execution_environment import Environment
 from AST.ASTNodes import *
 from AST.ASTsymbol_table import SymbolKind
 from errors.runtime_errors import SaltinoRuntimeError
-from typing import Any
+from lazy_lists import LazyList, cons_onto_lazy, lazy_cons
+from packed_lists import PackedList, is_list, type_name
+from prelude import BuiltinFunction, CallbackLoop
+from saltino_operators import SaltinoOperators
+from typing import Any, List, Tuple
 
 
 def execute_function_frame(frame: ExecutionFrame, interpreter):
@@ -106,6 +110,8 @@ def execute_expression_frame(frame: ExecutionFrame, interpreter):
     elif isinstance(node, EmptyList):
         frame.result = []
         frame.completed = True
+    elif isinstance(node, ListLiteral):
+        execute_list_literal(frame, interpreter)
     elif isinstance(node, BinaryExpression):
         execute_binary_expression(frame, interpreter)
     elif isinstance(node, UnaryExpression):
@@ -131,6 +137,12 @@ def execute_binary_expression(frame: ExecutionFrame, interpreter):
             interpreter.push_frame(FrameType.EXPRESSION,
                                    expr.left, frame.environment)
     elif current_index == 1:
+        if frame.state.get('lazy_cons'):
+            # Cons in posizione di return con liste pigre: la coda è sospesa
+            frame.result = lazy_cons(
+                operands_evaluated[0], expr.right, frame.environment)
+            frame.completed = True
+            return
         # Valutiamo l'operando destro
         if is_condition_node(expr.right):
             interpreter.push_frame(FrameType.CONDITION,
@@ -143,7 +155,20 @@ def execute_binary_expression(frame: ExecutionFrame, interpreter):
         left_value = operands_evaluated[0]
         right_value = operands_evaluated[1]
 
-        if expr.operator in interpreter.binary_operators:
+        if interpreter.lazy_lists:
+            if expr.operator == '::' and isinstance(right_value, LazyList):
+                frame.result = cons_onto_lazy(left_value, right_value)
+                frame.completed = True
+                return
+            values = interpreter.force_operands([left_value, right_value])
+            if values is None:
+                return
+            left_value, right_value = values
+
+        if expr.operator_impl is not None and not interpreter.checked_operators:
+            # Operatore legato al nodo dopo l'analisi
+            frame.result = expr.operator_impl(left_value, right_value)
+        elif expr.operator in interpreter.binary_operators:
             frame.result = interpreter.binary_operators[expr.operator](
                 left_value, right_value)
         else:
@@ -153,6 +178,37 @@ def execute_binary_expression(frame: ExecutionFrame, interpreter):
         frame.completed = True
 
 
+def execute_list_literal(frame: ExecutionFrame, interpreter):
+    """Esegue un letterale di lista [e1, ..., en]."""
+    literal = frame.node
+    if literal.value is not None:
+        # Letterale costante: le liste compatte sono immutabili e condivise,
+        # quelle corte vengono copiate
+        value = literal.value
+        frame.result = value if type(value) is PackedList else list(value)
+        frame.completed = True
+        return
+
+    values = frame.state['operands_evaluated']
+    current_index = frame.state['current_operand_index']
+    if current_index < len(literal.elements):
+        # Gli elementi sono valutati da sinistra a destra
+        element = literal.elements[current_index]
+        if is_condition_node(element):
+            interpreter.push_frame(FrameType.CONDITION, element, frame.environment)
+        else:
+            interpreter.push_frame(FrameType.EXPRESSION, element, frame.environment)
+        return
+
+    if interpreter.lazy_lists:
+        values = interpreter.force_operands(values)
+        if values is None:
+            return
+    # Stessi controlli ed errori di e1 :: ... :: en :: []
+    frame.result = SaltinoOperators.cons_all(values, [])
+    frame.completed = True
+
+
 def execute_unary_expression(frame: ExecutionFrame, interpreter):
     """Esegue un'espressione unaria."""
     expr = frame.node
@@ -171,7 +227,28 @@ def execute_unary_expression(frame: ExecutionFrame, interpreter):
         # L'operando è stato valutato
         operand_value = operands_evaluated[0]
 
-        if expr.operator in interpreter.unary_operators:
+        if interpreter.lazy_lists and isinstance(operand_value, LazyList):
+            if expr.operator == 'head':
+                frame.result = operand_value.head
+                frame.completed = True
+                return
+            if expr.operator == 'tail':
+                if not operand_value.forced:
+                    # Forza un solo livello: la coda può restare pigra
+                    interpreter.push_frame(FrameType.FORCE, operand_value,
+                                           operand_value.environment)
+                    return
+                frame.result = operand_value.rest
+                frame.completed = True
+                return
+            values = interpreter.force_operands([operand_value])
+            if values is None:
+                return
+            operand_value = values[0]
+
+        if expr.operator_impl is not None and not interpreter.checked_operators:
+            frame.result = expr.operator_impl(operand_value)
+        elif expr.operator in interpreter.unary_operators:
             frame.result = interpreter.unary_operators[expr.operator](
                 operand_value)
         else:
@@ -209,7 +286,7 @@ def execute_function_call_expression(frame: ExecutionFrame, interpreter):
             frame.state['function_resolved'] = True
         else:
             raise SaltinoRuntimeError(
-                f"Cannot call non-function value of type {type(function_value).__name__}"
+                f"Cannot call non-function value of type {type_name(function_value)}"
             )
 
     # Valutiamo gli argomenti
@@ -237,6 +314,14 @@ def execute_function_call_expression(frame: ExecutionFrame, interpreter):
                 f"got {len(args_evaluated)}"
             )
 
+        if isinstance(function, BuiltinFunction):
+            # Funzione del preludio: il risultato è immediato
+            ready, result = call_builtin(function, args_evaluated, interpreter, frame)
+            if ready:
+                frame.result = result
+                frame.completed = True
+            return
+
         # Creiamo un nuovo ambiente per la funzione
         function_env = interpreter._create_new_environment(
             interpreter.global_env)
@@ -288,7 +373,7 @@ def execute_condition_frame(frame: ExecutionFrame, interpreter):
             # Verifica che il valore sia un booleano
             if type(value) is not bool:
                 raise SaltinoRuntimeError(
-                    f"Variable '{node.name}' used in condition must be boolean, got {type(value).__name__}")
+                    f"Variable '{node.name}' used in condition must be boolean, got {type_name(value)}")
             frame.result = value
             frame.completed = True
         except SaltinoRuntimeError as e:
@@ -324,7 +409,7 @@ def execute_binary_condition(frame: ExecutionFrame, interpreter):
         # Controllo di tipo per il primo operando
         if type(left_value) is not bool:
             raise SaltinoRuntimeError(
-                f"Logical operators can only operate on boolean values, got {type(left_value).__name__}")
+                f"Logical operators can only operate on boolean values, got {type_name(left_value)}")
 
         if condition.operator == 'and' and not left_value:
             frame.result = False
@@ -343,7 +428,9 @@ def execute_binary_condition(frame: ExecutionFrame, interpreter):
         left_value = operands_evaluated[0]
         right_value = operands_evaluated[1]
 
-        if condition.operator in interpreter.logical_operators:
+        if condition.operator_impl is not None:
+            frame.result = condition.operator_impl(left_value, right_value)
+        elif condition.operator in interpreter.logical_operators:
             frame.result = interpreter.logical_operators[condition.operator](
                 left_value, right_value)
         else:
@@ -371,7 +458,7 @@ def execute_unary_condition(frame: ExecutionFrame, interpreter):
             # Controllo di tipo: negazione può operare solo su valori booleani
             if type(operand_value) is not bool:
                 raise SaltinoRuntimeError(
-                    f"Logical negation can only operate on boolean values, got {type(operand_value).__name__}")
+                    f"Logical negation can only operate on boolean values, got {type_name(operand_value)}")
             frame.result = not operand_value
         else:
             raise SaltinoRuntimeError(
@@ -399,7 +486,21 @@ def execute_comparison_condition(frame: ExecutionFrame, interpreter):
         left_value = operands_evaluated[0]
         right_value = operands_evaluated[1]
 
-        if comparison.operator in interpreter.comparison_operators:
+        if interpreter.lazy_lists and (isinstance(left_value, LazyList) or
+                                       isinstance(right_value, LazyList)):
+            if comparison.operator == '==' and not _may_equal_lazy(left_value, right_value):
+                # Una lista pigra non è mai vuota e non è uguale a un non-lista
+                frame.result = False
+                frame.completed = True
+                return
+            values = interpreter.force_operands([left_value, right_value])
+            if values is None:
+                return
+            left_value, right_value = values
+
+        if comparison.operator_impl is not None and not interpreter.checked_operators:
+            frame.result = comparison.operator_impl(left_value, right_value)
+        elif comparison.operator in interpreter.comparison_operators:
             frame.result = interpreter.comparison_operators[comparison.operator](
                 left_value, right_value)
         else:
@@ -436,7 +537,7 @@ def execute_function_call_in_condition(frame: ExecutionFrame, interpreter):
             frame.state['function_resolved'] = True
         else:
             raise SaltinoRuntimeError(
-                f"Cannot call non-function value of type {type(function_value).__name__}"
+                f"Cannot call non-function value of type {type_name(function_value)}"
             )
 
     # Valutiamo gli argomenti
@@ -464,6 +565,13 @@ def execute_function_call_in_condition(frame: ExecutionFrame, interpreter):
                 f"got {len(args_evaluated)}"
             )
 
+        if isinstance(function, BuiltinFunction):
+            ready, result = call_builtin(function, args_evaluated, interpreter, frame)
+            if ready:
+                frame.state['function_result'] = result
+                frame.state['function_called'] = True
+            return
+
         # Creiamo un nuovo ambiente per la funzione
         function_env = interpreter._create_new_environment(
             interpreter.global_env)
@@ -502,7 +610,7 @@ def execute_function_call_in_condition(frame: ExecutionFrame, interpreter):
         # Verifichiamo che il risultato sia un booleano
         if type(result) is not bool:
             raise SaltinoRuntimeError(
-                f"Function used in condition must return boolean, got {type(result).__name__}")
+                f"Function used in condition must return boolean, got {type_name(result)}")
         frame.result = result
         frame.completed = True
 
@@ -607,16 +715,27 @@ def execute_return_frame(frame: ExecutionFrame, interpreter):
             if interpreter.debug_mode:
                 print(
                     f"[TCO] Phase 3: Performing stack manipulation for tail call.")
+            function_obj = frame.state['tail_call_function_value']
+            if isinstance(function_obj, BuiltinFunction):
+                # Funzione del preludio: nessun frame da sostituire, il
+                # risultato è il valore del return
+                args = frame.state['tail_call_evaluated_args']
+                if len(args) != len(function_obj.parameters):
+                    raise SaltinoRuntimeError(
+                        f"Function '{function_obj.name}' expects {len(function_obj.parameters)} arguments, "
+                        f"got {len(args)}"
+                    )
+                ready, result = call_builtin(function_obj, args, interpreter, frame)
+                if ready:
+                    _return_from_function(frame, interpreter, result)
+                return
             # Phase 3: Stack manipulation for TCO
-            # Pop RETURN, BLOCK, FUNCTION_CALL frames
-            # (RETURN is current frame)
-            interpreter.pop_frame()  # Pop RETURN
-            # Pop BLOCK (function body)
-            if interpreter.execution_stack and interpreter.execution_stack[-1].frame_type == FrameType.BLOCK:
-                interpreter.pop_frame()
-            # Pop FUNCTION_CALL (current function)
-            if interpreter.execution_stack and interpreter.execution_stack[-1].frame_type == FrameType.FUNCTION_CALL:
-                interpreter.pop_frame()
+            # Pop RETURN (current frame) and every frame up to and including
+            # the FUNCTION_CALL of the current function: the body BLOCK and,
+            # when the return is inside an if, the IF and branch BLOCK frames
+            while interpreter.execution_stack:
+                if interpreter.pop_frame().frame_type == FrameType.FUNCTION_CALL:
+                    break
             # Prepare new environment for the tail call
             function_obj = frame.state['tail_call_function_value']
             args = frame.state['tail_call_evaluated_args']
@@ -667,21 +786,124 @@ def execute_return_frame(frame: ExecutionFrame, interpreter):
                 interpreter.push_frame(FrameType.CONDITION,
                                        return_stmt.value, frame.environment)
             else:
-                interpreter.push_frame(FrameType.EXPRESSION,
-                                       return_stmt.value, frame.environment)
+                value_frame = interpreter.push_frame(FrameType.EXPRESSION,
+                                                     return_stmt.value, frame.environment)
+                if (interpreter.lazy_lists and isinstance(return_stmt.value, BinaryExpression)
+                        and return_stmt.value.operator == '::'):
+                    value_frame.state['lazy_cons'] = True
         else:
             # Il valore è stato valutato
-            return_value = frame.state['return_value']
+            _return_from_function(frame, interpreter, frame.state['return_value'])
+
+
+def _return_from_function(frame: ExecutionFrame, interpreter, return_value: Any):
+    """Propaga il valore di return fino al frame della funzione."""
+    # Rimuoviamo tutti i frame fino alla funzione
+    while interpreter.execution_stack:
+        current = interpreter.pop_frame()
+        if current.frame_type == FrameType.FUNCTION_CALL:
+            # Impostiamo il risultato e completiamo la funzione
+            current.result = return_value
+            current.completed = True
+            interpreter.execution_stack.append(current)
+            break
+
+    frame.completed = True
+
+
+def call_builtin(function: BuiltinFunction, arguments: List[Any], interpreter,
+                 frame: ExecutionFrame) -> Tuple[bool, Any]:
+    """
+    Esegue una funzione del preludio. Restituisce (False, None) se prima va
+    forzata una lista pigra o se map, filter o foldl devono chiamare funzioni
+    Saltino con un frame BUILTIN: il frame chiamante verrà rieseguito e, nel
+    secondo caso, troverà il risultato in frame.state['builtin_result'].
+    """
+    if 'builtin_result' in frame.state:
+        return True, frame.state.pop('builtin_result')
+    if interpreter.lazy_lists:
+        arguments = interpreter.force_operands(arguments)
+        if arguments is None:
+            return False, None
+    result = function.call(arguments, interpreter)
+    if isinstance(result, CallbackLoop):
+        interpreter.push_frame(FrameType.BUILTIN, result, frame.environment)
+        return False, None
+    return True, result
+
+
+def execute_builtin_frame(frame: ExecutionFrame, interpreter):
+    """
+    Esegue il CallbackLoop di map, filter o foldl: ogni chiamata al callback
+    è un frame figlio di questo, sullo stack di esecuzione principale.
+    """
+    loop = frame.node
+
+    if frame.state['value_evaluated']:
+        value = frame.state['value']
+        if interpreter.lazy_lists:
+            # Come il risultato di una chiamata dall'esterno, il valore
+            # restituito dal callback viene forzato per intero
+            forced = interpreter.force_operands([value])
+            if forced is None:
+                return
+            value = forced[0]
+        frame.state['value_evaluated'] = False
+        loop.receive(value)
+
+    if loop.done():
+        frame.result = loop.result()
+        frame.completed = True
+        return
 
-            # Dobbiamo propagare il return fino al frame della funzione
-            # Rimuoviamo tutti i frame fino alla funzione
-            while interpreter.execution_stack:
-                current = interpreter.pop_frame()
-                if current.frame_type == FrameType.FUNCTION_CALL:
-                    # Impostiamo il risultato e completiamo la funzione
-                    current.result = return_value
-                    current.completed = True
-                    interpreter.execution_stack.append(current)
-                    break
+    function = loop.callback
+    arguments = loop.arguments()
+    if isinstance(function, BuiltinFunction):
+        # Un'altra funzione di ordine superiore usata come callback
+        ready, result = call_builtin(function, arguments, interpreter, frame)
+        if ready:
+            frame.state['value'] = result
+            frame.state['value_evaluated'] = True
+        return
 
-            frame.completed = True
+    function_env = interpreter._create_new_environment(interpreter.global_env)
+    function_scope = interpreter.semantic_analyzer.get_node_info(function, 'scope')
+    if not function_scope:
+        raise SaltinoRuntimeError(
+            f"No scope information for function '{function.name}'")
+    for param, arg in zip(function.parameters, arguments):
+        param_info = function_scope.lookup_local(param)
+        if not param_info or param_info.kind != SymbolKind.PARAMETER:
+            raise SaltinoRuntimeError(
+                f"Parameter '{param}' not found in function scope")
+        function_env.define_variable(param_info.unique_name, arg)
+
+    func_frame = interpreter.push_frame(
+        FrameType.FUNCTION_CALL, function, function_env)
+    func_frame.state['function'] = function
+    func_frame.state['body_executed'] = False
+
+
+def execute_force_frame(frame: ExecutionFrame, interpreter):
+    """Valuta la coda sospesa di una lista pigra e la memorizza nella cella."""
+    cell = frame.node
+
+    if not frame.state['value_evaluated']:
+        if is_condition_node(cell.node):
+            interpreter.push_frame(FrameType.CONDITION,
+                                   cell.node, frame.environment)
+        else:
+            interpreter.push_frame(FrameType.EXPRESSION,
+                                   cell.node, frame.environment)
+    else:
+        cell.resolve(frame.state['value'])
+        frame.result = cell.rest
+        frame.completed = True
+
+
+def _may_equal_lazy(left_value: Any, right_value: Any) -> bool:
+    """Falso se l'uguaglianza con una lista pigra si decide senza forzarla."""
+    for value in (left_value, right_value):
+        if value == [] or not (is_list(value) or isinstance(value, LazyList)):
+            return False
+    return True
@@ -0,0 +1,386 @@
+"""
+Codifica piatta (struct-of-arrays) dell'AST Saltino, con una forma su
+disco che si può mappare in memoria in sola lettura.
+
+Ogni nodo è un indice in colonne parallele di interi a 64 bit:
+
+    kind         codice del tipo di nodo (posizione in NODE_KINDS)
+    operator     operatore (indice nel pool di stringhe) o NO_VALUE
+    first_child  inizio dei figli nell'array children
+    child_count  numero di figli
+    position     riga nei 32 bit alti e colonna nei 32 bassi, o NO_VALUE
+    value        dato del nodo: nome (pool di stringhe) di funzioni,
+                 variabili e identificatori, indice nel pool dei letterali
+                 per gli interi, 0/1 per i booleani, altrimenti NO_VALUE
+    symbol       nome univoco assegnato dal SemanticAnalyzer (pool di
+                 stringhe) o NO_VALUE
+
+I figli di un nodo sono contigui in children, nell'ordine di valutazione
+(quello di type_inference.child_nodes); i parametri di una funzione sono
+nodi Identifier che precedono il corpo. Il nodo 0 è la radice. Gli interi
+letterali che non stanno in 64 bit sono scritti come testo nel pool di
+stringhe e il loro value vale BIG_LITERAL - indice.
+
+Il buffer serializzato contiene un'intestazione e poi, in little-endian,
+le colonne, children, i letterali, gli offset delle stringhe e i byte
+UTF-8 delle stringhe. load_flat_ast lo mappa in memoria: le colonne sono
+memoryview sul file e nessun nodo viene creato finché non si chiama
+to_program, quindi più processi che caricano lo stesso file condividono le
+stesse pagine. Per eseguire il programma, analyze_flat_ast ricostruisce
+l'AST a oggetti e ripete analisi semantica e inferenza dei tipi (le
+trasformazioni e le ottimizzazioni sono già applicate).
+"""
+
+import mmap
+import struct
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from AST.ASTNodes import (
+    Assignment, BinaryCondition, BinaryExpression, Block, BooleanLiteral,
+    ComparisonCondition, EmptyList, Function, FunctionCall, Identifier,
+    IfStatement, IntegerLiteral, ListLiteral, Program, ReturnStatement,
+    SourcePosition, UnaryCondition, UnaryExpression, constant_value, walk,
+)
+from AST.type_inference import child_nodes
+from binary_io import NATIVE_LITTLE_ENDIAN
+from errors.runtime_errors import SaltinoRuntimeError
+
+FLAT_AST_MAGIC = b'SALTAST\x00'
+FLAT_AST_VERSION = 1
+
+# Tipi di nodo, nell'ordine dei codici della colonna kind
+NODE_KINDS = (
+    Program, Function, Block, Assignment, IfStatement, ReturnStatement,
+    BinaryExpression, UnaryExpression, FunctionCall, IntegerLiteral,
+    BooleanLiteral, Identifier, EmptyList, ListLiteral,
+    BinaryCondition, UnaryCondition, ComparisonCondition,
+)
+_KIND_CODES = {kind: code for code, kind in enumerate(NODE_KINDS)}
+
+# Colonne dei nodi, nell'ordine in cui sono scritte nel buffer
+NODE_COLUMNS = ('kind', 'operator', 'first_child', 'child_count', 'position',
+                'value', 'symbol')
+
+NO_VALUE = -1
+BIG_LITERAL = -2
+POSITION_SHIFT = 32
+_COLUMN_MASK = (1 << POSITION_SHIFT) - 1
+
+# Magic, versione, nodi, figli, letterali, stringhe, byte delle stringhe;
+# riempita fino a HEADER_SIZE così le colonne sono allineate a 8 byte
+_HEADER = struct.Struct('<8s6q')
+HEADER_SIZE = 64
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+class FlatAST:
+    """AST piatto: colonne parallele di interi, pool di letterali e di stringhe."""
+
+    def __init__(self, columns: Dict[str, Sequence[int]], children: Sequence[int],
+                 literals: Sequence[int], string_offsets: Sequence[int],
+                 string_data: bytes):
+        self.columns = columns
+        self.children_index = children
+        self.literals = literals
+        self.string_offsets = string_offsets
+        self.string_data = string_data
+        self._strings: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.columns['kind'])
+
+    # ==================== LETTURA DEI NODI ====================
+
+    def kind(self, node: int) -> type:
+        return NODE_KINDS[self.columns['kind'][node]]
+
+    def children(self, node: int) -> Sequence[int]:
+        first = self.columns['first_child'][node]
+        return self.children_index[first:first + self.columns['child_count'][node]]
+
+    def position(self, node: int) -> Optional[SourcePosition]:
+        packed = self.columns['position'][node]
+        if packed == NO_VALUE:
+            return None
+        return SourcePosition(packed >> POSITION_SHIFT, packed & _COLUMN_MASK)
+
+    def operator(self, node: int) -> Optional[str]:
+        return self._optional_string(self.columns['operator'][node])
+
+    def name(self, node: int) -> Optional[str]:
+        """Nome di una funzione, di un identificatore o della variabile assegnata."""
+        return self._optional_string(self.columns['value'][node])
+
+    def symbol(self, node: int) -> Optional[str]:
+        """Nome univoco del SemanticAnalyzer, se l'AST è stato appiattito con l'analisi."""
+        return self._optional_string(self.columns['symbol'][node])
+
+    def integer(self, node: int) -> int:
+        value = self.columns['value'][node]
+        if value <= BIG_LITERAL:
+            return int(self.string(BIG_LITERAL - value))
+        return self.literals[value]
+
+    def string(self, index: int) -> str:
+        text = self._strings.get(index)
+        if text is None:
+            start, end = self.string_offsets[index], self.string_offsets[index + 1]
+            text = self._strings[index] = bytes(self.string_data[start:end]).decode('utf-8')
+        return text
+
+    def _optional_string(self, index: int) -> Optional[str]:
+        return None if index == NO_VALUE else self.string(index)
+
+    # ==================== CONVERSIONI ====================
+
+    def to_program(self) -> Program:
+        """Ricostruisce l'AST a oggetti (senza informazioni semantiche)."""
+        return walk(0, self._build_node)
+
+    def _build_node(self, node: int):
+        kind = self.kind(node)
+        position = self.position(node)
+        if kind is IntegerLiteral:
+            return IntegerLiteral(self.integer(node), position)
+        if kind is BooleanLiteral:
+            return BooleanLiteral(bool(self.columns['value'][node]), position)
+        if kind is Identifier:
+            return Identifier(self.name(node), position)
+        if kind is EmptyList:
+            return EmptyList(position)
+        return self._build_composite(node, kind, position)
+
+    def _build_composite(self, node: int, kind: type, position: Optional[SourcePosition]):
+        children = self.children(node)
+        if kind is Function:
+            parameters = [self.name(child) for child in children[:-1]]
+            body = yield children[-1]
+            return Function(self.name(node), parameters, body, position)
+        built = []
+        for child in children:
+            built.append((yield child))
+        if kind in (Program, Block):
+            return kind(built, position)
+        if kind is ListLiteral:
+            literal = ListLiteral(built, position)
+            literal.value = constant_value(built)
+            return literal
+        if kind is Assignment:
+            return Assignment(self.name(node), built[0] if built else None, position)
+        if kind is ReturnStatement:
+            return ReturnStatement(built[0] if built else None, position)
+        if kind is IfStatement:
+            else_block = built[2] if len(built) > 2 else None
+            return IfStatement(built[0], built[1], else_block, position)
+        if kind is FunctionCall:
+            return FunctionCall(built[0], built[1:], position)
+        if kind in (UnaryExpression, UnaryCondition):
+            return kind(self.operator(node), built[0], position)
+        return kind(built[0], self.operator(node), built[1], position)
+
+    def to_bytes(self) -> bytes:
+        """Forma serializzata: intestazione e sezioni little-endian."""
+        header = _HEADER.pack(FLAT_AST_MAGIC, FLAT_AST_VERSION, len(self),
+                              len(self.children_index), len(self.literals),
+                              len(self.string_offsets) - 1, len(self.string_data))
+        parts = [header.ljust(HEADER_SIZE, b'\x00')]
+        for section in self._int_sections():
+            buffer = array('q', section)
+            if not NATIVE_LITTLE_ENDIAN:
+                buffer.byteswap()
+            parts.append(buffer.tobytes())
+        parts.append(bytes(self.string_data))
+        return b''.join(parts)
+
+    def _int_sections(self) -> List[Sequence[int]]:
+        return ([self.columns[name] for name in NODE_COLUMNS] +
+                [self.children_index, self.literals, self.string_offsets])
+
+    @classmethod
+    def from_buffer(cls, buffer: Any) -> 'FlatAST':
+        """
+        AST piatto sopra un buffer serializzato (bytes, mmap...). Su macchine
+        little-endian le colonne sono viste sul buffer, senza copie.
+        """
+        data = memoryview(buffer)
+        if len(data) < HEADER_SIZE:
+            raise SaltinoRuntimeError("Invalid flat AST: truncated header")
+        (magic, version, nodes, children, literals,
+         strings, string_bytes) = _HEADER.unpack_from(data)
+        if magic != FLAT_AST_MAGIC:
+            raise SaltinoRuntimeError("Invalid flat AST: wrong magic number")
+        if version != FLAT_AST_VERSION:
+            raise SaltinoRuntimeError(f"Unsupported flat AST version {version}")
+        lengths = [nodes] * len(NODE_COLUMNS) + [children, literals, strings + 1]
+        if len(data) != HEADER_SIZE + 8 * sum(lengths) + string_bytes:
+            raise SaltinoRuntimeError("Invalid flat AST: wrong size")
+
+        sections = []
+        offset = HEADER_SIZE
+        for length in lengths:
+            section = data[offset:offset + 8 * length].cast('q')
+            if not NATIVE_LITTLE_ENDIAN:
+                # Su macchine big-endian i dati vanno convertiti in una copia
+                section = array('q', section.tobytes())
+                section.byteswap()
+            sections.append(section)
+            offset += 8 * length
+        columns = dict(zip(NODE_COLUMNS, sections))
+        return cls(columns, sections[-3], sections[-2], sections[-1], data[offset:])
+
+
+def flatten(program: Program, semantic_analyzer: Any = None) -> FlatAST:
+    """
+    Codifica piatta di un programma. Con il semantic_analyzer che lo ha
+    analizzato, la colonna symbol contiene i nomi univoci di funzioni,
+    variabili assegnate e identificatori.
+    """
+    columns = {name: array('q') for name in NODE_COLUMNS}
+    children = array('q')
+    literals = array('q')
+    literal_indices: Dict[int, int] = {}
+    strings: Dict[str, int] = {}
+
+    def string(text: Optional[str]) -> int:
+        if text is None:
+            return NO_VALUE
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    def literal(value: int) -> int:
+        if not _INT64_MIN <= value <= _INT64_MAX:
+            return BIG_LITERAL - string(str(value))
+        index = literal_indices.get(value)
+        if index is None:
+            index = literal_indices[value] = len(literals)
+            literals.append(value)
+        return index
+
+    # Ogni nodo riceve il suo indice quando viene estratto dalla pila e lo
+    # scrive nello slot riservato dal padre in children; i parametri delle
+    # funzioni arrivano con il loro nome univoco già risolto
+    stack = [(program, None, None)]
+    while stack:
+        node, slot, symbol = stack.pop()
+        index = len(columns['kind'])
+        if slot is not None:
+            children[slot] = index
+        kind = type(node)
+        if symbol is None:
+            symbol = _unique_name(node, semantic_analyzer)
+        if kind is Function:
+            node_children = [Identifier(parameter) for parameter in node.parameters]
+            node_children.append(node.body)
+            symbols = _parameter_names(node, semantic_analyzer) + [None]
+        else:
+            node_children = child_nodes(node)
+            symbols = [None] * len(node_children)
+
+        operator = getattr(node, 'operator', None)
+        position = node.position
+        value = NO_VALUE
+        if kind in (Function, Identifier):
+            value = string(node.name)
+        elif kind is Assignment:
+            value = string(node.variable)
+        elif kind is IntegerLiteral:
+            value = literal(node.value)
+        elif kind is BooleanLiteral:
+            value = int(node.value)
+
+        columns['kind'].append(_KIND_CODES[kind])
+        columns['operator'].append(string(operator))
+        columns['first_child'].append(len(children))
+        columns['child_count'].append(len(node_children))
+        columns['position'].append(
+            NO_VALUE if position is None
+            else position.line << POSITION_SHIFT | position.column)
+        columns['value'].append(value)
+        columns['symbol'].append(string(symbol))
+
+        first = len(children)
+        children.extend([NO_VALUE] * len(node_children))
+        for offset in reversed(range(len(node_children))):
+            stack.append((node_children[offset], first + offset, symbols[offset]))
+
+    offsets = array('q', [0])
+    encoded = []
+    for text in strings:
+        data = text.encode('utf-8')
+        encoded.append(data)
+        offsets.append(offsets[-1] + len(data))
+    return FlatAST(columns, children, literals, offsets, b''.join(encoded))
+
+
+def _parameter_names(function: Function, semantic_analyzer: Any) -> List[Optional[str]]:
+    """Nomi univoci dei parametri di una funzione, se noti all'analizzatore."""
+    scope = (semantic_analyzer.get_node_info(function, 'scope')
+             if semantic_analyzer is not None else None)
+    names = []
+    for parameter in function.parameters:
+        info = scope.lookup_local(parameter) if scope is not None else None
+        names.append(info.unique_name if info is not None else None)
+    return names
+
+
+def _unique_name(node: Any, semantic_analyzer: Any) -> Optional[str]:
+    """Nome univoco del simbolo di un nodo, se noto all'analizzatore."""
+    if semantic_analyzer is None:
+        return None
+    if isinstance(node, Function):
+        info = semantic_analyzer.get_node_info(node, 'symbol_info')
+    elif isinstance(node, Assignment):
+        info = semantic_analyzer.get_node_info(node, 'variable_info')
+    elif isinstance(node, Identifier):
+        scope = semantic_analyzer.get_node_info(node, 'scope')
+        try:
+            info = scope.lookup(node.name) if scope is not None else None
+        except ValueError:
+            # Variabile non definita: l'errore viene segnalato a runtime
+            info = None
+    else:
+        return None
+    return info.unique_name if info is not None else None
+
+
+def save_flat_ast(path: str, flat: FlatAST):
+    """Scrive l'AST piatto su file."""
+    try:
+        with open(path, 'wb') as file:
+            file.write(flat.to_bytes())
+    except OSError as e:
+        raise SaltinoRuntimeError(f"Cannot write flat AST file {path}: {e.strerror}")
+
+
+def load_flat_ast(path: str) -> FlatAST:
+    """AST piatto contenuto nel file, mappato in memoria in sola lettura."""
+    try:
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        # ValueError: mmap di un file vuoto
+        raise SaltinoRuntimeError(f"Cannot read flat AST file {path}: "
+                                  f"{getattr(e, 'strerror', None) or e}")
+    return FlatAST.from_buffer(mapped)
+
+
+def analyze_flat_ast(flat: FlatAST, entry_points: Iterable[str] = ('main',)):
+    """
+    AnalyzedProgram eseguibile da un AST piatto: ricostruisce i nodi e
+    ripete analisi semantica e inferenza dei tipi.
+    """
+    # Import locali: saltino_parser importa i passi di compilazione
+    from AST.semantic_analyzer import SemanticAnalyzer
+    from AST.type_inference import TypeInference
+    from saltino_parser import AnalyzedProgram
+
+    program = flat.to_program()
+    semantic_analyzer = SemanticAnalyzer()
+    # Come in parse_saltino, gli errori semantici si manifestano a runtime
+    if semantic_analyzer.analyze(program):
+        TypeInference(semantic_analyzer, entry_points).infer(program)
+    return AnalyzedProgram(program, semantic_analyzer)
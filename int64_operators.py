@@ -0,0 +1,89 @@
+"""
+Operatori aritmetici e di confronto su array NumPy int64.
+
+Ogni operatore aritmetico restituisce (valori, lane non valide): overflow,
+divisione per zero e potenze con esponente negativo vengono lasciati
+all'esecuzione scalare, che usa interi illimitati e solleva gli errori
+consueti. Usati dal BatchEvaluator e dai callback vettoriali
+(compiled_callbacks.py).
+
+NumPy è una dipendenza opzionale: senza NumPy np è None e COMPARISONS è
+vuoto.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def _add(x, y):
+    result = x + y
+    return result, ((x ^ result) & (y ^ result)) < 0
+
+
+def _subtract(x, y):
+    result = x - y
+    return result, ((x ^ y) & (x ^ result)) < 0
+
+
+def _multiply(x, y):
+    result = x * y
+    nonzero = x != 0
+    check = np.where(nonzero, x, 1)
+    invalid = nonzero & ((result // check != y) | ((x == -1) & (y == INT64_MIN)))
+    return result, invalid
+
+
+def _divide(x, y):
+    invalid = (y == 0) | ((x == INT64_MIN) & (y == -1))
+    return x // np.where(invalid, 1, y), invalid
+
+
+def _modulo(x, y):
+    invalid = (y == 0) | ((x == INT64_MIN) & (y == -1))
+    return x % np.where(invalid, 1, y), invalid
+
+
+def _power(x, y):
+    """Esponenziazione per quadrati con controllo di overflow a ogni passo."""
+    invalid = y < 0
+    exponent = np.where(invalid, 0, y)
+    result = np.ones_like(x)
+    base = x.copy()
+    while exponent.any():
+        odd = (exponent & 1) == 1
+        product, overflow = _multiply(result, base)
+        invalid |= odd & overflow
+        result = np.where(odd & ~invalid, product, result)
+        exponent = exponent >> 1
+        remaining = exponent > 0
+        if remaining.any():
+            square, overflow = _multiply(base, base)
+            invalid |= remaining & overflow
+            base = np.where(invalid, 1, square)
+    return result, invalid
+
+
+ARITHMETIC = {
+    '+': _add,
+    '-': _subtract,
+    '*': _multiply,
+    '/': _divide,
+    '%': _modulo,
+    '^': _power,
+}
+
+COMPARISONS = {}
+if np is not None:
+    COMPARISONS = {
+        '!=': np.not_equal,
+        '<': np.less,
+        '<=': np.less_equal,
+        '>': np.greater,
+        '>=': np.greater_equal,
+        'int>=': np.greater_equal,
+    }
@@ -5,13 +5,18 @@ Core interpreter class with modular execution handlers.
 
 from AST.ASTNodes import *
 from AST.semantic_analyzer import SemanticAnalyzer
+from AST.type_inference import value_has_type
 from errors.runtime_errors import SaltinoRuntimeError
 from execution_frames import ExecutionFrame, FrameType
 from execution_environment import Environment
 from saltino_operators import SaltinoOperators
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import execution_handlers as handlers
+from compiled_callbacks import VectorCallback, compile_callback, vectorize_callback
 from io_handler import get_main_arguments
+from lazy_lists import first_unforced, materialize
+from packed_lists import type_name, unpack
+from prelude import PRELUDE, BuiltinFunction
 from saltino_parser import parse_saltino
 
 
@@ -24,19 +29,46 @@ class IterativeSaltinoInterpreter:
     per utilizzare nomi univoci e informazioni di scope.
     """
 
-    def __init__(self, debug_mode: bool = False):
+    def __init__(self, debug_mode: bool = False,
+                 semantic_analyzer: Optional[SemanticAnalyzer] = None,
+                 lazy_lists: bool = False, packed_result: bool = False):
         self.debug_mode = debug_mode
+        # Valutazione on-demand delle code delle liste (vedi lazy_lists.py)
+        self.lazy_lists = lazy_lists
+        # Se vero un risultato finale compatto resta una PackedList, ad
+        # esempio per scriverlo su file senza convertirlo (binary_io.py)
+        self.packed_result = packed_result
         self.global_env = Environment(scope_name="global")
         self.execution_stack: List[ExecutionFrame] = []
         self.result_stack: List[Any] = []
-        # Analizzatore semantico
-        self.semantic_analyzer: Optional[SemanticAnalyzer] = None
+        # Analizzatore semantico (condiviso in sola lettura tra più interpreti)
+        self.semantic_analyzer: Optional[SemanticAnalyzer] = semantic_analyzer
+
+        # Stato del loop di esecuzione (permette l'esecuzione a fette)
+        self.finished = False
+        self.final_result: Any = None
+        self.steps_executed = 0
+        # True se una chiamata dall'esterno ha argomenti diversi dai tipi
+        # inferiti: gli operatori specializzati legati ai nodi non valgono più
+        self.checked_operators = False
 
         # Monitoraggio dello stack per l'analisi TCO
         self.max_stack_depth = 0
         self.function_call_count = 0
         self.tail_call_count = 0
 
+        self._init_dispatch_tables()
+        self._init_compiled_callbacks()
+
+    def _init_compiled_callbacks(self):
+        # Closure dei callback compilati (vedi compiled_callbacks.py),
+        # indicizzate per id della funzione: (funzione, closure o None,
+        # versione vettoriale o None)
+        self.compiled_callbacks: Dict[
+            int, Tuple[Function, Optional[Callable], Optional[VectorCallback]]] = {}
+
+    def _init_dispatch_tables(self):
+        """Inizializza le dispatch table degli operatori e dei frame handler."""
         # Dispatch table per le operazioni binarie
         self.binary_operators = SaltinoOperators.get_binary_operators()
 
@@ -58,8 +90,27 @@ class IterativeSaltinoInterpreter:
             FrameType.IF_STATEMENT: handlers.execute_if_frame,
             FrameType.ASSIGNMENT: handlers.execute_assignment_frame,
             FrameType.RETURN: handlers.execute_return_frame,
+            FrameType.FORCE: handlers.execute_force_frame,
+            FrameType.BUILTIN: handlers.execute_builtin_frame,
         }
 
+    def __getstate__(self):
+        """
+        Stato serializzabile per i checkpoint: le dispatch table contengono
+        lambda non serializzabili e vengono ricostruite al caricamento.
+        """
+        state = self.__dict__.copy()
+        for table in ('binary_operators', 'unary_operators',
+                      'comparison_operators', 'logical_operators',
+                      'frame_handlers', 'compiled_callbacks'):
+            state.pop(table, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_dispatch_tables()
+        self._init_compiled_callbacks()
+
     def _create_new_environment(self, parent: Environment = None) -> Environment:
         """Crea un nuovo ambiente con il parent specificato."""
         return Environment(parent or self.global_env)
@@ -101,28 +152,79 @@ class IterativeSaltinoInterpreter:
         """Esegue un programma Saltino in modo iterativo."""
         # L'analisi semantica è già stata eseguita nel parser
         # Quindi possiamo procedere direttamente con l'esecuzione
+        main_function = self.load_program(program)
 
-        # Registra tutte le funzioni nell'ambiente globale
-        for function in program.functions:
-            self.global_env.define_function(function.name, function)
+        # Se main ha parametri, chiede all'utente di inserirli
+        args = get_main_arguments(main_function)
+        return self.call_function(main_function, args)
+
+    def load_program(self, program: Program) -> Function:
+        """Registra tutte le funzioni nell'ambiente globale e restituisce main."""
+        self.define_functions(program)
 
-        # Cerca la funzione main e la esegue
+        # Cerca la funzione main
         try:
-            main_function = self.global_env.get_function('main')
+            return self.global_env.get_function('main')
         except SaltinoRuntimeError:
             raise SaltinoRuntimeError("No main function found")
 
-        # Se main ha parametri, chiede all'utente di inserirli
-        args = get_main_arguments(main_function)
-        return self.call_function(main_function, args)
+    def define_functions(self, program: Program):
+        """Definisce il preludio e le funzioni del programma, che lo nascondono."""
+        for builtin in PRELUDE.values():
+            self.global_env.define_function(builtin.name, builtin)
+        for function in program.functions:
+            self.global_env.define_function(function.name, function)
 
     def call_function(self, function: Function, arguments: List[Any]) -> Any:
-        """Inizia la chiamata di una funzione pushando un frame sullo stack."""
+        """Chiama una funzione ed esegue il loop iterativo fino al risultato."""
+        self.start_call(function, arguments)
+
+        # Inizia l'esecuzione iterativa
+        return self.execute()
+
+    def direct_callback(self, function: Function) -> Optional[Callable[[List[Any]], Any]]:
+        """
+        Funzione Python che esegue un callback di map, filter o foldl senza
+        frame: le funzioni del preludio che non ricevono callback e i corpi
+        compilati (vedi compiled_callbacks.py). None se il callback va
+        eseguito sullo stack (frame BUILTIN).
+        """
+        if isinstance(function, BuiltinFunction):
+            return None if function.higher_order else function.call
+        entry = self._callback_entry(function)
+        return entry[1] if entry else None
+
+    def vector_callback(self, function: Any) -> Optional[VectorCallback]:
+        """Versione NumPy di un callback di map o filter, se esiste."""
+        if not isinstance(function, Function) or isinstance(function, BuiltinFunction):
+            return None
+        entry = self._callback_entry(function)
+        return entry[2] if entry else None
+
+    def _callback_entry(self, function: Function):
+        if self.lazy_lists or self.semantic_analyzer is None:
+            # Con le liste pigre i cons restano all'interprete
+            return None
+        entry = self.compiled_callbacks.get(id(function))
+        if entry is None or entry[0] is not function:
+            compiled = compile_callback(function, self.semantic_analyzer)
+            vector = (vectorize_callback(function, self.semantic_analyzer, compiled)
+                      if compiled is not None else None)
+            entry = (function, compiled, vector)
+            self.compiled_callbacks[id(function)] = entry
+        return entry
+
+    def start_call(self, function: Function, arguments: List[Any]):
+        """
+        Prepara la chiamata di una funzione pushando un frame sullo stack,
+        senza eseguirla. L'esecuzione procede con execute() o run_steps().
+        """
         if len(arguments) != len(function.parameters):
             raise SaltinoRuntimeError(
                 f"Function '{function.name}' expects {len(function.parameters)} arguments, "
                 f"got {len(arguments)}"
             )
+        self._check_entry_arguments(function, arguments)
 
         # Crea un nuovo ambiente per la funzione
         function_env = self._create_new_environment(self.global_env)
@@ -159,45 +261,125 @@ class IterativeSaltinoInterpreter:
                                 function, function_env)
         frame.state['function'] = function
         frame.state['body_executed'] = False
-
-        # Inizia l'esecuzione iterativa
-        return self.execute()
+        self.finished = False
+        self.final_result = None
+
+    def _check_entry_arguments(self, function: Function, arguments: List[Any]):
+        """
+        Verifica gli argomenti di una chiamata dall'esterno rispetto ai tipi
+        inferiti staticamente. Gli operatori specializzati non ricontrollano
+        i tipi: con argomenti diversi l'interprete usa da qui in poi gli
+        operatori controllati delle dispatch table, come senza inferenza.
+        """
+        if self.semantic_analyzer is None or self.checked_operators:
+            return
+        param_types = self.semantic_analyzer.get_node_info(
+            function, 'param_types')
+        if not param_types:
+            return
+        for param, arg, expected in zip(function.parameters, arguments, param_types):
+            if not value_has_type(arg, expected):
+                if self.debug_mode:
+                    print(f"[TYPES] {function.name}: argument '{param}' is "
+                          f"{type_name(arg)}, not {expected.value}; using checked operators")
+                self.checked_operators = True
+                return
 
     def execute(self) -> Any:
         """Loop principale di esecuzione iterativa."""
-        while self.execution_stack:
-            frame = self.current_frame()
-
-            if frame.completed:
-                # Il frame è completato, propaghiamo il risultato
-                result = frame.result
-                self.pop_frame()
-
-                # Se c'è un frame parent, gli passiamo il risultato
-                if self.execution_stack:
-                    parent_frame = self.current_frame()
-                    self._handle_child_result(parent_frame, result)
-                else:
-                    # Non ci sono più frame, ritorniamo il risultato finale
-                    return result
-                continue
-
-            # Elabora il frame corrente usando la dispatch table
-            try:
-                handler = self.frame_handlers.get(frame.frame_type)
-                if handler:
-                    handler(frame, self)
-                else:
-                    raise SaltinoRuntimeError(
-                        f"Unknown frame type: {frame.frame_type}")
-            except Exception as e:
-                # Gestione degli errori - propaga l'errore
-                if isinstance(e, SaltinoRuntimeError):
-                    raise e
-                else:
-                    raise SaltinoRuntimeError(f"Internal error: {str(e)}")
-
-        return None
+        self.run_steps()
+        return self.final_result
+
+    def run_steps(self, max_steps: Optional[int] = None) -> bool:
+        """
+        Esegue al più max_steps dispatch del loop iterativo (tutti se None).
+
+        Restituisce True quando l'esecuzione è terminata: il risultato è
+        allora disponibile in final_result. Restituisce False se la fetta di
+        passi è esaurita e l'esecuzione può essere ripresa con un'altra chiamata.
+        """
+        steps = 0
+        # I passi vengono contati anche quando un'istruzione solleva un errore
+        try:
+            while self.execution_stack or self._force_final_result():
+                if max_steps is not None and steps >= max_steps:
+                    return False
+                steps += 1
+                frame = self.current_frame()
+
+                if frame.completed:
+                    # Il frame è completato, propaghiamo il risultato
+                    result = frame.result
+                    self.pop_frame()
+
+                    if frame.frame_type == FrameType.FORCE:
+                        # Il valore è già memorizzato nella lista pigra: il parent
+                        # riprende dallo stesso punto
+                        continue
+                    if frame.frame_type == FrameType.BUILTIN:
+                        # Il parent riesegue call_builtin, che trova il risultato
+                        self.current_frame().state['builtin_result'] = result
+                        continue
+
+                    # Se c'è un frame parent, gli passiamo il risultato
+                    if self.execution_stack:
+                        parent_frame = self.current_frame()
+                        self._handle_child_result(parent_frame, result)
+                    else:
+                        # Non ci sono più frame, memorizziamo il risultato finale
+                        # (le liste compatte tornano liste Python)
+                        self.final_result = self._final_value(result)
+                    continue
+
+                # Elabora il frame corrente usando la dispatch table
+                try:
+                    handler = self.frame_handlers.get(frame.frame_type)
+                    if handler:
+                        handler(frame, self)
+                    else:
+                        raise SaltinoRuntimeError(
+                            f"Unknown frame type: {frame.frame_type}")
+                except Exception as e:
+                    # Gestione degli errori - propaga l'errore
+                    if isinstance(e, SaltinoRuntimeError):
+                        raise e
+                    else:
+                        raise SaltinoRuntimeError(f"Internal error: {str(e)}")
+        finally:
+            self.steps_executed += steps
+        self.finished = True
+        return True
+
+    def _force_final_result(self) -> bool:
+        """
+        Con le liste pigre forza il risultato finale un livello alla volta.
+        Restituisce True se è stato pushato un frame FORCE, False quando il
+        risultato è completo (e convertito in una lista Python).
+        """
+        if not self.lazy_lists:
+            return False
+        cell = first_unforced(self.final_result)
+        if cell is None:
+            self.final_result = self._final_value(materialize(self.final_result))
+            return False
+        self.push_frame(FrameType.FORCE, cell, cell.environment)
+        return True
+
+    def _final_value(self, value: Any) -> Any:
+        return value if self.packed_result else unpack(value)
+
+    def force_operands(self, values: List[Any]) -> Optional[List[Any]]:
+        """
+        Valori pronti per un operatore stretto: se qualche lista pigra ha
+        ancora una coda sospesa pusha un frame FORCE e restituisce None (il
+        frame chiamante verrà rieseguito dopo la forzatura).
+        """
+        for value in values:
+            cell = first_unforced(value)
+            if cell is not None:
+                self.push_frame(FrameType.FORCE, cell, cell.environment)
+                return None
+        return [materialize(value) for value in values]
 
     def _handle_child_result(self, parent_frame: ExecutionFrame, result: Any):
         """Gestisce il risultato di un frame figlio nel frame parent."""
@@ -263,6 +445,14 @@ class IterativeSaltinoInterpreter:
                 # Il ramo è stato eseguito
                 parent_frame.state['branch_result'] = result
                 parent_frame.state['branch_executed'] = True
+        elif parent_frame.frame_type == FrameType.BUILTIN:
+            # Il callback ha restituito il risultato per l'elemento corrente
+            parent_frame.state['value'] = result
+            parent_frame.state['value_evaluated'] = True
+        elif parent_frame.frame_type == FrameType.FORCE:
+            # La coda sospesa è stata valutata
+            parent_frame.state['value'] = result
+            parent_frame.state['value_evaluated'] = True
         elif parent_frame.frame_type == FrameType.ASSIGNMENT:
             # Il valore dell'assegnamento è stato valutato
             parent_frame.state['value'] = result
@@ -6,6 +6,8 @@ Contains all functions related to direct user interaction (input/output).
 import sys
 from typing import List, Any
 from AST.ASTNodes import Function
+from binary_io import load_list
+from errors.runtime_errors import SaltinoRuntimeError
 
 
 def get_main_arguments(main_function: Function) -> List[Any]:
@@ -13,6 +15,8 @@ def get_main_arguments(main_function: Function) -> List[Any]:
     Ottiene gli argomenti per la funzione main dall'utente.
     Se main non ha parametri, restituisce una lista vuota.
     Se main ha parametri, chiede all'utente di inserirli.
+    Un valore @percorso carica una lista da un file .npy o int64 grezzo,
+    mappato in memoria senza copiarlo (vedi binary_io.py).
     """
     if not main_function.parameters:
         return []
@@ -42,9 +46,18 @@ def get_main_arguments(main_function: Function) -> List[Any]:
                     args.append([])
                     break
 
+                # Prova a caricare una lista da file
+                elif user_input.startswith('@'):
+                    try:
+                        args.append(load_list(user_input[1:]))
+                        break
+                    except SaltinoRuntimeError as e:
+                        print(f"    {e}")
+
                 else:
                     print(
-                        f"    Invalid input. Please enter an integer, 'true', 'false', or '[]'")
+                        f"    Invalid input. Please enter an integer, 'true', 'false', '[]' "
+                        f"or @file with a list (.npy or raw int64)")
 
             except KeyboardInterrupt:
                 print("\nExecution cancelled by user.")
@@ -0,0 +1,95 @@
+"""
+Liste pigre per la modalità di valutazione on-demand dell'interprete.
+
+Con lazy_lists=True l'operando destro di un `::` in posizione di return non
+viene valutato: il return produce una cella LazyList con la testa già
+calcolata e la coda sospesa (espressione e ambiente della chiamata). La
+coda viene forzata solo quando serve:
+
+- `head` legge la testa della cella senza forzare nulla;
+- `tail` forza un solo livello e restituisce la coda (eventualmente pigra);
+- `==` con [] o con un valore non lista si decide senza forzare (una cella
+  non è mai vuota), altrimenti forza l'intera lista;
+- `h :: xs` con xs pigra costruisce una nuova cella senza forzare;
+- ogni altro operatore, e il risultato finale dell'esecuzione, forzano
+  l'intera lista e la convertono in una lista Python.
+
+La forzatura valuta l'espressione sospesa con frame FORCE sullo stack
+dell'interprete, senza ricorsione Python, e memorizza il risultato nella
+cella: ogni coda è valutata al più una volta.
+"""
+
+from typing import Any, List, Optional
+
+from errors.runtime_errors import SaltinoRuntimeError
+from packed_lists import concat, is_list, type_name
+
+
+class LazyList:
+    """Cella cons con testa valutata e coda sospesa fino alla prima forzatura."""
+
+    __slots__ = ('head', 'node', 'environment', 'rest', 'forced')
+
+    def __init__(self, head: int, node: Any = None, environment: Any = None,
+                 rest: Any = None, forced: bool = False):
+        self.head = head
+        # Espressione della coda e ambiente in cui valutarla
+        self.node = node
+        self.environment = environment
+        self.rest = rest
+        self.forced = forced
+
+    def resolve(self, value: Any):
+        """Memorizza la coda forzata, con i controlli del cons stretto."""
+        if not (is_list(value) or isinstance(value, LazyList)):
+            raise SaltinoRuntimeError(
+                f"Cons operator expects a list as second argument, got {type_name(value)}")
+        if type(value) is list:
+            for i, item in enumerate(value):
+                if type(item) is not int:
+                    raise SaltinoRuntimeError(
+                        f"Cons operator expects a list of integers, got {type(item).__name__} at position {i}")
+        self.rest = value
+        self.forced = True
+        # L'ambiente non serve più e può essere liberato
+        self.node = None
+        self.environment = None
+
+    def __repr__(self):
+        return f"LazyList({self.head}, ...)"
+
+
+def lazy_cons(head: Any, node: Any, environment: Any) -> LazyList:
+    """Cella con coda sospesa; la testa è controllata subito come nel cons stretto."""
+    if type(head) is not int:
+        raise SaltinoRuntimeError(
+            f"Cons operator expects an integer as first argument, got {type_name(head)}")
+    return LazyList(head, node, environment)
+
+
+def cons_onto_lazy(head: Any, rest: LazyList) -> LazyList:
+    """h :: xs con xs pigra: nuova cella con la coda già disponibile."""
+    if type(head) is not int:
+        raise SaltinoRuntimeError(
+            f"Cons operator expects an integer as first argument, got {type_name(head)}")
+    return LazyList(head, rest=rest, forced=True)
+
+
+def first_unforced(value: Any) -> Optional[LazyList]:
+    """Prima cella non ancora forzata della lista, o None se è completa."""
+    while isinstance(value, LazyList):
+        if not value.forced:
+            return value
+        value = value.rest
+    return None
+
+
+def materialize(value: Any) -> Any:
+    """Converte una lista pigra completamente forzata in una lista Python."""
+    if not isinstance(value, LazyList):
+        return value
+    items: List[int] = []
+    while isinstance(value, LazyList):
+        items.append(value.head)
+        value = value.rest
+    return concat(items, value)
@@ -4,22 +4,50 @@ Main entry point for the Saltino interpreter.
 Handles command-line argument parsing and program execution.
 """
 
+import signal
 import sys
-from typing import Any
+import time
+from typing import Any, Optional
+from checkpoint import (ExecutionSuspended, load_checkpoint,
+                        run_with_checkpoints)
 from interpreter import IterativeSaltinoInterpreter
-from saltino_parser import parse_saltino
+from binary_io import save_list
+from io_handler import get_main_arguments
+from saltino_parser import DEFAULT_OPTIMIZATION_LEVEL, parse_saltino
 from errors.parser_errors import SaltinoParseError, SaltinoError
 from errors.runtime_errors import SaltinoRuntimeError
 
 
-def exec_saltino_iterative(filename: str, debug_mode: bool = False) -> Any:
-    """Esegue un file Saltino usando l'interprete iterativo con gestione errori personalizzata."""
+# Segnali che richiedono di salvare un checkpoint e sospendere l'esecuzione
+CHECKPOINT_SIGNALS = tuple(getattr(signal, name) for name in ('SIGTERM', 'SIGUSR1')
+                           if hasattr(signal, name))
+
+
+def exec_saltino_iterative(filename: str, debug_mode: bool = False,
+                           checkpoint_path: Optional[str] = None,
+                           checkpoint_every: Optional[int] = None,
+                           deadline: Optional[float] = None,
+                           optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL,
+                           lazy_lists: bool = False,
+                           output_path: Optional[str] = None) -> Any:
+    """
+    Esegue un file Saltino usando l'interprete iterativo con gestione errori personalizzata.
+
+    Con lazy_lists le code delle liste costruite nei return vengono valutate
+    solo quando servono (vedi lazy_lists.py). Con output_path il risultato,
+    che deve essere una lista, viene scritto in formato binario (binary_io.py).
+
+    Se checkpoint_path è indicato, l'esecuzione salva un checkpoint ogni
+    checkpoint_every passi e si sospende (ExecutionSuspended) alla scadenza
+    di deadline o alla ricezione di SIGTERM/SIGUSR1.
+    """
     try:
         with open(filename, 'r') as file:
             program_text = file.read()
 
         ast, errors, semantic_analyzer = parse_saltino(
-            program_text, raise_on_error=False, debug_mode=debug_mode)
+            program_text, raise_on_error=False, debug_mode=debug_mode,
+            optimization_level=optimization_level, lazy_lists=lazy_lists)
 
         # Controlla se ci sono stati errori di parsing
         if errors:
@@ -35,18 +63,28 @@ def exec_saltino_iterative(filename: str, debug_mode: bool = False) -> Any:
             raise SaltinoRuntimeError("Errore nella costruzione dell'AST")
 
         # Esecuzione con l'interprete iterativo
-        interpreter = IterativeSaltinoInterpreter(debug_mode=debug_mode)
-        interpreter.semantic_analyzer = semantic_analyzer  # Passa il semantic analyzer
-        result = interpreter.execute_program(ast)
+        interpreter = IterativeSaltinoInterpreter(
+            debug_mode=debug_mode, semantic_analyzer=semantic_analyzer,
+            lazy_lists=lazy_lists, packed_result=output_path is not None)
+        if checkpoint_path is None:
+            result = interpreter.execute_program(ast)
+        else:
+            main_function = interpreter.load_program(ast)
+            interpreter.start_call(
+                main_function, get_main_arguments(main_function))
+            result = _run_checkpointed(interpreter, checkpoint_path,
+                                       checkpoint_every, deadline)
 
         # Stampa le statistiche di esecuzione
         interpreter.print_execution_stats()
 
+        if output_path is not None:
+            save_list(output_path, result)
         return result
 
     except FileNotFoundError:
         raise SaltinoRuntimeError(f"File not found: {filename}")
-    except (SaltinoParseError, SaltinoError) as e:
+    except (SaltinoParseError, SaltinoError, ExecutionSuspended) as e:
         # Gli errori di parsing e semantici non sono errori di runtime
         raise e
     except Exception as e:
@@ -56,27 +94,112 @@ def exec_saltino_iterative(filename: str, debug_mode: bool = False) -> Any:
             raise SaltinoRuntimeError(f"Error executing {filename}: {str(e)}")
 
 
+def resume_saltino(checkpoint_path: str, checkpoint_every: Optional[int] = None,
+                   deadline: Optional[float] = None,
+                   debug_mode: bool = False,
+                   output_path: Optional[str] = None) -> Any:
+    """Riprende un'esecuzione da un checkpoint, continuando a salvarne di nuovi."""
+    interpreter = load_checkpoint(checkpoint_path)
+    interpreter.debug_mode = debug_mode
+    interpreter.packed_result = output_path is not None
+    result = _run_checkpointed(interpreter, checkpoint_path,
+                               checkpoint_every, deadline)
+    interpreter.print_execution_stats()
+    if output_path is not None:
+        save_list(output_path, result)
+    return result
+
+
+def _run_checkpointed(interpreter: IterativeSaltinoInterpreter, checkpoint_path: str,
+                      checkpoint_every: Optional[int], deadline: Optional[float]) -> Any:
+    """Esegue l'interprete con i checkpoint, sollevando ExecutionSuspended se sospeso."""
+    finished = run_with_checkpoints(interpreter, checkpoint_path,
+                                    every_steps=checkpoint_every,
+                                    deadline=deadline,
+                                    signals=CHECKPOINT_SIGNALS)
+    if not finished:
+        raise ExecutionSuspended(checkpoint_path, interpreter.steps_executed)
+    return interpreter.final_result
+
+
 if __name__ == "__main__":
     debug_mode = False
     filename = None
+    checkpoint_path = None
+    resume_path = None
+    checkpoint_every = None
+    deadline = None
+    optimization_level = DEFAULT_OPTIMIZATION_LEVEL
+    lazy_lists = False
+    output_path = None
 
     # Parse degli argomenti
     args = sys.argv[1:]
     for i, arg in enumerate(args):
         if arg == "--debug":
             debug_mode = True
-        elif not arg.startswith("--"):
+        elif arg == "--lazy":
+            lazy_lists = True
+        elif arg.startswith("--checkpoint="):
+            checkpoint_path = arg.split("=", 1)[1]
+        elif arg.startswith("--checkpoint-every="):
+            checkpoint_every = int(arg.split("=", 1)[1])
+        elif arg.startswith("--deadline="):
+            deadline = time.time() + float(arg.split("=", 1)[1])
+        elif arg.startswith("--resume="):
+            resume_path = arg.split("=", 1)[1]
+        elif arg.startswith("--output="):
+            output_path = arg.split("=", 1)[1]
+        elif arg.startswith("-O") and arg[2:].isdigit():
+            optimization_level = int(arg[2:])
+        elif not arg.startswith("-"):
             filename = arg
 
-    if filename is None:
-        print("Usage: python main.py <saltino_file> [--debug]")
+    if filename is None and resume_path is None:
+        print("Usage: python main.py <saltino_file> [--debug] [-O<n>] [--lazy] [--output=FILE] [--checkpoint=FILE ...]")
+        print("       python main.py --resume=FILE [--checkpoint-every=N] [--deadline=SECONDS]")
         print("\nOptions:")
-        print("  --debug    Enable debug mode with verbose output")
+        print("  --debug                 Enable debug mode with verbose output")
+        print("  -O<n>                   AST optimization level (0 = none, 1 = default,")
+        print("                          2 = also fuse list producers with their consumers,")
+        print("                          solve linear recurrences and drop functions")
+        print("                          unreachable from main)")
+        print("  --lazy                  Evaluate list tails only when tail or == needs them")
+        print("  --output=FILE           Write the list result to FILE (.npy or raw int64)")
+        print("  --checkpoint=FILE       Save checkpoints of the running program to FILE")
+        print("  --checkpoint-every=N    Save a checkpoint every N execution steps")
+        print("  --deadline=SECONDS      Checkpoint and suspend after SECONDS seconds")
+        print("  --resume=FILE           Resume a suspended execution from a checkpoint")
+        print("\nList arguments of main can be read from a file by entering @FILE (.npy or raw int64).")
+        print("SIGTERM and SIGUSR1 checkpoint and suspend a checkpointed execution.")
+        sys.exit(1)
+
+    if (checkpoint_every is not None or deadline is not None) and \
+            checkpoint_path is None and resume_path is None:
+        print("--checkpoint-every and --deadline require --checkpoint=FILE")
         sys.exit(1)
 
     try:
-        result = exec_saltino_iterative(filename, debug_mode=debug_mode)
-        print(f"Program result: {result}")
+        if resume_path is not None:
+            result = resume_saltino(resume_path, checkpoint_every=checkpoint_every,
+                                    deadline=deadline, debug_mode=debug_mode,
+                                    output_path=output_path)
+        else:
+            result = exec_saltino_iterative(filename, debug_mode=debug_mode,
+                                            checkpoint_path=checkpoint_path,
+                                            checkpoint_every=checkpoint_every,
+                                            deadline=deadline,
+                                            optimization_level=optimization_level,
+                                            lazy_lists=lazy_lists,
+                                            output_path=output_path)
+        if output_path is not None:
+            print(f"Program result: list of {len(result)} elements written to {output_path}")
+        else:
+            print(f"Program result: {result}")
+    except ExecutionSuspended as e:
+        print(f"{e}")
+        print(f"Resume with: python main.py --resume={e.path}")
+        sys.exit(0)
     except (SaltinoParseError, SaltinoError) as e:
         print(f"Parse/Semantic Error: {e}")
         sys.exit(1)
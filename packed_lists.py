@@ -0,0 +1,148 @@
+"""
+Rappresentazione compatta delle liste Saltino.
+
+Le liste Saltino contengono solo interi: una PackedList li memorizza in un
+array('q') (8 byte per elemento) insieme alla posizione del primo elemento.
+`tail` restituisce una vista sullo stesso buffer spostata di uno, in tempo
+costante, invece di copiare lst[1:].
+
+- il primo `tail` di una lista Python con più di PACK_THRESHOLD elementi la
+  converte in una PackedList, se tutti gli elementi stanno in 64 bit; le
+  liste corte restano liste Python;
+- `h :: xs` con xs compatta copia il buffer in uno nuovo, salvo quando h è
+  proprio l'elemento che precede la vista nel buffer (head(xs) :: tail(xs)):
+  allora la vista viene estesa senza copiare;
+- un elemento oltre i 64 bit riporta la lista alla forma Python.
+
+I buffer non vengono mai modificati dopo la creazione, quindi le viste si
+possono condividere. Il buffer può anche essere una memoryview 'q' di sola
+lettura, ad esempio su un file mappato in memoria (binary_io.py). Il risultato finale dell'interprete è sempre una lista
+Python.
+"""
+
+from array import array
+from typing import Any, List, Optional, Union
+
+# Lunghezza oltre la quale il primo tail converte una lista Python
+PACK_THRESHOLD = 32
+
+
+class PackedList:
+    """Lista di interi a 64 bit: vista del buffer a partire da start."""
+
+    __slots__ = ('buffer', 'start')
+
+    def __init__(self, buffer: Union[array, memoryview], start: int = 0):
+        self.buffer = buffer
+        self.start = start
+
+    def __reduce__(self):
+        # Le memoryview (file mappati) non si serializzano: nei checkpoint
+        # il buffer viene salvato come array
+        buffer = self.buffer
+        if not isinstance(buffer, array):
+            buffer = array('q', buffer.tobytes())
+        return (PackedList, (buffer, self.start))
+
+    def view(self) -> memoryview:
+        """Gli elementi della lista, senza copiarli."""
+        return memoryview(self.buffer)[self.start:]
+
+    def tolist(self) -> List[int]:
+        return self.view().tolist()
+
+    def __len__(self) -> int:
+        return len(self.buffer) - self.start
+
+    def __bool__(self) -> bool:
+        return len(self.buffer) > self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.view()[index].tolist()
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("list index out of range")
+        return self.buffer[self.start + index]
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __eq__(self, other: Any):
+        if isinstance(other, PackedList):
+            return self.view() == other.view()
+        if isinstance(other, list):
+            return len(self) == len(other) and self.tolist() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self.tolist())
+
+
+def is_list(value: Any) -> bool:
+    """Vero per le liste Saltino, in forma Python o compatta."""
+    return isinstance(value, (list, PackedList))
+
+
+def type_name(value: Any) -> str:
+    """Nome del tipo per i messaggi di errore: una PackedList è una lista."""
+    return 'list' if type(value) is PackedList else type(value).__name__
+
+
+def pack(values: List[Any]) -> Optional[PackedList]:
+    """PackedList con gli stessi elementi, o None se non sono tutti interi a 64 bit."""
+    if not set(map(type, values)) <= {int}:
+        return None
+    try:
+        return PackedList(array('q', values))
+    except OverflowError:
+        return None
+
+
+def unpack(value: Any) -> Any:
+    """Converte una PackedList in una lista Python; gli altri valori restano."""
+    return value.tolist() if type(value) is PackedList else value
+
+
+def tail_of(lst: Any) -> Any:
+    """Coda di una lista non vuota già verificata."""
+    return drop_of(lst, 1)
+
+
+def drop_of(lst: Any, count: int) -> Any:
+    """La lista senza i primi count elementi (0 <= count <= len(lst))."""
+    if type(lst) is PackedList:
+        return PackedList(lst.buffer, lst.start + count)
+    if len(lst) > PACK_THRESHOLD:
+        packed = pack(lst)
+        if packed is not None:
+            packed.start = count
+            return packed
+    return lst[count:]
+
+
+def prepend(head: int, rest: Any) -> Any:
+    """head :: rest tra un intero e una lista già verificati."""
+    if type(rest) is not PackedList:
+        return [head] + rest
+    start = rest.start
+    if start and rest.buffer[start - 1] == head:
+        # head è l'elemento che precede la vista: nessuna copia
+        return PackedList(rest.buffer, start - 1)
+    return concat([head], rest)
+
+
+def concat(items: List[Any], rest: Any) -> Any:
+    """items + rest, con rest lista Python o compatta."""
+    if type(rest) is not PackedList:
+        return items + rest
+    if not items:
+        return rest
+    packed = pack(items)
+    if packed is None:
+        return items + rest.tolist()
+    packed.buffer.frombytes(rest.view().cast('B'))
+    return packed
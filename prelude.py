@@ -0,0 +1,362 @@
+"""
+Preludio di funzioni predefinite implementate in Python.
+
+length, append, reverse, range, sum, take, drop, map, filter e foldl sono
+dichiarate nello scope globale dal SemanticAnalyzer e definite nell'ambiente globale
+dell'interprete, quindi si chiamano (e si passano come valori) come le
+funzioni dell'utente. Una funzione del programma con lo stesso nome le
+nasconde.
+
+Ogni funzione si comporta come la sua definizione Saltino in
+REFERENCE_SOURCE: stesso risultato e, per argomenti non validi, stesso
+errore con lo stesso messaggio, ma senza una chiamata interpretata e un
+cons per elemento. Con le liste pigre gli argomenti vengono forzati per
+intero prima della chiamata, come per gli operatori stretti.
+
+map, filter e foldl ricevono una funzione Saltino e la applicano a ogni
+elemento. Se il callback non richiede frame (una funzione del preludio o
+un corpo compilato, vedi compiled_callbacks.py) il ciclo è in Python;
+altrimenti restituiscono un CallbackLoop, che l'interprete esegue con un
+frame BUILTIN sul proprio stack: ogni applicazione è un frame
+FUNCTION_CALL figlio, quindi lo stack non cresce con la lunghezza della
+lista e le chiamate rispettano i limiti di passi di run_steps. Con NumPy,
+i callback di map e filter fatti di sola aritmetica intera e confronti
+sono applicati alle liste lunghe in modo vettoriale.
+"""
+
+from array import array
+from typing import Any, Callable, Dict, List
+
+from AST.ASTNodes import Function
+from compiled_callbacks import VECTOR_THRESHOLD
+from errors.runtime_errors import SaltinoRuntimeError
+from packed_lists import PACK_THRESHOLD, PackedList, drop_of, is_list, type_name
+from saltino_operators import SaltinoOperators
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+# Definizioni Saltino di riferimento: stessi risultati e stessi errori
+REFERENCE_SOURCE = """
+def length(xs) {
+    if (xs == []) {
+        return 0
+    }
+    return 1 + length(tail(xs))
+}
+
+def append(xs, ys) {
+    if (xs == []) {
+        return ys
+    }
+    return head(xs) :: append(tail(xs), ys)
+}
+
+def reverse(xs) {
+    return reverse_onto(xs, [])
+}
+
+def reverse_onto(xs, acc) {
+    if (xs == []) {
+        return acc
+    }
+    return reverse_onto(tail(xs), head(xs) :: acc)
+}
+
+def range(a, b) {
+    if (a >= b) {
+        return []
+    }
+    return a :: range(a + 1, b)
+}
+
+def sum(xs) {
+    if (xs == []) {
+        return 0
+    }
+    return head(xs) + sum(tail(xs))
+}
+
+def take(n, xs) {
+    if (n <= 0) {
+        return []
+    }
+    if (xs == []) {
+        return []
+    }
+    return head(xs) :: take(n - 1, tail(xs))
+}
+
+def drop(n, xs) {
+    if (n <= 0) {
+        return xs
+    }
+    if (xs == []) {
+        return xs
+    }
+    return drop(n - 1, tail(xs))
+}
+
+def map(f, xs) {
+    if (xs == []) {
+        return []
+    }
+    return f(head(xs)) :: map(f, tail(xs))
+}
+
+def filter(p, xs) {
+    if (xs == []) {
+        return []
+    }
+    if (p(head(xs))) {
+        return head(xs) :: filter(p, tail(xs))
+    }
+    return filter(p, tail(xs))
+}
+
+def foldl(f, acc, xs) {
+    if (xs == []) {
+        return acc
+    }
+    return foldl(f, f(acc, head(xs)), tail(xs))
+}
+"""
+
+
+class BuiltinFunction(Function):
+    """Funzione del preludio: il corpo è un'implementazione Python."""
+
+    def __init__(self, name: str, parameters: List[str],
+                 implementation: Callable[..., Any], return_type: str,
+                 higher_order: bool = False):
+        super().__init__(name, parameters, body=None)
+        self.implementation = implementation
+        # Tipo del risultato per l'inferenza dei tipi ('int', 'list' o 'any')
+        self.return_type = return_type
+        # Le funzioni di ordine superiore ricevono come primo argomento
+        # l'interprete e possono restituire un CallbackLoop
+        self.higher_order = higher_order
+
+    def call(self, arguments: List[Any], interpreter=None) -> Any:
+        if self.higher_order:
+            return self.implementation(interpreter, *arguments)
+        return self.implementation(*arguments)
+
+    def __str__(self):
+        params = ', '.join(self.parameters)
+        return f"Builtin({self.name}({params}))"
+
+
+class CallbackLoop:
+    """
+    Applicazione di un callback agli elementi di una lista, un elemento alla
+    volta. Lo stato contiene solo valori del programma, così un checkpoint
+    può salvare il ciclo a metà.
+    """
+
+    def __init__(self, callback: Function, items: Any, accumulator: Any):
+        self.callback = callback
+        self.items = items
+        self.index = 0
+        self.accumulator = accumulator
+
+    def done(self) -> bool:
+        return self.index >= len(self.items)
+
+    def arguments(self) -> List[Any]:
+        """Argomenti della prossima chiamata del callback."""
+        return [self.items[self.index]]
+
+    def receive(self, value: Any):
+        """Registra il risultato del callback e passa all'elemento successivo."""
+        self.index += 1
+
+    def result(self) -> Any:
+        return self.accumulator
+
+    def run(self, interpreter) -> Any:
+        """
+        Esegue subito il ciclo se il callback non richiede frame; altrimenti
+        restituisce il ciclo stesso, che l'interprete esegue sul suo stack.
+        """
+        _require_arity(self.callback, self.arguments())
+        call = interpreter.direct_callback(self.callback)
+        if call is None:
+            return self
+        while not self.done():
+            self.receive(call(self.arguments()))
+        return self.result()
+
+
+class _MapLoop(CallbackLoop):
+
+    def receive(self, value: Any):
+        self.accumulator.append(value)
+        self.index += 1
+
+    def result(self) -> Any:
+        # I cons del riferimento avvengono dopo tutte le chiamate, dall'ultimo
+        return SaltinoOperators.cons_all(self.accumulator, [])
+
+
+class _FilterLoop(CallbackLoop):
+
+    def receive(self, value: Any):
+        if type(value) is not bool:
+            raise SaltinoRuntimeError(
+                f"Function used in condition must return boolean, got {type_name(value)}")
+        if value:
+            self.accumulator.append(self.items[self.index])
+        self.index += 1
+
+
+class _FoldlLoop(CallbackLoop):
+
+    def arguments(self) -> List[Any]:
+        return [self.accumulator, self.items[self.index]]
+
+    def receive(self, value: Any):
+        self.accumulator = value
+        self.index += 1
+
+
+def _require_arity(function: Function, arguments: List[Any]):
+    """Stesso errore di una chiamata con il numero sbagliato di argomenti."""
+    if len(arguments) != len(function.parameters):
+        raise SaltinoRuntimeError(
+            f"Function '{function.name}' expects {len(function.parameters)} arguments, "
+            f"got {len(arguments)}"
+        )
+
+
+def _require_list(value: Any, operator: Callable[[Any], Any]):
+    """Su un valore che non è una lista solleva l'errore di operator (head o tail)."""
+    if not is_list(value):
+        operator(value)
+
+
+def _require_function(value: Any):
+    """Stesso errore di una chiamata a un valore che non è una funzione."""
+    if not isinstance(value, Function):
+        raise SaltinoRuntimeError(
+            f"Cannot call non-function value of type {type_name(value)}")
+
+
+def _all_integers(values: Any) -> bool:
+    # Le liste compatte contengono solo interi per costruzione
+    return type(values) is PackedList or set(map(type, values)) <= {int}
+
+
+def _length(xs: Any) -> int:
+    _require_list(xs, SaltinoOperators.tail)
+    return len(xs)
+
+
+def _append(xs: Any, ys: Any) -> Any:
+    _require_list(xs, SaltinoOperators.head)
+    # cons_all ha gli stessi controlli della catena di cons del riferimento
+    return SaltinoOperators.cons_all(list(xs), ys)
+
+
+def _reverse(xs: Any) -> Any:
+    _require_list(xs, SaltinoOperators.tail)
+    if type(xs) is PackedList:
+        buffer = array('q', xs.view())
+        buffer.reverse()
+        return PackedList(buffer)
+    if not _all_integers(xs):
+        # Il primo cons che fallisce è quello del primo elemento non intero
+        for item in xs:
+            SaltinoOperators.cons(item, [])
+    return xs[::-1]
+
+
+def _range(a: Any, b: Any) -> Any:
+    if not SaltinoOperators.less(a, b):
+        return []
+    if b - a > PACK_THRESHOLD and INT64_MIN <= a and b - 1 <= INT64_MAX:
+        return PackedList(array('q', range(a, b)))
+    return list(range(a, b))
+
+
+def _sum(xs: Any) -> int:
+    _require_list(xs, SaltinoOperators.head)
+    if _all_integers(xs):
+        return sum(xs)
+    # Le somme del riferimento partono dall'ultimo elemento
+    total = 0
+    for item in reversed(xs):
+        total = SaltinoOperators.add(item, total)
+    return total
+
+
+def _take(n: Any, xs: Any) -> Any:
+    if SaltinoOperators.less_equal(n, 0):
+        return []
+    _require_list(xs, SaltinoOperators.head)
+    return SaltinoOperators.cons_all(xs[:n], [])
+
+
+def _drop(n: Any, xs: Any) -> Any:
+    if SaltinoOperators.less_equal(n, 0):
+        return xs
+    _require_list(xs, SaltinoOperators.tail)
+    return drop_of(xs, min(n, len(xs)))
+
+
+def _vector_callback(interpreter, f: Any, xs: Any):
+    """Versione vettoriale di f per una lista lunga, se esiste."""
+    if len(xs) < VECTOR_THRESHOLD:
+        return None
+    return interpreter.vector_callback(f)
+
+
+def _map(interpreter, f: Any, xs: Any) -> Any:
+    if is_list(xs) and not xs:
+        return []
+    # Il riferimento valuta f prima di head(xs)
+    _require_function(f)
+    _require_list(xs, SaltinoOperators.head)
+    vector = _vector_callback(interpreter, f, xs)
+    if vector is not None:
+        results = vector.map(xs)
+        if results is not None:
+            return results
+    return _MapLoop(f, xs, []).run(interpreter)
+
+
+def _filter(interpreter, p: Any, xs: Any) -> Any:
+    if is_list(xs) and not xs:
+        return []
+    _require_function(p)
+    _require_list(xs, SaltinoOperators.head)
+    vector = _vector_callback(interpreter, p, xs)
+    if vector is not None:
+        kept = vector.filter(xs)
+        if kept is not None:
+            return kept
+    return _FilterLoop(p, xs, []).run(interpreter)
+
+
+def _foldl(interpreter, f: Any, acc: Any, xs: Any) -> Any:
+    if is_list(xs) and not xs:
+        return acc
+    _require_function(f)
+    _require_list(xs, SaltinoOperators.head)
+    return _FoldlLoop(f, xs, acc).run(interpreter)
+
+
+PRELUDE: Dict[str, BuiltinFunction] = {
+    builtin.name: builtin for builtin in (
+        BuiltinFunction('length', ['xs'], _length, 'int'),
+        BuiltinFunction('append', ['xs', 'ys'], _append, 'any'),
+        BuiltinFunction('reverse', ['xs'], _reverse, 'list'),
+        BuiltinFunction('range', ['a', 'b'], _range, 'list'),
+        BuiltinFunction('sum', ['xs'], _sum, 'int'),
+        BuiltinFunction('take', ['n', 'xs'], _take, 'list'),
+        BuiltinFunction('drop', ['n', 'xs'], _drop, 'any'),
+        BuiltinFunction('map', ['f', 'xs'], _map, 'list', higher_order=True),
+        BuiltinFunction('filter', ['p', 'xs'], _filter, 'list', higher_order=True),
+        BuiltinFunction('foldl', ['f', 'acc', 'xs'], _foldl, 'any', higher_order=True),
+    )
+}
@@ -0,0 +1,501 @@
+"""
+Recurrence solver for linear recursions over a single integer parameter.
+
+Recognizes functions whose body is a chain of base clauses on the parameter
+followed by a linear recurrence, e.g.
+
+    sum(n) = if (n == 0) 0 else n + sum(n - 1)
+    fib(n) = if (n <= 1) n else fib(n - 1) + fib(n - 2)
+
+and replaces the recursion, for the inputs where it is guaranteed to reach
+the base clauses, with a direct computation:
+
+- first order, f(n) = f(n-1) + a*n + b: arithmetic-series closed form;
+- first order, f(n) = p * f(n-1): geometric closed form p ^ (n - K);
+- second order, f(n) = p * f(n-1) + q * f(n-2): 2x2 matrix fast
+  exponentiation, in generated Saltino helpers (logarithmic depth).
+
+All the values involved are integers and Saltino integers are unbounded, so
+the direct computation gives exactly the same result. For every other input
+(a non-integer argument, or an integer below the base clauses, where the
+original may fail or never terminate) the wrapper calls a renamed copy of
+the original function, so errors and non-termination are unchanged.
+
+The pass runs before the TailCallTransformer, which may then rewrite the
+renamed copies as usual.
+"""
+
+import sys
+
+from AST.ASTNodes import *
+from AST.hash_consing import HashConsTable
+from AST.type_inference import iter_nodes, iter_nodes_post_order
+from typing import Dict, List, Optional, Any, Tuple
+
+# Internal comparison with no surface syntax: true when the left operand is
+# an integer not smaller than the right one; it never fails
+INTEGER_AT_LEAST_OPERATOR = "int>="
+
+# Mirrored comparison operators: k OP n is the same as n MIRRORED[OP] k
+MIRRORED_COMPARISONS = {'==': '==', '>=': '<=', '>': '<', '<=': '>=', '<': '>'}
+
+
+def split_base_clauses(statements: List[Statement], param: str,
+                       table: Optional[HashConsTable] = None
+                       ) -> Tuple[List[Tuple[str, int, Tuple[int, int]]], Any]:
+    """
+    Walk if/else chains and guard clauses down to the recursive return.
+    The base values are read with affine_form, numbering them in table.
+
+    Returns:
+        (clauses, recursive_value) where each clause is
+        (operator, literal, affine base value); ([], None) if the body
+        does not have this shape
+    """
+    clauses = []
+    while True:
+        if len(statements) == 1 and isinstance(statements[0], ReturnStatement):
+            if isinstance(statements[0].value, IfStatement):
+                statements = [statements[0].value]
+                continue
+            return clauses, statements[0].value
+
+        if not statements or not isinstance(statements[0], IfStatement):
+            return [], None
+        if_stmt = statements[0]
+
+        clause = _base_clause(if_stmt, param, table)
+        if clause is None:
+            return [], None
+        clauses.append(clause)
+
+        if if_stmt.else_block is not None:
+            if len(statements) != 1:
+                return [], None
+            statements = if_stmt.else_block.statements
+        else:
+            statements = statements[1:]
+
+
+def _base_clause(if_stmt: IfStatement, param: str, table: Optional[HashConsTable]):
+    """Read `if (param OP k) { return B }` as (op, k, affine B), with op '==' or '<='."""
+    then_statements = if_stmt.then_block.statements
+    if len(then_statements) != 1 or not isinstance(then_statements[0], ReturnStatement):
+        return None
+    value = affine_form(then_statements[0].value, param, table)
+    if value is None:
+        return None
+
+    condition = if_stmt.condition
+    if not isinstance(condition, ComparisonCondition):
+        return None
+    if (isinstance(condition.left, Identifier) and condition.left.name == param and
+            isinstance(condition.right, IntegerLiteral)):
+        operator, literal = condition.operator, condition.right.value
+    elif (isinstance(condition.right, Identifier) and condition.right.name == param and
+          isinstance(condition.left, IntegerLiteral)):
+        operator = MIRRORED_COMPARISONS.get(condition.operator)
+        literal = condition.left.value
+    else:
+        return None
+
+    if operator == '<':
+        return ('<=', literal - 1, value)
+    if operator in ('==', '<='):
+        return (operator, literal, value)
+    return None
+
+
+def evaluate_base(clauses, m: int) -> Optional[int]:
+    """Value of the first base clause that applies to the integer m, if any."""
+    for operator, literal, (a, b) in clauses:
+        if (operator == '==' and m == literal) or (operator == '<=' and m <= literal):
+            return a * m + b
+    return None
+
+
+def affine_form(expr, param: str,
+                table: Optional[HashConsTable] = None) -> Optional[Tuple[int, int]]:
+    """
+    Read expr as a * param + b with integer a and b, or None.
+
+    Subtrees are numbered in table (a fresh one if not given); a pass that
+    reads several expressions should share one table across them.
+    """
+    keys = (table if table is not None else HashConsTable()).keys_below(expr)
+    return _affine_forms(expr, param, keys)[keys[id(expr)]]
+
+
+def _affine_forms(root, param: str,
+                  keys: Dict[int, int]) -> Dict[int, Optional[Tuple[int, int]]]:
+    """
+    affine_form of root and of every node below it, by structural number
+    (see HashConsTable.keys_below): structurally equal subtrees, such as the
+    two n - 1 of f(n - 1) + f(n - 1), are read once. Computed bottom-up
+    with an explicit stack: long operator chains do not recurse.
+    """
+    forms: Dict[int, Optional[Tuple[int, int]]] = {}
+    for expr in iter_nodes_post_order(root):
+        key = keys[id(expr)]
+        if key not in forms:
+            forms[key] = _affine_step(expr, param, forms, keys)
+    return forms
+
+
+def _affine_step(expr, param: str, forms, keys) -> Optional[Tuple[int, int]]:
+    """affine_form of expr, given the forms of its operands."""
+    if isinstance(expr, IntegerLiteral):
+        return (0, expr.value)
+    if isinstance(expr, Identifier) and expr.name == param:
+        return (1, 0)
+    if isinstance(expr, UnaryExpression) and expr.operator in ('+', '-'):
+        operand = forms[keys[id(expr.operand)]]
+        if operand is None:
+            return None
+        sign = -1 if expr.operator == '-' else 1
+        return (sign * operand[0], sign * operand[1])
+    if isinstance(expr, BinaryExpression) and expr.operator in ('+', '-', '*'):
+        left = forms[keys[id(expr.left)]]
+        right = forms[keys[id(expr.right)]]
+        if left is None or right is None:
+            return None
+        if expr.operator == '+':
+            return (left[0] + right[0], left[1] + right[1])
+        if expr.operator == '-':
+            return (left[0] - right[0], left[1] - right[1])
+        if left[0] == 0:
+            return (left[1] * right[0], left[1] * right[1])
+        if right[0] == 0:
+            return (right[1] * left[0], right[1] * left[1])
+    return None
+
+
+class RecurrenceSolver:
+    """
+    Replaces linear recurrences with closed forms or fast exponentiation.
+
+    Only single-parameter functions are considered; each base clause must
+    compare the parameter with an integer literal (==, <= or <) and return
+    an affine expression of the parameter (a * n + b with literal a, b).
+    """
+
+    def __init__(self):
+        """Initialize the solver with fresh state for each program."""
+        self.helper_functions: List[Function] = []
+        self.name_counters: Dict[str, int] = {}
+        self.used_names: set = set()
+        self.solved_functions: List[str] = []
+        # Structural numbers of the expressions read by the pattern matching
+        self.table = HashConsTable()
+
+    def _get_unique_name(self, base_name: str) -> str:
+        """Generate a unique name, skipping the names already used in the program."""
+        while True:
+            self.name_counters[base_name] = self.name_counters.get(base_name, 0) + 1
+            name = sys.intern(f"{base_name}_{self.name_counters[base_name]}")
+            if name not in self.used_names:
+                self.used_names.add(name)
+                return name
+
+    def solve_program(self, program: Program) -> Program:
+        """
+        Solve every recognized recurrence in the program.
+
+        Returns:
+            A new Program with the solved functions replaced by wrappers,
+            followed by the renamed originals and the generated helpers
+        """
+        self.helper_functions = []
+        self.name_counters = {}
+        self.used_names = {function.name for function in program.functions}
+        self.solved_functions = []
+        self.table = HashConsTable()
+
+        functions = []
+        for function in program.functions:
+            recurrence = self._match_recurrence(function)
+            if recurrence is None:
+                functions.append(function)
+            else:
+                functions.append(self._rewrite_function(function, recurrence))
+                self.solved_functions.append(function.name)
+
+        return Program(functions + self.helper_functions, program.position)
+
+    # Pattern matching
+
+    def _match_recurrence(self, function: Function) -> Optional[Dict[str, Any]]:
+        """Extract base clauses and recurrence coefficients, or None."""
+        if len(function.parameters) != 1:
+            return None
+        param = function.parameters[0]
+
+        clauses, recursive_value = split_base_clauses(function.body.statements, param,
+                                                     self.table)
+        if not clauses or recursive_value is None:
+            return None
+
+        combination = self._linear_combination(recursive_value, function.name, param)
+        if combination is None:
+            return None
+        coefficients, (a, b) = combination
+        if not coefficients:
+            return None
+        order = max(coefficients)
+
+        # Above the largest threshold no base clause applies; the recursion
+        # needs `order` consecutive seeds decided by the base clauses
+        threshold = max(k for _, k, _ in clauses)
+        seeds = []
+        for m in range(threshold, threshold - order, -1):
+            seed = evaluate_base(clauses, m)
+            if seed is None:
+                return None
+            seeds.append(seed)
+
+        if order == 1:
+            p = coefficients[1]
+            if p == 1:
+                kind = 'series'
+            elif a == 0 and b == 0:
+                kind = 'geometric'
+            else:
+                return None
+        elif order == 2:
+            if a != 0 or b != 0:
+                return None
+            kind = 'matrix'
+        else:
+            return None
+
+        return {
+            'kind': kind,
+            'param': param,
+            'threshold': threshold,
+            'seeds': seeds,
+            'coefficients': coefficients,
+            'affine': (a, b)
+        }
+
+    def _linear_combination(self, expr, function_name: str, param: str):
+        """
+        Read expr as sum(c_j * f(param - j)) + a * param + b.
+
+        Returns:
+            ({j: c_j}, (a, b)) or None
+        """
+        # Bottom-up over the whole expression, by structural number, so that
+        # every distinct subtree is read once and long chains do not recurse
+        keys = self.table.keys_below(expr)
+        forms = _affine_forms(expr, param, keys)
+        combinations = {}
+        for node in iter_nodes_post_order(expr):
+            key = keys[id(node)]
+            if key not in combinations:
+                combinations[key] = self._combination_step(
+                    node, function_name, forms, combinations, keys)
+        return combinations[keys[id(expr)]]
+
+    @staticmethod
+    def _combination_step(expr, function_name: str, forms, combinations, keys):
+        """The linear combination of expr, given those of its operands."""
+        if (isinstance(expr, FunctionCall) and isinstance(expr.function, Identifier) and
+                expr.function.name == function_name):
+            if len(expr.arguments) != 1:
+                return None
+            argument = forms[keys[id(expr.arguments[0])]]
+            if argument is None or argument[0] != 1 or argument[1] >= 0:
+                return None
+            return ({-argument[1]: 1}, (0, 0))
+
+        affine = forms[keys[id(expr)]]
+        if affine is not None:
+            return ({}, affine)
+
+        if isinstance(expr, BinaryExpression) and expr.operator in ('+', '-'):
+            left = combinations[keys[id(expr.left)]]
+            right = combinations[keys[id(expr.right)]]
+            if left is None or right is None:
+                return None
+            sign = 1 if expr.operator == '+' else -1
+            coefficients = dict(left[0])
+            for offset, coefficient in right[0].items():
+                coefficients[offset] = coefficients.get(offset, 0) + sign * coefficient
+            return ({offset: c for offset, c in coefficients.items() if c != 0},
+                    (left[1][0] + sign * right[1][0], left[1][1] + sign * right[1][1]))
+
+        if isinstance(expr, BinaryExpression) and expr.operator == '*':
+            for factor, other in ((expr.left, expr.right), (expr.right, expr.left)):
+                constant = forms[keys[id(factor)]]
+                if constant is None or constant[0] != 0:
+                    continue
+                combination = combinations[keys[id(other)]]
+                if combination is None:
+                    return None
+                scale = constant[1]
+                coefficients, (a, b) = combination
+                return ({offset: scale * c for offset, c in coefficients.items() if scale * c != 0},
+                        (scale * a, scale * b))
+        return None
+
+    # AST rewriting
+
+    def _rewrite_function(self, function: Function, recurrence: Dict[str, Any]) -> Function:
+        """Create the guarded wrapper and the renamed copy of the original."""
+        param = recurrence['param']
+        threshold = recurrence['threshold']
+
+        fallback_name = self._get_unique_name(f"{function.name}_rec")
+        fallback = copy_tree(function)
+        fallback.name = fallback_name
+        self._rename_calls(fallback.body, function.name, fallback_name)
+        self.helper_functions.append(fallback)
+
+        exponent = self._binary(Identifier(param), '-', IntegerLiteral(threshold))
+        if recurrence['kind'] == 'series':
+            closed_block = Block([ReturnStatement(self._series(recurrence))])
+        elif recurrence['kind'] == 'geometric':
+            closed_block = Block([ReturnStatement(self._binary(
+                IntegerLiteral(recurrence['seeds'][0]), '*',
+                self._binary(IntegerLiteral(recurrence['coefficients'][1]), '^', exponent)))])
+        else:
+            closed_block = self._matrix_block(function, recurrence, exponent)
+
+        guard = IfStatement(
+            condition=ComparisonCondition(
+                left=Identifier(param),
+                operator=INTEGER_AT_LEAST_OPERATOR,
+                right=IntegerLiteral(threshold)
+            ),
+            then_block=closed_block,
+            else_block=Block([ReturnStatement(FunctionCall(
+                function=Identifier(fallback_name),
+                arguments=[Identifier(param)]
+            ))])
+        )
+        return Function(
+            name=function.name,
+            parameters=list(function.parameters),
+            body=Block([guard]),
+            position=function.position
+        )
+
+    def _series(self, recurrence: Dict[str, Any]):
+        """S + a * (T(n) - T(K)) + b * (n - K), with T(x) = x * (x + 1) / 2."""
+        param = recurrence['param']
+        threshold = recurrence['threshold']
+        a, b = recurrence['affine']
+
+        # n * (n + 1) is always even: the division is exact
+        result = IntegerLiteral(recurrence['seeds'][0])
+        if a != 0:
+            triangle = self._binary(
+                self._binary(Identifier(param), '*',
+                             self._binary(Identifier(param), '+', IntegerLiteral(1))),
+                '/', IntegerLiteral(2))
+            difference = self._binary(triangle, '-',
+                                      IntegerLiteral(threshold * (threshold + 1) // 2))
+            result = self._binary(result, '+',
+                                  self._binary(IntegerLiteral(a), '*', difference))
+        if b != 0:
+            steps = self._binary(Identifier(param), '-', IntegerLiteral(threshold))
+            result = self._binary(result, '+',
+                                  self._binary(IntegerLiteral(b), '*', steps))
+        return result
+
+    def _matrix_block(self, function: Function, recurrence: Dict[str, Any], exponent) -> Block:
+        """
+        m = M ^ (n - K), with M = [[p, q], [1, 0]] stored as p :: q :: 1 :: 0 :: []
+        return m[0][0] * f(K) + m[0][1] * f(K - 1)
+        """
+        multiply_name = self._get_unique_name(f"{function.name}_matmul")
+        power_name = self._get_unique_name(f"{function.name}_matpow")
+        p = recurrence['coefficients'].get(1, 0)
+        q = recurrence['coefficients'].get(2, 0)
+        self.helper_functions.append(self._matrix_multiply(multiply_name))
+        self.helper_functions.append(self._matrix_power(power_name, multiply_name, p, q))
+
+        matrix = self._get_unique_name("m")
+        current, previous = recurrence['seeds']
+        value = self._binary(
+            self._binary(UnaryExpression('head', Identifier(matrix)), '*', IntegerLiteral(current)),
+            '+',
+            self._binary(self._element(Identifier(matrix), 1), '*', IntegerLiteral(previous)))
+        return Block([
+            Assignment(matrix, FunctionCall(Identifier(power_name), [exponent])),
+            ReturnStatement(value)
+        ])
+
+    def _matrix_multiply(self, name: str) -> Function:
+        """mul(x, y): product of two 2x2 matrices stored as 4-element lists."""
+        statements = []
+        for matrix in ('x', 'y'):
+            for index in range(4):
+                statements.append(Assignment(f"{matrix}{index}",
+                                             self._element(Identifier(matrix), index)))
+
+        def entry(row, column):
+            return self._binary(
+                self._binary(Identifier(f"x{2 * row}"), '*', Identifier(f"y{column}")),
+                '+',
+                self._binary(Identifier(f"x{2 * row + 1}"), '*', Identifier(f"y{2 + column}")))
+
+        statements.append(ReturnStatement(self._list(
+            [entry(0, 0), entry(0, 1), entry(1, 0), entry(1, 1)])))
+        return Function(name, ['x', 'y'], Block(statements))
+
+    def _matrix_power(self, name: str, multiply_name: str, p: int, q: int) -> Function:
+        """
+        pow(e): M ^ e by repeated squaring
+            if (e == 0) return identity
+            half = pow(e / 2); square = mul(half, half)
+            if (e % 2 == 0) return square else return mul(square, M)
+        """
+        identity = self._list([IntegerLiteral(1), IntegerLiteral(0),
+                               IntegerLiteral(0), IntegerLiteral(1)])
+        step = self._list([IntegerLiteral(p), IntegerLiteral(q),
+                           IntegerLiteral(1), IntegerLiteral(0)])
+        body = Block([
+            IfStatement(
+                condition=ComparisonCondition(Identifier('e'), '==', IntegerLiteral(0)),
+                then_block=Block([ReturnStatement(identity)])
+            ),
+            Assignment('half', FunctionCall(Identifier(name), [
+                self._binary(Identifier('e'), '/', IntegerLiteral(2))])),
+            Assignment('square', FunctionCall(Identifier(multiply_name), [
+                Identifier('half'), Identifier('half')])),
+            IfStatement(
+                condition=ComparisonCondition(
+                    self._binary(Identifier('e'), '%', IntegerLiteral(2)), '==', IntegerLiteral(0)),
+                then_block=Block([ReturnStatement(Identifier('square'))]),
+                else_block=Block([ReturnStatement(FunctionCall(Identifier(multiply_name), [
+                    Identifier('square'), step]))])
+            )
+        ])
+        return Function(name, ['e'], body)
+
+    def _rename_calls(self, node, old_name: str, new_name: str):
+        """Redirect the recursive calls of the copied original to the copy."""
+        for child in iter_nodes(node):
+            if (isinstance(child, FunctionCall) and isinstance(child.function, Identifier) and
+                    child.function.name == old_name):
+                child.function.name = new_name
+
+    @staticmethod
+    def _binary(left, operator: str, right) -> BinaryExpression:
+        return BinaryExpression(left=left, operator=operator, right=right)
+
+    @staticmethod
+    def _element(matrix, index: int):
+        """head(tail^index(matrix))"""
+        for _ in range(index):
+            matrix = UnaryExpression('tail', matrix)
+        return UnaryExpression('head', matrix)
+
+    @staticmethod
+    def _list(elements):
+        """e0 :: e1 :: ... :: []"""
+        result = EmptyList()
+        for element in reversed(elements):
+            result = BinaryExpression(left=element, operator='::', right=result)
+        return result
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Integrazione asyncio per l'interprete Saltino.
+
+Espone run(), una coroutine che esegue una funzione di un programma Saltino
+a fette di slice_steps dispatch, cedendo il controllo all'event loop tra una
+fetta e l'altra. In questo modo un servizio asyncio può valutare programmi
+Saltino senza bloccare le altre coroutine e senza ricorrere ai thread.
+"""
+
+import asyncio
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Union
+
+from AST.ASTNodes import Program
+from interpreter import IterativeSaltinoInterpreter
+from saltino_parser import AnalyzedProgram, compile_saltino
+
+
+@dataclass
+class ExecutionProgress:
+    """Istantanea dello stato di un'esecuzione, passata al progress callback."""
+    steps: int
+    stack_depth: int
+    max_stack_depth: int
+
+
+async def run(program: Union[AnalyzedProgram, Program, str], fn: str = 'main',
+              args: Optional[List[Any]] = None, *,
+              semantic_analyzer: Any = None,
+              slice_steps: int = 1000,
+              timeout: Optional[float] = None,
+              progress_callback: Optional[Callable[[ExecutionProgress], Any]] = None,
+              debug_mode: bool = False) -> Any:
+    """
+    Esegue fn(args) del programma cedendo all'event loop ogni slice_steps dispatch.
+
+    Args:
+        program: AnalyzedProgram, AST già analizzato oppure codice sorgente
+        fn: Nome della funzione da eseguire
+        args: Argomenti della funzione
+        semantic_analyzer: Analizzatore semantico dell'AST (richiesto se program è un AST)
+        slice_steps: Numero di dispatch eseguiti prima di cedere il controllo
+        timeout: Tempo massimo in secondi, controllato tra una fetta e l'altra
+        progress_callback: Funzione (o coroutine) chiamata dopo ogni fetta
+            con un ExecutionProgress
+
+    Returns:
+        Il valore restituito dalla funzione
+
+    Raises:
+        SaltinoRuntimeError: Per gli errori di esecuzione del programma
+        asyncio.TimeoutError: Se l'esecuzione supera timeout
+        asyncio.CancelledError: Se il task viene cancellato
+    """
+    if slice_steps <= 0:
+        raise ValueError("slice_steps must be a positive integer")
+
+    if isinstance(program, str):
+        program = compile_saltino(program, debug_mode=debug_mode,
+                                  entry_points=(fn,))
+    if isinstance(program, AnalyzedProgram):
+        program, semantic_analyzer = (program.program,
+                                      program.semantic_analyzer)
+    elif semantic_analyzer is None:
+        raise ValueError("semantic_analyzer is required for an AST program")
+
+    interpreter = IterativeSaltinoInterpreter(
+        debug_mode=debug_mode, semantic_analyzer=semantic_analyzer)
+    interpreter.load_program(program)
+    function = interpreter.global_env.get_function(fn)
+    interpreter.start_call(function, list(args or []))
+
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+
+    while not interpreter.run_steps(slice_steps):
+        if progress_callback is not None:
+            progress = ExecutionProgress(
+                steps=interpreter.steps_executed,
+                stack_depth=len(interpreter.execution_stack),
+                max_stack_depth=interpreter.max_stack_depth)
+            outcome = progress_callback(progress)
+            if inspect.isawaitable(outcome):
+                await outcome
+
+        if deadline is not None and loop.time() >= deadline:
+            raise asyncio.TimeoutError(
+                f"Saltino function '{fn}' exceeded timeout of {timeout}s "
+                f"after {interpreter.steps_executed} steps")
+
+        # Punto di cessione (e di cancellazione) per l'event loop
+        await asyncio.sleep(0)
+
+    return interpreter.final_result
+
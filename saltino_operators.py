@@ -8,6 +8,7 @@ supportati dal linguaggio Saltino con controlli di tipo appropriati.
 
 from typing import Any, List, Union
 from errors.runtime_errors import SaltinoRuntimeError
+from packed_lists import concat, is_list, prepend, tail_of, type_name
 
 
 class SaltinoOperators:
@@ -18,8 +19,7 @@ class SaltinoOperators:
         """Divisione sicura che controlla la divisione per zero."""
         # Controllo di tipo: operatori aritmetici possono operare solo tra interi
         if type(x) is not int or type(y) is not int:
-            raise SaltinoRuntimeError(
-                f"Arithmetic operators can only operate on integers, got {type(x).__name__} and {type(y).__name__}")
+            raise SaltinoOperators._arithmetic_type_error(x, y)
         if y == 0:
             raise SaltinoRuntimeError("Division by zero")
         return x // y  # Divisione intera per mantenere il tipo intero
@@ -30,21 +30,23 @@ class SaltinoOperators:
         # Controllo di tipo: :: può operare solo tra un intero e una lista di interi
         if type(head) is not int:
             raise SaltinoRuntimeError(
-                f"Cons operator expects an integer as first argument, got {type(head).__name__}")
-        if not isinstance(tail, list):
+                f"Cons operator expects an integer as first argument, got {type_name(head)}")
+        if not is_list(tail):
             raise SaltinoRuntimeError(
-                f"Cons operator expects a list as second argument, got {type(tail).__name__}")
-        # Verifica che tutti gli elementi della lista siano interi
-        for i, item in enumerate(tail):
-            if type(item) is not int:
-                raise SaltinoRuntimeError(
-                    f"Cons operator expects a list of integers, got {type(item).__name__} at position {i}")
-        return [head] + tail
+                f"Cons operator expects a list as second argument, got {type_name(tail)}")
+        # Verifica che tutti gli elementi della lista siano interi (sempre
+        # vero per le liste compatte)
+        if type(tail) is list:
+            for i, item in enumerate(tail):
+                if type(item) is not int:
+                    raise SaltinoRuntimeError(
+                        f"Cons operator expects a list of integers, got {type(item).__name__} at position {i}")
+        return prepend(head, tail)
 
     @staticmethod
     def head(lst: List[Any]) -> Any:
         """Restituisce il primo elemento di una lista."""
-        if not isinstance(lst, list):
+        if not is_list(lst):
             raise SaltinoRuntimeError(
                 f"Head operator expects a list, got {type(lst)}")
         if len(lst) == 0:
@@ -54,100 +56,294 @@ class SaltinoOperators:
     @staticmethod
     def tail(lst: List[Any]) -> List[Any]:
         """Restituisce la coda di una lista (tutti gli elementi tranne il primo)."""
-        if not isinstance(lst, list):
+        if not is_list(lst):
             raise SaltinoRuntimeError(
                 f"Tail operator expects a list, got {type(lst)}")
         if len(lst) == 0:
             raise SaltinoRuntimeError("Tail of empty list")
-        return lst[1:]
+        return tail_of(lst)
 
     @staticmethod
-    def arithmetic_op(x: Any, y: Any, operation) -> int:
-        """Esegue un'operazione aritmetica con controllo di tipo."""
-        # Controllo di tipo: operatori aritmetici possono operare solo tra interi
-        # Nota: isinstance(True, int) è True in Python, quindi controlliamo esplicitamente bool
+    def equality_comparison(x: Any, y: Any) -> bool:
+        """Esegue il confronto di uguaglianza con regole speciali."""
+        # == può operare su interi o tra liste di interi, dove una deve essere []
+        if type(x) is int and type(y) is int:
+            return x == y
+        elif is_list(x) and is_list(y):
+            return x == y
+        else:
+            return False
+
+    # Varianti senza controlli di tipo, usate solo sui nodi i cui operandi
+    # hanno tipo dimostrato dall'inferenza statica (AST/type_inference.py).
+    # I controlli sui valori (divisione per zero, lista vuota) restano.
+
+    @staticmethod
+    def unchecked_divide(x: int, y: int) -> int:
+        """Divisione intera tra interi già verificati."""
+        if y == 0:
+            raise SaltinoRuntimeError("Division by zero")
+        return x // y
+
+    @staticmethod
+    def unchecked_cons(head: int, tail: List[int]) -> List[int]:
+        """Cons tra un intero e una lista di interi già verificati."""
+        return prepend(head, tail)
+
+    @staticmethod
+    def integer_at_least(value: Any, bound: int) -> bool:
+        """
+        Vero se value è un intero non minore di bound; non fallisce mai.
+        Usato dal RecurrenceSolver per scegliere la forma chiusa.
+        """
+        return type(value) is int and value >= bound
+
+    @staticmethod
+    def accumulate(acc: List[Any], value: Any) -> List[Any]:
+        """
+        Aggiunge in coda all'accumulatore un valore, senza controlli di tipo.
+        Usato solo dagli helper generati dal TailCallTransformer: la lista
+        nasce vuota nel wrapper e non esce dall'helper, quindi può essere
+        modificata sul posto.
+        """
+        acc.append(value)
+        return acc
+
+    @staticmethod
+    def cons_all(pending: List[Any], result: Any) -> List[Any]:
+        """
+        Equivale a pending[0] :: (pending[1] :: ... (pending[-1] :: result)):
+        stessi controlli e stessi errori della sequenza di cons, a partire
+        dall'ultimo elemento, ma in tempo lineare.
+        """
+        if not pending:
+            return result
+        # Il primo cons verifica anche la lista di partenza; i successivi
+        # possono fallire solo sull'elemento aggiunto
+        SaltinoOperators.cons(pending[-1], result)
+        for value in reversed(pending):
+            if type(value) is not int:
+                raise SaltinoRuntimeError(
+                    f"Cons operator expects an integer as first argument, got {type(value).__name__}")
+        return concat(pending, result)
+
+    @staticmethod
+    def unchecked_cons_all(pending: List[int], result: List[int]) -> List[int]:
+        """cons_all tra liste di interi già verificate."""
+        return concat(pending, result)
+
+    @staticmethod
+    def unchecked_head(lst: List[int]) -> int:
+        """Head di una lista di interi già verificata."""
+        if not lst:
+            raise SaltinoRuntimeError("Head of empty list")
+        return lst[0]
+
+    @staticmethod
+    def unchecked_tail(lst: List[int]) -> List[int]:
+        """Tail di una lista di interi già verificata."""
+        if not lst:
+            raise SaltinoRuntimeError("Tail of empty list")
+        return tail_of(lst)
+
+    # Operatori piatti: una sola chiamata con il controllo di tipo in linea.
+    # Sono quelli delle dispatch table e quelli legati ai nodi dell'AST
+    # (operator_impl) dopo l'analisi.
+
+    @staticmethod
+    def _arithmetic_type_error(x: Any, y: Any) -> SaltinoRuntimeError:
+        return SaltinoRuntimeError(
+            f"Arithmetic operators can only operate on integers, got {type_name(x)} and {type_name(y)}")
+
+    @staticmethod
+    def _comparison_type_error(x: Any, y: Any) -> SaltinoRuntimeError:
+        return SaltinoRuntimeError(
+            f"Comparison operators can only operate on integers, got {type_name(x)} and {type_name(y)}")
+
+    @staticmethod
+    def _logical_type_error(x: Any, y: Any) -> SaltinoRuntimeError:
+        return SaltinoRuntimeError(
+            f"Logical operators can only operate on booleans, got {type_name(x)} and {type_name(y)}")
+
+    @staticmethod
+    def _unary_type_error(x: Any) -> SaltinoRuntimeError:
+        return SaltinoRuntimeError(
+            f"Unary arithmetic operators can only operate on integers, got {type_name(x)}")
+
+    @staticmethod
+    def add(x: Any, y: Any) -> int:
         if type(x) is not int or type(y) is not int:
-            raise SaltinoRuntimeError(
-                f"Arithmetic operators can only operate on integers, got {type(x).__name__} and {type(y).__name__}")
-        return operation(x, y)
+            raise SaltinoOperators._arithmetic_type_error(x, y)
+        return x + y
 
     @staticmethod
-    def unary_arithmetic_op(x: Any, operation) -> int:
-        """Esegue un'operazione aritmetica unaria con controllo di tipo."""
-        # Controllo di tipo: operatori aritmetici possono operare solo su interi
+    def subtract(x: Any, y: Any) -> int:
+        if type(x) is not int or type(y) is not int:
+            raise SaltinoOperators._arithmetic_type_error(x, y)
+        return x - y
+
+    @staticmethod
+    def multiply(x: Any, y: Any) -> int:
+        if type(x) is not int or type(y) is not int:
+            raise SaltinoOperators._arithmetic_type_error(x, y)
+        return x * y
+
+    @staticmethod
+    def modulo(x: Any, y: Any) -> int:
+        if type(x) is not int or type(y) is not int:
+            raise SaltinoOperators._arithmetic_type_error(x, y)
+        return x % y
+
+    @staticmethod
+    def power(x: Any, y: Any) -> Union[int, float]:
+        if type(x) is not int or type(y) is not int:
+            raise SaltinoOperators._arithmetic_type_error(x, y)
+        return x ** y
+
+    @staticmethod
+    def positive(x: Any) -> int:
         if type(x) is not int:
-            raise SaltinoRuntimeError(
-                f"Unary arithmetic operators can only operate on integers, got {type(x).__name__}")
-        return operation(x)
+            raise SaltinoOperators._unary_type_error(x)
+        return +x
+
+    @staticmethod
+    def negate(x: Any) -> int:
+        if type(x) is not int:
+            raise SaltinoOperators._unary_type_error(x)
+        return -x
 
     @staticmethod
-    def comparison_op(x: Any, y: Any, operation) -> bool:
-        """Esegue un'operazione di confronto con controllo di tipo."""
-        # Controllo di tipo: operatori di confronto (eccetto ==) possono operare solo su interi
+    def not_equal(x: Any, y: Any) -> bool:
         if type(x) is not int or type(y) is not int:
-            raise SaltinoRuntimeError(
-                f"Comparison operators can only operate on integers, got {type(x).__name__} and {type(y).__name__}")
-        return operation(x, y)
+            raise SaltinoOperators._comparison_type_error(x, y)
+        return x != y
 
     @staticmethod
-    def equality_comparison(x: Any, y: Any) -> bool:
-        """Esegue il confronto di uguaglianza con regole speciali."""
-        # == può operare su interi o tra liste di interi, dove una deve essere []
-        if type(x) is int and type(y) is int:
-            return x == y
-        elif isinstance(x, list) and isinstance(y, list):
-            return x == y
-        else:
-            return False
+    def less(x: Any, y: Any) -> bool:
+        if type(x) is not int or type(y) is not int:
+            raise SaltinoOperators._comparison_type_error(x, y)
+        return x < y
 
     @staticmethod
-    def logical_op(x: Any, y: Any, operation) -> bool:
-        """Esegue un'operazione logica con controllo di tipo."""
-        # Controllo di tipo: connettivi logici possono operare solo tra valori booleani
+    def less_equal(x: Any, y: Any) -> bool:
+        if type(x) is not int or type(y) is not int:
+            raise SaltinoOperators._comparison_type_error(x, y)
+        return x <= y
+
+    @staticmethod
+    def greater(x: Any, y: Any) -> bool:
+        if type(x) is not int or type(y) is not int:
+            raise SaltinoOperators._comparison_type_error(x, y)
+        return x > y
+
+    @staticmethod
+    def greater_equal(x: Any, y: Any) -> bool:
+        if type(x) is not int or type(y) is not int:
+            raise SaltinoOperators._comparison_type_error(x, y)
+        return x >= y
+
+    @staticmethod
+    def logical_and(x: Any, y: Any) -> bool:
         if type(x) is not bool or type(y) is not bool:
-            raise SaltinoRuntimeError(
-                f"Logical operators can only operate on booleans, got {type(x).__name__} and {type(y).__name__}")
-        return operation(x, y)
+            raise SaltinoOperators._logical_type_error(x, y)
+        return x and y
+
+    @staticmethod
+    def logical_or(x: Any, y: Any) -> bool:
+        if type(x) is not bool or type(y) is not bool:
+            raise SaltinoOperators._logical_type_error(x, y)
+        return x or y
 
     @classmethod
     def get_binary_operators(cls):
         """Restituisce la dispatch table per le operazioni binarie."""
         return {
-            '+': lambda x, y: cls.arithmetic_op(x, y, lambda a, b: a + b),
-            '-': lambda x, y: cls.arithmetic_op(x, y, lambda a, b: a - b),
-            '*': lambda x, y: cls.arithmetic_op(x, y, lambda a, b: a * b),
-            '/': lambda x, y: cls.safe_divide(x, y),
-            '%': lambda x, y: cls.arithmetic_op(x, y, lambda a, b: a % b),
-            '^': lambda x, y: cls.arithmetic_op(x, y, lambda a, b: a ** b),
-            '::': lambda x, y: cls.cons(x, y),
+            '+': cls.add,
+            '-': cls.subtract,
+            '*': cls.multiply,
+            '/': cls.safe_divide,
+            '%': cls.modulo,
+            '^': cls.power,
+            '::': cls.cons,
+            'accumulate': cls.accumulate,
+            'cons_all': cls.cons_all,
+            **cls.get_fold_operators(),
         }
 
+    @classmethod
+    def get_fold_operators(cls):
+        """
+        Operatori interni 'foldr<op>' e 'foldl<op>' degli helper generati dal
+        TailCallTransformer: applicano le operazioni rimaste in sospeso
+        partendo dalla più interna, con le stesse verifiche dell'operatore.
+        """
+        operators = {}
+        for symbol, operation in (('+', cls.add), ('-', cls.subtract),
+                                  ('*', cls.multiply), ('/', cls.safe_divide),
+                                  ('%', cls.modulo), ('^', cls.power), ('::', cls.cons)):
+            operators['foldr' + symbol] = cls._pending_fold(operation, False)
+            operators['foldl' + symbol] = cls._pending_fold(operation, True)
+        return operators
+
+    @staticmethod
+    def _pending_fold(operation, call_on_left: bool):
+        """
+        Crea l'operatore che applica le operazioni in sospeso, dall'ultima
+        alla prima: value OP result (foldr) oppure result OP value (foldl).
+        """
+        return PendingFold(operation, call_on_left)
+
     @classmethod
     def get_unary_operators(cls):
         """Restituisce la dispatch table per le operazioni unarie."""
         return {
-            '+': lambda x: cls.unary_arithmetic_op(x, lambda a: +a),
-            '-': lambda x: cls.unary_arithmetic_op(x, lambda a: -a),
-            'head': lambda x: cls.head(x),
-            'tail': lambda x: cls.tail(x),
+            '+': cls.positive,
+            '-': cls.negate,
+            'head': cls.head,
+            'tail': cls.tail,
         }
 
     @classmethod
     def get_comparison_operators(cls):
         """Restituisce la dispatch table per gli operatori di confronto."""
         return {
-            '==': lambda x, y: cls.equality_comparison(x, y),
-            '!=': lambda x, y: cls.comparison_op(x, y, lambda a, b: a != b),
-            '<': lambda x, y: cls.comparison_op(x, y, lambda a, b: a < b),
-            '<=': lambda x, y: cls.comparison_op(x, y, lambda a, b: a <= b),
-            '>': lambda x, y: cls.comparison_op(x, y, lambda a, b: a > b),
-            '>=': lambda x, y: cls.comparison_op(x, y, lambda a, b: a >= b),
+            '==': cls.equality_comparison,
+            '!=': cls.not_equal,
+            '<': cls.less,
+            '<=': cls.less_equal,
+            '>': cls.greater,
+            '>=': cls.greater_equal,
+            'int>=': cls.integer_at_least,
         }
 
     @classmethod
     def get_logical_operators(cls):
         """Restituisce la dispatch table per le operazioni logiche."""
         return {
-            'and': lambda x, y: cls.logical_op(x, y, lambda a, b: a and b),
-            'or': lambda x, y: cls.logical_op(x, y, lambda a, b: a or b),
+            'and': cls.logical_and,
+            'or': cls.logical_or,
         }
+
+
+class PendingFold:
+    """
+    Operatore 'foldr<op>'/'foldl<op>' legato ai nodi dell'AST. È una classe
+    e non una closure perché i nodi (con operator_impl) vengono serializzati
+    nei checkpoint.
+    """
+
+    __slots__ = ('operation', 'call_on_left')
+
+    def __init__(self, operation, call_on_left: bool):
+        self.operation = operation
+        self.call_on_left = call_on_left
+
+    def __call__(self, pending: List[Any], result: Any) -> Any:
+        operation = self.operation
+        if self.call_on_left:
+            for value in reversed(pending):
+                result = operation(result, value)
+        else:
+            for value in reversed(pending):
+                result = operation(value, result)
+        return result
@@ -11,18 +11,178 @@ from Grammatica.SaltinoLexer import SaltinoLexer
 from AST.ASTVisitor import build_ast
 from AST.ASTNodes import Program
 from antlr4 import InputStream, CommonTokenStream
+from antlr4.PredictionContext import PredictionContextCache
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.dfa.DFA import DFA
 from errors.custom_error_listener import create_error_listener
 from errors.parser_errors import SaltinoParseError
-from typing import Optional, Tuple, List, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Tuple, List, Dict, Any, Iterable
+import sys
+import threading
 
+# Livello di ottimizzazione predefinito per i passi sull'AST
+DEFAULT_OPTIMIZATION_LEVEL = 1
 
-def parse_saltino(input_text: str, raise_on_error: bool = True, debug_mode = False) -> Tuple[Optional[Program], List[Dict[str, Any]], Optional[Any]]:
+
+@dataclass(frozen=True)
+class AnalyzedProgram:
+    """
+    Programma trasformato e analizzato, pronto per l'esecuzione.
+
+    Non viene modificato durante l'esecuzione: più interpreti, anche in
+    thread diversi, possono eseguire lo stesso AnalyzedProgram.
+    """
+    program: Program
+    semantic_analyzer: Any
+
+
+# Cache DFA di ANTLR per thread: le cache generate nelle classi del lexer e
+# del parser sono condivise da tutte le istanze e non sono thread-safe
+_thread_state = threading.local()
+
+
+def _use_thread_local_caches(lexer: SaltinoLexer, parser: SaltinoParser):
+    """Sostituisce i simulatori ATN con versioni che usano cache del thread corrente."""
+    caches = getattr(_thread_state, 'caches', None)
+    if caches is None:
+        caches = (
+            [DFA(state, i) for i, state in enumerate(SaltinoLexer.atn.decisionToState)],
+            [DFA(state, i) for i, state in enumerate(SaltinoParser.atn.decisionToState)],
+            PredictionContextCache())
+        _thread_state.caches = caches
+    lexer_dfa, parser_dfa, context_cache = caches
+    lexer._interp = LexerATNSimulator(
+        lexer, lexer.atn, lexer_dfa, PredictionContextCache())
+    parser._interp = ParserATNSimulator(
+        parser, parser.atn, parser_dfa, context_cache)
+
+
+# Il parser generato da ANTLR è ricorsivo: ogni livello di annidamento
+# (parentesi, blocchi, letterali di lista, operandi destri di :: e ^,
+# operatori prefissi) costa
+# al più una decina di frame Python, mentre le catene di operatori
+# associativi a sinistra sono riconosciute con un ciclo. I sorgenti annidati
+# in profondità vengono analizzati in un thread dedicato, con il limite di
+# ricorsione alzato quanto basta a quel thread
+_FRAMES_PER_LEVEL = 8
+# Frame usati dal thread del parser fuori dalle regole (avvio del thread,
+# listener degli errori, strategia di recupero)
+_PARSE_FRAME_MARGIN = 200
+# Stack del thread del parser. Dalla 3.11 le chiamate tra funzioni Python
+# non occupano lo stack C e basta quello minimo; prima ogni frame ne occupa
+# circa un kilobyte. È memoria virtuale riservata: le pagine vengono
+# occupate solo fin dove il parse scende davvero
+_STACK_BYTES_PER_FRAME = 0 if sys.version_info >= (3, 11) else 1024
+_MIN_PARSE_STACK_SIZE = 16 * 1024 * 1024
+_deep_parse_lock = threading.Lock()
+
+# Operatori che fanno ricorrere il parser sul loro operando destro
+_NESTING_OPERATORS = frozenset(('::', '^', '!'))
+_SIGNS = frozenset(('+', '-'))
+# Token dopo i quali + e - sono binari (associativi a sinistra)
+_OPERAND_ENDS = frozenset((')', ']', 'true', 'false', '[]'))
+# Token dopo i quali inizia un'espressione nuova allo stesso livello
+_EXPRESSION_STARTS = frozenset((',', '=', 'return'))
+
+
+def _nesting_depth(tokens) -> int:
+    """
+    Stima per eccesso della profondità di annidamento: parentesi e graffe
+    aperte più, a ogni livello, gli operatori che annidano l'operando destro.
+    """
+    levels = [0]
+    pending = 0
+    depth = 0
+    previous = None
+    for token in tokens:
+        text = token.text
+        if text in ('(', '{', '['):
+            levels.append(0)
+        elif text in (')', '}', ']'):
+            if len(levels) > 1:
+                pending -= levels.pop()
+        elif text in _NESTING_OPERATORS or (
+                text in _SIGNS and previous is not None and
+                previous.type not in (SaltinoLexer.ID, SaltinoLexer.INT, SaltinoLexer.TABELLA) and
+                previous.text not in _OPERAND_ENDS):
+            levels[-1] += 1
+            pending += 1
+        elif text in _EXPRESSION_STARTS:
+            pending -= levels[-1]
+            levels[-1] = 0
+        depth = max(depth, len(levels) + pending)
+        previous = token
+    return depth
+
+
+def _parse_program(parser: SaltinoParser, token_stream: CommonTokenStream):
+    """Esegue la regola 'programma', anche su sorgenti annidati molto in profondità."""
+    token_stream.fill()
+    frames = _nesting_depth(token_stream.tokens) * _FRAMES_PER_LEVEL
+    if frames < sys.getrecursionlimit() // 2:
+        return parser.programma()
+
+    outcome = {}
+    # Il thread parte con lo stack vuoto: gli basta un limite pari ai frame
+    # stimati, non a quelli stimati più quelli del chiamante
+    limit = frames + _PARSE_FRAME_MARGIN
+    stack_size = max(_MIN_PARSE_STACK_SIZE, limit * _STACK_BYTES_PER_FRAME)
+    stack_size = -(-stack_size // (1024 * 1024)) * 1024 * 1024
+
+    def run():
+        # CPython non ha un limite di ricorsione per thread: il limite è del
+        # processo e finché è alzato vale anche per gli altri thread. Viene
+        # alzato solo durante il parse, dal thread che ne ha bisogno, e mai
+        # oltre quanto serve a lui
+        previous_limit = sys.getrecursionlimit()
+        try:
+            sys.setrecursionlimit(max(previous_limit, limit))
+            outcome['tree'] = parser.programma()
+        except BaseException as e:
+            outcome['error'] = e
+        finally:
+            sys.setrecursionlimit(previous_limit)
+
+    # Anche la dimensione dello stack dei nuovi thread è globale e viene
+    # ripristinata appena il thread è partito. Un parse profondo alla volta,
+    # così ognuno ripristina il limite di ricorsione che ha trovato
+    with _deep_parse_lock:
+        worker = threading.Thread(target=run, name="saltino-parser")
+        previous_stack_size = threading.stack_size(stack_size)
+        try:
+            worker.start()
+        finally:
+            threading.stack_size(previous_stack_size)
+        worker.join()
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['tree']
+
+
+def parse_saltino(input_text: str, raise_on_error: bool = True, debug_mode = False,
+                  entry_points: Iterable[str] = ('main',),
+                  optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL,
+                  lazy_lists: bool = False) -> Tuple[Optional[Program], List[Dict[str, Any]], Optional[Any]]:
     """
     Analizza il codice sorgente Saltino e genera l'AST.
 
     Args:
         input_text: Il codice sorgente da analizzare
         raise_on_error: Se True, lancia eccezioni per errori di parsing
+        entry_points: Funzioni chiamabili dall'esterno con argomenti arbitrari
+            (l'inferenza dei tipi non fa ipotesi sui loro parametri)
+        optimization_level: 0 disattiva le ottimizzazioni sull'AST,
+            1 (default) applica inlining, constant folding e semplificazioni
+            2 fonde anche le coppie produttore/consumatore di liste
+            (deforestation), risolve le ricorrenze lineari (forme chiuse ed
+            esponenziazione veloce) e rimuove le funzioni irraggiungibili
+            dagli entry_points
+        lazy_lists: Se True il programma verrà eseguito con le liste pigre:
+            le funzioni che costruiscono liste con :: non vengono riscritte
+            dal TailCallTransformer né inlinate, così i loro return restano
+            sospendibili
 
     Returns:
         tuple: (ast, errors, semantic_analyzer) dove:
@@ -51,9 +211,10 @@ def parse_saltino(input_text: str, raise_on_error: bool = True, debug_mode = Fal
         parser_error_listener = create_error_listener()
         parser.removeErrorListeners()  # Rimuovi i listener di default
         parser.addErrorListener(parser_error_listener)
+        _use_thread_local_caches(lexer, parser)
 
         # Parsa il programma
-        tree = parser.programma()
+        tree = _parse_program(parser, token_stream)
 
         # Combina gli errori del lexer e del parser
         all_errors = lexer_error_listener.get_errors() + parser_error_listener.get_errors()
@@ -73,13 +234,30 @@ def parse_saltino(input_text: str, raise_on_error: bool = True, debug_mode = Fal
 
         # Esegui l'analisi semantica
         from AST.semantic_analyzer import SemanticAnalyzer
+        from AST.constant_folding import ConstantFolder
+        from AST.inliner import FunctionInliner
+        from AST.tree_shaking import TreeShaker
+        from AST.type_inference import TypeInference
+        from deforestation import Deforester
+        from recurrence_solver import RecurrenceSolver
         from tail_recursive_transformer import TailCallTransformer
         semantic_analyzer = SemanticAnalyzer(debug_mode=debug_mode)
-        tail_recursive_transformer = TailCallTransformer()
+        tail_recursive_transformer = TailCallTransformer(rewrite_cons=not lazy_lists)
 
         try:
+            if optimization_level >= 2:
+                ast = Deforester().fuse_program(ast)
+                ast = RecurrenceSolver().solve_program(ast)
             ast = tail_recursive_transformer.transform_program(ast)
-            semantic_analyzer.analyze(ast)
+            if optimization_level >= 2:
+                TreeShaker(entry_points).shake(ast)
+            if semantic_analyzer.analyze(ast):
+                # I passi successivi richiedono un AST completamente decorato
+                # Inferenza dei tipi e binding degli operatori sui nodi
+                TypeInference(semantic_analyzer, entry_points).infer(ast)
+                if optimization_level >= 1:
+                    FunctionInliner(semantic_analyzer, lazy_lists=lazy_lists).inline_program(ast)
+                    ConstantFolder(semantic_analyzer).fold_program(ast)
             # Se l'analisi semantica ha successo, non ci sono errori aggiuntivi
             return ast, all_errors, semantic_analyzer
         except Exception as semantic_error:
@@ -126,6 +304,28 @@ def parse_saltino(input_text: str, raise_on_error: bool = True, debug_mode = Fal
             return None, [generic_error], None
 
 
+def compile_saltino(input_text: str, debug_mode: bool = False,
+                    entry_points: Iterable[str] = ('main',),
+                    optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL,
+                    lazy_lists: bool = False) -> AnalyzedProgram:
+    """
+    Compila il codice sorgente in un AnalyzedProgram condivisibile.
+
+    Ogni chiamata usa il proprio stato (transformer, analizzatore, symbol
+    table), quindi compilazioni concorrenti in thread diversi sono indipendenti.
+
+    Raises:
+        SaltinoParseError: Se ci sono errori di parsing
+    """
+    ast, errors, semantic_analyzer = parse_saltino(
+        input_text, raise_on_error=True, debug_mode=debug_mode,
+        entry_points=entry_points, optimization_level=optimization_level,
+        lazy_lists=lazy_lists)
+    if ast is None or semantic_analyzer is None:
+        raise SaltinoParseError("Compilation failed")
+    return AnalyzedProgram(ast, semantic_analyzer)
+
+
 def parse_saltino_interactive(input_text: str) -> Optional[Program]:
     """
     Funzione di parsing interattiva che mostra errori dettagliati.
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Scheduler cooperativo per l'interprete Saltino.
+
+Poiché l'interprete è una macchina a stack esplicita, più programmi possono
+essere eseguiti in modo interlacciato nello stesso thread: ogni task possiede
+il proprio interprete (con execution_stack e global_env separati) e viene
+eseguito per una fetta di N dispatch prima di cedere il turno al successivo.
+"""
+
+import heapq
+import itertools
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from AST.ASTNodes import Program
+from errors.runtime_errors import SaltinoRuntimeError
+from interpreter import IterativeSaltinoInterpreter
+from saltino_parser import AnalyzedProgram
+
+
+class SchedulingPolicy(Enum):
+    """Politiche di scelta del prossimo task da eseguire."""
+    ROUND_ROBIN = "round_robin"
+    PRIORITY = "priority"
+
+
+@dataclass
+class ScheduledTask:
+    """Contesto di esecuzione di un programma gestito dallo scheduler."""
+    task_id: int
+    interpreter: IterativeSaltinoInterpreter
+    function_name: str
+    priority: int = 0
+    result: Any = None
+    error: Optional[SaltinoRuntimeError] = None
+    completed: bool = False
+    slices: int = 0
+
+    @property
+    def steps(self) -> int:
+        """Numero di dispatch eseguiti finora dal task."""
+        return self.interpreter.steps_executed
+
+
+class SaltinoScheduler:
+    """
+    Esegue più programmi Saltino in modo cooperativo in un unico thread.
+
+    Con ROUND_ROBIN ogni task pronto riceve a turno una fetta di slice_steps
+    dispatch. Con PRIORITY viene sempre eseguito il task pronto con priorità
+    più alta; i task con la stessa priorità si alternano in round-robin.
+    """
+
+    def __init__(self, slice_steps: int = 1000,
+                 policy: SchedulingPolicy = SchedulingPolicy.ROUND_ROBIN,
+                 debug_mode: bool = False):
+        if slice_steps <= 0:
+            raise ValueError("slice_steps must be a positive integer")
+        self.slice_steps = slice_steps
+        self.policy = policy
+        self.debug_mode = debug_mode
+        self.tasks: Dict[int, ScheduledTask] = {}
+        self._ids = itertools.count(1)
+        # Coda dei task pronti: deque per round-robin, heap per priorità
+        self._ready_queue: deque = deque()
+        self._ready_heap: List = []
+        self._sequence = itertools.count()
+        # Task terminati già in fase di submit, restituiti al prossimo run()
+        self._completed_on_submit: List[ScheduledTask] = []
+
+    def submit(self, program: Union[Program, AnalyzedProgram],
+               semantic_analyzer: Any = None,
+               args: Optional[List[Any]] = None, function_name: str = 'main',
+               priority: int = 0) -> int:
+        """
+        Registra un nuovo task che esegue function_name(args) del programma.
+
+        program può essere un AnalyzedProgram oppure un AST accompagnato dal
+        suo semantic_analyzer. Restituisce l'identificativo del task. Gli
+        errori di avvio (funzione inesistente, numero di argomenti errato)
+        completano subito il task.
+        """
+        if isinstance(program, AnalyzedProgram):
+            program, semantic_analyzer = (program.program,
+                                          program.semantic_analyzer)
+        interpreter = IterativeSaltinoInterpreter(
+            debug_mode=self.debug_mode, semantic_analyzer=semantic_analyzer)
+        task = ScheduledTask(next(self._ids), interpreter,
+                             function_name, priority)
+        self.tasks[task.task_id] = task
+
+        try:
+            interpreter.load_program(program)
+            function = interpreter.global_env.get_function(function_name)
+            interpreter.start_call(function, list(args or []))
+        except SaltinoRuntimeError as e:
+            task.error = e
+            task.completed = True
+            self._completed_on_submit.append(task)
+            return task.task_id
+
+        self._enqueue(task)
+        return task.task_id
+
+    def _enqueue(self, task: ScheduledTask):
+        """Inserisce un task nella coda dei pronti secondo la politica."""
+        if self.policy == SchedulingPolicy.PRIORITY:
+            heapq.heappush(self._ready_heap,
+                           (-task.priority, next(self._sequence), task))
+        else:
+            self._ready_queue.append(task)
+
+    def _dequeue(self) -> Optional[ScheduledTask]:
+        """Estrae il prossimo task da eseguire, None se non ce ne sono."""
+        if self.policy == SchedulingPolicy.PRIORITY:
+            if self._ready_heap:
+                return heapq.heappop(self._ready_heap)[2]
+            return None
+        if self._ready_queue:
+            return self._ready_queue.popleft()
+        return None
+
+    @property
+    def pending(self) -> int:
+        """Numero di task non ancora completati."""
+        return len(self._ready_queue) + len(self._ready_heap)
+
+    def run_slice(self) -> Optional[ScheduledTask]:
+        """
+        Esegue una singola fetta del prossimo task pronto.
+
+        Restituisce il task se si è completato durante la fetta, None altrimenti.
+        """
+        task = self._dequeue()
+        if task is None:
+            return None
+
+        task.slices += 1
+        try:
+            done = task.interpreter.run_steps(self.slice_steps)
+        except SaltinoRuntimeError as e:
+            task.error = e
+            done = True
+
+        if not done:
+            self._enqueue(task)
+            return None
+
+        if task.error is None:
+            task.result = task.interpreter.final_result
+        task.completed = True
+        if self.debug_mode:
+            print(f"[SCHED] Task {task.task_id} completato dopo "
+                  f"{task.slices} fette ({task.steps} passi)")
+        return task
+
+    def run(self) -> Iterator[ScheduledTask]:
+        """Esegue tutti i task restituendoli man mano che si completano."""
+        while self._completed_on_submit:
+            yield self._completed_on_submit.pop(0)
+
+        while self.pending:
+            task = self.run_slice()
+            if task is not None:
+                yield task
+
+            while self._completed_on_submit:
+                yield self._completed_on_submit.pop(0)
+
+    def run_all(self) -> Dict[int, ScheduledTask]:
+        """Esegue tutti i task fino al completamento e li restituisce per id."""
+        for _ in self.run():
+            pass
+        return self.tasks
@@ -8,9 +8,29 @@ that uses tail recursion by creating a "helper" function with an accumulator and
 a "wrapper" function that maintains the original function's signature.
 """
 
+import sys
+
 from AST.ASTNodes import *
+from AST.hash_consing import HashConsTable
+from AST.type_inference import iter_nodes
+from recurrence_solver import (INTEGER_AT_LEAST_OPERATOR, affine_form,
+                               evaluate_base, split_base_clauses)
 from typing import Dict, List, Optional, Any
-import copy
+
+# Internal operators used by the helpers generated for head-expr :: f(tail-args)
+# (they have no surface syntax): the first appends a head value to the
+# accumulator, the second rebuilds the list with the checked '::' semantics
+ACCUMULATE_OPERATOR = "accumulate"
+CONS_ALL_OPERATOR = "cons_all"
+
+# Prefixes of the internal operators that apply the pending operations of a
+# multi-clause recursion at its base case: 'foldr' + op for head OP f(...),
+# 'foldl' + op for f(...) OP value (e.g. "foldr+", "foldl*")
+FOLD_RIGHT_PREFIX = "foldr"
+FOLD_LEFT_PREFIX = "foldl"
+
+# Operators the legacy single-if rewrite folds into a scalar accumulator
+ACCUMULATOR_OPERATORS = ("+", "*")
 
 
 class TailCallTransformer:
@@ -21,14 +41,25 @@ class TailCallTransformer:
     tail call optimization for functions matching specific recursive patterns.
     """
 
-    def __init__(self):
-        """Initialize the transformer with fresh state for each transformation pass."""
+    def __init__(self, rewrite_cons: bool = True):
+        """
+        Initialize the transformer with fresh state for each transformation pass.
+
+        Args:
+            rewrite_cons: If False, functions building lists with :: are left
+                unchanged, so that lazy list evaluation can suspend their tails
+        """
+        self.rewrite_cons = rewrite_cons
+
         # List to store new helper functions generated during transformation
         self.helper_functions: List[Function] = []
 
         # Counters for generating unique names (reset per program)
         self.name_counters: Dict[str, int] = {}
 
+        # Structural numbers of the expressions read by the pattern matching
+        self.table = HashConsTable()
+
     def _get_unique_name(self, base_name: str) -> str:
         """
         Generate a unique name by appending a counter to the base name.
@@ -43,7 +74,26 @@ class TailCallTransformer:
             self.name_counters[base_name] = 0
 
         self.name_counters[base_name] += 1
-        return f"{base_name}_{self.name_counters[base_name]}"
+        return sys.intern(f"{base_name}_{self.name_counters[base_name]}")
+
+    def _accumulator_name(self, function: Function) -> str:
+        """
+        Generate a unique accumulator name that the function does not use.
+
+        The helper takes the accumulator next to the original parameters and
+        runs (a copy of) the original body, so the name must not collide
+        with a parameter, a local variable or any other identifier in it.
+        """
+        used_names = {node.name for node in iter_nodes(function.body)
+                      if isinstance(node, Identifier)}
+        used_names.update(node.variable for node in iter_nodes(function.body)
+                          if isinstance(node, Assignment))
+        used_names.update(function.parameters)
+
+        acc_name = self._get_unique_name("acc")
+        while acc_name in used_names:
+            acc_name = self._get_unique_name("acc")
+        return acc_name
 
     def transform_program(self, program: Program) -> Program:
         """
@@ -58,6 +108,7 @@ class TailCallTransformer:
         # Reset state for fresh transformation pass
         self.helper_functions = []
         self.name_counters = {}
+        self.table = HashConsTable()
 
         # Store original/wrapper functions
         transformed_functions = []
@@ -95,6 +146,17 @@ class TailCallTransformer:
 
     def _match_pattern(self, function: Function) -> Optional[Dict[str, Any]]:
         """Check if function matches any of the supported recursive patterns."""
+        pattern_info = self._match_single_if_pattern(function)
+        if pattern_info is None:
+            pattern_info = self._match_clauses_pattern(function)
+        if pattern_info is None:
+            pattern_info = self._match_tree_pattern(function)
+        if pattern_info is not None and pattern_info['operator'] == "::" and not self.rewrite_cons:
+            return None
+        return pattern_info
+
+    def _match_single_if_pattern(self, function: Function) -> Optional[Dict[str, Any]]:
+        """Match the single if/else shape rewritten with a scalar accumulator."""
 
         # 1. Parameter Check: exactly one or two main parameters
         if len(function.parameters) not in [1, 2]:
@@ -131,7 +193,7 @@ class TailCallTransformer:
             return None
 
         base_return = if_stmt.then_block.statements[0]
-        if not isinstance(base_return.value, (IntegerLiteral, BooleanLiteral, Identifier)):
+        if not isinstance(base_return.value, (IntegerLiteral, BooleanLiteral, Identifier, EmptyList)):
             return None
 
         initial_accumulator_value = base_return.value
@@ -157,9 +219,6 @@ class TailCallTransformer:
             binary_expr = recursive_value
             operator = binary_expr.operator
 
-            if operator == "::":
-                return None
-
             if self._is_recursive_call(binary_expr.left, function.name):
                 recursive_call = binary_expr.left
                 other_operand = binary_expr.right
@@ -178,11 +237,21 @@ class TailCallTransformer:
             if self._is_recursive_call(other_operand, function.name):
                 return None
 
-            # Check for non-commutative operators that would require complex transformation
-            # subtraction, division, cons, exponentiation
-            non_commutative_ops = ["-", "/", "::", "^"]
-            if operator in non_commutative_ops and not is_recursive_call_on_left:
-                return None
+            if operator == "::":
+                # List construction is only supported as head-expr :: f(tail-args):
+                # the head values are accumulated and consed at the end
+                if is_recursive_call_on_left:
+                    return None
+            else:
+                # An empty list base case only makes sense for list construction
+                if isinstance(initial_accumulator_value, EmptyList):
+                    return None
+
+                # Only associative and commutative operators can be regrouped
+                # into a scalar accumulator; the others are left to the
+                # multi-clause rewrite, which keeps the original grouping
+                if operator not in ACCUMULATOR_OPERATORS:
+                    return None
 
         elif isinstance(recursive_value, FunctionCall) and self._is_recursive_call(recursive_value, function.name):
             # Case 2: Direct recursive call (e.g., flex_func(y, x-1))
@@ -190,6 +259,8 @@ class TailCallTransformer:
             other_operand = None
             operator = None
             is_recursive_call_on_left = True  # Doesn't matter for direct calls
+            if isinstance(initial_accumulator_value, EmptyList):
+                return None
         else:
             return None
 
@@ -213,6 +284,184 @@ class TailCallTransformer:
             'is_recursive_call_on_left': is_recursive_call_on_left
         }
 
+    def _match_clauses_pattern(self, function: Function) -> Optional[Dict[str, Any]]:
+        """
+        Match a body made of guarded branches, with any number of parameters.
+
+        The body may contain local assignments, guard clauses
+        (if without else that always returns) and nested if/else, as long
+        as every path ends in a return. Each return is a clause:
+          - base:      return B                (no recursive call)
+          - tail:      return f(args)
+          - recursive: return H OP f(args)  or  return f(args) OP V
+        All recursive clauses must share the same operator and the same side
+        of the call, and at least one must exist. With the call on the left,
+        V is evaluated after the recursion in the original, so it must be a
+        literal or a variable, whose evaluation cannot fail.
+        """
+        clauses: List[Dict[str, Any]] = []
+        if not self._collect_clauses(function.body.statements, function, clauses):
+            return None
+
+        recursive = [clause for clause in clauses if clause['kind'] == 'recursive']
+        if not recursive:
+            return None
+
+        shapes = {(clause['operator'], clause['is_recursive_call_on_left'])
+                  for clause in recursive}
+        if len(shapes) != 1:
+            return None
+        operator, is_recursive_call_on_left = shapes.pop()
+
+        return {
+            'clauses': clauses,
+            'operator': operator,
+            'is_recursive_call_on_left': is_recursive_call_on_left,
+            'main_param': function.parameters[0] if function.parameters else None,
+            'base_value': None,
+            'initial_accumulator_value': None
+        }
+
+    def _match_tree_pattern(self, function: Function) -> Optional[Dict[str, Any]]:
+        """
+        Match a double recursion f(n - 1) OP f(n - 2) (or f(n - 2) OP f(n - 1)).
+
+        The single parameter is an integer that decreases by one and two; the
+        base clauses compare it with integer literals and return affine
+        values of it (e.g. `if (n <= 1) return n`), so that the two seeds
+        f(K) and f(K - 1), with K the largest literal, are known constants.
+        """
+        if len(function.parameters) != 1:
+            return None
+        param = function.parameters[0]
+
+        clauses, recursive_value = split_base_clauses(function.body.statements, param,
+                                                     self.table)
+        if not clauses or not isinstance(recursive_value, BinaryExpression):
+            return None
+
+        offsets = []
+        for operand in (recursive_value.left, recursive_value.right):
+            if not (self._is_recursive_call(operand, function.name) and
+                    len(operand.arguments) == 1):
+                return None
+            argument = affine_form(operand.arguments[0], param, self.table)
+            if argument is None or argument[0] != 1:
+                return None
+            offsets.append(-argument[1])
+        if sorted(offsets) != [1, 2]:
+            return None
+
+        threshold = max(literal for _, literal, _ in clauses)
+        seeds = [evaluate_base(clauses, threshold), evaluate_base(clauses, threshold - 1)]
+        if None in seeds:
+            return None
+
+        return {
+            'tree': True,
+            'main_param': param,
+            'operator': recursive_value.operator,
+            'is_recursive_call_on_left': offsets[0] == 1,
+            'threshold': threshold,
+            'seeds': seeds,
+            'base_value': None,
+            'initial_accumulator_value': None
+        }
+
+    def _collect_clauses(self, statements: List[Statement], function: Function,
+                         clauses: List[Dict[str, Any]]) -> bool:
+        """Check that a block always returns and collect its return clauses."""
+        # Explicit stack of ('block', statements) and ('return', statement)
+        # tasks, popped in source order, so nested ifs do not recurse
+        tasks = [('block', statements)]
+        while tasks:
+            kind, item = tasks.pop()
+            if kind == 'return':
+                clause = self._classify_return(item.value, function)
+                if clause is None:
+                    return False
+                clauses.append(clause)
+                continue
+
+            statements = item
+            if not statements:
+                return False
+
+            steps = []
+            for stmt in statements[:-1]:
+                if isinstance(stmt, Assignment):
+                    if self._contains_recursive_call(stmt.value, function.name):
+                        return False
+                elif isinstance(stmt, IfStatement) and stmt.else_block is None:
+                    # Guard clause: the then-branch returns, otherwise fall through
+                    if self._contains_recursive_call(stmt.condition, function.name):
+                        return False
+                    steps.append(('block', stmt.then_block.statements))
+                else:
+                    return False
+
+            last = statements[-1]
+            if isinstance(last, ReturnStatement) and isinstance(last.value, IfStatement):
+                last = last.value
+
+            if isinstance(last, IfStatement):
+                if (last.else_block is None or
+                        self._contains_recursive_call(last.condition, function.name)):
+                    return False
+                steps.append(('block', last.then_block.statements))
+                steps.append(('block', last.else_block.statements))
+            elif isinstance(last, ReturnStatement):
+                steps.append(('return', last))
+            else:
+                return False
+            tasks.extend(reversed(steps))
+        return True
+
+    def _classify_return(self, value, function: Function) -> Optional[Dict[str, Any]]:
+        """Classify a returned expression as a base, tail or recursive clause."""
+        name = function.name
+        if not self._contains_recursive_call(value, name):
+            return {'kind': 'base'}
+
+        if self._is_recursive_call(value, name):
+            if not self._valid_recursive_call(value, function):
+                return None
+            return {'kind': 'tail'}
+
+        if not isinstance(value, BinaryExpression):
+            return None
+
+        if self._is_recursive_call(value.left, name):
+            recursive_call, other_operand, on_left = value.left, value.right, True
+        elif self._is_recursive_call(value.right, name):
+            recursive_call, other_operand, on_left = value.right, value.left, False
+        else:
+            return None
+
+        if (not self._valid_recursive_call(recursive_call, function) or
+                self._contains_recursive_call(other_operand, name)):
+            return None
+        if on_left and not isinstance(other_operand, (IntegerLiteral, BooleanLiteral,
+                                                      EmptyList, Identifier)):
+            return None
+
+        return {
+            'kind': 'recursive',
+            'operator': value.operator,
+            'is_recursive_call_on_left': on_left
+        }
+
+    def _valid_recursive_call(self, call: FunctionCall, function: Function) -> bool:
+        """A recursive call must match the arity and have no nested recursion."""
+        return (len(call.arguments) == len(function.parameters) and
+                not any(self._contains_recursive_call(arg, function.name)
+                        for arg in call.arguments))
+
+    def _contains_recursive_call(self, node, function_name: str) -> bool:
+        """Check if a recursive call appears anywhere inside the node."""
+        return any(self._is_recursive_call(child, function_name)
+                   for child in iter_nodes(node))
+
     def _extract_base_value(self, condition, main_param: str):
         """Extract the base case value from the condition."""
         if not isinstance(condition, ComparisonCondition):
@@ -311,10 +560,19 @@ class TailCallTransformer:
 
         Creates a helper function and returns a wrapper function.
         """
+        if 'clauses' in pattern_info:
+            return self._rewrite_clauses_function(original_function, pattern_info)
+
+        if 'tree' in pattern_info:
+            return self._rewrite_tree_function(original_function, pattern_info)
+
+        if pattern_info['operator'] == "::":
+            return self._rewrite_cons_function(original_function, pattern_info)
+
         # Generate unique names
         helper_name = self._get_unique_name(
             f"{original_function.name}_tc_helper")
-        acc_name = self._get_unique_name("acc")
+        acc_name = self._accumulator_name(original_function)
 
         # Create helper function
         helper_function = self._create_helper_function(
@@ -327,6 +585,258 @@ class TailCallTransformer:
         return self._create_wrapper_function(
             original_function, pattern_info, helper_name, acc_name)
 
+    def _rewrite_cons_function(self, original_function: Function,
+                               pattern_info: Dict[str, Any]) -> Function:
+        """
+        Rewrite a list-building recursion head-expr :: f(tail-args).
+
+        The helper appends every head value to an accumulator and, at the
+        base case, 'cons_all' conses them onto the base value starting
+        from the last one. These are exactly the cons operations of the
+        original, with the same operands and in the same order, so results
+        and errors are unchanged; see tail_recursive_transformer.md.
+        """
+        helper_name = self._get_unique_name(
+            f"{original_function.name}_tc_helper")
+        acc_name = self._accumulator_name(original_function)
+
+        self.helper_functions.append(self._create_cons_helper_function(
+            original_function, pattern_info, helper_name, acc_name))
+
+        # Wrapper: start with an empty accumulator
+        wrapper_call = FunctionCall(
+            function=Identifier(helper_name),
+            arguments=[EmptyList()] + [Identifier(param)
+                                       for param in original_function.parameters]
+        )
+        return Function(
+            name=original_function.name,
+            parameters=original_function.parameters,
+            body=Block([ReturnStatement(wrapper_call)]),
+            position=original_function.position
+        )
+
+    def _rewrite_clauses_function(self, original_function: Function,
+                                  pattern_info: Dict[str, Any]) -> Function:
+        """
+        Rewrite a multi-clause recursion into helper(acc, params...).
+
+        The helper keeps the original body, with its assignments and branches,
+        and only changes the returns:
+          - return B           -> return acc FOLD B
+          - return f(args)     -> return helper(acc, args)
+          - return H OP f(args) (or f(args) OP V)
+                               -> return helper(acc accumulate H, args)
+        where FOLD applies the pending operations starting from the innermost
+        one, so the original grouping, results and errors are preserved
+        without requiring OP to be associative.
+        """
+        helper_name = self._get_unique_name(
+            f"{original_function.name}_tc_helper")
+        acc_name = self._accumulator_name(original_function)
+
+        operator = pattern_info['operator']
+        if operator == "::" and not pattern_info['is_recursive_call_on_left']:
+            fold_operator = CONS_ALL_OPERATOR
+        elif pattern_info['is_recursive_call_on_left']:
+            fold_operator = FOLD_LEFT_PREFIX + operator
+        else:
+            fold_operator = FOLD_RIGHT_PREFIX + operator
+
+        helper_body = copy_tree(original_function.body)
+        self._rewrite_clause_returns(helper_body.statements, original_function.name,
+                                     helper_name, acc_name, fold_operator)
+        self.helper_functions.append(Function(
+            name=helper_name,
+            parameters=[acc_name] + list(original_function.parameters),
+            body=helper_body,
+            position=original_function.position
+        ))
+
+        wrapper_call = FunctionCall(
+            function=Identifier(helper_name),
+            arguments=[EmptyList()] + [Identifier(param)
+                                       for param in original_function.parameters]
+        )
+        return Function(
+            name=original_function.name,
+            parameters=original_function.parameters,
+            body=Block([ReturnStatement(wrapper_call)]),
+            position=original_function.position
+        )
+
+    def _rewrite_tree_function(self, original_function: Function,
+                               pattern_info: Dict[str, Any]) -> Function:
+        """
+        Rewrite f(n - 1) OP f(n - 2) into a sliding window over f(K - 1), f(K):
+
+            f(n) = if (n int>= K) window(n - K, f(K), f(K - 1))
+                   else f_tc_fallback(n)
+            window(steps, current, previous) =
+                if (steps == 0) current
+                else window(steps - 1, current OP previous, current)
+
+        The window applies OP to the same operands as the original, in the
+        order in which the original first computes each f(m) (increasing m),
+        so the result and the first error raised are unchanged. Arguments
+        that are not integers at or above K, where the original may fail or
+        never reach the base clauses, run a renamed copy of the original.
+        """
+        param = pattern_info['main_param']
+        threshold = pattern_info['threshold']
+        window_name = self._get_unique_name(f"{original_function.name}_tc_window")
+        fallback_name = self._get_unique_name(f"{original_function.name}_tc_fallback")
+
+        fallback = copy_tree(original_function)
+        fallback.name = fallback_name
+        for node in iter_nodes(fallback.body):
+            if self._is_recursive_call(node, original_function.name):
+                node.function.name = fallback_name
+
+        if pattern_info['is_recursive_call_on_left']:
+            step = BinaryExpression(Identifier("current"), pattern_info['operator'],
+                                    Identifier("previous"))
+        else:
+            step = BinaryExpression(Identifier("previous"), pattern_info['operator'],
+                                    Identifier("current"))
+        window = Function(
+            name=window_name,
+            parameters=["steps", "current", "previous"],
+            body=Block([IfStatement(
+                condition=ComparisonCondition(Identifier("steps"), "==", IntegerLiteral(0)),
+                then_block=Block([ReturnStatement(Identifier("current"))]),
+                else_block=Block([ReturnStatement(FunctionCall(
+                    function=Identifier(window_name),
+                    arguments=[
+                        BinaryExpression(Identifier("steps"), "-", IntegerLiteral(1)),
+                        step,
+                        Identifier("current")
+                    ]
+                ))])
+            )]),
+            position=original_function.position
+        )
+        self.helper_functions.extend([window, fallback])
+
+        current, previous = pattern_info['seeds']
+        guard = IfStatement(
+            condition=ComparisonCondition(Identifier(param), INTEGER_AT_LEAST_OPERATOR,
+                                          IntegerLiteral(threshold)),
+            then_block=Block([ReturnStatement(FunctionCall(
+                function=Identifier(window_name),
+                arguments=[
+                    BinaryExpression(Identifier(param), "-", IntegerLiteral(threshold)),
+                    IntegerLiteral(current),
+                    IntegerLiteral(previous)
+                ]
+            ))]),
+            else_block=Block([ReturnStatement(FunctionCall(
+                function=Identifier(fallback_name),
+                arguments=[Identifier(param)]
+            ))])
+        )
+        return Function(
+            name=original_function.name,
+            parameters=original_function.parameters,
+            body=Block([guard]),
+            position=original_function.position
+        )
+
+    def _rewrite_clause_returns(self, statements: List[Statement], function_name: str,
+                                helper_name: str, acc_name: str, fold_operator: str):
+        """Rewrite in place the returns of a body accepted by _collect_clauses."""
+        # Explicit stack of statements: nested ifs do not recurse
+        stack = list(reversed(statements))
+        while stack:
+            stmt = stack.pop()
+            if isinstance(stmt, ReturnStatement) and isinstance(stmt.value, IfStatement):
+                stmt = stmt.value
+
+            if isinstance(stmt, IfStatement):
+                if stmt.else_block is not None:
+                    stack.extend(reversed(stmt.else_block.statements))
+                stack.extend(reversed(stmt.then_block.statements))
+            elif isinstance(stmt, ReturnStatement):
+                stmt.value = self._rewrite_clause_value(
+                    stmt.value, function_name, helper_name, acc_name, fold_operator)
+
+    def _rewrite_clause_value(self, value, function_name: str, helper_name: str,
+                              acc_name: str, fold_operator: str):
+        """Return the helper's version of a returned clause expression."""
+        if self._is_recursive_call(value, function_name):
+            return FunctionCall(
+                function=Identifier(helper_name),
+                arguments=[Identifier(acc_name)] + value.arguments,
+                position=value.position
+            )
+
+        if isinstance(value, BinaryExpression):
+            if self._is_recursive_call(value.right, function_name):
+                recursive_call, pending = value.right, value.left
+            elif self._is_recursive_call(value.left, function_name):
+                recursive_call, pending = value.left, value.right
+            else:
+                recursive_call = None
+
+            if recursive_call is not None:
+                new_acc_expr = BinaryExpression(
+                    left=Identifier(acc_name),
+                    operator=ACCUMULATE_OPERATOR,
+                    right=pending
+                )
+                return FunctionCall(
+                    function=Identifier(helper_name),
+                    arguments=[new_acc_expr] + recursive_call.arguments,
+                    position=recursive_call.position
+                )
+
+        # Base clause
+        return BinaryExpression(
+            left=Identifier(acc_name),
+            operator=fold_operator,
+            right=value,
+            position=value.position
+        )
+
+    def _create_cons_helper_function(self, original: Function, pattern_info: Dict[str, Any],
+                                     helper_name: str, acc_name: str) -> Function:
+        """
+        Create helper(acc, params...):
+            if (base_condition) return acc cons_all base_value
+            else return helper(acc accumulate head_expr, tail_args...)
+
+        The accumulator is the first parameter so that, as in the original,
+        the head expression is evaluated before the recursive arguments.
+        """
+        base_block = Block([ReturnStatement(BinaryExpression(
+            left=Identifier(acc_name),
+            operator=CONS_ALL_OPERATOR,
+            right=copy_tree(pattern_info['initial_accumulator_value'])
+        ))])
+
+        new_acc_expr = BinaryExpression(
+            left=Identifier(acc_name),
+            operator=ACCUMULATE_OPERATOR,
+            right=copy_tree(pattern_info['other_operand'])
+        )
+        tail_call = FunctionCall(
+            function=Identifier(helper_name),
+            arguments=[new_acc_expr] + [copy_tree(arg)
+                                        for arg in pattern_info['recursive_args']]
+        )
+
+        helper_if = IfStatement(
+            condition=copy_tree(pattern_info['condition']),
+            then_block=base_block,
+            else_block=Block([ReturnStatement(tail_call)])
+        )
+        return Function(
+            name=helper_name,
+            parameters=[acc_name] + list(original.parameters),
+            body=Block([helper_if]),
+            position=original.position
+        )
+
     def _create_helper_function(self, original: Function, pattern_info: Dict[str, Any],
                                 helper_name: str, acc_name: str) -> Function:
         """Create the tail-recursive helper function with accumulator."""
@@ -340,7 +850,7 @@ class TailCallTransformer:
             helper_params = [main_param, second_param, acc_name]
 
         # Base case condition (same as original)
-        base_condition = copy.deepcopy(pattern_info['condition'])
+        base_condition = copy_tree(pattern_info['condition'])
 
         # Base case action: return accumulator
         base_return = ReturnStatement(Identifier(acc_name))
@@ -351,7 +861,7 @@ class TailCallTransformer:
         if operator is not None:
             # Binary operation case (e.g., n * factorial(n-1))
             # Compute new accumulator value
-            new_acc_left = copy.deepcopy(pattern_info['other_operand'])
+            new_acc_left = copy_tree(pattern_info['other_operand'])
             new_acc_right = Identifier(acc_name)
 
             if pattern_info['is_recursive_call_on_left']:
@@ -380,15 +890,15 @@ class TailCallTransformer:
         if second_param is None:
             tail_call_args = [
                 # modified main param
-                copy.deepcopy(pattern_info['recursive_args'][0]),
+                copy_tree(pattern_info['recursive_args'][0]),
                 new_acc_expr  # new accumulator value
             ]
         else:
             tail_call_args = [
                 # modified main param
-                copy.deepcopy(pattern_info['recursive_args'][0]),
+                copy_tree(pattern_info['recursive_args'][0]),
                 # modified second param
-                copy.deepcopy(pattern_info['recursive_args'][1]),
+                copy_tree(pattern_info['recursive_args'][1]),
                 new_acc_expr  # new accumulator value
             ]
 
@@ -428,7 +938,7 @@ class TailCallTransformer:
                 # pass through original param
                 Identifier(main_param),
                 # initial acc value
-                copy.deepcopy(pattern_info['initial_accumulator_value'])
+                copy_tree(pattern_info['initial_accumulator_value'])
             ]
         else:
             wrapper_args = [
@@ -436,7 +946,7 @@ class TailCallTransformer:
                 Identifier(main_param),
                 Identifier(second_param),
                 # initial acc value
-                copy.deepcopy(pattern_info['initial_accumulator_value'])
+                copy_tree(pattern_info['initial_accumulator_value'])
             ]
 
         wrapper_call = FunctionCall(
@@ -532,16 +1042,25 @@ def analyze_function_pattern(function: Function) -> Dict[str, Any]:
 
     if pattern_info is None:
         # Provide detailed analysis of why it can't be transformed
-        if len(function.parameters) not in [1, 2]:
-            result['reason'] = f"Function has {len(function.parameters)} parameters, expected 1 or 2"
-        elif len(function.body.statements) != 1:
-            result['reason'] = f"Function body has {len(function.body.statements)} statements, expected 1"
+        if not transformer._contains_recursive_call(function.body, function.name):
+            result['reason'] = "Function structure doesn't match expected recursive pattern: no recursive call"
         else:
-            stmt = function.body.statements[0]
-            if not isinstance(stmt, (IfStatement, ReturnStatement)):
-                result['reason'] = f"Main statement is {type(stmt).__name__}, expected IfStatement or ReturnStatement"
-            else:
-                result['reason'] = "Function structure doesn't match expected recursive pattern"
+            result['reason'] = "Function structure doesn't match expected recursive pattern"
+    elif 'tree' in pattern_info:
+        result['pattern_info'] = {
+            'main_parameter': pattern_info['main_param'],
+            'operator': pattern_info['operator'],
+            'threshold': pattern_info['threshold'],
+            'seeds': pattern_info['seeds']
+        }
+    elif 'clauses' in pattern_info:
+        kinds = [clause['kind'] for clause in pattern_info['clauses']]
+        result['pattern_info'] = {
+            'main_parameter': pattern_info['main_param'],
+            'operator': pattern_info['operator'],
+            'base_clauses': kinds.count('base'),
+            'recursive_clauses': kinds.count('recursive') + kinds.count('tail')
+        }
     else:
         result['pattern_info'] = {
             'main_parameter': pattern_info['main_param'],
@@ -10,7 +10,10 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from errors.runtime_errors import SaltinoRuntimeError
+from interpreter import IterativeSaltinoInterpreter
 from main import exec_saltino_iterative
+from saltino_parser import compile_saltino
 
 @pytest.fixture
 def test_suite_path():
@@ -33,3 +36,45 @@ def saltino_executor():
     def _execute(program_path):
         return execute_saltino_program(program_path)
     return _execute
+
+
+def run_function(analyzed, args=(), name='main', lazy_lists=False, max_steps=None):
+    """
+    Runs a function of a compiled program and returns its result. With
+    max_steps the interpreter runs in slices of at most max_steps dispatches.
+    """
+    interpreter = IterativeSaltinoInterpreter(
+        semantic_analyzer=analyzed.semantic_analyzer, lazy_lists=lazy_lists)
+    interpreter.load_program(analyzed.program)
+    function = interpreter.global_env.get_function(name)
+    if max_steps is None:
+        return interpreter.call_function(function, list(args))
+    interpreter.start_call(function, list(args))
+    while not interpreter.run_steps(max_steps):
+        pass
+    return interpreter.final_result
+
+
+def run_outcome(analyzed, args=(), name='main', **options):
+    """Like run_function, but returns the message of a runtime error"""
+    try:
+        return run_function(analyzed, args, name, **options)
+    except SaltinoRuntimeError as e:
+        return str(e)
+
+
+def compile_without(monkeypatch, owner, method, source, **options):
+    """Compiles source with a pass disabled: owner.method returns the program unchanged"""
+    with monkeypatch.context() as patch:
+        patch.setattr(owner, method, lambda self, program: program)
+        return compile_saltino(source, **options)
+
+
+def assert_same_behaviour(optimized, reference, args=(), name='main'):
+    """
+    Runs the same function of two compilations of a program: results and
+    error messages must match. Returns the outcome.
+    """
+    outcome = run_outcome(optimized, args, name)
+    assert outcome == run_outcome(reference, args, name)
+    return outcome
@@ -0,0 +1,167 @@
+"""
+Test suite for the NumPy batch evaluator.
+
+Every row of a batch must give exactly the result (or the error) of a scalar
+call; rows that cannot be evaluated in int64 fall back to the interpreter.
+"""
+import pytest
+import batch_evaluator
+from batch_evaluator import BatchEvaluator
+from errors.runtime_errors import SaltinoRuntimeError
+from interpreter import IterativeSaltinoInterpreter
+from saltino_parser import compile_saltino
+
+np = pytest.importorskip("numpy")
+
+SOURCE = """
+def main(a, b, c) {
+    return min_two(min_two(a, b), c)
+}
+
+def min_two(x, y) {
+    if (x < y) {
+        return x
+    } else {
+        return y
+    }
+}
+
+def sign(x) {
+    if (x < 0) {
+        return 0 - 1
+    }
+    if (x == 0) {
+        return 0
+    }
+    return 1
+}
+
+def fact(n) {
+    if (n <= 1) {
+        return 1
+    }
+    return n * fact(n - 1)
+}
+
+def mix(a, b) {
+    t = a * b
+    if (t > 10 and !(b == 0)) {
+        return t / b + a ^ 2
+    }
+    return a % b
+}
+
+def lt(a, b) {
+    return a < b
+}
+
+def sumto(n) {
+    if (n == 0) {
+        return 0
+    } else {
+        return n + sumto(n - 1)
+    }
+}
+
+def depth(n) {
+    if (n == 0) {
+        return 0
+    }
+    return sign(depth(n - 1)) + n
+}
+
+def lists(n) {
+    if (n > 3) {
+        return [] :: []
+    }
+    return n
+}
+"""
+
+ENTRY_POINTS = ('main', 'min_two', 'sign', 'fact', 'mix', 'lt', 'sumto', 'depth', 'lists')
+ANALYZED = compile_saltino(SOURCE, entry_points=ENTRY_POINTS)
+
+
+def scalar(name, row):
+    interpreter = IterativeSaltinoInterpreter(semantic_analyzer=ANALYZED.semantic_analyzer)
+    interpreter.load_program(ANALYZED.program)
+    try:
+        return interpreter.call_function(interpreter.global_env.get_function(name), list(row))
+    except SaltinoRuntimeError as e:
+        return str(e)
+
+
+def assert_matches_scalar(name, rows, evaluator=None):
+    result = (evaluator or BatchEvaluator(ANALYZED)).evaluate(name, rows)
+    for i, row in enumerate(rows):
+        value = str(result.errors[i]) if i in result.errors else result.values[i]
+        assert value == scalar(name, row), f"{name}{tuple(row)}"
+    return result
+
+
+@pytest.mark.functions
+class TestBatchEvaluator:
+
+    def test_branches_and_calls(self):
+        """Each lane follows its own branches through nested calls"""
+        rows = [[a, b, c] for a in (-2, 0, 3) for b in (-1, 5) for c in (4, -7)]
+        result = assert_matches_scalar('main', rows)
+        assert result.fallback_rows == 0
+        assert_matches_scalar('sign', [[-5], [0], [9]])
+
+    def test_recursion(self):
+        """Recursive calls continue only with the lanes that reach them"""
+        result = assert_matches_scalar('sumto', [[n] for n in range(0, 40)])
+        assert result.fallback_rows == 0
+
+    def test_overflow_falls_back_to_bigints(self):
+        """Lanes that overflow int64 are rerun with unbounded integers"""
+        rows = [[2 ** 40, 2 ** 30], [2 ** 31, 2 ** 31], [6, 7], [-2 ** 62, 4]]
+        result = assert_matches_scalar('mix', rows)
+        assert result.fallback_rows == 2
+        assert result.values[0] == 2 ** 40 + 2 ** 80
+        assert_matches_scalar('main', [[2 ** 70, 1, 2], [1, 2, 3]])
+        # Rewritten functions that use list accumulators always fall back
+        assert_matches_scalar('fact', [[n] for n in range(0, 30)])
+
+    def test_errors_are_reported_per_row(self):
+        """Division by zero fails only its own row"""
+        rows = [[a, b] for a in (-4, 0, 3, 7) for b in (-2, 0, 5)]
+        result = assert_matches_scalar('mix', rows)
+        assert set(result.errors) == {i for i, row in enumerate(rows) if row[1] == 0}
+        assert all(result.values[i] is None for i in result.errors)
+
+    def test_boolean_results(self):
+        """Functions returning conditions give Python booleans"""
+        result = assert_matches_scalar('lt', [[1, 2], [2, 1], [3, 3]])
+        assert result.values == [True, False, False]
+
+    def test_unsupported_values_fall_back(self):
+        """Lists and mistyped arguments are left to the interpreter"""
+        result = assert_matches_scalar('lists', [[1], [5], [3]])
+        assert result.fallback_rows == 1
+        assert_matches_scalar('lt', [[True, 1], [1, 2]])
+
+    def test_depth_limit(self):
+        """Lanes deeper than max_depth finish in the scalar interpreter"""
+        result = assert_matches_scalar('depth', [[3], [50]], BatchEvaluator(ANALYZED, max_depth=10))
+        assert result.fallback_rows == 1
+
+    def test_tail_calls_do_not_nest(self):
+        """Tail-call helper loops run as masked loops, however many iterations"""
+        rows = [[0], [7], [200], [3000]]
+        result = assert_matches_scalar('sumto', rows, BatchEvaluator(ANALYZED, max_depth=10))
+        assert result.fallback_rows == 0
+        assert result.values[-1] == 3000 * 3001 // 2
+
+    def test_ndarray_rows(self):
+        """A 2D integer array is evaluated column by column"""
+        rows = np.random.default_rng(0).integers(-1000, 1000, size=(500, 3))
+        result = BatchEvaluator(ANALYZED).evaluate('main', rows)
+        assert result.values == rows.min(axis=1).tolist()
+
+    def test_requires_numpy(self, monkeypatch):
+        """Without NumPy the evaluator raises a runtime error"""
+        monkeypatch.setattr(batch_evaluator, 'np', None)
+        with pytest.raises(SaltinoRuntimeError, match="NumPy"):
+            BatchEvaluator(ANALYZED)
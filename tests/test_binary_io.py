@@ -0,0 +1,135 @@
+"""
+Test suite for memory-mapped binary list input and output.
+
+Lists are read from .npy or raw little-endian int64 files as read-only
+packed lists on the mapped file, and list results are written back in the
+same formats.
+"""
+import pickle
+import subprocess
+import sys
+from array import array
+from pathlib import Path
+
+import pytest
+from binary_io import load_list, save_list
+from errors.runtime_errors import SaltinoRuntimeError
+from interpreter import IterativeSaltinoInterpreter
+from packed_lists import PackedList
+from saltino_parser import compile_saltino
+
+project_root = Path(__file__).parent.parent
+
+SOURCE = """
+def main(xs) {
+    return tail(xs)
+}
+
+def total(xs) {
+    if (xs == []) {
+        return 0
+    }
+    return head(xs) + total(tail(xs))
+}
+"""
+
+VALUES = [-2 ** 63, -1, 0, 1, 2 ** 63 - 1] + list(range(100))
+
+
+def run(name, args, packed_result=False):
+    analyzed = compile_saltino(SOURCE, entry_points=('main', 'total'))
+    interpreter = IterativeSaltinoInterpreter(
+        semantic_analyzer=analyzed.semantic_analyzer, packed_result=packed_result)
+    interpreter.load_program(analyzed.program)
+    return interpreter.call_function(interpreter.global_env.get_function(name), args)
+
+
+@pytest.mark.functions
+class TestBinaryIO:
+
+    @pytest.mark.parametrize("name", ["values.npy", "values.bin"])
+    def test_round_trip(self, tmp_path, name):
+        """A written list is read back unchanged"""
+        path = str(tmp_path / name)
+        save_list(path, VALUES)
+        loaded = load_list(path)
+        assert isinstance(loaded, PackedList) and loaded == VALUES
+
+    def test_loaded_lists_map_the_file(self, tmp_path):
+        """The list is a read-only view on the file, not a copy"""
+        path = tmp_path / "values.bin"
+        path.write_bytes(array('q', VALUES).tobytes())
+        loaded = load_list(str(path))
+        assert isinstance(loaded.buffer, memoryview) and loaded.buffer.readonly
+        # Checkpoints store a copy of the mapped buffer
+        assert pickle.loads(pickle.dumps(loaded)) == VALUES
+
+    def test_empty_files(self, tmp_path):
+        path = str(tmp_path / "empty.npy")
+        save_list(path, [])
+        assert load_list(path) == []
+        (tmp_path / "empty.bin").write_bytes(b"")
+        assert load_list(str(tmp_path / "empty.bin")) == []
+
+    def test_invalid_files(self, tmp_path):
+        """Malformed inputs and non-int64 results raise runtime errors"""
+        (tmp_path / "odd.bin").write_bytes(b"\0" * 12)
+        with pytest.raises(SaltinoRuntimeError, match="multiple of 8"):
+            load_list(str(tmp_path / "odd.bin"))
+        (tmp_path / "bad.npy").write_bytes(b"not numpy")
+        with pytest.raises(SaltinoRuntimeError, match="Not a .npy file"):
+            load_list(str(tmp_path / "bad.npy"))
+        with pytest.raises(SaltinoRuntimeError, match="Cannot read"):
+            load_list(str(tmp_path / "missing.bin"))
+        with pytest.raises(SaltinoRuntimeError, match="do not fit in int64"):
+            save_list(str(tmp_path / "big.bin"), [2 ** 64])
+        with pytest.raises(SaltinoRuntimeError, match="Only list results"):
+            save_list(str(tmp_path / "int.bin"), 3)
+
+    def test_numpy_compatibility(self, tmp_path):
+        """Files are exchanged with NumPy when it is installed"""
+        np = pytest.importorskip("numpy")
+        path = str(tmp_path / "values.npy")
+        np.save(path, np.array(VALUES, dtype=np.int64))
+        assert load_list(path) == VALUES
+        save_list(path, VALUES)
+        assert np.load(path).tolist() == VALUES
+        np.save(path, np.zeros((2, 2), dtype=np.int64))
+        with pytest.raises(SaltinoRuntimeError, match="one-dimensional"):
+            load_list(path)
+
+    def test_programs_on_mapped_lists(self, tmp_path):
+        """Mapped lists are ordinary list values for the program"""
+        path = str(tmp_path / "values.npy")
+        save_list(path, VALUES)
+        assert run('total', [load_list(path)]) == sum(VALUES)
+        result = run('main', [load_list(path)], packed_result=True)
+        assert isinstance(result, PackedList) and result == VALUES[1:]
+        assert type(run('main', [load_list(path)])) is list
+
+    def test_command_line(self, tmp_path):
+        """@FILE reads an argument of main and --output writes the result"""
+        source, output = tmp_path / "tail.salt", tmp_path / "out.bin"
+        source.write_text(SOURCE)
+        save_list(str(tmp_path / "in.npy"), VALUES)
+        completed = subprocess.run(
+            [sys.executable, "main.py", str(source), f"--output={output}"],
+            input=f"@{tmp_path / 'in.npy'}\n", cwd=project_root,
+            capture_output=True, text=True, timeout=120)
+        assert completed.returncode == 0, completed.stdout
+        assert f"list of {len(VALUES) - 1} elements" in completed.stdout
+        assert load_list(str(output)) == VALUES[1:]
+
+    def test_output_over_the_input_file(self, tmp_path):
+        """--output may name the mapped input file without corrupting it"""
+        source, data = tmp_path / "tail.salt", tmp_path / "data.npy"
+        source.write_text(SOURCE)
+        values = list(range(99999)) + [7]
+        save_list(str(data), values)
+        completed = subprocess.run(
+            [sys.executable, "main.py", str(source), f"--output={data}"],
+            input=f"@{data}\n", cwd=project_root,
+            capture_output=True, text=True, timeout=120)
+        assert completed.returncode == 0, completed.stdout
+        assert load_list(str(data)) == values[1:]
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["data.npy", "tail.salt"]
@@ -0,0 +1,167 @@
+"""
+Test suite for checkpoint and resume of running executions
+"""
+import subprocess
+import sys
+import time
+import pytest
+from pathlib import Path
+from AST.ASTNodes import (BinaryExpression, Block, Function, IntegerLiteral, Program,
+                          ReturnStatement)
+from AST.semantic_analyzer import SemanticAnalyzer
+from checkpoint import load_checkpoint, run_with_checkpoints, save_checkpoint
+from errors.runtime_errors import SaltinoRuntimeError
+from interpreter import IterativeSaltinoInterpreter
+from saltino_parser import compile_saltino
+
+project_root = Path(__file__).parent.parent
+
+SOURCE = """
+def main() {
+    return total(build(60))
+}
+
+def build(n) {
+    if (n <= 0) {
+        return []
+    } else {
+        return n :: build(n - 1)
+    }
+}
+
+def total(xs) {
+    if (xs == []) {
+        return 0
+    } else {
+        return head(xs) + total(tail(xs))
+    }
+}
+"""
+
+# Far deeper than the recursion limit used while pickling
+DEPTH = 30000
+
+
+def start_interpreter():
+    analyzed = compile_saltino(SOURCE)
+    interpreter = IterativeSaltinoInterpreter(
+        semantic_analyzer=analyzed.semantic_analyzer)
+    main_function = interpreter.load_program(analyzed.program)
+    interpreter.start_call(main_function, [])
+    return interpreter
+
+
+@pytest.mark.functions
+class TestCheckpoint:
+
+    def test_resume_after_reload(self, tmp_path):
+        """
+        An execution saved mid-run and loaded again completes with the
+        same result as an uninterrupted run (sum of 1..60 = 1830)
+        """
+        interpreter = start_interpreter()
+        assert not interpreter.run_steps(500)
+        assert interpreter.execution_stack
+
+        path = str(tmp_path / "run.ckpt")
+        save_checkpoint(interpreter, path)
+        restored = load_checkpoint(path)
+
+        assert restored.steps_executed == 500
+        assert restored.execute() == 1830
+
+    def test_programs_with_pending_folds(self, tmp_path):
+        """Helpers that fold pending operations can be checkpointed"""
+        source = """
+def main() {
+    return total(1 :: 2 :: 3 :: [])
+}
+
+def total(xs) {
+    if (xs == []) {
+        return 0
+    }
+    return head(xs) + total(tail(xs))
+}
+"""
+        analyzed = compile_saltino(source)
+        interpreter = IterativeSaltinoInterpreter(
+            semantic_analyzer=analyzed.semantic_analyzer)
+        interpreter.start_call(interpreter.load_program(analyzed.program), [])
+        assert not interpreter.run_steps(20)
+
+        path = str(tmp_path / "run.ckpt")
+        save_checkpoint(interpreter, path)
+        assert load_checkpoint(path).execute() == 6
+
+    def test_resume_in_another_process(self, tmp_path):
+        """A checkpoint can be resumed by a separate interpreter process"""
+        interpreter = start_interpreter()
+        interpreter.run_steps(300)
+        path = tmp_path / "run.ckpt"
+        save_checkpoint(interpreter, str(path))
+
+        completed = subprocess.run(
+            [sys.executable, "main.py", f"--resume={path}"],
+            cwd=project_root, capture_output=True, text=True, timeout=120)
+
+        assert completed.returncode == 0, completed.stderr
+        assert "Program result: 1830" in completed.stdout
+
+    def test_periodic_checkpoints(self, tmp_path):
+        """Checkpoints are written every N steps while execution continues"""
+        interpreter = start_interpreter()
+        path = tmp_path / "run.ckpt"
+
+        finished = run_with_checkpoints(interpreter, str(path), every_steps=200)
+
+        assert finished
+        assert interpreter.final_result == 1830
+        assert path.exists()
+        assert load_checkpoint(str(path)).steps_executed >= 200
+
+    def test_deadline_suspends_execution(self, tmp_path):
+        """An expired deadline saves a checkpoint and suspends the run"""
+        interpreter = start_interpreter()
+        path = str(tmp_path / "run.ckpt")
+
+        finished = run_with_checkpoints(interpreter, path, slice_steps=50,
+                                        deadline=time.time() - 1)
+
+        assert not finished
+        assert load_checkpoint(path).execute() == 1830
+
+    def test_deep_programs(self, tmp_path):
+        """
+        A sum DEPTH levels deep inside DEPTH nested blocks (and so DEPTH
+        nested scopes and environments) is checkpointed mid-run
+        """
+        chain = IntegerLiteral(0)
+        for _ in range(DEPTH):
+            chain = BinaryExpression(IntegerLiteral(3), '+', chain)
+        body = Block([ReturnStatement(chain)])
+        for _ in range(DEPTH):
+            body = Block([body])
+        program = Program([Function('main', ['x'], body)])
+        semantic_analyzer = SemanticAnalyzer()
+        assert semantic_analyzer.analyze(program), semantic_analyzer.error_message
+        interpreter = IterativeSaltinoInterpreter(semantic_analyzer=semantic_analyzer)
+        interpreter.start_call(interpreter.load_program(program), [0])
+        assert not interpreter.run_steps(DEPTH + 1000)
+
+        path = tmp_path / "run.ckpt"
+        save_checkpoint(interpreter, str(path))
+
+        assert load_checkpoint(str(path)).execute() == 3 * DEPTH
+        assert [entry.name for entry in tmp_path.iterdir()] == ["run.ckpt"]
+
+    def test_failed_save_leaves_no_files(self, tmp_path):
+        """A state that cannot be pickled raises SaltinoRuntimeError and removes the temporary file"""
+        interpreter = start_interpreter()
+        interpreter.run_steps(100)
+        interpreter.global_env.variables['callback'] = lambda: None
+        path = tmp_path / "run.ckpt"
+
+        with pytest.raises(SaltinoRuntimeError, match="Cannot save checkpoint"):
+            save_checkpoint(interpreter, str(path))
+        assert list(tmp_path.iterdir()) == []
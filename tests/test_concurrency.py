@@ -0,0 +1,75 @@
+"""
+Stress test for concurrent compilation and execution in a thread pool
+"""
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from conftest import run_function
+from saltino_parser import compile_saltino
+
+PROGRAMS = [
+    (("edge_cases", "deep_recursion.salt"), 100),
+    (("functions", "tail_recursion_factorial.salt"), 120),
+    (("lists", "append.salt"), 1),
+    (("lists", "cons_precedence.salt"), 13),
+    (("conditions", "complex_conditions.salt"), None),
+]
+
+
+def compile_and_run(source):
+    analyzed = compile_saltino(source)
+    return run_function(analyzed)
+
+
+def unique_names(analyzed):
+    """Collect the unique names bound by one compilation, in scope order"""
+    names = []
+    pending = [analyzed.semantic_analyzer.global_scope]
+    while pending:
+        scope = pending.pop()
+        names.extend(info.unique_name for info in scope.symbol2info.values())
+        pending.extend(reversed(scope.children))
+    return names
+
+
+@pytest.mark.functions
+class TestConcurrency:
+
+    @pytest.fixture
+    def sources(self, test_suite_path):
+        return [test_suite_path.joinpath(*relative).read_text()
+                for relative, _ in PROGRAMS]
+
+    def test_parallel_compile_and_run(self, sources):
+        """
+        Compiling and running many programs in a thread pool gives the same
+        results as running them sequentially
+        """
+        expected = [compile_and_run(source) for source in sources]
+        for (_, known), value in zip(PROGRAMS, expected):
+            if known is not None:
+                assert value == known
+
+        workload = sources * 20
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(compile_and_run, workload))
+
+        assert results == expected * 20
+
+    def test_shared_analyzed_program(self, sources):
+        """One AnalyzedProgram can be executed by many threads at once"""
+        analyzed = compile_saltino(sources[0])
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(run_function, [analyzed] * 200))
+
+        assert results == [100] * 200
+
+    def test_unique_names_are_per_compilation(self, sources):
+        """
+        Unique names depend only on the compiled source, not on how many
+        compilations ran before or concurrently
+        """
+        reference = unique_names(compile_saltino(sources[2]))
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            compiled = list(pool.map(compile_saltino, [sources[2]] * 50))
+
+        assert all(unique_names(analyzed) == reference for analyzed in compiled)
@@ -0,0 +1,158 @@
+"""
+Test suite for constant folding and algebraic simplification
+"""
+import pytest
+from AST.ASTNodes import (BinaryExpression, Block, BooleanLiteral, IfStatement,
+                          IntegerLiteral)
+from conftest import run_function
+from errors.runtime_errors import SaltinoRuntimeError
+from saltino_parser import compile_saltino
+
+
+def compile_main(body, params=""):
+    source = f"def main({params}) {{\n{body}\n}}"
+    return compile_saltino(source)
+
+
+def main_statements(analyzed):
+    return analyzed.program.functions[0].body.statements
+
+
+def returned(analyzed):
+    (statement,) = main_statements(analyzed)
+    return statement.value
+
+
+@pytest.mark.functions
+class TestConstantFolding:
+
+    def test_arithmetic_is_folded(self):
+        """Literal-only arithmetic becomes a single literal"""
+        analyzed = compile_main("return (2 + 3) * 4 - -1 % 3 / 1")
+        value = returned(analyzed)
+
+        assert isinstance(value, IntegerLiteral)
+        assert value.value == run_function(compile_saltino(
+            "def main() {\nreturn (2 + 3) * 4 - -1 % 3 / 1\n}",
+            optimization_level=0))
+
+    def test_conditions_are_folded(self):
+        """Comparisons, negation and literal and/or become boolean literals"""
+        analyzed = compile_main("return !(1 < 2) or (3 == 3 and [] == [])")
+        value = returned(analyzed)
+
+        assert isinstance(value, BooleanLiteral)
+        assert value.value is True
+
+    def test_short_circuit_drops_unevaluated_side(self):
+        """false and X becomes false without evaluating X"""
+        analyzed = compile_main("return false and head([]) == 1")
+
+        assert isinstance(returned(analyzed), BooleanLiteral)
+        assert run_function(analyzed) is False
+
+    def test_head_and_tail_of_literal_lists(self):
+        """head/tail of a literal cons chain are folded"""
+        analyzed = compile_main("return head(tail(1 :: 2 :: []))")
+
+        assert isinstance(returned(analyzed), IntegerLiteral)
+        assert returned(analyzed).value == 2
+
+    def test_identities_on_proven_integers(self):
+        """x * 1 and x + 0 drop the operation when x is a proven integer"""
+        analyzed = compile_saltino("""
+def main() {
+    return twice(5)
+}
+
+def twice(x) {
+    return (x * 2) * 1 + 0
+}
+""")
+        twice = analyzed.program.functions[1]
+        (statement,) = twice.body.statements
+
+        assert isinstance(statement.value, BinaryExpression)
+        assert statement.value.operator == '*'
+        assert run_function(analyzed) == 10
+
+    def test_identities_keep_type_errors(self):
+        """x + 0 is kept when x is not proven to be an integer"""
+        analyzed = compile_main("return x + 0", params="x")
+
+        assert isinstance(returned(analyzed), BinaryExpression)
+        with pytest.raises(SaltinoRuntimeError, match="only operate on integers"):
+            run_function(analyzed, [[]])
+
+    @pytest.mark.parametrize("expression, message", [
+        ("10 / (5 - 5)", "Division by zero"),
+        ("head(tail(1 :: []))", "Head of empty list"),
+        ("1 :: 2", "expects a list"),
+    ])
+    def test_errors_are_preserved(self, expression, message):
+        """Subexpressions that would raise are left unfolded"""
+        analyzed = compile_main(f"return {expression}")
+
+        assert not isinstance(returned(analyzed), (IntegerLiteral, BooleanLiteral))
+        with pytest.raises(SaltinoRuntimeError, match=message):
+            run_function(analyzed)
+
+    @pytest.mark.parametrize("expression, message", [
+        ("5 % 0", "modulo by zero"),
+        ("0 ^ (0 - 1)", "negative power"),
+    ])
+    def test_python_arithmetic_errors_are_preserved(self, expression, message):
+        """% and ^ by zero compile and raise at runtime as with -O0"""
+        analyzed = compile_main(f"return {expression}")
+
+        assert isinstance(returned(analyzed), BinaryExpression)
+        with pytest.raises(SaltinoRuntimeError, match=message):
+            run_function(analyzed)
+
+    def test_errors_in_dead_branches(self):
+        """A modulo by zero in a branch that never runs does not fail"""
+        analyzed = compile_main("""
+    if (1 == 2) {
+        return 5 % 0
+    } else {
+        return 1
+    }
+""")
+        assert run_function(analyzed) == 1
+
+    def test_literal_if_is_pruned(self):
+        """if(true)/if(false) are replaced by the branch that runs"""
+        analyzed = compile_main("""
+    if (false) {
+        return 30
+    }
+    if (1 > 2) {
+        return 10
+    } else {
+        return 20
+    }
+""")
+        statements = main_statements(analyzed)
+
+        assert not any(isinstance(s, IfStatement) for s in statements)
+        assert all(isinstance(s, Block) for s in statements)
+        assert statements[0].statements == []
+        assert run_function(analyzed) == 20
+
+    def test_pruned_if_keeps_implicit_result(self):
+        """A pruned if without else still yields None as last statement"""
+        analyzed = compile_main("""
+    x = 1
+    if (false) {
+        x = 2
+    }
+""")
+        assert run_function(analyzed) is None
+
+    def test_level_zero_disables_folding(self):
+        """optimization_level=0 leaves the AST untouched"""
+        analyzed = compile_saltino("def main() {\nreturn 1 + 2\n}",
+                                   optimization_level=0)
+
+        assert isinstance(returned(analyzed), BinaryExpression)
+        assert run_function(analyzed) == 3
@@ -0,0 +1,214 @@
+"""
+Test suite for deeply nested programs.
+
+AST construction, the transformations, the semantic analysis and the
+optimizations use explicit stacks, so sources nested far beyond the Python
+recursion limit compile and run without RecursionError. The generated ANTLR
+parser is still recursive and runs deeply nested sources in a thread of its
+own, which raises the recursion limit only as far as it needs.
+"""
+import sys
+import threading
+
+import pytest
+import saltino_parser
+from AST.ASTNodes import (Assignment, BinaryCondition, BinaryExpression, Block,
+                          ComparisonCondition, EmptyList, Function, FunctionCall, Identifier,
+                          IfStatement, IntegerLiteral, Program, ReturnStatement,
+                          SourcePosition, copy_tree, walk)
+from AST.ASTVisitor import print_ast
+from AST.ASTsymbol_table import SymbolKind, SymbolTable
+from AST.constant_folding import ConstantFolder
+from AST.inliner import FunctionInliner
+from AST.semantic_analyzer import SemanticAnalyzer
+from AST.type_inference import TypeInference, iter_nodes
+from conftest import run_function
+from errors.parser_errors import SaltinoParseError
+from interpreter import IterativeSaltinoInterpreter
+from saltino_parser import compile_saltino
+from tail_recursive_transformer import TailCallTransformer
+
+# Deeper than the default recursion limit
+DEPTH = 1500
+# Trees built without the parser can be much deeper
+AST_DEPTH = 5000
+
+SOURCES = {
+    'blocks': ("{\n" * DEPTH + "return x\n" + "}\n" * DEPTH, 3),
+    'cons': ("return " + "x :: " * DEPTH + "[]\n", [3] * DEPTH),
+    'sum': ("return " + "x + " * DEPTH + "1\n", 3 * DEPTH + 1),
+    'parens': ("return " + "(" * DEPTH + "x" + ")" * DEPTH + "\n", 3),
+    'ifs': ("if (x > 0) {\n" * DEPTH + "return 1\n" + "}\n" * DEPTH + "return 0\n", 1),
+    'nots': ("return " + "!" * DEPTH + "(x > 0)\n", True),
+    'and': ("return " + "x > 0 and " * DEPTH + "x > 2\n", True),
+}
+
+
+def positive():
+    return ComparisonCondition(Identifier('x'), '>', IntegerLiteral(0))
+
+
+def deep_programs():
+    """Deep bodies for main, built directly as ASTs, with their results for x = 1"""
+    blocks = Block([ReturnStatement(Identifier('x'))])
+    calls = Identifier('x')
+    ifs = Block([ReturnStatement(IntegerLiteral(1))])
+    conditions = positive()
+    assignments = Block([ReturnStatement(Identifier('y'))])
+    for _ in range(AST_DEPTH):
+        blocks = Block([blocks])
+        calls = FunctionCall(Identifier('f'), [calls])
+        ifs = Block([IfStatement(positive(), ifs)])
+        conditions = BinaryCondition(positive(), 'and', conditions)
+        assignments = Block([Assignment('y', Identifier('x')), IfStatement(positive(), assignments)])
+    return {
+        'blocks': (blocks, 1),
+        'calls': (Block([ReturnStatement(calls)]), AST_DEPTH + 1),
+        'ifs': (Block(ifs.statements + [ReturnStatement(IntegerLiteral(0))]), 1),
+        'and': (Block([ReturnStatement(conditions)]), True),
+        'assignments': (Block(assignments.statements + [ReturnStatement(IntegerLiteral(0))]), 1),
+    }
+
+
+@pytest.mark.edge_cases
+class TestDeepNesting:
+
+    @pytest.mark.parametrize("shape", sorted(SOURCES))
+    def test_deep_sources(self, shape):
+        """Every pass runs, including those of -O2"""
+        body, expected = SOURCES[shape]
+        limit = sys.getrecursionlimit()
+        analyzed = compile_saltino("def main(x) {\n" + body + "}\n", optimization_level=2)
+        assert sys.getrecursionlimit() == limit
+        assert run_function(analyzed, [3]) == expected
+
+    def test_parse_errors_in_deep_sources(self):
+        """Errors raised by the parser thread reach the caller"""
+        source = "def main(x) {\n" + "{\n" * DEPTH + "return x +\n" + "}\n" * DEPTH + "}\n"
+        with pytest.raises(SaltinoParseError, match=f"Riga {DEPTH + 3}"):
+            compile_saltino(source)
+
+    @pytest.mark.parametrize("shape", sorted(SOURCES) + ['flat'])
+    def test_only_nested_sources_use_the_parser_thread(self, shape, monkeypatch):
+        """Long sources without deep nesting parse in the calling thread"""
+        started = []
+
+        class RecordingThread(threading.Thread):
+            def start(self):
+                started.append(self.name)
+                super().start()
+
+        monkeypatch.setattr(saltino_parser.threading, 'Thread', RecordingThread)
+        if shape == 'flat':
+            body = "y = -x + f(x, 2 :: [])\n" * DEPTH + "return y\n"
+        else:
+            body, _ = SOURCES[shape]
+        compile_saltino("def main(x) {\n" + body + "}\ndef f(a, b) {\n    return a\n}\n")
+        deep = shape not in ('sum', 'and', 'flat')
+        assert started == (['saltino-parser'] if deep else [])
+
+    def test_recursion_limit_is_raised_only_for_the_parse(self, monkeypatch):
+        """The parser thread raises the limit to its own needs and restores it"""
+        calls = []
+        set_limit = sys.setrecursionlimit
+
+        def record(limit):
+            calls.append((threading.current_thread().name, limit))
+            set_limit(limit)
+
+        monkeypatch.setattr(sys, 'setrecursionlimit', record)
+        previous = sys.getrecursionlimit()
+        body, _ = SOURCES['cons']
+        compile_saltino("def main(x) {\n" + body + "}\n")
+        (first_thread, raised), (second_thread, restored) = calls
+        assert first_thread == second_thread == 'saltino-parser'
+        assert restored == previous
+        needed = DEPTH * saltino_parser._FRAMES_PER_LEVEL
+        assert needed < raised < previous + needed
+
+    @pytest.mark.parametrize("shape", ['blocks', 'calls', 'ifs', 'and', 'assignments'])
+    def test_passes_on_deep_asts(self, shape):
+        body, expected = deep_programs()[shape]
+        increment = Function('f', ['y'], Block([ReturnStatement(
+            BinaryExpression(Identifier('y'), '+', IntegerLiteral(1)))]))
+        program = TailCallTransformer().transform_program(
+            Program([Function('main', ['x'], body), increment]))
+        semantic_analyzer = SemanticAnalyzer()
+        assert semantic_analyzer.analyze(program), semantic_analyzer.error_message
+        TypeInference(semantic_analyzer, ('main',)).infer(program)
+        FunctionInliner(semantic_analyzer).inline_program(program)
+        ConstantFolder(semantic_analyzer).fold_program(program)
+        interpreter = IterativeSaltinoInterpreter(semantic_analyzer=semantic_analyzer)
+        interpreter.load_program(program)
+        assert interpreter.call_function(interpreter.global_env.get_function('main'), [1]) \
+            == expected
+
+    def test_walk(self):
+        def total(node):
+            if isinstance(node, IntegerLiteral):
+                return node.value
+            left = yield node.left
+            right = yield node.right
+            return left + right
+
+        expression = IntegerLiteral(0)
+        for value in range(1, AST_DEPTH + 1):
+            expression = BinaryExpression(IntegerLiteral(value), '+', expression)
+        assert walk(expression, total) == AST_DEPTH * (AST_DEPTH + 1) // 2
+
+    def test_walk_errors_reach_the_parent(self):
+        """An exception raised by a child is thrown into its parent's generator"""
+        def visit(node):
+            if isinstance(node, Identifier):
+                raise KeyError(node.name)
+            try:
+                yield node.left
+            except KeyError:
+                return 'caught'
+            return 'not caught'
+
+        expression = BinaryExpression(Identifier('x'), '+', IntegerLiteral(1))
+        assert walk(expression, visit) == 'caught'
+        with pytest.raises(KeyError):
+            walk(Identifier('x'), visit)
+
+    def test_copy_tree(self):
+        position = SourcePosition(1, 2)
+        expression = EmptyList()
+        for _ in range(AST_DEPTH):
+            expression = BinaryExpression(Identifier('x', position), '::', expression)
+        function = Function('main', ['x'], Block([ReturnStatement(expression)]))
+        copy = copy_tree(function)
+        originals = list(iter_nodes(function))
+        copies = list(iter_nodes(copy))
+        assert len(copies) == len(originals)
+        assert not {id(node) for node in originals} & {id(node) for node in copies}
+        assert copy.parameters == ['x'] and copy.parameters is not function.parameters
+        # Positions are never modified, so they are shared
+        assert all(node.position is position for node in copies if isinstance(node, Identifier))
+
+    def test_str_and_print_ast(self):
+        condition = positive()
+        for _ in range(DEPTH):
+            condition = BinaryCondition(positive(), 'and', condition)
+        assert str(condition).count('ComparisonCondition(') == DEPTH + 1
+        body = Block([ReturnStatement(Identifier('x'))])
+        for _ in range(DEPTH):
+            body = Block([body])
+        printed = print_ast(Program([Function('main', ['x'], body)]))
+        assert printed.count('Block(1 statements)') == DEPTH + 1
+
+    def test_symbol_lookup_sees_new_bindings(self):
+        """Lookups remembered by nested scopes are refreshed when a name is bound"""
+        outer = SymbolTable()
+        outer_x = outer.bind('x', SymbolKind.VARIABLE)
+        middle = outer.enter()
+        inner = middle
+        for _ in range(AST_DEPTH):
+            inner = inner.enter()
+        assert inner.lookup('x') is outer_x
+        middle_x = middle.bind('x', SymbolKind.VARIABLE)
+        assert inner.lookup('x') is middle_x
+        assert outer.lookup('x') is outer_x
+        with pytest.raises(ValueError):
+            inner.lookup('y')
@@ -0,0 +1,176 @@
+"""
+Test suite for the fusion of list producers with their consumers, enabled
+at optimization level 2.
+
+Programs are run both through the normal pipeline and with the fusion
+disabled; results and error messages must match.
+"""
+import pytest
+from conftest import assert_same_behaviour, compile_without, run_function
+from deforestation import Deforester
+from saltino_parser import compile_saltino
+
+SUM_SOURCE = """
+def main(n) {
+    return sum_list(build(n))
+}
+
+def build(n) {
+    if (n <= 0) {
+        return []
+    } else {
+        return n :: build(n - 1)
+    }
+}
+
+def sum_list(xs) {
+    if (xs == []) {
+        return 0
+    } else {
+        return head(xs) + sum_list(tail(xs))
+    }
+}
+"""
+
+PIPELINE_SOURCE = """
+def main(n, k) {
+    return size(quotients(n, k)) + weigh(quotients(n, k)) + head(doubled(squares(n)))
+}
+
+def quotients(n, k) {
+    if (n == 0) {
+        return []
+    }
+    return 100 / (n - k) :: quotients(n - 1, k)
+}
+
+def squares(n) {
+    if (n == 0) {
+        return []
+    }
+    return n * n :: squares(n - 1)
+}
+
+def size(xs) {
+    if (xs == []) {
+        return 0
+    }
+    return 1 + size(tail(xs))
+}
+
+def weigh(xs) {
+    if ([] == xs) {
+        return 1
+    } else {
+        return weigh(tail(xs)) - 3 * head(xs) % 7
+    }
+}
+
+def doubled(xs) {
+    if (xs == []) {
+        return []
+    } else {
+        return 2 * head(xs) :: doubled(tail(xs))
+    }
+}
+"""
+
+
+def fused_and_original(source, monkeypatch):
+    """The program compiled at level 2 with and without the fusion"""
+    return (compile_saltino(source, optimization_level=2),
+            compile_without(monkeypatch, Deforester, 'fuse_program', source,
+                            optimization_level=2))
+
+
+def function_names(source, optimization_level=2):
+    analyzed = compile_saltino(source, optimization_level=optimization_level)
+    return [function.name for function in analyzed.program.functions]
+
+
+@pytest.mark.functions
+class TestDeforestation:
+
+    def test_sum_of_built_list_is_fused(self, monkeypatch):
+        """sum_list(build(n)) becomes a single recursion"""
+        names = function_names(SUM_SOURCE)
+        assert 'build_sum_list_fused_1' in names
+        assert 'build' not in names and 'sum_list' not in names
+        programs = fused_and_original(SUM_SOURCE, monkeypatch)
+        for n in (-2, 0, 1, 10):
+            assert assert_same_behaviour(*programs, [n]) == max(n, 0) * (max(n, 0) + 1) // 2
+
+    def test_no_intermediate_list(self):
+        """The fused sum is solved in closed form, so huge inputs are immediate"""
+        analyzed = compile_saltino(SUM_SOURCE, optimization_level=2)
+        assert run_function(analyzed, [10 ** 9]) == 10 ** 9 * (10 ** 9 + 1) // 2
+
+    def test_every_consumer_shape(self, monkeypatch):
+        """Length, non-associative steps and list-building consumers give the original results"""
+        names = function_names(PIPELINE_SOURCE)
+        for name in ('quotients_size_fused_1', 'quotients_weigh_fused_1',
+                     'squares_doubled_fused_1'):
+            assert name in names
+        programs = fused_and_original(PIPELINE_SOURCE, monkeypatch)
+        for n in range(0, 6):
+            assert_same_behaviour(*programs, [n, 10])
+
+    def test_errors_are_preserved(self, monkeypatch):
+        """Producer errors are raised as in the original, even if the consumer ignores the element"""
+        pipeline = fused_and_original(PIPELINE_SOURCE, monkeypatch)
+        total = fused_and_original(SUM_SOURCE, monkeypatch)
+        assert "Division by zero" in assert_same_behaviour(*pipeline, [5, 3])
+        assert "Runtime Error" in assert_same_behaviour(*total, [[]])
+        assert "Runtime Error" in assert_same_behaviour(*pipeline, [True, 1])
+
+    def test_unsafe_pairs_are_not_fused(self):
+        """Early-stopping consumers, unknown elements and failing steps keep the list"""
+        source = """
+def main(f, n) {
+    return head(build(n)) + sum_list(apply(f, n)) + reciprocal(build(n))
+}
+
+def build(n) {
+    if (n <= 0) {
+        return []
+    } else {
+        return n :: build(n - 1)
+    }
+}
+
+def apply(f, n) {
+    if (n == 0) {
+        return []
+    } else {
+        return f(n) :: apply(f, n - 1)
+    }
+}
+
+def sum_list(xs) {
+    if (xs == []) {
+        return 0
+    } else {
+        return head(xs) + sum_list(tail(xs))
+    }
+}
+
+def reciprocal(xs) {
+    if (xs == []) {
+        return 0
+    } else {
+        return 1 / head(xs) + reciprocal(tail(xs))
+    }
+}
+"""
+        assert not any('fused' in name for name in function_names(source))
+
+    def test_shadowed_names_are_not_fused(self):
+        """A parameter with the consumer's name is not the consumer"""
+        source = SUM_SOURCE.replace("def main(n) {", "def main(n, sum_list) {")
+        analyzed = compile_saltino(source, optimization_level=2,
+                                   entry_points=('main', 'sum_list'))
+        assert not any('fused' in function.name for function in analyzed.program.functions)
+
+    def test_lower_levels_keep_the_list(self):
+        """The fusion only runs at optimization level 2"""
+        assert not any('fused' in name for name in function_names(SUM_SOURCE, 1))
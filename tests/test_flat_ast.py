@@ -0,0 +1,129 @@
+"""
+Test suite for the flat struct-of-arrays AST encoding.
+
+A compiled program is flattened into parallel int64 columns with a literal
+and a string pool, serialized to one buffer and memory-mapped back
+read-only. Rebuilding the object AST from it and analyzing it again gives
+the same program and the same results.
+"""
+from pathlib import Path
+
+import pytest
+from AST.ASTNodes import (Block, Function, Identifier, IntegerLiteral, ListLiteral, Program,
+                          ReturnStatement)
+from AST.ASTVisitor import print_ast
+from AST.type_inference import iter_nodes
+from conftest import assert_same_behaviour
+from errors.runtime_errors import SaltinoRuntimeError
+from flat_ast import (FlatAST, NO_VALUE, analyze_flat_ast, flatten, load_flat_ast,
+                      save_flat_ast)
+from saltino_parser import compile_saltino
+
+project_root = Path(__file__).parent.parent
+# ex.salt uses a syntax the grammar does not accept
+PROGRAMS = sorted(path.name for path in (project_root / "programs").glob("*.salt")
+                  if path.name != "ex.salt")
+
+SOURCE = """
+def main(n) {
+    xs = [1, 2, 3] :: [n, n + 1]
+    if (n > 0 and !(n == 5)) {
+        return head(tail(xs))
+    }
+    return square(n) - 1
+}
+
+def square(x) {
+    return x * x
+}
+"""
+
+
+def reloaded(analyzed, tmp_path):
+    path = str(tmp_path / "program.saltast")
+    save_flat_ast(path, flatten(analyzed.program, analyzed.semantic_analyzer))
+    return load_flat_ast(path)
+
+
+@pytest.mark.basic
+class TestFlatAST:
+
+    @pytest.mark.parametrize("name", PROGRAMS)
+    @pytest.mark.parametrize("optimization_level", [0, 2])
+    def test_round_trip(self, name, optimization_level, tmp_path):
+        """The rebuilt program prints and runs like the compiled one"""
+        source = (project_root / "programs" / name).read_text()
+        analyzed = compile_saltino(source, optimization_level=optimization_level)
+        rebuilt = analyze_flat_ast(reloaded(analyzed, tmp_path))
+        assert print_ast(rebuilt.program) == print_ast(analyzed.program)
+        main, = [f for f in analyzed.program.functions if f.name == 'main']
+        args = [5] * len(main.parameters)
+        assert_same_behaviour(rebuilt, analyzed, args)
+
+    def test_mapped_columns(self, tmp_path):
+        """Loaded columns are read-only views on the mapped file"""
+        flat = reloaded(compile_saltino(SOURCE), tmp_path)
+        assert all(isinstance(column, memoryview) and column.readonly
+                   for column in flat.columns.values())
+        assert flat.kind(0) is Program and len(flat.children(0)) == 2
+
+    def test_node_accessors(self):
+        analyzed = compile_saltino(SOURCE, optimization_level=0)
+        flat = flatten(analyzed.program, analyzed.semantic_analyzer)
+        nodes = list(iter_nodes(analyzed.program))
+        main = analyzed.program.functions[0]
+        # Pre-order, with the parameters before the body of each function
+        kinds = [flat.kind(i) for i in range(len(flat))]
+        assert kinds[:4] == [Program, Function, Identifier, Block]
+        parameters = sum(len(f.parameters) for f in analyzed.program.functions)
+        assert len(flat) == len(nodes) + parameters
+        assert flat.name(1) == 'main' and flat.name(2) == 'n'
+        assert flat.symbol(1) == analyzed.semantic_analyzer.get_node_info(
+            main, 'symbol_info').unique_name
+        assert flat.symbol(2) == analyzed.semantic_analyzer.get_node_info(
+            main, 'scope').lookup('n').unique_name
+
+        assignment = main.body.statements[0]
+        index = kinds.index(type(assignment))
+        assert flat.name(index) == 'xs' and flat.operator(index) is None
+        cons, = flat.children(index)
+        assert flat.operator(cons) == '::'
+        position = flat.position(cons)
+        assert (position.line, position.column) == (assignment.value.position.line,
+                                                    assignment.value.position.column)
+        literal = flat.children(cons)[0]
+        assert flat.kind(literal) is ListLiteral
+        assert [flat.integer(child) for child in flat.children(literal)] == [1, 2, 3]
+
+    def test_literal_pool(self):
+        """Equal literals share a pool entry; values beyond int64 are kept as text"""
+        big = 2 ** 70
+        program = Program([Function('main', [], Block([ReturnStatement(ListLiteral(
+            [IntegerLiteral(7), IntegerLiteral(big), IntegerLiteral(7), IntegerLiteral(-big)]))]))])
+        flat = FlatAST.from_buffer(flatten(program).to_bytes())
+        assert list(flat.literals) == [7]
+        assert flat.symbol(0) is None and flat.columns['position'][0] == NO_VALUE
+        rebuilt = flat.to_program().functions[0].body.statements[0].value
+        assert rebuilt.value == [7, big, 7, -big]
+
+    def test_deep_programs(self):
+        body = Block([ReturnStatement(Identifier('x'))])
+        for _ in range(5000):
+            body = Block([body])
+        program = Program([Function('main', ['x'], body)])
+        flat = FlatAST.from_buffer(flatten(program).to_bytes())
+        assert print_ast(flat.to_program()) == print_ast(program)
+
+    def test_invalid_files(self, tmp_path):
+        data = flatten(compile_saltino(SOURCE).program).to_bytes()
+        with pytest.raises(SaltinoRuntimeError, match="wrong magic"):
+            FlatAST.from_buffer(b"NOTANAST" + data[8:])
+        with pytest.raises(SaltinoRuntimeError, match="wrong size"):
+            FlatAST.from_buffer(data[:-1])
+        with pytest.raises(SaltinoRuntimeError, match="truncated header"):
+            FlatAST.from_buffer(data[:10])
+        (tmp_path / "empty.saltast").write_bytes(b"")
+        with pytest.raises(SaltinoRuntimeError, match="Cannot read"):
+            load_flat_ast(str(tmp_path / "empty.saltast"))
+        with pytest.raises(SaltinoRuntimeError, match="Cannot read"):
+            load_flat_ast(str(tmp_path / "missing.saltast"))
@@ -0,0 +1,207 @@
+"""
+Test suite for hash-consing of the AST.
+
+The AST builder interns names and operators and shares positions and
+integers through a HashConsTable, the symbol table and the transformers
+intern the names they generate, and structurally equal subtrees get the
+same number, which the optimization passes use to compare subtrees and
+to read equal subtrees once. Nodes and their semantic annotations stay per occurrence;
+equal annotation dictionaries are shared copy-on-write.
+"""
+import pickle
+import sys
+
+import pytest
+from AST.ASTNodes import (Assignment, BinaryExpression, BooleanLiteral, ComparisonCondition,
+                          EmptyList, Function, FunctionCall, Identifier, IntegerLiteral, ListLiteral,
+                          ReturnStatement, SourcePosition, UnaryExpression)
+from AST.ASTsymbol_table import SymbolKind, SymbolTable
+from AST.hash_consing import HashConsTable
+from AST.type_inference import iter_nodes
+import recurrence_solver
+from deforestation import Deforester
+from recurrence_solver import RecurrenceSolver
+from saltino_parser import compile_saltino
+from tail_recursive_transformer import TailCallTransformer
+
+SOURCE = """
+def main(n) {
+    total = n * 100000 + 1
+    total = total + (n * 100000 + 1)
+    if (total > 1 and n >= 0) {
+        return helper(total) - 1
+    }
+    return helper(n) - 1
+}
+
+def helper(n) {
+    return n + 1
+}
+"""
+
+# Deeper than the default recursion limit
+DEPTH = 5000
+
+
+def nodes_of(analyzed, node_type):
+    return [node for node in iter_nodes(analyzed.program) if isinstance(node, node_type)]
+
+
+def increment(name):
+    return BinaryExpression(Identifier(name), '+', IntegerLiteral(1))
+
+
+@pytest.mark.basic
+class TestHashConsing:
+
+    def test_names_and_operators_are_interned(self):
+        analyzed = compile_saltino(SOURCE, optimization_level=0)
+        names = [node.name for node in nodes_of(analyzed, Identifier)]
+        names += [node.variable for node in nodes_of(analyzed, Assignment)]
+        names += [parameter for function in nodes_of(analyzed, Function)
+                  for parameter in function.parameters]
+        operators = [node.operator for node in nodes_of(analyzed, BinaryExpression)]
+        assert names.count('n') > 3 and operators.count('-') == 2
+        assert all(text is sys.intern(text) for text in names + operators)
+
+    def test_unique_names_are_interned(self):
+        scope = SymbolTable().enter('function')
+        first = scope.bind('total', SymbolKind.VARIABLE)
+        second = scope.enter().bind(''.join(['to', 'tal']), SymbolKind.VARIABLE)
+        assert first.unique_name is sys.intern(first.unique_name)
+        assert second.name is first.name
+        # Names generated by the transformers are interned as well
+        transformer = TailCallTransformer()
+        name = transformer._get_unique_name('acc')
+        assert name is sys.intern('acc_1')
+
+    def test_positions_and_integers_are_shared(self):
+        analyzed = compile_saltino(SOURCE, optimization_level=0)
+        first, second = analyzed.program.functions[0].body.statements[:2]
+        product = first.value.left
+        # The expression and its first operand start at the same token
+        assert product.position is product.left.position
+        assert (product.position.line, product.position.column) == (3, 12)
+        repeated = second.value.right.left
+        assert product.right.value == 100000 and repeated.right.value is product.right.value
+        # The nodes themselves are not shared
+        assert repeated.right is not product.right
+
+    def test_nodes_keep_their_own_annotations(self):
+        """Equal subtrees in different scopes resolve to different symbols"""
+        analyzed = compile_saltino(SOURCE, optimization_level=0)
+        analyzer = analyzed.semantic_analyzer
+        sums = [node for node in nodes_of(analyzed, BinaryExpression) if node.operator == '+'
+                and isinstance(node.left, Identifier) and node.left.name == 'n']
+        main_n = analyzed.program.functions[0].body.statements[-1].value.left.arguments[0]
+        helper_n = sums[0].left
+        table = HashConsTable()
+        assert table.same_tree(main_n, helper_n)
+        assert analyzer.get_node_info(main_n, 'resolved_info').unique_name != \
+            analyzer.get_node_info(helper_n, 'resolved_info').unique_name
+
+    def test_equal_annotations_are_shared(self):
+        analyzed = compile_saltino(SOURCE, optimization_level=0)
+        analyzer = analyzed.semantic_analyzer
+        statement = analyzed.program.functions[0].body.statements[0]
+        literal = statement.value.right
+        product = statement.value.left
+        assert analyzer.node_info[id(literal)] is analyzer.node_info[id(product.right)]
+        # Updating one node leaves the others unchanged
+        analyzer.set_node_info(literal, marker=True)
+        assert analyzer.get_node_info(literal, 'marker') is True
+        assert analyzer.get_node_info(product.right, 'marker') is None
+        assert analyzer.get_node_info(literal, 'scope') is analyzer.get_node_info(
+            product.right, 'scope')
+
+    def test_annotations_after_pickling(self):
+        analyzed = compile_saltino(SOURCE, optimization_level=0)
+        program, analyzer = pickle.loads(pickle.dumps(
+            (analyzed.program, analyzed.semantic_analyzer)))
+        statement = program.functions[0].body.statements[0]
+        analyzer.set_node_info(statement.value.right, marker=True)
+        assert analyzer.get_node_info(statement.value.left.right, 'marker') is None
+        assert analyzer.get_node_info(statement.value.right, 'scope') is not None
+
+    def test_structural_keys(self):
+        table = HashConsTable()
+        product = BinaryExpression(increment('x'), '*', increment('x'))
+        assert table.same_tree(product.left, product.right)
+        assert len(table) == 3
+        table.key(product)
+        assert len(table) == 4
+        keys = table.keys_below(product)
+        assert keys[id(product.left)] == keys[id(product.right)] != keys[id(product)]
+
+        different = [
+            BinaryExpression(Identifier('x'), '-', IntegerLiteral(1)),
+            BinaryExpression(Identifier('y'), '+', IntegerLiteral(1)),
+            BinaryExpression(Identifier('x'), '+', IntegerLiteral(2)),
+            BinaryExpression(Identifier('x'), '+', BooleanLiteral(True)),
+            BinaryExpression(IntegerLiteral(1), '+', Identifier('x')),
+            UnaryExpression('-', increment('x')),
+            ListLiteral([Identifier('x'), IntegerLiteral(1)]),
+        ]
+        assert len({table.key(node) for node in different + [product.left]}) == 8
+        # Positions are not part of the structure
+        positioned = BinaryExpression(Identifier('x', SourcePosition(4, 2)), '+',
+                                      IntegerLiteral(1, SourcePosition(4, 6)))
+        assert table.same_tree(positioned, product.left)
+        assert table.same_tree(ReturnStatement(None), ReturnStatement(None))
+        assert not table.same_tree(ReturnStatement(None), ReturnStatement(IntegerLiteral(0)))
+        assert table.same_tree(None, None) and not table.same_tree(product, None)
+
+    def test_function_keys(self):
+        table = HashConsTable()
+        analyzed = compile_saltino(SOURCE + SOURCE.replace('main', 'other')
+                                   .replace('helper', 'other_helper'), optimization_level=0)
+        main, helper, other, other_helper = analyzed.program.functions
+        assert not table.same_tree(main.body, other.body)
+        assert table.same_tree(helper.body, other_helper.body)
+        assert not table.same_tree(helper, other_helper)
+
+    def test_deep_trees(self):
+        def chain():
+            expression = IntegerLiteral(0)
+            for value in range(DEPTH):
+                expression = BinaryExpression(IntegerLiteral(value), '+', expression)
+            return expression
+
+        table = HashConsTable()
+        first, second = chain(), chain()
+        assert table.same_tree(first, second)
+        # The integers 0..DEPTH-1 and one sum per level
+        assert len(table) == 2 * DEPTH
+
+    def test_passes_read_equal_subtrees_once(self, monkeypatch):
+        program = compile_saltino("""
+def twice(n) {
+    if (n <= 0) {
+        return 1
+    }
+    return twice(n - 1) * 2 + twice(n - 1) * 2
+}
+""", entry_points=['twice'], optimization_level=0).program
+        steps = []
+        affine_step = recurrence_solver._affine_step
+        monkeypatch.setattr(recurrence_solver, '_affine_step',
+                            lambda expr, *rest: steps.append(expr) or affine_step(expr, *rest))
+        solver = RecurrenceSolver()
+        solver.solve_program(program)
+        assert solver.solved_functions == ['twice']
+        # 1 in the base clause; n, 1, n - 1, twice, twice(n - 1), 2, the
+        # product and the sum in the recurrence, whose 13 nodes have 8 structures
+        assert len(steps) == 9
+        assert len(solver.table) == 8
+
+    def test_templates_ignore_positions(self):
+        deforester = Deforester()
+        condition = ComparisonCondition(EmptyList(SourcePosition(3, 9)), '==',
+                                        Identifier('xs', SourcePosition(3, 15)))
+        assert deforester._is_empty_test(condition, 'xs')
+        assert not deforester._is_empty_test(condition, 'ys')
+        walk_call = FunctionCall(Identifier('length'), [
+            UnaryExpression('tail', Identifier('xs', SourcePosition(7, 25)))])
+        assert deforester._is_walk_call(walk_call, 'length', 'xs')
+        assert not deforester._is_walk_call(walk_call, 'sum', 'xs')
+        assert not deforester._is_walk_call(IntegerLiteral(0), 'length', 'xs')
@@ -0,0 +1,209 @@
+"""
+Test suite for inlining of small non-recursive functions
+"""
+import pytest
+from AST.ASTNodes import FunctionCall
+from AST.type_inference import iter_nodes
+from conftest import assert_same_behaviour, run_function
+from saltino_parser import compile_saltino
+
+
+def function_named(analyzed, name):
+    return next(f for f in analyzed.program.functions if f.name == name)
+
+
+def calls_in(analyzed, name):
+    """Names of the functions called directly from a function body"""
+    return [node.function.name
+            for node in iter_nodes(function_named(analyzed, name).body)
+            if isinstance(node, FunctionCall)]
+
+
+def unoptimized(source):
+    return compile_saltino(source, optimization_level=0)
+
+
+@pytest.mark.functions
+class TestInliner:
+
+    def test_call_graph(self):
+        """The semantic analyzer records direct calls between functions"""
+        analyzed = compile_saltino("""
+def main() {
+    return f(1) + g(2)
+}
+
+def f(x) {
+    return f(x - 1)
+}
+
+def g(x) {
+    return x
+}
+""", optimization_level=0)
+        call_graph = analyzed.semantic_analyzer.call_graph
+
+        assert call_graph['main'] == {'f', 'g'}
+        assert call_graph['f'] == {'f'}
+        assert 'g' not in call_graph
+
+    def test_small_helpers_are_inlined(self):
+        """double(increment(5)) becomes a single folded literal"""
+        source = """
+def double(x) {
+    return x * 2
+}
+
+def increment(x) {
+    return x + 1
+}
+
+def main() {
+    return double(increment(5))
+}
+"""
+        analyzed = compile_saltino(source)
+
+        assert calls_in(analyzed, 'main') == []
+        assert run_function(analyzed) == 12
+
+    def test_recursive_functions_are_not_inlined(self):
+        """Directly and mutually recursive callees keep their calls"""
+        source = """
+def main() {
+    return even(10)
+}
+
+def even(n) {
+    return n == 0 or odd(n - 1)
+}
+
+def odd(n) {
+    return !(n == 0) and even(n - 1)
+}
+"""
+        analyzed = compile_saltino(source)
+
+        assert calls_in(analyzed, 'main') == ['even']
+        assert assert_same_behaviour(analyzed, unoptimized(source)) is True
+
+    def test_multi_statement_and_large_bodies_are_not_inlined(self):
+        """Only single-return bodies within the size budget are inlined"""
+        analyzed = compile_saltino("""
+def main() {
+    return local(1) + big(2)
+}
+
+def local(x) {
+    y = x + 1
+    return y
+}
+
+def big(x) {
+    return x + x + x + x + x + x + x + x + x + x
+}
+""")
+        assert calls_in(analyzed, 'main') == ['local', 'big']
+
+    def test_argument_evaluation_order_is_preserved(self):
+        """Calls that would reorder argument evaluation are not inlined"""
+        source = """
+def main() {
+    return first(1 / 0, head([])) + swap(1 / 0, head([]))
+}
+
+def first(a, b) {
+    return a + b
+}
+
+def swap(a, b) {
+    return b + a
+}
+"""
+        analyzed = compile_saltino(source)
+
+        assert calls_in(analyzed, 'main') == ['swap']
+        assert "Division by zero" in assert_same_behaviour(analyzed, unoptimized(source))
+
+    def test_unused_argument_is_still_evaluated(self):
+        """A non-trivial argument the body ignores keeps the call"""
+        source = """
+def main() {
+    return ignore(head([]))
+}
+
+def ignore(x) {
+    return 0
+}
+"""
+        analyzed = compile_saltino(source)
+
+        assert calls_in(analyzed, 'main') == ['ignore']
+        assert "Head of empty list" in assert_same_behaviour(analyzed, unoptimized(source))
+
+    def test_trivial_arguments_may_be_duplicated(self):
+        """Literal and parameter arguments can be used more than once"""
+        source = """
+def main(n) {
+    return square(n) + square(3)
+}
+
+def square(x) {
+    return x * x
+}
+"""
+        analyzed = compile_saltino(source)
+
+        assert calls_in(analyzed, 'main') == []
+        assert assert_same_behaviour(analyzed, unoptimized(source), [4]) == 25
+
+    def test_condition_positions(self):
+        """Predicates are inlined in conditions, values only where allowed"""
+        source = """
+def main(n) {
+    if (positive(n) and small(n)) {
+        return twice(n)
+    } else {
+        return 0
+    }
+}
+
+def positive(x) {
+    return x > 0
+}
+
+def small(x) {
+    return x < 10
+}
+
+def twice(x) {
+    return x + x
+}
+"""
+        analyzed = compile_saltino(source)
+
+        assert calls_in(analyzed, 'main') == []
+        reference = unoptimized(source)
+        assert assert_same_behaviour(analyzed, reference, [4]) == 8
+        assert assert_same_behaviour(analyzed, reference, [40]) == 0
+        assert "only operate on integers" in assert_same_behaviour(analyzed, reference, [[]])
+
+    def test_non_boolean_body_in_condition_keeps_call(self):
+        """A value-returning callee used as a condition is not inlined"""
+        source = """
+def main() {
+    if (one()) {
+        return 1
+    } else {
+        return 2
+    }
+}
+
+def one() {
+    return 1
+}
+"""
+        analyzed = compile_saltino(source)
+
+        assert calls_in(analyzed, 'main') == ['one']
+        assert "must return boolean" in assert_same_behaviour(analyzed, unoptimized(source))
@@ -0,0 +1,146 @@
+"""
+Test suite for the opt-in lazy list evaluation mode.
+
+The tail of a :: in return position is suspended and forced only by tail,
+by equality with another non-empty list, or by any other strict operator.
+Results match the strict mode; errors in tails that are never forced are
+not raised.
+"""
+import pytest
+from conftest import run_function, run_outcome
+from lazy_lists import LazyList
+from saltino_parser import compile_saltino
+
+SOURCE = """
+def main(n) {
+    return head(map(add1, upto(n)))
+}
+
+def map(f, lst) {
+    if (lst == []) {
+        return []
+    } else {
+        return f(head(lst)) :: map(f, tail(lst))
+    }
+}
+
+def add1(x) {
+    return x + 1
+}
+
+def upto(n) {
+    if (n == 0) {
+        return []
+    }
+    return n :: upto(n - 1)
+}
+
+def naturals(n) {
+    return n :: naturals(n + 1)
+}
+
+def take(k, xs) {
+    if (k == 0) {
+        return []
+    }
+    return head(xs) :: take(k - 1, tail(xs))
+}
+
+def first_three() {
+    return take(3, naturals(0))
+}
+
+def same(xs, ys) {
+    return xs == ys
+}
+
+def is_empty(xs) {
+    return xs == []
+}
+
+def broken(n) {
+    return n :: 10 / (n - n)
+}
+
+def front(n) {
+    return head(broken(n))
+}
+
+def bad_head(n) {
+    return [] :: upto(n)
+}
+
+def bad_tail(n) {
+    return n :: n
+}
+
+def total(xs) {
+    if (xs == []) {
+        return 0
+    }
+    return head(xs) + total(tail(xs))
+}
+"""
+
+ENTRY_POINTS = ('main', 'map', 'upto', 'naturals', 'take', 'first_three', 'same',
+                'is_empty', 'broken', 'front', 'bad_head', 'bad_tail', 'total')
+COMPILED = {}
+
+
+def run(name, args, lazy=True, max_steps=None):
+    if lazy not in COMPILED:
+        COMPILED[lazy] = compile_saltino(SOURCE, entry_points=ENTRY_POINTS, lazy_lists=lazy)
+    return run_outcome(COMPILED[lazy], args, name, lazy_lists=lazy, max_steps=max_steps)
+
+
+@pytest.mark.functions
+class TestLazyLists:
+
+    def test_results_match_strict_mode(self):
+        """Fully consumed lazy lists give the strict results"""
+        assert run('main', [5]) == run('main', [5], lazy=False) == 6
+        assert run('upto', [4]) == run('upto', [4], lazy=False) == [4, 3, 2, 1]
+        assert run('total', [[1, 2, 3]]) == run('total', [[1, 2, 3]], lazy=False) == 6
+        assert run('same', [[1, 2], [1, 2]]) is run('same', [[1, 2], [1, 2]], lazy=False) is True
+        assert run('same', [[1, 2], [1, 3]]) is run('same', [[1, 2], [1, 3]], lazy=False) is False
+
+    def test_only_the_front_is_evaluated(self):
+        """head(map(f, xs)) does not walk the whole list"""
+        assert run('main', [10 ** 6]) == 10 ** 6 + 1
+
+    def test_infinite_lists(self):
+        """Tails that are never needed are never evaluated"""
+        assert run('first_three', []) == [0, 1, 2]
+        assert run('is_empty', [[]]) is True
+
+    def test_equality_with_empty_does_not_force(self):
+        """A lazy cell is never empty, so == [] is decided immediately"""
+        source = SOURCE.replace("return head(map(add1, upto(n)))",
+                                "return naturals(n) == []")
+        analyzed = compile_saltino(source, lazy_lists=True)
+        assert run_function(analyzed, [0], lazy_lists=True) is False
+
+    def test_errors_in_unused_tails_are_not_raised(self):
+        """The documented difference from the strict mode"""
+        assert "Division by zero" in run('front', [1], lazy=False)
+        assert run('front', [1]) == 1
+        # The final result is forced completely, as in the strict mode
+        assert "Division by zero" in run('broken', [1])
+
+    def test_cons_errors_are_preserved(self):
+        """Heads are checked eagerly, tails when they are forced"""
+        assert run('bad_head', [2]) == run('bad_head', [2], lazy=False)
+        assert "integer as first argument" in run('bad_head', [2])
+        assert run('bad_tail', [2]) == run('bad_tail', [2], lazy=False)
+        assert "list as second argument" in run('bad_tail', [2])
+
+    def test_forcing_across_execution_slices(self):
+        """Results are complete Python lists even when run in slices"""
+        result = run('upto', [20], max_steps=7)
+        assert result == list(range(20, 0, -1))
+        assert not isinstance(result, LazyList)
+
+    def test_strict_mode_is_the_default(self):
+        """Without lazy_lists the list functions are rewritten as usual"""
+        names = [function.name for function in compile_saltino(SOURCE).program.functions]
+        assert 'upto_tc_helper_1' in names
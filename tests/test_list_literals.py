@@ -0,0 +1,178 @@
+"""
+Test suite for list literals [e1, e2, ..., en].
+
+A literal behaves like e1 :: e2 :: ... :: en :: []: the elements are
+evaluated from left to right and the same errors are raised. Literals made
+only of integers are computed once at compile time, and are read by the
+lexer as a single token.
+"""
+import pytest
+from AST.ASTNodes import EmptyList, ListLiteral
+from AST.type_inference import iter_nodes
+from conftest import run_outcome
+from errors.parser_errors import SaltinoParseError
+from interpreter import IterativeSaltinoInterpreter
+from packed_lists import PACK_THRESHOLD, PackedList
+from saltino_parser import compile_saltino, parse_saltino
+
+# Each literal next to the equivalent chain of cons
+EQUIVALENT = [
+    ("[1, 2, 3]", "1 :: 2 :: 3 :: []"),
+    ("[-1, +2, - 3]", "-1 :: +2 :: - 3 :: []"),
+    ("[n, n + 1, f(n), head([n])]", "n :: n + 1 :: f(n) :: head(n :: []) :: []"),
+    ("[n] :: []", "(n :: []) :: []"),
+    ("[1, [2]]", "1 :: (2 :: []) :: []"),
+    ("[true]", "true :: []"),
+    ("[n, n / 0]", "n :: n / 0 :: []"),
+    ("[f(n), g(n)]", "f(n) :: g(n) :: []"),
+    ("tail([1, 2]) :: [3]", "tail(1 :: 2 :: []) :: 3 :: []"),
+]
+
+FUNCTIONS = """
+def f(x) {
+    return x * 2
+}
+
+def g(x) {
+    return head(tail(x :: []))
+}
+"""
+
+
+def program(expression: str) -> str:
+    return f"def main(n) {{\n    return {expression}\n}}\n" + FUNCTIONS
+
+
+def run(source, args=(), optimization_level=1, lazy_lists=False):
+    analyzed = compile_saltino(source, optimization_level=optimization_level,
+                               lazy_lists=lazy_lists)
+    return run_outcome(analyzed, args, lazy_lists=lazy_lists)
+
+
+def literals(source):
+    program_ast, _, _ = parse_saltino(source, optimization_level=0)
+    return [node for node in iter_nodes(program_ast) if isinstance(node, ListLiteral)]
+
+
+@pytest.mark.lists
+class TestListLiterals:
+
+    @pytest.mark.parametrize("optimization_level", [0, 1, 2])
+    @pytest.mark.parametrize("lazy_lists", [False, True])
+    @pytest.mark.parametrize("literal,chain", EQUIVALENT)
+    def test_same_as_cons_chain(self, literal, chain, optimization_level, lazy_lists):
+        options = dict(optimization_level=optimization_level, lazy_lists=lazy_lists)
+        assert run(program(literal), [5], **options) == run(program(chain), [5], **options)
+
+    def test_values(self):
+        assert run(program("[1, n, f(n)]"), [5]) == [1, 5, 10]
+        assert "expects an integer" in run(program("[n - 1, [], n]"), [5])
+        assert run(program("[[]]"), [5]) == run(program("[] :: []"), [5])
+
+    def test_constant_literals(self):
+        """Integer literals are computed once, at compile time"""
+        short, negative, mixed = literals(program("[1, 2] :: [-3, 4] :: [n, 5]"))
+        assert short.value == [1, 2] and negative.value == [-3, 4]
+        assert mixed.value is None
+
+        table = list(range(-PACK_THRESHOLD, PACK_THRESHOLD))
+        source = program(str(table))
+        literal, = literals(source)
+        assert isinstance(literal.value, PackedList) and literal.value == table
+        assert run(source, [0]) == table
+
+    def test_constant_results_are_copies(self):
+        """Callers may modify the result without changing the program"""
+        analyzed = compile_saltino(program("[1, 2, 3]"))
+        interpreter = IterativeSaltinoInterpreter(semantic_analyzer=analyzed.semantic_analyzer)
+        interpreter.load_program(analyzed.program)
+        main = interpreter.global_env.get_function('main')
+        interpreter.call_function(main, [0]).append(4)
+        assert interpreter.call_function(main, [0]) == [1, 2, 3]
+
+    def test_folded_elements_become_constant(self):
+        source = program("[2 * 3, 1 + 1]")
+        program_ast, _, _ = parse_saltino(source)
+        literal, = [node for node in iter_nodes(program_ast) if isinstance(node, ListLiteral)]
+        assert literal.value == [6, 2]
+
+    def test_large_table(self):
+        """A large table becomes one flat node"""
+        table = list(range(20000))
+        source = program(str(table))
+        literal, = literals(source)
+        assert len(literal.elements) == len(table)
+        assert run(source, [0]) == table
+
+    def test_comments_and_empty_lists(self):
+        source = """
+def main() {
+    // [not, a, literal
+    /* [neither] */
+    xs = [] :: [[], []]
+    return xs == []
+}
+"""
+        assert run(source) == run(source.replace("[[], []]", "[] :: [] :: []"))
+
+    def test_positions(self):
+        source = "def main(n) {\n    xs = [1, 2] :: [n,\n  f(n)]\n    return [xs]\n}\n" + FUNCTIONS
+        program_ast, _, _ = parse_saltino(source, optimization_level=0)
+        assignment, ret = program_ast.functions[0].body.statements
+        first, second = assignment.value.left, assignment.value.right
+        assert (first.position.line, first.position.column) == (2, 9)
+        assert [(e.position.line, e.position.column) for e in first.elements] == [(2, 10), (2, 13)]
+        assert (second.position.line, second.position.column) == (2, 19)
+        assert [(e.position.line, e.position.column) for e in second.elements] == [(2, 20), (3, 2)]
+        assert (ret.value.position.line, ret.value.position.column) == (4, 11)
+
+    def test_table_positions(self):
+        """Each element of an integer table keeps its own position and sign"""
+        source = "def main(n) {\n    return [1,\n -2, +3]\n}\n"
+        program_ast, _, _ = parse_saltino(source, optimization_level=0)
+        literal = program_ast.functions[0].body.statements[0].value
+        assert (literal.position.line, literal.position.column) == (2, 11)
+        assert [(e.value, e.position.line, e.position.column) for e in literal.elements] == \
+            [(1, 2, 12), (-2, 3, 1), (3, 3, 5)]
+
+    def test_parse_errors(self):
+        with pytest.raises(SaltinoParseError, match="Riga 3, colonna 0"):
+            parse_saltino("def main() {\n    return [1, 2] +\n}")
+        _, errors, _ = parse_saltino("def main() {\n    return [1, 2\n}", raise_on_error=False)
+        assert errors and (errors[0]['line'], errors[0]['column']) == (3, 0)
+        _, errors, _ = parse_saltino("def main(n) {\n    return [n, 2 +]\n}", raise_on_error=False)
+        assert errors[0]['column'] == 18 and "']'" in errors[0]['message']
+
+    def test_no_reserved_names(self):
+        """Literals are part of the grammar: any identifier is free to use"""
+        source = """
+def main(n) {
+    __table__ = 1
+    return [__list__(n), __table__]
+}
+
+def __list__(x) {
+    return x * 2
+}
+"""
+        assert run(source, [5]) == [10, 1]
+
+    def test_inlining(self):
+        source = """
+def main(n) {
+    return pair(n, n + 1)
+}
+
+def pair(a, b) {
+    return [a, b]
+}
+"""
+        assert run(source, [3]) == [3, 4]
+        program_ast, _, _ = parse_saltino(source)
+        assert isinstance(program_ast.functions[0].body.statements[0].value, ListLiteral)
+
+    @pytest.mark.parametrize("literal", ["[ ]", "[\n]", "[ /* none */ ]", "[1, [ ]]"])
+    def test_blank_brackets_are_rejected(self, literal):
+        """Only '[]' is the empty list: brackets without elements do not parse"""
+        with pytest.raises(SaltinoParseError, match="in corrispondenza di '\\]'"):
+            parse_saltino(program(literal))
@@ -0,0 +1,107 @@
+"""
+Test suite for the packed int64 list representation.
+
+Long lists are packed into an array('q') by their first tail, and further
+tails are views on the same buffer. Results, errors and equality are the
+same as with Python lists.
+"""
+import pytest
+from conftest import run_function
+from errors.runtime_errors import SaltinoRuntimeError
+from packed_lists import PACK_THRESHOLD, PackedList, pack
+from saltino_operators import SaltinoOperators
+from saltino_parser import compile_saltino
+
+SOURCE = """
+def main() {
+    return rest(copy([]))
+}
+
+def count(xs, acc) {
+    if (xs == []) {
+        return acc
+    }
+    return count(tail(xs), acc + 1)
+}
+
+def copy(xs) {
+    if (xs == []) {
+        return []
+    }
+    return head(xs) :: copy(tail(xs))
+}
+
+def rest(xs) {
+    return tail(tail(xs))
+}
+
+def same(xs, ys) {
+    return xs == ys
+}
+
+def push(x, xs) {
+    return x :: tail(xs)
+}
+
+def add_to(xs) {
+    return 1 + tail(xs)
+}
+"""
+
+ENTRY_POINTS = ('count', 'copy', 'rest', 'same', 'push', 'add_to')
+ANALYZED = compile_saltino(SOURCE, entry_points=ENTRY_POINTS)
+LONG = list(range(PACK_THRESHOLD * 4))
+
+
+@pytest.mark.functions
+class TestPackedLists:
+
+    def test_tail_is_a_view(self):
+        """The first tail packs a long list, the next ones share its buffer"""
+        first = SaltinoOperators.tail(LONG)
+        second = SaltinoOperators.tail(first)
+        assert isinstance(first, PackedList) and isinstance(second, PackedList)
+        assert second.buffer is first.buffer
+        assert second == LONG[2:] and LONG[2:] == second
+        assert SaltinoOperators.head(second) == 2
+
+    def test_short_lists_stay_python_lists(self):
+        """Lists up to the threshold are copied as before"""
+        assert SaltinoOperators.tail([1, 2, 3]) == [2, 3]
+        assert type(SaltinoOperators.tail([1, 2, 3])) is list
+
+    def test_overflow_keeps_python_lists(self):
+        """Elements beyond 64 bits are never packed"""
+        values = [2 ** 63] + LONG
+        assert type(SaltinoOperators.tail(values)) is list
+        assert pack([True]) is None
+        promoted = SaltinoOperators.cons(2 ** 64, SaltinoOperators.tail(LONG))
+        assert type(promoted) is list and promoted == [2 ** 64] + LONG[1:]
+
+    def test_cons_reuses_the_buffer(self):
+        """head(xs) :: tail(xs) extends the view instead of copying"""
+        view = SaltinoOperators.tail(LONG)
+        again = SaltinoOperators.cons(0, view)
+        assert again.buffer is view.buffer and again == LONG
+        other = SaltinoOperators.cons(7, view)
+        assert other.buffer is not view.buffer and other == [7] + LONG[1:]
+
+    def test_results_are_python_lists(self):
+        """The interpreter returns the same values as with boxed lists"""
+        assert run_function(ANALYZED, [LONG, 0], 'count') == len(LONG)
+        for name, args, expected in (('copy', [LONG], LONG),
+                                     ('rest', [LONG], LONG[2:]),
+                                     ('push', [9, LONG], [9] + LONG[1:])):
+            result = run_function(ANALYZED, args, name)
+            assert type(result) is list and result == expected
+
+    def test_equality(self):
+        """== compares packed and boxed lists element by element"""
+        assert run_function(ANALYZED, [LONG, LONG], 'same') is True
+        assert run_function(ANALYZED, [LONG, LONG[:-1] + [0]], 'same') is False
+        assert run_function(ANALYZED, [LONG, []], 'same') is False
+
+    def test_error_messages_name_lists(self):
+        """Type errors on a packed list still report a list"""
+        with pytest.raises(SaltinoRuntimeError, match="got int and list"):
+            run_function(ANALYZED, [LONG], 'add_to')
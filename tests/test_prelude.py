@@ -0,0 +1,317 @@
+"""
+Test suite for the native prelude functions.
+
+length, append, reverse, range, sum, take, drop, map, filter and foldl are
+implemented in Python and bound in the global scope. Each one must give the same result, or raise
+the same error, as its Saltino definition in prelude.REFERENCE_SOURCE, and
+a function of the program with the same name shadows it.
+"""
+import functools
+
+import pytest
+from checkpoint import load_checkpoint, save_checkpoint
+from errors.runtime_errors import SaltinoRuntimeError
+from execution_frames import FrameType
+from interpreter import IterativeSaltinoInterpreter
+from packed_lists import PACK_THRESHOLD, PackedList
+from prelude import PRELUDE, REFERENCE_SOURCE
+from saltino_parser import compile_saltino
+
+# One wrapper per builtin, so that the same calls run natively or, with
+# REFERENCE_SOURCE appended, through the Saltino definitions
+WRAPPERS = """
+def main() {
+    return apply(take, 2, range(0, 5))
+}
+
+def call_length(xs) {
+    return length(xs)
+}
+
+def call_append(xs, ys) {
+    return append(xs, ys)
+}
+
+def call_reverse(xs) {
+    return reverse(xs)
+}
+
+def call_range(a, b) {
+    return range(a, b)
+}
+
+def call_sum(xs) {
+    return sum(xs)
+}
+
+def call_take(n, xs) {
+    return take(n, xs)
+}
+
+def call_drop(n, xs) {
+    return drop(n, xs)
+}
+
+def call_map(f, xs) {
+    return map(f, xs)
+}
+
+def call_filter(p, xs) {
+    return filter(p, xs)
+}
+
+def call_foldl(f, acc, xs) {
+    return foldl(f, acc, xs)
+}
+
+def add1(x) {
+    return x + 1
+}
+
+def plus(a, b) {
+    return a + b
+}
+
+def snoc(acc, x) {
+    return x :: acc
+}
+
+def positive(x) {
+    if (x > 0) {
+        return true
+    } else {
+        return false
+    }
+}
+
+def flag(b) {
+    if (b and true) {
+        return true
+    }
+    return false
+}
+
+def identity(x) {
+    return x
+}
+
+def singleton(x) {
+    return x :: []
+}
+
+def twice(x) {
+    return add1(add1(x))
+}
+
+def apply(f, x, y) {
+    return f(x, y)
+}
+
+def nested(n) {
+    return sum(take(3, reverse(range(0, n)))) + length(drop(2, append(0 :: [], range(0, n))))
+}
+
+def is_short(xs) {
+    if (length(xs) < 3) {
+        return true
+    }
+    return false
+}
+"""
+
+# Callbacks are entry points too: they are passed in from the tests
+CALLBACKS = ('add1', 'plus', 'snoc', 'positive', 'flag', 'identity', 'singleton', 'twice')
+ENTRY_POINTS = (tuple(f"call_{name}" for name in PRELUDE) + CALLBACKS +
+                ('main', 'apply', 'nested', 'is_short'))
+LONG = list(range(PACK_THRESHOLD * 3))
+
+CASES = [
+    ('call_length', [[]]),
+    ('call_length', [[1, 2, 3]]),
+    ('call_length', [LONG]),
+    ('call_length', [5]),
+    ('call_append', [[1, 2], [3]]),
+    ('call_append', [[], 7]),
+    ('call_append', [[1], 7]),
+    ('call_append', [LONG, LONG]),
+    ('call_append', [3, []]),
+    ('call_reverse', [[1, 2, 3]]),
+    ('call_reverse', [[]]),
+    ('call_reverse', [LONG]),
+    ('call_reverse', [True]),
+    ('call_range', [2, 6]),
+    ('call_range', [6, 2]),
+    ('call_range', [-40, 40]),
+    ('call_range', [True, 3]),
+    ('call_range', [1, []]),
+    ('call_sum', [[1, 2, 3]]),
+    ('call_sum', [[]]),
+    ('call_sum', [LONG]),
+    ('call_sum', [3]),
+    ('call_take', [2, [1, 2, 3]]),
+    ('call_take', [5, [1, 2]]),
+    ('call_take', [0, 9]),
+    ('call_take', [-1, []]),
+    ('call_take', [2, 9]),
+    ('call_take', [40, LONG]),
+    ('call_take', [[], [1]]),
+    ('call_drop', [1, [1, 2, 3]]),
+    ('call_drop', [5, [1, 2]]),
+    ('call_drop', [0, 9]),
+    ('call_drop', [2, 9]),
+    ('call_drop', [40, LONG]),
+    ('call_drop', [False, [1]]),
+    ('call_map', ['add1', LONG]),
+    ('call_map', ['add1', []]),
+    ('call_map', ['twice', [1, 2, 3]]),
+    ('call_map', ['length', [1]]),
+    ('call_map', ['singleton', [1, 2]]),
+    ('call_map', ['plus', [1]]),
+    ('call_map', ['add1', 5]),
+    ('call_map', [5, []]),
+    ('call_map', [5, [1]]),
+    ('call_map', [5, 5]),
+    ('call_filter', ['positive', [-1, 2, 0, 3]]),
+    ('call_filter', ['positive', LONG]),
+    ('call_filter', ['flag', [1]]),
+    ('call_filter', ['identity', [1]]),
+    ('call_filter', ['positive', True]),
+    ('call_foldl', ['plus', 0, LONG]),
+    ('call_foldl', ['plus', 7, []]),
+    ('call_foldl', ['snoc', [], LONG]),
+    ('call_foldl', ['plus', [], [1]]),
+    ('call_foldl', [3, 0, [1]]),
+    ('call_foldl', ['plus', 0, 3]),
+    ('nested', [50]),
+]
+
+
+@functools.lru_cache(maxsize=None)
+def compiled(source, lazy_lists, optimization_level):
+    return compile_saltino(source, entry_points=ENTRY_POINTS, lazy_lists=lazy_lists,
+                           optimization_level=optimization_level)
+
+
+def run(source, name, args, lazy_lists=False, optimization_level=1):
+    analyzed = compiled(source, lazy_lists, optimization_level)
+    interpreter = IterativeSaltinoInterpreter(
+        semantic_analyzer=analyzed.semantic_analyzer, lazy_lists=lazy_lists)
+    interpreter.load_program(analyzed.program)
+    # Names stand for the functions of the program (or of the prelude)
+    args = [interpreter.global_env.get_function(arg) if isinstance(arg, str) else arg
+            for arg in args]
+    return interpreter.call_function(interpreter.global_env.get_function(name), args)
+
+
+def outcome(source, name, args, **options):
+    """Result of the call, or the error message it raises"""
+    try:
+        return run(source, name, args, **options)
+    except SaltinoRuntimeError as e:
+        return ('error', str(e))
+
+
+@pytest.mark.functions
+class TestPrelude:
+
+    @pytest.mark.parametrize("name,args", CASES)
+    def test_same_as_reference(self, name, args):
+        """Native and Saltino definitions agree on values and errors"""
+        assert outcome(WRAPPERS, name, args) == outcome(WRAPPERS + REFERENCE_SOURCE, name, args)
+
+    @pytest.mark.parametrize("optimization_level", [0, 2])
+    def test_optimization_levels(self, optimization_level):
+        assert run(WRAPPERS, 'nested', [50], optimization_level=optimization_level) == \
+            run(WRAPPERS + REFERENCE_SOURCE, 'nested', [50])
+
+    def test_user_definitions_shadow_builtins(self):
+        source = WRAPPERS + """
+def length(xs) {
+    return 42
+}
+"""
+        assert run(source, 'call_length', [[1, 2]]) == 42
+        assert run(source, 'call_sum', [[1, 2]]) == 3
+
+    def test_builtins_are_function_values(self):
+        """A builtin passed as an argument is called like a user function"""
+        analyzed = compile_saltino(WRAPPERS, entry_points=ENTRY_POINTS)
+        interpreter = IterativeSaltinoInterpreter(semantic_analyzer=analyzed.semantic_analyzer)
+        assert interpreter.execute_program(analyzed.program) == [0, 1]
+
+    def test_conditions_and_arity(self):
+        assert run(WRAPPERS, 'is_short', [[1]]) is True
+        assert run(WRAPPERS, 'is_short', [LONG]) is False
+        with pytest.raises(SaltinoRuntimeError, match="'length' expects 1 arguments, got 2"):
+            run(WRAPPERS, 'apply', [PRELUDE['length'], [1], [2]])
+
+    def test_packed_lists(self):
+        """Long results are packed and drop returns a view"""
+        values = PRELUDE['range'].call([0, PACK_THRESHOLD * 2])
+        assert isinstance(values, PackedList) and values == list(range(PACK_THRESHOLD * 2))
+        rest = PRELUDE['drop'].call([5, values])
+        assert isinstance(rest, PackedList) and rest.buffer is values.buffer
+        assert PRELUDE['reverse'].call([values]) == list(reversed(values))
+        assert run(WRAPPERS, 'call_range', [0, 100]) == list(range(100))
+
+    def test_callbacks_do_not_grow_the_stack(self):
+        """Native map, filter and foldl loop in Python over long lists"""
+        source = WRAPPERS + """
+def total(n) {
+    return foldl(plus, 0, filter(positive, map(digits, range(0 - n, n))))
+}
+
+def digits(x) {
+    if (x < 10) {
+        return 1
+    }
+    return 1 + digits(x / 10)
+}
+"""
+        analyzed = compile_saltino(source, entry_points=ENTRY_POINTS + ('total',))
+        interpreter = IterativeSaltinoInterpreter(semantic_analyzer=analyzed.semantic_analyzer)
+        interpreter.load_program(analyzed.program)
+        n = 5000
+        assert interpreter.call_function(interpreter.global_env.get_function('total'), [n]) == \
+            sum(len(str(x)) if x > 0 else 1 for x in range(-n, n))
+        assert interpreter.max_stack_depth < 20
+        closures = {function.name: closure is not None
+                    for function, closure, _ in interpreter.compiled_callbacks.values()}
+        # The recursive callback runs through the interpreter
+        assert closures == {'plus': True, 'positive': True, 'digits': False}
+
+    def test_recursion_through_callbacks(self, tmp_path):
+        """Callbacks run on the main stack: deep recursion and step slices work"""
+        source = WRAPPERS + """
+def down(n) {
+    if (n == 0) {
+        return 0
+    }
+    return head(map(up, [n]))
+}
+
+def up(n) {
+    return down(n - 1) + 1
+}
+"""
+        analyzed = compile_saltino(source, entry_points=ENTRY_POINTS + ('down',))
+        interpreter = IterativeSaltinoInterpreter(semantic_analyzer=analyzed.semantic_analyzer)
+        interpreter.load_program(analyzed.program)
+        down = interpreter.global_env.get_function('down')
+        assert interpreter.call_function(down, [3000]) == 3000
+
+        interpreter.start_call(down, [200])
+        assert not interpreter.run_steps(1000)
+        assert FrameType.BUILTIN in {frame.frame_type for frame in interpreter.execution_stack}
+        # A checkpoint taken inside map resumes where it stopped
+        path = str(tmp_path / "map.ckpt")
+        save_checkpoint(interpreter, path)
+        restored = load_checkpoint(path)
+        assert restored.steps_executed == interpreter.steps_executed
+        assert restored.execute() == 200
+
+    def test_lazy_lists(self):
+        """Lazy arguments are forced before the native call"""
+        assert run(WRAPPERS, 'nested', [50], lazy_lists=True) == run(WRAPPERS, 'nested', [50])
+        assert run(WRAPPERS, 'call_reverse', [LONG], lazy_lists=True) == LONG[::-1]
+        assert run(WRAPPERS, 'call_foldl', ['snoc', [], LONG], lazy_lists=True) == LONG[::-1]
@@ -0,0 +1,132 @@
+"""
+Test suite for the recurrence solver enabled at optimization level 2
+"""
+import pytest
+from conftest import assert_same_behaviour, run_function
+from saltino_parser import compile_saltino
+
+SOURCE = """
+def main(n) {
+    return fibonacci(n)
+}
+
+def fibonacci(n) {
+    if (n <= 1) {
+        return n
+    } else {
+        return fibonacci(n - 1) + fibonacci(n - 2)
+    }
+}
+
+def sum(n) {
+    if (n == 0) {
+        return 0
+    } else {
+        return n + sum(n - 1)
+    }
+}
+
+def pow2(n) {
+    if (n == 0) {
+        return 1
+    }
+    return 2 * pow2(n - 1)
+}
+
+def pell(n) {
+    if (n == 0) {
+        return 0
+    }
+    if (n == 1) {
+        return 1
+    }
+    return 2 * pell(n - 1) + pell(n - 2)
+}
+
+def steps(n) {
+    if (n < 3) {
+        return 7
+    } else {
+        return steps(n - 1) + 3 * n - 1
+    }
+}
+
+def factorial(n) {
+    if (n <= 1) {
+        return 1
+    } else {
+        return n * factorial(n - 1)
+    }
+}
+"""
+
+
+ENTRY_POINTS = ('main', 'fibonacci', 'sum', 'pow2', 'pell', 'steps', 'factorial')
+COMPILED = {}
+
+
+def compiled(optimization_level):
+    if optimization_level not in COMPILED:
+        COMPILED[optimization_level] = compile_saltino(
+            SOURCE, optimization_level=optimization_level, entry_points=ENTRY_POINTS)
+    return COMPILED[optimization_level]
+
+
+def solved_and_original():
+    """SOURCE with the recurrences solved (level 2) and without (level 1)"""
+    return compiled(2), compiled(1)
+
+
+def fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+@pytest.mark.functions
+class TestRecurrenceSolver:
+
+    def test_recognized_recurrences(self):
+        """Linear recurrences are solved, factorial is left to the other passes"""
+        analyzed = compile_saltino(SOURCE, optimization_level=2, entry_points=ENTRY_POINTS)
+        names = [function.name for function in analyzed.program.functions]
+
+        for name in ('fibonacci', 'sum', 'pow2', 'pell', 'steps'):
+            assert f"{name}_rec_1" in names
+        assert 'factorial_rec_1' not in names
+        assert 'fibonacci_matpow_1' in names
+
+    def test_results_match_original(self):
+        """Closed forms and matrix powers give the original values"""
+        programs = solved_and_original()
+        for n in range(0, 12):
+            assert assert_same_behaviour(*programs, [n], 'fibonacci') == fibonacci(n)
+            for name in ('sum', 'pow2', 'pell', 'steps'):
+                assert_same_behaviour(*programs, [n], name)
+
+    def test_below_threshold_uses_original(self):
+        """Inputs below the base clauses run the original code"""
+        programs = solved_and_original()
+        assert assert_same_behaviour(*programs, [-5], 'fibonacci') == -5
+        assert assert_same_behaviour(*programs, [-3], 'steps') == 7
+
+    def test_errors_are_preserved(self):
+        """Non-integer arguments fail exactly as in the original"""
+        programs = solved_and_original()
+        for name in ('fibonacci', 'sum', 'pell', 'steps'):
+            assert "Runtime Error" in assert_same_behaviour(*programs, [[]], name)
+            assert "Runtime Error" in assert_same_behaviour(*programs, [True], name)
+
+    def test_large_inputs(self):
+        """Exponential and linear recursions become fast"""
+        solved = compiled(2)
+        assert run_function(solved, [300], 'fibonacci') == fibonacci(300)
+        assert run_function(solved, [10 ** 12], 'sum') == 10 ** 12 * (10 ** 12 + 1) // 2
+        assert run_function(solved, [500], 'pow2') == 2 ** 500
+
+    def test_lower_levels_keep_recursion(self):
+        """The solver only runs at optimization level 2"""
+        analyzed = compile_saltino(SOURCE, entry_points=('main', 'pow2'))
+        names = [function.name for function in analyzed.program.functions]
+        assert not any(name.startswith('pow2_rec') for name in names)
@@ -0,0 +1,91 @@
+"""
+Test suite for the asyncio integration of the interpreter
+"""
+import asyncio
+import pytest
+from errors.runtime_errors import SaltinoRuntimeError
+from saltino_async import run
+
+LOOP_SOURCE = """
+def main(n) {
+    return loop(n)
+}
+
+def loop(n) {
+    if (n <= 0) {
+        return 0
+    } else {
+        return 2 + loop(n - 1)
+    }
+}
+"""
+
+FOREVER_SOURCE = """
+def main() {
+    return forever(0)
+}
+
+def forever(n) {
+    return forever(n + 1)
+}
+"""
+
+
+@pytest.mark.functions
+class TestSaltinoAsync:
+
+    def test_run_returns_result(self):
+        """run() returns the same value as the synchronous interpreter"""
+        result = asyncio.run(run(LOOP_SOURCE, 'main', [50], slice_steps=16))
+        assert result == 100
+
+    def test_run_yields_to_event_loop(self):
+        """Another coroutine makes progress while a program is running"""
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        async def scenario():
+            ticker_task = asyncio.create_task(ticker())
+            result = await run(LOOP_SOURCE, 'main', [200], slice_steps=10)
+            ticker_task.cancel()
+            return result
+
+        assert asyncio.run(scenario()) == 400
+        assert len(ticks) > 10
+
+    def test_progress_callback_reports_stack_depth(self):
+        """The progress callback receives steps and current stack depth"""
+        reports = []
+        asyncio.run(run(LOOP_SOURCE, 'main', [30], slice_steps=5,
+                        progress_callback=reports.append))
+
+        assert reports
+        assert all(report.stack_depth > 0 for report in reports)
+        steps = [report.steps for report in reports]
+        assert steps == sorted(steps)
+
+    def test_timeout(self):
+        """A non-terminating program is interrupted by the timeout"""
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run(FOREVER_SOURCE, slice_steps=100, timeout=0.05))
+
+    def test_cancellation(self):
+        """Cancelling the awaiting task stops the execution"""
+        async def scenario():
+            task = asyncio.create_task(run(FOREVER_SOURCE, slice_steps=100))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(scenario())
+
+    def test_runtime_errors_propagate(self):
+        """Runtime errors of the program are raised by run()"""
+        source = "def main() { return 1 / 0 }"
+        with pytest.raises(SaltinoRuntimeError, match="Division by zero"):
+            asyncio.run(run(source))
@@ -0,0 +1,120 @@
+"""
+Test suite for the cooperative multi-program scheduler
+"""
+import pytest
+from saltino_parser import parse_saltino
+from scheduler import SaltinoScheduler, SchedulingPolicy
+
+
+def compile_program(path):
+    with open(path, 'r') as file:
+        ast, errors, semantic_analyzer = parse_saltino(file.read())
+    return ast, semantic_analyzer
+
+
+COUNTDOWN_SOURCE = """
+def main(n) {
+    return countdown(n)
+}
+
+def countdown(n) {
+    if (n <= 0) {
+        return 0
+    } else {
+        return countdown(n - 1)
+    }
+}
+"""
+
+FAILING_SOURCE = """
+def main(n) {
+    return fail(n)
+}
+
+def fail(n) {
+    if (n <= 0) {
+        return 1 / n
+    } else {
+        return fail(n - 1)
+    }
+}
+"""
+
+
+@pytest.mark.functions
+class TestScheduler:
+
+    def test_results_match_direct_execution(self, test_suite_path):
+        """
+        Several programs submitted together must produce the same results
+        they produce when executed on their own.
+        """
+        scheduler = SaltinoScheduler(slice_steps=7)
+        expected = {}
+        for relative, value in [(("edge_cases", "deep_recursion.salt"), 100),
+                                (("functions", "tail_recursion_factorial.salt"), 120),
+                                (("lists", "append.salt"), 1)]:
+            ast, analyzer = compile_program(test_suite_path.joinpath(*relative))
+            expected[scheduler.submit(ast, analyzer)] = value
+
+        tasks = scheduler.run_all()
+
+        for task_id, value in expected.items():
+            assert tasks[task_id].error is None
+            assert tasks[task_id].result == value
+
+    def test_short_task_completes_first(self):
+        """
+        With round-robin slices a short program submitted after a long one
+        must complete before it.
+        """
+        ast, analyzer = parse_saltino(COUNTDOWN_SOURCE)[0::2]
+        scheduler = SaltinoScheduler(slice_steps=10)
+        long_id = scheduler.submit(ast, analyzer, [500])
+        short_id = scheduler.submit(ast, analyzer, [2])
+
+        order = [task.task_id for task in scheduler.run()]
+
+        assert order == [short_id, long_id]
+        assert scheduler.tasks[long_id].slices > scheduler.tasks[short_id].slices
+
+    def test_priority_policy(self):
+        """The highest priority task runs to completion first"""
+        ast, analyzer = parse_saltino(COUNTDOWN_SOURCE)[0::2]
+        scheduler = SaltinoScheduler(slice_steps=10,
+                                     policy=SchedulingPolicy.PRIORITY)
+        low_id = scheduler.submit(ast, analyzer, [2], priority=0)
+        high_id = scheduler.submit(ast, analyzer, [200], priority=5)
+
+        order = [task.task_id for task in scheduler.run()]
+
+        assert order == [high_id, low_id]
+
+    def test_errors_are_reported_per_task(self, test_suite_path):
+        """A failing task does not stop the other tasks"""
+        scheduler = SaltinoScheduler(slice_steps=3)
+        bad_ast, bad_analyzer = compile_program(
+            test_suite_path / "error_cases" / "division_by_zero.salt")
+        ast, analyzer = parse_saltino(COUNTDOWN_SOURCE)[0::2]
+        bad_id = scheduler.submit(bad_ast, bad_analyzer)
+        good_id = scheduler.submit(ast, analyzer, [20])
+        wrong_arity_id = scheduler.submit(ast, analyzer, [])
+
+        tasks = scheduler.run_all()
+
+        assert "Division by zero" in str(tasks[bad_id].error)
+        assert "expects 1 arguments" in str(tasks[wrong_arity_id].error)
+        assert tasks[good_id].error is None
+        assert tasks[good_id].result == 0
+
+    def test_failing_slice_is_counted(self):
+        """The steps of the slice that raises count toward the task's steps"""
+        ast, analyzer = parse_saltino(FAILING_SOURCE)[0::2]
+        steps = []
+        for slice_steps in (3, 1000000):
+            scheduler = SaltinoScheduler(slice_steps=slice_steps)
+            task_id = scheduler.submit(ast, analyzer, [20])
+            task = scheduler.run_all()[task_id]
+            assert "Division by zero" in str(task.error)
+            steps.append(task.steps)
+        assert steps[0] == steps[1] > 0
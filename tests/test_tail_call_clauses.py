@@ -0,0 +1,194 @@
+"""
+Test suite for the multi-clause tail-call rewrite: nested ifs, guard clauses,
+local assignments and any number of parameters.
+
+Programs are run both through the normal pipeline and with the tail-call
+transformer disabled; results and error messages must match.
+"""
+import pytest
+from conftest import assert_same_behaviour, compile_without, run_function
+from saltino_parser import compile_saltino
+from tail_recursive_transformer import TailCallTransformer
+
+FILTER_SOURCE = """
+def main(xs) {
+    return positives(xs)
+}
+
+def positives(xs) {
+    if (xs == []) {
+        return []
+    } else {
+        h = head(xs)
+        if (h > 0) {
+            return h :: positives(tail(xs))
+        } else {
+            return positives(tail(xs))
+        }
+    }
+}
+"""
+
+GUARDS_SOURCE = """
+def main(n, w, limit) {
+    return weighted(n, w, limit)
+}
+
+def weighted(n, w, limit) {
+    if (n == 0) {
+        return 0
+    }
+    if (n > limit) {
+        return 0 - 1
+    }
+    step = n * w
+    return step + weighted(n - 1, w, limit)
+}
+"""
+
+SUBTRACT_SOURCE = """
+def main(n) {
+    return alternate(n) + countdown(n)
+}
+
+def alternate(n) {
+    if (n == 0) {
+        return 0
+    } else {
+        return n - alternate(n - 1)
+    }
+}
+
+def countdown(n) {
+    if (n == 0) {
+        return 100
+    } else {
+        return countdown(n - 1) - n
+    }
+}
+"""
+
+
+def transformed_and_original(source, monkeypatch):
+    """The program compiled with and without the tail-call transformer"""
+    return (compile_saltino(source),
+            compile_without(monkeypatch, TailCallTransformer, 'transform_program', source))
+
+
+def function_names(source):
+    return [function.name for function in compile_saltino(source).program.functions]
+
+
+@pytest.mark.functions
+class TestClausesTailCall:
+
+    def test_nested_ifs_and_assignments_are_rewritten(self, monkeypatch):
+        """A filter with a local and a nested if gets a tail-recursive helper"""
+        assert 'positives_tc_helper_1' in function_names(FILTER_SOURCE)
+        programs = transformed_and_original(FILTER_SOURCE, monkeypatch)
+        assert assert_same_behaviour(*programs, [[3, -1, 4, 0, 5]]) == [3, 4, 5]
+        assert assert_same_behaviour(*programs, [[-1, -2]]) == []
+
+    def test_guard_clauses_and_three_parameters(self, monkeypatch):
+        """Several base cases and more than two parameters are supported"""
+        assert 'weighted_tc_helper_1' in function_names(GUARDS_SOURCE)
+        programs = transformed_and_original(GUARDS_SOURCE, monkeypatch)
+        assert assert_same_behaviour(*programs, [4, 2, 10]) == 20
+        assert assert_same_behaviour(*programs, [4, 2, 3]) == -1
+
+    def test_non_associative_operators_keep_grouping(self, monkeypatch):
+        """n - f(n - 1) and f(n - 1) - n give the original results"""
+        names = function_names(SUBTRACT_SOURCE)
+        assert 'alternate_tc_helper_1' in names
+        assert 'countdown_tc_helper_1' in names
+        programs = transformed_and_original(SUBTRACT_SOURCE, monkeypatch)
+        assert assert_same_behaviour(*programs, [5]) == 3 + 85
+
+    def test_errors_are_preserved(self, monkeypatch):
+        """The first error raised is the same as in the original recursion"""
+        # A non-integer element fails only when its pending cons is applied
+        positives = transformed_and_original(FILTER_SOURCE, monkeypatch)
+        weighted = transformed_and_original(GUARDS_SOURCE, monkeypatch)
+        assert "integer" in assert_same_behaviour(*positives, [[1, [2], 3]])
+        assert "integer" in assert_same_behaviour(*weighted, [3, [], 5])
+
+    def test_mixed_shapes_are_rejected(self):
+        """Recursive clauses with different operators are not rewritten"""
+        source = """
+def main() {
+    return mixed(4)
+}
+
+def mixed(n) {
+    if (n == 0) {
+        return 1
+    }
+    if (n % 2 == 0) {
+        return n + mixed(n - 1)
+    } else {
+        return n * mixed(n - 1)
+    }
+}
+"""
+        assert function_names(source) == ['main', 'mixed']
+
+    def test_late_operand_must_be_trivial(self):
+        """With the call on the left, the other operand cannot be reordered"""
+        source = """
+def main() {
+    return late(3)
+}
+
+def late(n) {
+    if (n == 0) {
+        return 0
+    }
+    return late(n - 1) + 10 / n
+}
+"""
+        assert function_names(source) == ['main', 'late']
+
+    def test_paths_without_return_are_rejected(self):
+        """An if without else at the end of the body is left unchanged"""
+        source = """
+def main() {
+    return partial(3)
+}
+
+def partial(n) {
+    if (n > 0) {
+        return 1 + partial(n - 1)
+    }
+}
+"""
+        assert function_names(source) == ['main', 'partial']
+
+    def test_tail_calls_inside_guard_clauses(self, monkeypatch):
+        """A tail call in an if without else does not fall through to the next statement"""
+        source = """
+def main(xs) {
+    return keep(positive, xs)
+}
+
+def positive(x) {
+    return x > 0
+}
+
+def keep(p, xs) {
+    if (xs == []) {
+        return []
+    }
+    if (p(head(xs))) {
+        return head(xs) :: keep(p, tail(xs))
+    }
+    return keep(p, tail(xs))
+}
+"""
+        programs = transformed_and_original(source, monkeypatch)
+        assert assert_same_behaviour(*programs, [[1, -2, 3, 4]]) == [1, 3, 4]
+
+    def test_deep_recursion(self):
+        """Long inputs are filtered by the tail-recursive helper"""
+        values = [n if n % 3 else -n for n in range(3000)]
+        analyzed = compile_saltino(FILTER_SOURCE)
+        assert run_function(analyzed, [values]) == [n for n in values if n > 0]
@@ -0,0 +1,155 @@
+"""
+Test suite for the accumulate-and-reverse rewrite of head-expr :: f(tail-args).
+
+Every program is run both through the normal pipeline and with the
+tail-call transformer disabled; results and error messages must match.
+"""
+import pytest
+from AST.ASTNodes import *
+from conftest import assert_same_behaviour, compile_without, run_function
+from saltino_parser import compile_saltino
+from tail_recursive_transformer import (ACCUMULATE_OPERATOR, CONS_ALL_OPERATOR,
+                                        TailCallTransformer)
+
+APPEND_SOURCE = """
+def main(xs, ys) {
+    return append(xs, ys)
+}
+
+def append(xs, ys) {
+    if (xs == []) {
+        return ys
+    } else {
+        return head(xs) :: append(tail(xs), ys)
+    }
+}
+"""
+
+RANGE_SOURCE = """
+def main(n) {
+    return upto(n)
+}
+
+def upto(n) {
+    if (n == 0) {
+        return []
+    } else {
+        return 10 / (n - 5) :: upto(n - 1)
+    }
+}
+"""
+
+# The parameter has the name the transformer generates for the accumulator
+ACC_SOURCE = """
+def main(n) {
+    return build(n)
+}
+
+def build(acc_1) {
+    if (acc_1 == 0) {
+        return []
+    } else {
+        return acc_1 :: build(acc_1 - 1)
+    }
+}
+"""
+
+
+def transformed_and_original(source, monkeypatch):
+    """The program compiled with and without the tail-call transformer"""
+    return (compile_saltino(source),
+            compile_without(monkeypatch, TailCallTransformer, 'transform_program', source))
+
+
+def append_function() -> Function:
+    """append(xs, ys) = if (xs == []) ys else head(xs) :: append(tail(xs), ys)"""
+    return Function("append", ["xs", "ys"], Block([
+        IfStatement(
+            condition=ComparisonCondition(Identifier("xs"), "==", EmptyList()),
+            then_block=Block([ReturnStatement(Identifier("ys"))]),
+            else_block=Block([ReturnStatement(BinaryExpression(
+                left=UnaryExpression("head", Identifier("xs")),
+                operator="::",
+                right=FunctionCall(Identifier("append"), [
+                    UnaryExpression("tail", Identifier("xs")),
+                    Identifier("ys")
+                ])
+            ))])
+        )
+    ]))
+
+
+@pytest.mark.functions
+class TestConsTailCall:
+
+    def test_append_is_rewritten(self):
+        """append becomes a wrapper around an accumulating helper"""
+        transformer = TailCallTransformer()
+        program = transformer.transform_program(Program([append_function()]))
+
+        names = [function.name for function in program.functions]
+        assert names == ["append", "append_tc_helper_1"]
+
+        wrapper, helper = program.functions
+        call = wrapper.body.statements[0].value
+        assert call.function.name == "append_tc_helper_1"
+        assert isinstance(call.arguments[0], EmptyList)
+
+        # The accumulator comes first so the head is evaluated before the tail
+        assert helper.parameters == ["acc_1", "xs", "ys"]
+        step = helper.body.statements[0].else_block.statements[0].value
+        assert step.arguments[0].operator == ACCUMULATE_OPERATOR
+        base = helper.body.statements[0].then_block.statements[0].value
+        assert base.operator == CONS_ALL_OPERATOR
+        assert base.right.name == "ys"
+
+    def test_recursive_call_on_left_is_rejected(self):
+        """f(...) :: x keeps the original function"""
+        function = append_function()
+        expr = function.body.statements[0].else_block.statements[0].value
+        expr.left, expr.right = expr.right, expr.left
+
+        program = TailCallTransformer().transform_program(Program([function]))
+        assert program.functions == [function]
+
+    def test_empty_list_base_is_not_an_accumulator(self):
+        """[] as base value of + is kept as the value the pending sums apply to"""
+        function = append_function()
+        function.body.statements[0].then_block.statements[0].value = EmptyList()
+        expr = function.body.statements[0].else_block.statements[0].value
+        expr.operator = "+"
+
+        program = TailCallTransformer().transform_program(Program([function]))
+        helper = program.functions[1]
+        base = helper.body.statements[0].then_block.statements[0].value
+        assert base.operator == "foldr+"
+        assert isinstance(base.right, EmptyList)
+
+    def test_element_order_is_preserved(self, monkeypatch):
+        """The rebuilt list keeps the original order"""
+        append = transformed_and_original(APPEND_SOURCE, monkeypatch)
+        upto = transformed_and_original(RANGE_SOURCE, monkeypatch)
+        assert assert_same_behaviour(*append, [[1, 2, 3], [4, 5]]) == [1, 2, 3, 4, 5]
+        assert assert_same_behaviour(*append, [[], [4]]) == [4]
+        assert len(assert_same_behaviour(*upto, [4])) == 4
+
+    def test_errors_are_preserved(self, monkeypatch):
+        """Type errors in the cons chain and in the heads are the same"""
+        append = transformed_and_original(APPEND_SOURCE, monkeypatch)
+        upto = transformed_and_original(RANGE_SOURCE, monkeypatch)
+        # Non-list base value: the innermost cons fails
+        assert "expects a list" in assert_same_behaviour(*append, [[1, 2], 3])
+        # Non-integer element: the cons that would build it fails
+        assert "integer" in assert_same_behaviour(*append, [[1, [2]], [3]])
+        # Failing head expression: raised during the descent
+        assert "Division by zero" in assert_same_behaviour(*upto, [7])
+
+    def test_parameter_named_like_the_accumulator(self, monkeypatch):
+        """The helper's accumulator does not shadow a parameter called acc_1"""
+        build = transformed_and_original(ACC_SOURCE, monkeypatch)
+        assert assert_same_behaviour(*build, [3]) == [3, 2, 1]
+
+    def test_deep_recursion(self):
+        """Long lists are built by the tail-recursive helper"""
+        analyzed = compile_saltino(APPEND_SOURCE)
+        assert run_function(analyzed, [list(range(3000)), [0]]) == list(range(3000)) + [0]
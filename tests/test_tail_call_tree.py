@@ -0,0 +1,122 @@
+"""
+Test suite for the sliding-window rewrite of f(n - 1) OP f(n - 2).
+
+Programs are run both through the normal pipeline and with the tail-call
+transformer disabled; results and error messages must match.
+"""
+import pytest
+from conftest import assert_same_behaviour, compile_without, run_function
+from saltino_parser import compile_saltino
+from tail_recursive_transformer import TailCallTransformer, analyze_function_pattern
+
+SOURCE = """
+def main(n) {
+    return fibonacci(n)
+}
+
+def fibonacci(n) {
+    if (n <= 1) {
+        return n
+    } else {
+        return fibonacci(n - 1) + fibonacci(n - 2)
+    }
+}
+
+def swapped(n) {
+    if (n == 0) {
+        return 3
+    }
+    if (n == 1) {
+        return 10
+    }
+    return swapped(n - 2) - swapped(n - 1)
+}
+
+def pairs(n) {
+    if (n < 2) {
+        return 0
+    } else {
+        return pairs(n - 1) :: pairs(n - 2)
+    }
+}
+"""
+
+ENTRY_POINTS = ('main', 'fibonacci', 'swapped', 'pairs')
+
+
+def transformed_and_original(monkeypatch):
+    """SOURCE compiled with and without the tail-call transformer"""
+    options = dict(optimization_level=0, entry_points=ENTRY_POINTS)
+    return (compile_saltino(SOURCE, **options),
+            compile_without(monkeypatch, TailCallTransformer, 'transform_program', SOURCE,
+                            **options))
+
+
+def fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+@pytest.mark.functions
+class TestTreeTailCall:
+
+    def test_double_recursion_is_rewritten(self):
+        """A window helper and a fallback copy are generated"""
+        names = [function.name for function in
+                 compile_saltino(SOURCE, entry_points=ENTRY_POINTS).program.functions]
+
+        for name in ('fibonacci', 'swapped', 'pairs'):
+            assert f"{name}_tc_window_1" in names
+            assert f"{name}_tc_fallback_1" in names
+
+    def test_results_match_original(self, monkeypatch):
+        """Both operand orders give the original values"""
+        programs = transformed_and_original(monkeypatch)
+        for n in range(-2, 12):
+            assert_same_behaviour(*programs, [n], 'fibonacci')
+        for n in range(0, 12):
+            assert_same_behaviour(*programs, [n], 'swapped')
+        assert run_function(programs[0], [30], 'fibonacci') == fibonacci(30)
+
+    def test_errors_are_preserved(self, monkeypatch):
+        """Failing operators and non-integer arguments fail as in the original"""
+        programs = transformed_and_original(monkeypatch)
+        assert "expects a list" in assert_same_behaviour(*programs, [3], 'pairs')
+        assert assert_same_behaviour(*programs, [1], 'pairs') == 0
+        assert "Runtime Error" in assert_same_behaviour(*programs, [[]], 'fibonacci')
+
+    def test_linear_time(self):
+        """Large inputs run in linear time and constant stack"""
+        analyzed = compile_saltino(SOURCE, optimization_level=0, entry_points=ENTRY_POINTS)
+        assert run_function(analyzed, [3000], 'fibonacci') == fibonacci(3000)
+
+    def test_other_offsets_are_rejected(self):
+        """Only n - 1 and n - 2 are recognized"""
+        source = """
+def main() {
+    return tri(10)
+}
+
+def tri(n) {
+    if (n <= 2) {
+        return 1
+    } else {
+        return tri(n - 1) + tri(n - 3)
+    }
+}
+"""
+        names = [function.name for function in compile_saltino(source).program.functions]
+        assert names == ['main', 'tri']
+
+    def test_analysis_reports_window(self):
+        """analyze_function_pattern describes the seeds of the window"""
+        fib = next(function for function in
+                   compile_saltino(SOURCE, optimization_level=0,
+                                   entry_points=ENTRY_POINTS).program.functions
+                   if function.name == 'fibonacci_tc_fallback_1')
+        analysis = analyze_function_pattern(fib)
+
+        assert analysis['can_transform']
+        assert analysis['pattern_info']['seeds'] == [1, 0]
@@ -0,0 +1,85 @@
+"""
+Test suite for removal of functions unreachable from main
+"""
+import pytest
+from AST.tree_shaking import TreeShaker
+from conftest import run_function
+from saltino_parser import compile_saltino
+
+SOURCE = """
+def main() {
+    return apply(inc, helper(1))
+}
+
+def apply(f, x) {
+    return f(x)
+}
+
+def inc(x) {
+    return x + 1
+}
+
+def helper(x) {
+    return x * 2
+}
+
+def unused(x) {
+    return dead(x)
+}
+
+def dead(x) {
+    return x
+}
+"""
+
+
+def function_names(analyzed):
+    return [function.name for function in analyzed.program.functions]
+
+
+@pytest.mark.functions
+class TestTreeShaking:
+
+    def test_unreachable_functions_are_removed(self):
+        """Functions not reachable from main are dropped at level 2"""
+        analyzed = compile_saltino(SOURCE, optimization_level=2)
+
+        assert function_names(analyzed) == ['main', 'apply', 'inc', 'helper']
+        assert run_function(analyzed) == 3
+
+    def test_function_values_are_reachable(self):
+        """A function passed as an argument is kept"""
+        analyzed = compile_saltino(SOURCE, optimization_level=2)
+
+        assert 'inc' in function_names(analyzed)
+        assert not analyzed.semantic_analyzer.global_scope.lookup_local('dead')
+
+    def test_lower_levels_keep_all_functions(self):
+        """Levels below 2 keep every function"""
+        analyzed = compile_saltino(SOURCE)
+
+        assert len(function_names(analyzed)) == 6
+
+    def test_entry_points_are_roots(self):
+        """Every entry point and what it reaches is kept"""
+        analyzed = compile_saltino(SOURCE, optimization_level=2,
+                                   entry_points=('main', 'unused'))
+
+        assert set(function_names(analyzed)) == {
+            'main', 'apply', 'inc', 'helper', 'unused', 'dead'}
+
+    def test_program_without_entry_point_is_unchanged(self):
+        """Without main nothing is removed, so the usual error is reported"""
+        analyzed = compile_saltino("def f() {\nreturn 1\n}", optimization_level=2)
+
+        assert function_names(analyzed) == ['f']
+        with pytest.raises(Exception, match="No main function found"):
+            run_function(analyzed)
+
+    def test_removed_functions_are_reported(self):
+        """The shaker records which functions it removed"""
+        shaker = TreeShaker()
+        program = compile_saltino(SOURCE, optimization_level=0).program
+        shaker.shake(program)
+
+        assert shaker.removed_functions == ['unused', 'dead']
@@ -0,0 +1,192 @@
+"""
+Test suite for the static type inference pass
+"""
+import pytest
+from AST.ASTNodes import (BinaryCondition, BinaryExpression,
+                           ComparisonCondition, UnaryExpression)
+from AST.type_inference import SaltinoType, iter_nodes
+from conftest import run_function
+from errors.runtime_errors import SaltinoRuntimeError
+from saltino_operators import SaltinoOperators
+from saltino_parser import compile_saltino
+from scheduler import SaltinoScheduler
+
+SUM_SOURCE = """
+def main() {
+    return total(build(60))
+}
+
+def build(n) {
+    if (n <= 0) {
+        return []
+    } else {
+        return n :: build(n - 1)
+    }
+}
+
+def total(xs) {
+    if (xs == []) {
+        return 0
+    } else {
+        return head(xs) + total(tail(xs))
+    }
+}
+"""
+
+
+def function_named(analyzed, name):
+    return next(f for f in analyzed.program.functions if f.name == name)
+
+
+def operator_nodes(function):
+    return [node for node in iter_nodes(function.body)
+            if isinstance(node, (BinaryExpression, UnaryExpression,
+                                 ComparisonCondition, BinaryCondition))]
+
+
+@pytest.mark.functions
+class TestTypeInference:
+
+    def test_parameters_flow_from_call_sites(self):
+        """Parameters of non-entry functions take the types of their arguments"""
+        analyzed = compile_saltino(SUM_SOURCE)
+        info = analyzed.semantic_analyzer.get_node_info
+
+        assert info(function_named(analyzed, 'main'), 'param_types') == []
+        assert info(function_named(analyzed, 'build'), 'param_types') == [SaltinoType.INT]
+        assert info(function_named(analyzed, 'total'), 'param_types') == [SaltinoType.LIST]
+        assert info(function_named(analyzed, 'build'), 'return_type') == SaltinoType.LIST
+        assert info(function_named(analyzed, 'total'), 'return_type') == SaltinoType.INT
+
+    def test_proven_nodes_are_specialized(self):
+        """Every operator whose operands are proven gets an unchecked implementation"""
+        analyzed = compile_saltino(SUM_SOURCE)
+
+        for name in ('build', 'total'):
+            for node in operator_nodes(function_named(analyzed, name)):
+                assert node.operator_impl is not None, str(node)
+        # build is rewritten into an accumulating helper whose final
+        # rebuild of the list works on proven integers
+        assert any(node.operator_impl is SaltinoOperators.unchecked_cons_all
+                   for function in analyzed.program.functions
+                   if function.name.startswith('build')
+                   for node in operator_nodes(function))
+        assert run_function(analyzed, []) == 1830
+
+    def test_entry_point_keeps_checked_operators(self):
+        """Operands depending on entry parameters keep the checked path"""
+        source = """
+def main(x) {
+    return x + 1
+}
+"""
+        analyzed = compile_saltino(source)
+        (addition,) = operator_nodes(function_named(analyzed, 'main'))
+
+        assert addition.operator_impl is SaltinoOperators.add
+        with pytest.raises(SaltinoRuntimeError, match="only operate on integers"):
+            run_function(analyzed, [True])
+
+    def test_escaping_function_keeps_checked_operators(self):
+        """Functions passed as values may receive anything and stay checked"""
+        source = """
+def main() {
+    return apply(inc, 1)
+}
+
+def apply(f, x) {
+    return f(x)
+}
+
+def inc(y) {
+    return y + 1
+}
+"""
+        analyzed = compile_saltino(source)
+        (addition,) = operator_nodes(function_named(analyzed, 'inc'))
+
+        assert addition.operator_impl is SaltinoOperators.add
+        assert run_function(analyzed, []) == 2
+
+    def test_mixed_call_sites_keep_checked_operators(self):
+        """A parameter receiving different types is not specialized"""
+        source = """
+def main() {
+    a = neg(1)
+    return neg(true)
+}
+
+def neg(x) {
+    return -x
+}
+"""
+        analyzed = compile_saltino(source)
+        (negation,) = operator_nodes(function_named(analyzed, 'neg'))
+
+        assert negation.operator_impl is SaltinoOperators.negate
+        with pytest.raises(SaltinoRuntimeError, match="Unary arithmetic"):
+            run_function(analyzed, [])
+
+    def test_value_errors_are_preserved(self):
+        """Specialized operators still raise division by zero and empty list errors"""
+        source = """
+def main() {
+    return div(1, 0)
+}
+
+def div(a, b) {
+    return a / b
+}
+
+def first() {
+    return head(tail(1 :: []))
+}
+"""
+        analyzed = compile_saltino(source, entry_points=('main', 'first'))
+        (division,) = operator_nodes(function_named(analyzed, 'div'))
+
+        assert division.operator_impl is SaltinoOperators.unchecked_divide
+        with pytest.raises(SaltinoRuntimeError, match="Division by zero"):
+            run_function(analyzed, [])
+        with pytest.raises(SaltinoRuntimeError, match="Head of empty list"):
+            run_function(analyzed, [], name='first')
+
+    def test_direct_call_with_other_types_uses_checked_operators(self):
+        """Calling a specialized function from outside with other types runs checked"""
+        analyzed = compile_saltino(SUM_SOURCE)
+
+        assert run_function(analyzed, [2], name='build') == [2, 1]
+        with pytest.raises(SaltinoRuntimeError, match="only operate on integers"):
+            run_function(analyzed, [[True]], name='total')
+        assert run_function(analyzed, [[1, 2]], name='total') == 3
+
+        scheduler = SaltinoScheduler()
+        task_id = scheduler.submit(analyzed, args=[[[]]], function_name='total')
+        list(scheduler.run())
+        assert "only operate on integers" in str(scheduler.tasks[task_id].error)
+
+        reanalyzed = compile_saltino(SUM_SOURCE, entry_points=('main', 'total'))
+        with pytest.raises(SaltinoRuntimeError, match="only operate on integers"):
+            run_function(reanalyzed, [[True]], name='total')
+
+    def test_every_operator_is_bound(self):
+        """All operator nodes hold a flat implementation after analysis"""
+        source = """
+def main(a, b) {
+    if (a < b and !(a == b) or false) {
+        return -a + b :: []
+    } else {
+        return head(tail(a :: b :: []))
+    }
+}
+"""
+        analyzed = compile_saltino(source)
+        nodes = operator_nodes(function_named(analyzed, 'main'))
+        impls = {node.operator: node.operator_impl for node in nodes}
+
+        assert all(node.operator_impl is not None for node in nodes)
+        assert impls['and'] is SaltinoOperators.logical_and
+        assert impls['or'] is SaltinoOperators.logical_or
+        assert impls['<'] is SaltinoOperators.less
+        assert run_function(analyzed, [1, 2]) == [1]
+        assert run_function(analyzed, [2, 1]) == 1
@@ -0,0 +1,169 @@
+"""
+Test suite for vectorized map and filter callbacks.
+
+Callbacks with one parameter made of integer arithmetic and comparisons are
+applied to long lists with NumPy. Elements that overflow int64 or raise an
+error are recomputed exactly, so results and error messages are the same as
+with one call per element.
+"""
+from array import array
+
+import pytest
+import compiled_callbacks
+from errors.runtime_errors import SaltinoRuntimeError
+from interpreter import IterativeSaltinoInterpreter
+from packed_lists import PackedList
+from saltino_parser import compile_saltino
+
+np = pytest.importorskip("numpy")
+
+SOURCE = """
+def main(xs) {
+    return map(add1, xs)
+}
+
+def run_map(f, xs) {
+    return map(f, xs)
+}
+
+def run_filter(p, xs) {
+    return filter(p, xs)
+}
+
+def add1(x) {
+    return x + 1
+}
+
+def square(x) {
+    return x * x
+}
+
+def inverse(x) {
+    return 100 / x
+}
+
+def reciprocal(x) {
+    return x ^ (0 - 1)
+}
+
+def even(x) {
+    return x % 2 == 0
+}
+
+def positive(x) {
+    if (x > 0) {
+        return true
+    } else {
+        return false
+    }
+}
+
+def large_quotient(x) {
+    return !(x == 0) and 100 / x > 3
+}
+
+def clamp(x) {
+    if (x < 0 - 10) {
+        return 0 - 10
+    }
+    if (x > 10) {
+        return 10
+    }
+    return x
+}
+
+def digits(x) {
+    if (x < 10) {
+        return 1
+    }
+    return 1 + digits(x / 10)
+}
+"""
+
+CALLBACKS = ('add1', 'square', 'inverse', 'reciprocal', 'even', 'positive', 'large_quotient',
+             'clamp', 'digits')
+ANALYZED = compile_saltino(SOURCE, entry_points=('main', 'run_map', 'run_filter') + CALLBACKS)
+VALUES = list(range(-100, 100))
+
+
+def run(name, callback, values, packed_result=False):
+    interpreter = IterativeSaltinoInterpreter(
+        semantic_analyzer=ANALYZED.semantic_analyzer, packed_result=packed_result)
+    interpreter.load_program(ANALYZED.program)
+    function = interpreter.global_env.get_function(callback)
+    try:
+        result = interpreter.call_function(
+            interpreter.global_env.get_function(name), [function, values])
+    except SaltinoRuntimeError as e:
+        result = ('error', str(e))
+    vector = interpreter.vector_callback(function)
+    return result, vector
+
+
+def outcome(name, callback, values, monkeypatch):
+    """Vectorized result, checked against the per-element one"""
+    result, vector = run(name, callback, values)
+    with monkeypatch.context() as patch:
+        patch.setattr(compiled_callbacks, 'np', None)
+        scalar, no_vector = run(name, callback, values)
+    assert no_vector is None
+    assert result == scalar
+    return result, vector
+
+
+@pytest.mark.functions
+class TestVectorCallbacks:
+
+    @pytest.mark.parametrize("name,callback,expected", [
+        ('run_map', 'add1', [x + 1 for x in VALUES]),
+        ('run_map', 'clamp', [max(-10, min(10, x)) for x in VALUES]),
+        ('run_filter', 'even', [x for x in VALUES if x % 2 == 0]),
+        ('run_filter', 'positive', [x for x in VALUES if x > 0]),
+        ('run_filter', 'large_quotient', [x for x in VALUES if x != 0 and 100 // x > 3]),
+    ])
+    def test_vectorized_results(self, name, callback, expected, monkeypatch):
+        result, vector = outcome(name, callback, VALUES, monkeypatch)
+        assert vector is not None
+        assert result == expected
+
+    def test_packed_lists(self):
+        """Packed inputs are read in place and long results stay packed"""
+        packed = PackedList(array('q', VALUES))
+        result, _ = run('run_map', 'add1', packed, packed_result=True)
+        assert isinstance(result, PackedList) and result == [x + 1 for x in VALUES]
+
+    def test_overflow_falls_back_to_exact_integers(self, monkeypatch):
+        values = [2 ** 62, 2 ** 63 - 1, -2 ** 63] + VALUES
+        result, vector = outcome('run_map', 'square', values, monkeypatch)
+        assert vector is not None and result == [x * x for x in values]
+        result, _ = outcome('run_map', 'add1', values, monkeypatch)
+        assert result == [x + 1 for x in values]
+
+    def test_elements_beyond_int64(self, monkeypatch):
+        """Lists that do not fit in int64 are mapped element by element"""
+        values = VALUES + [2 ** 70]
+        result, _ = outcome('run_map', 'add1', values, monkeypatch)
+        assert result == [x + 1 for x in values]
+
+    def test_errors(self, monkeypatch):
+        """The first failing element raises the usual error"""
+        result, vector = outcome('run_map', 'inverse', VALUES, monkeypatch)
+        assert vector is not None and result == ('error', 'Runtime Error: Division by zero')
+        # A boolean result cannot be consed onto the list
+        result, _ = outcome('run_map', 'even', VALUES, monkeypatch)
+        assert result[0] == 'error' and 'got bool' in result[1]
+        # Nor can a float computed exactly for an element NumPy rejects
+        result, vector = outcome('run_map', 'reciprocal', list(range(1, 40)), monkeypatch)
+        assert vector is not None and result == (
+            'error', 'Runtime Error: Cons operator expects an integer as first argument, '
+                     'got float')
+        result, _ = outcome('run_filter', 'add1', VALUES, monkeypatch)
+        assert result == ('error', 'Runtime Error: Function used in condition must return '
+                                   'boolean, got int')
+
+    def test_short_lists_and_other_callbacks(self, monkeypatch):
+        """Short lists and callbacks with calls use one call per element"""
+        assert outcome('run_map', 'add1', [1, 2, 3], monkeypatch)[0] == [2, 3, 4]
+        result, vector = outcome('run_map', 'digits', VALUES, monkeypatch)
+        assert vector is None
+        assert result == [len(str(x)) if x > 0 else 1 for x in VALUES]